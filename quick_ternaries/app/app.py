@@ -1,9 +1,6 @@
 import json
-import os
-from time import time
 import re
 import traceback
-import webbrowser
 from dataclasses import fields
 from pathlib import Path
 
@@ -34,6 +31,7 @@ from PySide6.QtWidgets import (
     QLabel,
     QMainWindow,
     QMessageBox,
+    QProgressDialog,
     QPushButton,
     QStackedWidget,
     QVBoxLayout,
@@ -47,15 +45,24 @@ from quick_ternaries.services.ternary_trace_maker import (
 )
 from quick_ternaries.services.cartesian_plot_maker import CartesianPlotMaker
 from quick_ternaries.services.zmap_plot_maker import ZmapPlotMaker
+from quick_ternaries.services.hover_store import HOVER_STORE
+from quick_ternaries.services.line_decimation import LINE_STORE
+from quick_ternaries.services.selection_store import SELECTION_STORE
+from quick_ternaries.services.viewport_lod import VIEWPORT_STORE
+from quick_ternaries.services.ternary_webgl import maybe_to_webgl_figure
 
 from quick_ternaries.utils.functions import (
-    is_valid_formula,
     validate_data_library,
     get_numeric_columns_from_dataframe,
-    get_numeric_columns_from_file
+    get_numeric_columns_from_file,
+    get_all_columns_from_file
 )
 from quick_ternaries.utils.fonts import OPEN_SANS_FONT_FILES
-from quick_ternaries.utils.plotly_html import figure_to_html, write_plotly_html
+from quick_ternaries.utils.plotly_html import figure_to_page_html, write_plotly_html
+from quick_ternaries.utils.page_scheme import install_page_scheme_handler
+from quick_ternaries.utils.page_store import PLOTLY_JS_PATH, PageStore
+from quick_ternaries.utils.plot_page import plot_page_html
+from quick_ternaries.utils.typed_arrays import float32_coordinates_enabled
 from quick_ternaries.utils.constants import (
     ADD_TRACE_LABEL,
     SETUP_MENU_LABEL,
@@ -82,6 +89,7 @@ from quick_ternaries.views.widgets import (
 from quick_ternaries.views.tab_panel_widget import TabPanel
 from quick_ternaries.views.setup_menu_view import SetupMenuView
 from quick_ternaries.views.trace_editor_view import TraceEditorView
+from quick_ternaries.views.dialogs.zmap_scatter_dialog import ZmapScatterDialog
 
 from quick_ternaries.controllers import (
     TraceEditorController,
@@ -124,7 +132,9 @@ class MainWindow(QMainWindow):
         self.tabPanel = TabPanel()
         self.h_splitter.addWidget(self.tabPanel)
 
-        self.zmap_plot_maker = ZmapPlotMaker()
+        # Generated pages are served from memory, under this window's own URL host
+        self.page_store = PageStore()
+        self.zmap_plot_maker = ZmapPlotMaker(self.page_store)
 
         # Initialize color palette for new traces
         self.color_palette = ColorPalette()
@@ -136,6 +146,7 @@ class MainWindow(QMainWindow):
         self.plotly_interface = PlotlyInterface()
 
         self.zmap_channel = QWebChannel()
+        self.zmap_scatter_dialog = None  # Created on the first double-clicked Zmap cell
         self.zmap_handler = ZmapPlotHandler(self)
         self.zmap_channel.registerObject("zmapHandler", self.zmap_handler)
 
@@ -161,11 +172,14 @@ class MainWindow(QMainWindow):
         self.plotView = QWebEngineView()
         self.plotView.setHtml("<h3>Plot Window</h3><p>QWebEngineView placeholder</p>")
         self.h_splitter.addWidget(self.plotView)
+        install_page_scheme_handler(self.plotView.page().profile())
 
         # Set up the web channel
         self.web_channel = QWebChannel(self.plotView.page())
         self.web_channel.registerObject("plotlyInterface", self.plotly_interface)
         self.plotView.page().setWebChannel(self.web_channel)
+        # Set once the persistent plot page is loaded; other pages (e.g. Z-maps) replace it
+        self.plot_page_loaded = False
 
         # Connect TabPanel callbacks
         self.tabPanel.tabSelectedCallback = self.on_tab_selected
@@ -465,27 +479,25 @@ class MainWindow(QMainWindow):
 
     def on_prev_zmap_clicked(self):
         """Handle click on Previous ZMap button."""
-        file_path = self.zmap_plot_maker.prev_plot()
-        if file_path and os.path.exists(file_path):
-            self.plotView.setUrl(QUrl.fromLocalFile(file_path))
-            
-            # Update status label if available
-            if hasattr(self, 'statusLabel'):
-                total_plots = len(self.zmap_plot_maker.heatmap_files)
-                current_target = self.zmap_plot_maker.current_target
-                self.statusLabel.setText(f"Plot {self.zmap_plot_maker.current_index + 1}/{total_plots}: {current_target}")
+        self._show_zmap_target(self.zmap_plot_maker.prev_plot())
 
     def on_next_zmap_clicked(self):
         """Handle click on Next ZMap button."""
-        file_path = self.zmap_plot_maker.next_plot()
-        if file_path and os.path.exists(file_path):
-            self.plotView.setUrl(QUrl.fromLocalFile(file_path))
-            
-            # Update status label if available
-            if hasattr(self, 'statusLabel'):
-                total_plots = len(self.zmap_plot_maker.heatmap_files)
-                current_target = self.zmap_plot_maker.current_target
-                self.statusLabel.setText(f"Plot {self.zmap_plot_maker.current_index + 1}/{total_plots}: {current_target}")
+        self._show_zmap_target(self.zmap_plot_maker.next_plot())
+
+    def _show_zmap_target(self, index):
+        """Draw a target on the loaded Z-map page, which holds every target's correlations."""
+        if index is None:
+            return
+        self.plotView.page().runJavaScript(f"showTarget({index});")
+        self._update_zmap_status()
+
+    def _update_zmap_status(self):
+        """Show the current Z-map target in the status label, if available."""
+        if hasattr(self, 'statusLabel'):
+            total_plots = len(self.zmap_plot_maker.targets)
+            current_target = self.zmap_plot_maker.current_target
+            self.statusLabel.setText(f"Plot {self.zmap_plot_maker.current_index + 1}/{total_plots}: {current_target}")
     
     def show_save_dialog(self):
         # Define file filters for the dropdown, adding PDF and HTML
@@ -507,172 +519,29 @@ class MainWindow(QMainWindow):
 
         return Path(file_path), selected_filter
     
-    def generate_scatter_plot(self, category_value, target, other):
+    def generate_scatter_plot(self, category_index, target, other):
         """
-        Generate a scatter plot for a double-clicked cell in the Zmap.
+        Show the scatter plot of a double-clicked cell in the Zmap.
+
+        The plot is built from the data the Zmap was made from (cached by the
+        ZmapPlotMaker) and shown in a window of the app.
         
         Args:
-            category_value: The value of the categorical column
+            category_index: Position of the category on the Zmap's x-axis
             target: The target column
             other: The other column
         """
-        # Get visible traces
-        visible_traces = self._get_visible_traces()
-        
-        # Get the categorical column from the setup model
-        categorical_column = self.setupMenuModel.axis_members.categorical_column
-        
-        if not categorical_column:
-            print("No categorical column selected")
-            return
-        
-        # Concatenate data from all traces after applying filters
-        combined_df = pd.DataFrame()
-        
-        for uid, trace_model in visible_traces:
-            # Skip traces with hiding enabled
-            if getattr(trace_model, "hide_on", False):
-                continue
-            
-            # Get the dataframe for this trace
-            df = self.setupMenuModel.data_library.dataframe_manager.get_dataframe_by_metadata(trace_model.datafile)
-            if df is None:
-                continue
-            
-            # Apply filters if enabled
-            if getattr(trace_model, "filters_on", False) and hasattr(trace_model, "filters"):
-                # Use the ZmapPlotMaker's _apply_filters method
-                filtered_df = self.zmap_plot_maker._apply_filters(df, trace_model.filters)
-                if not filtered_df.empty:
-                    combined_df = pd.concat([combined_df, filtered_df], ignore_index=True)
-            else:
-                # No filtering needed
-                combined_df = pd.concat([combined_df, df], ignore_index=True)
-        
-        if combined_df.empty:
-            print("No data available for scatter plot")
-            return
-        
-        # Filter to only include the selected category value
-        try:
-            # Try to convert category value to match the dataframe's type
-            if combined_df[categorical_column].dtype == 'int64' or combined_df[categorical_column].dtype == 'float64':
-                try:
-                    category_converted = float(category_value) if '.' in category_value else int(category_value)
-                except (ValueError, TypeError):
-                    category_converted = category_value
-            else:
-                category_converted = category_value
-            
-            # Filter the dataframe
-            df_f = combined_df[combined_df[categorical_column] == category_converted]
-            
-            # If empty result, try string comparison
-            if df_f.empty:
-                df_f = combined_df[combined_df[categorical_column].astype(str) == str(category_value)]
-                
-                # If still empty, try finding the value in different formats
-                if df_f.empty:
-                    all_values = combined_df[categorical_column].unique()
-                    
-                    # Try as int
-                    try:
-                        if int(float(category_value)) in all_values:
-                            category_converted = int(float(category_value))
-                            df_f = combined_df[combined_df[categorical_column] == category_converted]
-                    except:
-                        pass
-                    
-                    # Try as float
-                    if df_f.empty:
-                        try:
-                            if float(category_value) in all_values:
-                                category_converted = float(category_value)
-                                df_f = combined_df[combined_df[categorical_column] == category_converted]
-                        except:
-                            pass
-                    
-                    # Try as string if all else fails
-                    if df_f.empty and any(str(v) == str(category_value) for v in all_values):
-                        matching_values = [v for v in all_values if str(v) == str(category_value)]
-                        if matching_values:
-                            category_converted = matching_values[0]
-                            df_f = combined_df[combined_df[categorical_column] == category_converted]
-        except Exception as e:
-            print(f"Error filtering data: {e}")
-            return
-        
-        if df_f.empty:
-            print(f"No data for {categorical_column}={category_value}")
+        scatter_fig = self.zmap_plot_maker.scatter_figure(category_index, target, other)
+        if scatter_fig is None:
             return
         
-        # Get data for the two elements
-        try:
-            x_data = df_f[target]
-            y_data = df_f[other]
-        except KeyError:
-            print(f"Columns {target} and/or {other} not found in data")
-            return
-        
-        print(f"Found {len(x_data)} data points for plotting")
-        
-        # Compute the best fit line
-        try:
-            coeffs = np.polyfit(x_data, y_data, 1)
-            slope, intercept = coeffs
-            x_line = np.array([x_data.min(), x_data.max()])
-            y_line = slope * x_line + intercept
-            r_value = np.corrcoef(x_data, y_data)[0, 1]
-        except Exception as e:
-            print(f"Error computing best fit: {e}")
-            # Default values if fit fails
-            slope, intercept = 0, 0
-            x_line = np.array([x_data.min(), x_data.max()])
-            y_line = np.zeros_like(x_line)
-            r_value = 0
-        
-        # Create scatter plot figure
-        scatter_fig = go.Figure()
-        scatter_fig.add_trace(go.Scatter(
-            x=x_data, y=y_data, mode='markers', name='Data Points'
-        ))
-        scatter_fig.add_trace(go.Scatter(
-            x=x_line, y=y_line, mode='lines', 
-            name=f'Best Fit (r = {r_value:.3f})'
-        ))
-        scatter_fig.update_layout(
-            title=f"Scatter: {target} vs {other} for {categorical_column}={category_converted}",
-            xaxis_title=target,
-            yaxis_title=other,
-            paper_bgcolor="white",
-            plot_bgcolor="white",
-            width=800,
-            height=600,
-            margin=dict(l=50, r=50, t=50, b=50)
-        )
-        
-        # Generate a unique filename for this plot
-        safe_value = str(category_converted).replace('/', '_').replace('\\', '_')
-        filename = f"scatter_{target}_{other}_{safe_value}_{int(time())}.html"
-        scatter_dir = "scatter_plots"
-        
-        # Make sure scatter plots directory exists
-        if not os.path.exists(scatter_dir):
-            os.makedirs(scatter_dir)
+        # Serve the page from memory, with plotly.js from the local bundle
+        scatter_html = figure_to_page_html(scatter_fig, full_html=True, include_plotlyjs=PLOTLY_JS_PATH)
+        url = self.page_store.put("zmap/scatter.html", scatter_html)
         
-        filepath = os.path.join(scatter_dir, filename)
-        
-        # Write the scatter plot HTML to a file
-        scatter_html = figure_to_html(scatter_fig, include_plotlyjs=True, full_html=True)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(scatter_html)
-        
-        print(f"Saved scatter plot to {filepath}")
-
-        # Open in system browser
-        file_url = QUrl.fromLocalFile(os.path.abspath(filepath)).toString()
-        webbrowser.open(file_url)
-        print(f"Opened scatter plot in browser: {file_url}")
+        if self.zmap_scatter_dialog is None:
+            self.zmap_scatter_dialog = ZmapScatterDialog(self)
+        self.zmap_scatter_dialog.show_page(url, f"Scatter: {target} vs {other}")
 
     # Add a validation method for density contour settings
     def validate_density_contour_settings(self):
@@ -885,8 +754,9 @@ class MainWindow(QMainWindow):
             'y_axis': getattr(self.setupMenuModel.axis_members, 'y_axis', []),
         }
         
-        # Get current formulas
+        # Get current formulas and validate them all at once
         formula_model = self.setupMenuModel.chemical_formulas
+        formula_validity = formula_model.validate()
         
         # Track missing or invalid formulas
         missing_formulas = []
@@ -907,7 +777,7 @@ class MainWindow(QMainWindow):
                         
                         if not formula.strip():
                             missing_formulas.append((model.trace_name, column, axis_name))
-                        elif not is_valid_formula(formula):
+                        elif not formula_validity.get(axis_name, {}).get(column, False):
                             invalid_formulas.append((model.trace_name, column, formula, axis_name))
         
         # If problems found, show a warning
@@ -971,11 +841,30 @@ class MainWindow(QMainWindow):
                 )
                 return
             
+            # Resampling significance tests can take a while; show their progress and allow cancelling
+            progress_dialog = None
+            if getattr(self.setupMenuModel.advanced_settings, 'zmap_significance', 'asymptotic') != 'asymptotic':
+                progress_dialog = QProgressDialog("Testing Z-map significance...", "Cancel", 0, 0, self)
+                progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+                progress_dialog.setMinimumDuration(500)
+
+            def report_progress(done, total):
+                progress_dialog.setMaximum(total)
+                progress_dialog.setValue(done)
+                QApplication.processEvents()
+
             # Generate the zmap plots
             success = self.zmap_plot_maker.make_plot(
                 self.setupMenuModel, 
-                [model for _, model in visible_traces]
+                [model for _, model in visible_traces],
+                progress=report_progress if progress_dialog is not None else None,
+                cancelled=progress_dialog.wasCanceled if progress_dialog is not None else None,
             )
+            if progress_dialog is not None:
+                progress_dialog.close()
+
+            if self.zmap_plot_maker.cancelled:
+                return
             
             if not success:
                 QMessageBox.warning(
@@ -985,33 +874,31 @@ class MainWindow(QMainWindow):
                 )
                 return
             
-            # Get the current plot file path
-            current_path = self.zmap_plot_maker.load_current_plot()
+            # Get the current plot's page (served from memory)
+            current_url = self.zmap_plot_maker.load_current_plot()
             
-            if not current_path or not os.path.exists(current_path):
+            if not current_url:
                 QMessageBox.warning(
                     self, 
-                    "File Not Found",
-                    f"Could not find the plot file: {current_path}"
+                    "Plot Not Found",
+                    "Could not find the current Z-map page."
                 )
                 return
             
             # Load the plot using QUrl
-            self.plotView.setUrl(QUrl.fromLocalFile(current_path))
+            self.plotView.setUrl(QUrl(current_url))
+            self.plot_page_loaded = False
             
             # Set the WebChannel for ZMap interactions
             self.plotView.page().setWebChannel(self.zmap_channel)
             
             # Show/hide the Zmap navigation buttons based on number of targets
-            has_multiple_targets = len(self.zmap_plot_maker.heatmap_files) > 1
+            has_multiple_targets = len(self.zmap_plot_maker.targets) > 1
             self.zmapPrevButton.setVisible(has_multiple_targets)
             self.zmapNextButton.setVisible(has_multiple_targets)
             
             # Update status label if available
-            if hasattr(self, 'statusLabel'):
-                total_plots = len(self.zmap_plot_maker.heatmap_files)
-                current_target = self.zmap_plot_maker.current_target
-                self.statusLabel.setText(f"Plot {self.zmap_plot_maker.current_index + 1}/{total_plots}: {current_target}")
+            self._update_zmap_status()
             
             return
         
@@ -1019,6 +906,13 @@ class MainWindow(QMainWindow):
         self.zmapPrevButton.setVisible(False)
         self.zmapNextButton.setVisible(False)
         
+        # Hover rows, full-resolution traces and selectable points of the previous plot are no longer reachable from the page
+        HOVER_STORE.clear()
+        LINE_STORE.clear()
+        VIEWPORT_STORE.clear()
+        SELECTION_STORE.clear()
+        self.plotly_interface.selection = []
+
         if current_plot_type == 'ternary':
             # Handle ternary plots
             regular_traces = [model for _, model in visible_traces if not getattr(model, "is_contour", False)]
@@ -1030,35 +924,22 @@ class MainWindow(QMainWindow):
             
             # Create the basic figure with regular traces
             # fig = self.ternary_plot_maker.make_plot(self.setupMenuModel, regular_traces)
-            fig = self.ternary_plot_maker.make_plot(self.setupMenuModel, [(uid, model) for uid, model in visible_traces if not getattr(model, "is_contour", False)])
+            # The preview is assembled as plain dicts (exports build validated figures)
+            fig = self.ternary_plot_maker.make_plot(
+                self.setupMenuModel,
+                [(uid, model) for uid, model in visible_traces if not getattr(model, "is_contour", False)],
+                validate=False
+            )
 
             # For each regular trace, track its index in the plotly figure
-            # and also track indices of any density contours it creates
             for ui_index, (uid, model) in enumerate(visible_traces):
                 if getattr(model, "is_contour", False):
                     continue  # Skip contour traces here
                 
-                # Record mapping for this main trace
-                trace_mapping[current_trace_index] = ui_index
-                current_trace_index += 1  # Move to next plotly trace index
-                
-                # If this trace has density contours, account for them too
-                if getattr(model, "density_contour_on", False):
-                    # Check if it's multiple contours
-                    if getattr(model, "density_contour_multiple", False):
-                        percentiles_str = getattr(model, "density_contour_percentiles", "60,70,80")
-                        try:
-                            percentiles = [float(p.strip()) for p in percentiles_str.split(',') if p.strip()]
-                            num_contours = len(percentiles) if percentiles else 3
-                        except ValueError:
-                            num_contours = 3
-                    else:
-                        num_contours = 1
-                    
-                    # Each contour gets its own plotly trace but maps back to the same UI trace
-                    for _ in range(num_contours):
-                        trace_mapping[current_trace_index] = ui_index
-                        current_trace_index += 1
+                # Record mapping for this main trace (split traces produce one per category)
+                for _ in range(self.ternary_plot_maker.trace_counts.get(uid, 1)):
+                    trace_mapping[current_trace_index] = ui_index
+                    current_trace_index += 1  # Move to next plotly trace index
             
             # Add bootstrap contour traces if any exist
             for uid, model in contour_traces:
@@ -1071,26 +952,28 @@ class MainWindow(QMainWindow):
                     current_trace_index += 1
             
             # Add density contours for regular traces that have it enabled
-            for ui_index, (uid, model) in enumerate(visible_traces):
-                # Skip bootstrap contour traces, they can't have density contours
-                if getattr(model, "is_contour", False):
-                    continue
-                
-                # Check if density contour is enabled
-                if getattr(model, "density_contour_on", False):
-                    # Get contour traces (can now be multiple)
-                    contour_traces = self.density_contour_maker.make_trace(
-                        self.setupMenuModel, model, f"density-{uid}"
-                    )
-                    
-                    if contour_traces:
-                        if isinstance(contour_traces, list):
-                            # Add each contour trace to the figure
-                            for trace in contour_traces:
-                                fig.add_trace(trace)
-                        else:
-                            # Handle case where a single trace is returned
-                            fig.add_trace(contour_traces)
+            # (bootstrap contour traces can't have density contours)
+            density_items = [
+                (ui_index, uid, model) for ui_index, (uid, model) in enumerate(visible_traces)
+                if not getattr(model, "is_contour", False) and getattr(model, "density_contour_on", False)
+            ]
+
+            # The KDEs are computed in parallel; results come back in tab order
+            density_results = self.density_contour_maker.make_traces(
+                self.setupMenuModel,
+                [(model, f"density-{uid}") for _, uid, model in density_items]
+            )
+
+            for (ui_index, _, _), density_traces in zip(density_items, density_results):
+                # Each contour gets its own plotly trace but maps back to the same UI trace
+                for trace in density_traces or []:
+                    fig.add_trace(trace)
+                    trace_mapping[current_trace_index] = ui_index
+                    current_trace_index += 1
+
+            # Very large figures are redrawn on WebGL Cartesian axes; the trace
+            # order is kept, so the mapping and selection are unaffected
+            fig = maybe_to_webgl_figure(fig, self.setupMenuModel)
                     
             # Store the trace mapping in a global variable for bootstrap to use
             self.plotly_trace_mapping = trace_mapping
@@ -1099,8 +982,9 @@ class MainWindow(QMainWindow):
         elif current_plot_type == 'cartesian':
             # Create the figure with regular traces using cartesian plot maker
             fig = self.cartesian_plot_maker.make_plot(
-                self.setupMenuModel, 
-                [model for _, model in visible_traces if not getattr(model, "is_contour", False)]
+                self.setupMenuModel,
+                [(uid, model) for uid, model in visible_traces if not getattr(model, "is_contour", False)],
+                validate=False
             )
         
         elif current_plot_type == 'histogram':
@@ -1120,36 +1004,29 @@ class MainWindow(QMainWindow):
             )
             return
 
-        # Generate HTML with plotlyInterface for ternary/cartesian plots
-        html = figure_to_html(fig)
-        javascript = """
-            <script type="text/javascript" src="qrc:///qtwebchannel/qwebchannel.js"></script>
-            <script type="text/javascript">
-                document.addEventListener("DOMContentLoaded", function() {
-                    new QWebChannel(qt.webChannelTransport, function (channel) {
-                        window.plotlyInterface = channel.objects.plotlyInterface;
-                        var plotElement = document.getElementsByClassName('plotly-graph-div')[0];
-                        plotElement.on('plotly_selected', function(eventData) {
-                            if (eventData) {
-                                var indices = eventData.points.map(function(pt) {
-                                    return {traceID: pt.customdata[pt.customdata.length - 1], pointIndex: pt.customdata[pt.customdata.length - 2], curveNumber: pt.curveNumber};  // the index is the last item in customdata
-                                });
-                                window.plotlyInterface.receive_selected_indices(indices);
-                            }
-                        });
-                    });
-                });
-            </script>
+        # Keep the plot coordinates of selectable points, so lasso selections are resolved in Python
+        SELECTION_STORE.register_figure(fig)
+
+        # The plot page stays loaded; new figures are applied in place, keeping the user's zoom
+        self.plotly_interface.show_figure(
+            fig,
+            float32_coordinates_enabled(self.setupMenuModel),
+            notify_page=self.plot_page_loaded
+        )
+        if not self.plot_page_loaded:
+            # The page asks for the figure once its web channel is up
+            self._load_plot_page()
+
+    def _load_plot_page(self):
         """
-        full = html + javascript
-        
-        fname = Path(__file__).parent / "__tmp.html"
+        Loads the persistent plot page, which receives figures over the web channel.
+        """
+        # Serve the page from memory and load it (once, until another page replaces it)
+        url = self.page_store.put('plot.html', plot_page_html(PLOTLY_JS_PATH))
 
-        # Write temporary file and load it
-        with open(fname, "w", encoding='utf-8') as f:
-            f.write(full)
-        
-        self.plotView.setUrl(QUrl.fromLocalFile(fname))
+        self.plotView.page().setWebChannel(self.web_channel)
+        self.plotView.setUrl(QUrl(url))
+        self.plot_page_loaded = True
 
     def _get_visible_traces(self):
         """
@@ -1188,10 +1065,10 @@ class MainWindow(QMainWindow):
             )
             return
 
-        # Get selected indices from the plot
-        indices = self.plotly_interface.get_indices()
+        # Get the selected points (resolved from the lasso region against the shown figure)
+        selection = self.plotly_interface.get_selection()
         
-        if not indices or len(indices) != 1:
+        if sum(len(group['rows']) for group in selection) != 1:
             QMessageBox.warning(
                 self, 
                 "Selection Error",
@@ -1199,11 +1076,11 @@ class MainWindow(QMainWindow):
             )
             return
         
-        # Extract point information
-        point_info = indices[0]
+        # Extract point information; the point index is the row's dataframe index label
+        point_info = next(group for group in selection if len(group['rows']))
         print(f'{point_info=}')
         curve_number = point_info.get('curveNumber')
-        point_index = point_info.get('pointIndex')
+        point_index = point_info['rows'].tolist()[0]
         # If we have source_trace_id in customdata, extract it
         source_trace_id = point_info.get('traceID')
         
@@ -1283,14 +1160,17 @@ class MainWindow(QMainWindow):
             return
         
         # Extract the specific row from the dataframe
-        # Get the row corresponding to the point index
-        if point_index < len(df):
-            series = df.iloc[point_index]
+        # The point index is an index label, which survives filtering and sorting
+        if point_index in df.index:
+            series = df.loc[point_index]
+            # Duplicate index labels give a frame; use the first matching row
+            if isinstance(series, pd.DataFrame):
+                series = series.iloc[0]
         else:
             QMessageBox.warning(
                 self, 
                 "Index Error", 
-                f"Point index {point_index} is out of bounds for the dataframe."
+                f"Point index {point_index} is not in the dataframe."
             )
             return
         
@@ -1516,6 +1396,7 @@ class MainWindow(QMainWindow):
         model = self.traceEditorView.model
         original_heatmap_column = model.heatmap_column
         original_sizemap_column = model.sizemap_column
+        original_split_column = model.split_category_column
 
         # Block ALL signals during UI update
         for widget_name, widget in self.traceEditorView.widgets.items():
@@ -1598,6 +1479,20 @@ class MainWindow(QMainWindow):
                     # Now set the combobox value to match the model
                     sizemap_combo.setCurrentText(original_sizemap_column)
 
+                split_combo = self.traceEditorView.widgets.get("split_category_column")
+                if split_combo and isinstance(split_combo, QComboBox):
+                    all_cols = get_all_columns_from_file(
+                        datafile.file_path, header=datafile.header_row, sheet=datafile.sheet
+                    )
+                    split_combo.clear()
+                    split_combo.addItems(all_cols)
+                    if (
+                        original_split_column
+                        and original_split_column not in all_cols
+                    ):
+                        split_combo.addItem(original_split_column)
+                    split_combo.setCurrentText(original_split_column)
+
         # Unblock signals after all updates are done
         for widget_name, widget in self.traceEditorView.widgets.items():
             if hasattr(widget, "blockSignals"):
@@ -1607,6 +1502,7 @@ class MainWindow(QMainWindow):
         # This is a safeguard in case any signals still fired
         model.heatmap_column = original_heatmap_column
         model.sizemap_column = original_sizemap_column
+        model.split_category_column = original_split_column
 
     def on_plot_type_changed(self, plot_type: str):
         plot_type_lower = plot_type.lower()
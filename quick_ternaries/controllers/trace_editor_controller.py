@@ -299,6 +299,11 @@ class TraceEditorController:
                 else:
                     changes["sizemap_column"] = ""
         
+        # Check and update the split-by-category column if needed
+        if getattr(self.model, "split_by_category_on", False):
+            if self.model.split_category_column not in all_columns:
+                changes["split_category_column"] = all_columns[0] if all_columns else ""
+
         # Check and update filters if needed
         if hasattr(self.model, "filters_on") and self.model.filters_on and hasattr(self.model, "filters"):
             for i, filter_model in enumerate(self.model.filters):
@@ -382,6 +387,14 @@ class TraceEditorController:
                 sizemap_combo.setCurrentText(numeric_columns[0])
             sizemap_combo.blockSignals(False)
         
+        split_combo = self.view.widgets.get("split_category_column")
+        if split_combo:
+            split_combo.blockSignals(True)
+            split_combo.clear()
+            split_combo.addItems(all_columns)
+            split_combo.setCurrentText(self.model.split_category_column)
+            split_combo.blockSignals(False)
+
         # Update filter column options
         self.view.update_filter_columns(all_columns)
         
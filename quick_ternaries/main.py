@@ -3,12 +3,15 @@ import sys
 from PySide6.QtWidgets import QApplication
 
 from quick_ternaries.app import MainWindow
+from quick_ternaries.utils.page_scheme import register_page_scheme
 
 
 # --------------------------------------------------------------------
 # Main entry point
 # --------------------------------------------------------------------
 def main():
+    # The in-memory page scheme must be known before QtWebEngine starts
+    register_page_scheme()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
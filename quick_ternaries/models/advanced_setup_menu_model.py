@@ -12,6 +12,8 @@ from quick_ternaries.views.widgets import (
     ColorScaleDropdown, 
     ColorButton
 )
+from quick_ternaries.services.zmap_correlation import CORRELATION_METHODS
+from quick_ternaries.services.zmap_significance import CORRECTION_METHODS, SIGNIFICANCE_METHODS
 from quick_ternaries.utils.legend_layout import (
     LEGEND_COORDINATE_REFERENCE_OPTIONS,
     LEGEND_ORIENTATION_OPTIONS,
@@ -99,6 +101,44 @@ class AdvancedPlotSettingsModel:
             "plot_types": ["zmap"],
         },
     )
+    zmap_correlation_method: str = field(
+        default="spearman",
+        metadata={
+            "label": "Correlation:",
+            "widget": QComboBox,
+            "plot_types": ["zmap"],
+            "options": CORRELATION_METHODS,
+        },
+    )
+    zmap_significance: str = field(
+        default="asymptotic",
+        metadata={
+            "label": "Significance Test:",
+            "widget": QComboBox,
+            "plot_types": ["zmap"],
+            "options": SIGNIFICANCE_METHODS,
+        },
+    )
+    zmap_resamples: int = field(
+        default=1000,
+        metadata={
+            "label": "Resamples per Category:",
+            "widget": QSpinBox,
+            "plot_types": ["zmap"],
+            "minimum": 100,
+            "maximum": 1000000,
+            "single_step": 100,
+        },
+    )
+    zmap_correction: str = field(
+        default="none",
+        metadata={
+            "label": "Multiple-Testing Correction:",
+            "widget": QComboBox,
+            "plot_types": ["zmap"],
+            "options": CORRECTION_METHODS,
+        },
+    )
     background_color: str = field(
         default="#e3ecf7",
         metadata={
@@ -147,6 +187,66 @@ class AdvancedPlotSettingsModel:
             "plot_types": ["ternary", "cartesian"]
         }
     )
+    webgl_point_threshold: int = field(
+        default=50000,
+        metadata={
+            "label": "WebGL Above Point Count (0 = Off):",
+            "widget": QSpinBox,
+            "plot_types": ["ternary", "cartesian"],
+            "minimum": 0,
+            "maximum": 100000000,
+            "single_step": 10000,
+        }
+    )
+    point_budget: int = field(
+        default=0,
+        metadata={
+            "label": "Max Points per Figure (0 = All):",
+            "widget": QSpinBox,
+            "plot_types": ["cartesian"],
+            "minimum": 0,
+            "maximum": 100000000,
+            "single_step": 10000,
+        }
+    )
+    line_points_per_view: int = field(
+        default=2000,
+        metadata={
+            "label": "Line Points per View (0 = All):",
+            "widget": QSpinBox,
+            "plot_types": ["cartesian"],
+            "minimum": 0,
+            "maximum": 1000000,
+            "single_step": 500,
+        }
+    )
+    marker_points_per_view: int = field(
+        default=0,
+        metadata={
+            "label": "Marker Points per View (0 = All):",
+            "widget": QSpinBox,
+            "plot_types": ["ternary", "cartesian"],
+            "minimum": 0,
+            "maximum": 100000000,
+            "single_step": 10000,
+        }
+    )
+    lazy_hover_on: bool = field(
+        default=False,
+        metadata={
+            "label": "Load Hover Data On Demand:",
+            "widget": QCheckBox,
+            "plot_types": ["ternary", "cartesian"]
+        }
+    )
+    float32_coordinates_on: bool = field(
+        default=False,
+        metadata={
+            "label": "Send Coordinates as float32:",
+            "widget": QCheckBox,
+            "plot_types": ["ternary", "cartesian"]
+        }
+    )
     legend_position: str = field(
         default="top-right",
         metadata={
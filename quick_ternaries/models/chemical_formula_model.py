@@ -1,5 +1,7 @@
 from dataclasses import dataclass, field
 
+from quick_ternaries.services.molar_mass_calculator import validate_formulas
+
 @dataclass
 class ChemicalFormulaModel:
     """Model for storing chemical formulas for each column in each axis."""
@@ -37,4 +39,24 @@ class ChemicalFormulaModel:
             column_keys = list(self.formulas[axis_name].keys())
             for column in column_keys:
                 if column not in valid_columns:
-                    del self.formulas[axis_name][column]
\ No newline at end of file
+                    del self.formulas[axis_name][column]
+
+    def validate(self):
+        """Validate every non-empty formula in one batch.
+
+        Returns a dict mapping axis name -> column name -> whether its formula is valid.
+        """
+        validity = validate_formulas(
+            formula
+            for axis_formulas in self.formulas.values()
+            for formula in axis_formulas.values()
+            if formula.strip()
+        )
+        return {
+            axis_name: {
+                column: validity[formula]
+                for column, formula in axis_formulas.items()
+                if formula.strip()
+            }
+            for axis_name, axis_formulas in self.formulas.items()
+        }
@@ -604,6 +604,35 @@ class TraceEditorModel:
             "group": "density_contour",
         },
     )
+    binning_on: bool = field(
+        default=False,
+        metadata={
+            "label": "Triangular Binning:",
+            "widget": QCheckBox,
+            "plot_types": ["ternary"],
+            "depends_on": "show_advanced_settings_on"
+        },
+    )
+    binning_resolution: int = field(
+        default=40,
+        metadata={
+            "label": "Bins per Side:",
+            "widget": QSpinBox,
+            "plot_types": ["ternary"],
+            "depends_on": ["show_advanced_settings_on", "binning_on"],
+            "group": "binning",
+        },
+    )
+    binning_statistic: str = field(
+        default="count",
+        metadata={
+            "label": "Bin Color (non-count uses Heatmap Column):",
+            "widget": QComboBox,
+            "plot_types": ["ternary"],
+            "depends_on": ["show_advanced_settings_on", "binning_on"],
+            "group": "binning",
+        },
+    )
     custom_colorscale_on: bool = field(
         default=False,
         metadata={
@@ -647,6 +676,27 @@ class TraceEditorModel:
         },
     )
 
+    split_by_category_on: bool = field(
+        default=False,
+        metadata={
+            "label": "Split by Category:",
+            "widget": QCheckBox,
+            "plot_types": ["ternary"],
+            "depends_on": "show_advanced_settings_on",
+        },
+    )
+
+    split_category_column: str = field(
+        default="",
+        metadata={
+            "label": "Category Column:",
+            "widget": QComboBox,
+            "plot_types": ["ternary"],
+            "depends_on": ["show_advanced_settings_on", "split_by_category_on"],
+            "group": "categories",
+        },
+    )
+
     def to_dict(self):
         ret = asdict(self)
         # Convert source point series if necessary.
@@ -0,0 +1,131 @@
+"""Projects data columns onto plot axes (ternary apices or x/y) with one matrix multiply"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from quick_ternaries.services.trace_arrays import TraceArrays
+
+
+def get_formula_map(setup_model, axis_names: Iterable[str], columns: Iterable[str]) -> Optional[Dict[str, str]]:
+    """
+    Collects the chemical formulas of the given columns from the setup model.
+
+    Args:
+        setup_model: The SetupMenuModel
+        axis_names: ChemicalFormulaModel axis keys to read, e.g. ['top_axis', 'left_axis', 'right_axis']
+        columns: The columns the plot uses
+
+    Returns:
+        Dictionary mapping column names to formulas, or None if the setup model
+        has no chemical formulas at all
+    """
+    if not (hasattr(setup_model, 'chemical_formulas') and hasattr(setup_model.chemical_formulas, 'formulas')):
+        return None
+
+    columns = set(columns)
+    formula_map = {}
+    for axis_name in axis_names:
+        if axis_name in setup_model.chemical_formulas.formulas:
+            for col, formula in setup_model.chemical_formulas.formulas[axis_name].items():
+                if col in columns:
+                    formula_map[col] = formula
+    return formula_map
+
+
+def get_molar_factors(
+        columns: Iterable[str],
+        formula_map: Dict[str, str],
+        calculator,
+        missing: float = 0.0,
+        raise_errors: bool = False) -> Dict[str, float]:
+    """
+    Returns the wt% -> molar multiplier (1 / molar mass) for each column.
+
+    Args:
+        columns: The columns to convert
+        formula_map: Dictionary mapping column names to chemical formulas
+        calculator: MolarMassCalculator instance
+        missing: Multiplier for columns without a formula
+        raise_errors: Re-raise molar mass errors instead of giving the column a 0 multiplier
+
+    Returns:
+        Dictionary mapping column names to multipliers
+    """
+    factors = {}
+    for col in dict.fromkeys(columns):
+        if col not in formula_map:
+            factors[col] = missing
+            continue
+
+        formula = formula_map[col]
+        try:
+            factors[col] = 1.0 / calculator.get_molar_mass(formula)
+        except Exception as e:
+            if raise_errors:
+                raise
+            # Skip this column if there's an error calculating molar mass
+            print(f"\t\tWARNING: Error calculating molar mass for {formula}: {e}")
+            factors[col] = 0.0
+    return factors
+
+
+class AxisProjection:
+    """
+    Maps data columns onto plot axes with a single (n_columns x n_axes) weight matrix.
+
+    Each weight is the column's scale factor for that axis, times its molar
+    multiplier when molar conversion is on, so scaling, molar conversion and
+    the per-axis sums all happen in one ``block @ weights`` product.
+    """
+
+    def __init__(
+            self,
+            axis_columns: Dict[str, List[str]],
+            scaling_maps: Optional[Dict[str, Dict[str, float]]] = None,
+            molar_factors: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            axis_columns: Ordered mapping of axis names ('top', 'left', 'right' or 'x', 'y')
+                to the columns summed on that axis
+            scaling_maps: Optional mapping of axis names to column scale factors (default 1.0)
+            molar_factors: Optional mapping of columns to molar multipliers; columns
+                missing from it get 0.0
+        """
+        scaling_maps = scaling_maps or {}
+
+        self.axes = list(axis_columns)
+        self.columns = list(dict.fromkeys(col for cols in axis_columns.values() for col in cols))
+        positions = {col: i for i, col in enumerate(self.columns)}
+
+        self.weights = np.zeros((len(self.columns), len(self.axes)))
+        for j, axis in enumerate(self.axes):
+            axis_scale_map = scaling_maps.get(axis, {})
+            for col in axis_columns[axis]:
+                weight = axis_scale_map.get(col, 1.0)
+                if molar_factors is not None:
+                    weight *= molar_factors.get(col, 0.0)
+                # A column listed twice on one axis is counted twice, as in a column sum
+                self.weights[positions[col], j] += weight
+
+    def project(self, block: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Projects an (n_rows, n_columns) block, ordered like ``self.columns``, onto the axes.
+
+        Returns:
+            Dictionary mapping axis names to 1-D arrays of axis values
+        """
+        # (n_axes, n_columns) @ (n_columns, n_rows) keeps the long dimension contiguous
+        # for the column-major blocks TraceArrays builds
+        columns_first = block.T
+        values = self.weights.T @ columns_first
+
+        # Missing values count as 0, like the skipna column sums this replaces
+        if np.isnan(values).any():
+            values = self.weights.T @ np.where(np.isnan(columns_first), 0.0, columns_first)
+
+        return {axis: values[j] for j, axis in enumerate(self.axes)}
+
+    def project_arrays(self, trace_data: TraceArrays) -> Dict[str, np.ndarray]:
+        """Projects the source columns of a TraceArrays container onto the axes."""
+        return self.project(trace_data.block(self.columns))
@@ -6,7 +6,10 @@ import plotly.graph_objects as go
 from plotly.graph_objects import Figure, Layout
 
 from quick_ternaries.services.cartesian_trace_maker import CartesianTraceMaker
+from quick_ternaries.services.point_budget import allocate_point_budget, point_budget
+from quick_ternaries.utils.fast_figure import FastFigure
 from quick_ternaries.utils.legend_layout import build_legend_layout
+from quick_ternaries.utils.parallel import ordered_map
 from quick_ternaries.utils.plotly_html import write_plotly_html
 
 from PySide6.QtWidgets import QMessageBox
@@ -23,16 +26,18 @@ class CartesianPlotMaker:
         """Initialize the plot maker with supporting objects."""
         self.trace_maker = CartesianTraceMaker()
     
-    def make_plot(self, setup_model, trace_models) -> Figure:
+    def make_plot(self, setup_model, trace_models, validate: bool = True) -> Figure:
         """
         Creates a complete Plotly figure for a Cartesian diagram.
         
         Args:
             setup_model: The SetupMenuModel containing global plot settings
-            trace_models: List of trace models
+            trace_models: List of (uid, model) tuples or just models; the uid
+                keeps a trace's store keys the same between renders
+            validate: If False, return a FastFigure (see ternary_plot_maker)
             
         Returns:
-            A Plotly Figure object
+            A Plotly Figure object (or a FastFigure)
         """
         layout = self._create_layout(setup_model)
         # traces = self._create_traces(setup_model, trace_models)
@@ -49,25 +54,42 @@ class CartesianPlotMaker:
             
         # return fig
         # Separate regular traces from vertical line traces
-        regular_traces = []
         vertical_line_shapes = []
+        data_trace_models = []
         
-        for trace_model in trace_models:
+        for item in trace_models:
+            # Check if item is a tuple (uid, model) or just model
+            uid, trace_model = item if isinstance(item, tuple) and len(item) == 2 else (None, item)
             if getattr(trace_model, "vertical_line_only", False):
                 # Convert vertical line trace models to shapes
                 shape = self._create_vertical_line_shape(trace_model)
                 vertical_line_shapes.append(shape)
             else:
-                # Create regular trace
-                trace = self.trace_maker.make_trace(setup_model, trace_model)
-                regular_traces.append(trace)
+                data_trace_models.append((uid, trace_model))
+
+        # Prepare regular traces concurrently; results keep tab order
+        prepared_traces = ordered_map(
+            lambda item: self.trace_maker.prepare_trace(setup_model, item[1], item[0]),
+            data_trace_models
+        )
         
+        # Share the figure's point budget (if any) between the traces
+        max_points = allocate_point_budget(
+            [len(prepared['x']) for prepared in prepared_traces],
+            point_budget(setup_model)
+        )
+        regular_traces = [
+            self.trace_maker.build_trace(prepared, trace_max_points)
+            for prepared, trace_max_points in zip(prepared_traces, max_points)
+        ]
+
         # Add shapes to layout if any exist
         if vertical_line_shapes:
             layout.shapes = vertical_line_shapes
         
         # Create figure with regular traces and layout (which includes shapes)
-        fig = Figure(data=regular_traces, layout=layout)
+        figure_class = Figure if validate else FastFigure
+        fig = figure_class(data=regular_traces, layout=layout)
         
         return fig
     
@@ -297,16 +319,15 @@ class CartesianPlotMaker:
         """
         Creates all traces for the plot.
         """
-        traces = []
-        
-        for trace_model in trace_models:
+        def build(trace_model):
             try:
-                trace = self.trace_maker.make_trace(setup_model, trace_model)
-                traces.append(trace)
+                return self.trace_maker.make_trace(setup_model, trace_model)
             except Exception as e:
                 print(f"Error creating trace {trace_model.trace_name}: {e}")
+                return None
         
-        return traces
+        # Traces are independent, so build them concurrently; results keep tab order
+        return [trace for trace in ordered_map(build, trace_models) if trace is not None]
         
     def _format_axis_name(self, custom_name: str, axis_columns: List[str], setup_model, axis: str) -> str:
         """
@@ -1,12 +1,39 @@
-import time
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
 import plotly.graph_objects as go
 from PySide6.QtWidgets import QMessageBox
 
 from quick_ternaries.services.molar_mass_calculator import MolarMassCalculator
+from quick_ternaries.services.trace_arrays import TraceArrays
+from quick_ternaries.services.hover_store import (
+    HOVER_STORE,
+    lazy_hover_enabled,
+    slice_hover_kwargs,
+    trace_store_key
+)
+from quick_ternaries.services.line_decimation import LINE_STORE
+from quick_ternaries.services.point_budget import (
+    budget_positions,
+    line_points_per_view,
+    marker_points_per_view,
+    webgl_threshold
+)
+from quick_ternaries.services.viewport_lod import VIEWPORT_STORE, collect_point_arrays
+from quick_ternaries.services.marker_styling import (
+    heatmap_marker,
+    log_transform,
+    normalize_sizes,
+    slice_marker,
+    sort_order,
+    z_order
+)
+from quick_ternaries.services.axis_projection import (
+    AxisProjection,
+    get_formula_map,
+    get_molar_factors
+)
 from quick_ternaries.services.filters import (
     EqualsFilterStrategy, 
     OneOfFilterStrategy, 
@@ -49,10 +76,6 @@ class CartesianContourTraceMaker:
     This class handles specifically the contour generation logic for Cartesian plots.
     """
     
-    # Pattern constants for column naming
-    AXIS_PATTERN = '__{axis}_scaled_sum_{us}'
-    SIMULATED_PATTERN = '__{col}_simulated_{us}'
-    
     # Number of simulation points for bootstrap
     N_SIMULATION_POINTS = 10_000
     
@@ -87,8 +110,6 @@ class CartesianContourTraceMaker:
             
         series = source_data["series"]
         
-        unique_str = self._generate_unique_str()
-        
         # Get column lists for x and y axes
         x_columns = self._get_axis_columns(setup_model, 'x_axis')
         y_columns = self._get_axis_columns(setup_model, 'y_axis')
@@ -103,12 +124,11 @@ class CartesianContourTraceMaker:
         name = model.trace_name
         
         # Prepare the bootstrap data for contour generation
-        marker, trace_data_df = self._prepare_bootstrap_data(
+        marker, trace_data = self._prepare_bootstrap_data(
             model,
             setup_model,
             x_columns,
             y_columns,
-            unique_str,
             trace_id,
             scaling_map,
             series
@@ -125,7 +145,7 @@ class CartesianContourTraceMaker:
             contour_level = str(model.contour_percentile)
         
         # Generate contours
-        x, y = self._generate_contours(trace_id, trace_data_df, unique_str, contour_level)
+        x, y = self._generate_contours(trace_id, trace_data, contour_level)
         
         # Get hover data and template
         customdata, hovertemplate = self._get_bootstrap_hover_data_and_template(model, scaling_map)
@@ -173,10 +193,9 @@ class CartesianContourTraceMaker:
             setup_model,
             x_columns: List[str],
             y_columns: List[str],
-            unique_str: str,
             trace_id: str,
             scaling_map: dict,
-            series: pd.Series) -> Tuple[dict, pd.DataFrame]:
+            series: pd.Series) -> Tuple[dict, TraceArrays]:
         """
         Prepare data for bootstrap contour generation.
         
@@ -185,71 +204,59 @@ class CartesianContourTraceMaker:
             setup_model: The global setup model
             x_columns: List of columns for x axis
             y_columns: List of columns for y axis
-            unique_str: Unique string for column naming
             trace_id: Trace identifier
             scaling_map: Dictionary of column scaling factors
             series: The pandas Series containing the point data
             
         Returns:
-            Tuple of (marker dict, processed dataframe)
+            Tuple of (marker dict, simulated trace arrays with 'x' and 'y' computed)
         """
-        # Create a dataframe from the series
-        trace_data_df = series.to_frame().T
-        
         # Apply scaling if necessary
         if scaling_map:
-            trace_data_df = self._apply_scale_factors(trace_data_df, scaling_map)
+            point = self._apply_scale_factors(series.to_frame().T, scaling_map).iloc[0]
             err_repr = self._generate_error_repr(model, series, scaling_map)
         else:
+            point = series
             err_repr = self._generate_error_repr(model, series)
         
-        # Expand the dataframe to make room for simulated points
-        trace_data_df = pd.DataFrame(
-            data=np.repeat(
-                trace_data_df.values, 
-                self.N_SIMULATION_POINTS, 
-                axis=0), 
-            columns=trace_data_df.columns)
-        
-        # Fill the expanded dataframe with simulated data
-        for col, err in err_repr.items():
-            if col in trace_data_df.columns:
-                sim_col_fmt = self.SIMULATED_PATTERN.format(col=col, us=unique_str)
-                # Normal distribution simulation
-                trace_data_df[sim_col_fmt] = np.random.normal(
-                    trace_data_df[col].values[0], err, self.N_SIMULATION_POINTS)
+        # Simulate each column with an error around the (scaled) point value
+        simulated = {
+            col: np.random.normal(float(point[col]), err, self.N_SIMULATION_POINTS)
+            for col, err in err_repr.items()
+            if col in point.index
+        }
+        trace_data = TraceArrays(simulated, pd.RangeIndex(self.N_SIMULATION_POINTS))
         
         # Apply molar conversion if needed
         convert_to_molar = getattr(model, 'convert_from_wt_to_molar', False)
         
         # Call appropriate conversion method
         if convert_to_molar:
-            trace_data_df = self._molar_calibration(
+            trace_data = self._molar_calibration(
                 setup_model,
-                trace_data_df,
+                trace_data,
                 x_columns,
                 y_columns,
-                unique_str,
                 trace_id,
                 convert_to_molar,
                 bootstrap=True
             )
         else:
             # Simple summation for non-molar conversion
-            for axis_name, axis_cols_list in zip(['x', 'y'], [x_columns, y_columns]):
-                axis_cols_sim = [self.SIMULATED_PATTERN.format(col=c, us=unique_str) for c in axis_cols_list]
-                try:
-                    trace_data_df[self.AXIS_PATTERN.format(axis=axis_name, us=unique_str)] = \
-                        trace_data_df[axis_cols_sim].sum(axis=1)
-                except KeyError as err:
-                    # Handle missing columns error
-                    missing = [x for x in axis_cols_sim if x not in trace_data_df.columns]
-                    raise Exception(f"Missing simulated columns: {missing}") from err
+            for axis_cols_list in (x_columns, y_columns):
+                # Handle missing columns error
+                missing = [c for c in axis_cols_list if c not in trace_data]
+                if missing:
+                    raise Exception(f"Missing simulated columns: {missing}")
+
+            # Scale factors were applied before simulating, so this is a plain axis sum
+            projection = AxisProjection({'x': x_columns, 'y': y_columns})
+            trace_data.computed.update(projection.project_arrays(trace_data))
         
         # Create a basic marker dict
         marker = self._get_basic_marker_dict(model)
         
-        return marker, trace_data_df
+        return marker, trace_data
     
     def _generate_error_repr(self, model, series: pd.Series, scaling_map: Dict[str, float]=None) -> Dict[str, float]:
         """
@@ -297,129 +304,59 @@ class CartesianContourTraceMaker:
     def _molar_calibration(
             self,
             setup_model,
-            trace_data_df: pd.DataFrame,
+            trace_data: TraceArrays,
             x_columns: List[str],
             y_columns: List[str],
-            unique_str: str,
             trace_id: str,
             convert_to_molar: bool,
-            bootstrap: bool = True):
+            bootstrap: bool = True) -> TraceArrays:
         """
         Convert weight percentages to molar proportions.
         """
-        # Create a simplified MolarConverter for this function
-        class MolarConverter:
-            def __init__(self, df, x_cols, y_cols, axis_pattern, unique_str, calculator):
-                self.df = df
-                self.x_cols = x_cols
-                self.y_cols = y_cols
-                self.axis_pattern = axis_pattern
-                self.unique_str = unique_str
-                self.calculator = calculator
-                self.SIMULATED_PATTERN = '__{col}_simulated_{us}'
-                self.MOLAR_PATTERN = '__{col}_molar_{us}'
-                
-            def molar_conversion(self, formula_map=None):
-                """Convert to molar proportions using chemical formulas."""
-                axis_columns = self.x_cols + self.y_cols
-                
-                # Default to using column name as formula if no map provided
-                if formula_map is None:
-                    formula_map = {c: c for c in axis_columns}
-                
-                # Process each axis
-                for axis_name, cols in zip(['x', 'y'], [self.x_cols, self.y_cols]):
-                    molar_cols = []
-                    
-                    for col in cols:
-                        if col in formula_map:
-                            formula = formula_map[col]
-                            
-                            # For bootstrap, use simulated columns
-                            sim_col = self.SIMULATED_PATTERN.format(col=col, us=self.unique_str)
-                            if sim_col in self.df.columns:
-                                try:
-                                    molar_mass = self.calculator.get_molar_mass(formula)
-                                    molar_col = self.MOLAR_PATTERN.format(col=col, us=self.unique_str)
-                                    self.df[molar_col] = self.df[sim_col] / molar_mass
-                                    molar_cols.append(molar_col)
-                                except Exception as e:
-                                    print(f"Warning: Error calculating molar mass for {formula}: {e}")
-                    
-                    # Sum molar values for the axis
-                    if molar_cols:
-                        self.df[self.axis_pattern.format(axis=axis_name, us=self.unique_str)] = \
-                            self.df[molar_cols].sum(axis=1)
-                    else:
-                        # If no molar columns, use zeros
-                        self.df[self.axis_pattern.format(axis=axis_name, us=self.unique_str)] = 0
-                
-                return self.df
-                
-            def nonmolar_conversion(self):
-                """Simple normalization without molar conversion."""
-                for axis_name, cols in zip(['x', 'y'], [self.x_cols, self.y_cols]):
-                    # For bootstrap, use simulated columns
-                    sim_cols = [self.SIMULATED_PATTERN.format(col=c, us=self.unique_str) for c in cols]
-                    self.df[self.axis_pattern.format(axis=axis_name, us=self.unique_str)] = \
-                        self.df[sim_cols].sum(axis=1)
-                return self.df
-        
-        # Create converter instance
-        converter = MolarConverter(
-            trace_data_df,
-            x_columns,
-            y_columns,
-            self.AXIS_PATTERN,
-            unique_str,
-            self.calculator
-        )
-        
-        # Get formula mappings from setup model if available
-        formula_map = None
-        if hasattr(setup_model, 'chemical_formulas') and hasattr(setup_model.chemical_formulas, 'formulas'):
-            formula_map = {}
-            for axis_name, axis_cols in zip(
-                ['x_axis', 'y_axis'],
-                [x_columns, y_columns]
-            ):
-                if axis_name in setup_model.chemical_formulas.formulas:
-                    for col, formula in setup_model.chemical_formulas.formulas[axis_name].items():
-                        if col in x_columns + y_columns:
-                            formula_map[col] = formula
+        axis_columns = x_columns + y_columns
+
+        # Get formula mappings from setup model if available, defaulting to
+        # using column names as formulas if no mapping is provided
+        formula_map = get_formula_map(setup_model, ['x_axis', 'y_axis'], axis_columns)
+        if formula_map is None:
+            formula_map = {c: c for c in axis_columns}
+
+        # For bootstrap, only the simulated columns contribute
+        projection_columns = {
+            axis_name: [c for c in cols if c in trace_data]
+            for axis_name, cols in zip(['x', 'y'], [x_columns, y_columns])
+        }
         
         # Use molar conversion or simple normalization
+        molar_factors = None
         if convert_to_molar:
-            return converter.molar_conversion(formula_map)
-        else:
-            return converter.nonmolar_conversion()
+            simulated_columns = [c for c in axis_columns if c in trace_data]
+            molar_factors = get_molar_factors(simulated_columns, formula_map, self.calculator)
+
+        projection = AxisProjection(projection_columns, molar_factors=molar_factors)
+        trace_data.computed.update(projection.project_arrays(trace_data))
+        return trace_data
 
     def _generate_contours(
             self, 
             trace_id: str, 
-            trace_data_df: pd.DataFrame,
-            unique_str: str, 
+            trace_data: TraceArrays,
             contour_level: str):
         """
         Generate contour data from the simulated points.
         
         Args:
             trace_id: Identifier for the trace
-            trace_data_df: DataFrame with simulated points data
-            unique_str: Unique string for column naming
+            trace_data: Simulated trace arrays with 'x' and 'y' computed
             contour_level: Contour level (percentile) as a string
             
         Returns:
             tuple: (x, y) coordinates for the contour
         """
         try:
-            # Extract x and y coordinates
-            x_col = self.AXIS_PATTERN.format(axis='x', us=unique_str)
-            y_col = self.AXIS_PATTERN.format(axis='y', us=unique_str)
-            
             # Extract the coordinates as numpy arrays
-            x_values = trace_data_df[x_col].values
-            y_values = trace_data_df[y_col].values
+            x_values = trace_data.computed['x']
+            y_values = trace_data.computed['y']
             
             # Standardize the data to have similar scales - this helps the KDE algorithm
             x_mean, x_std = np.mean(x_values), np.std(x_values)
@@ -585,10 +522,6 @@ class CartesianContourTraceMaker:
             # Default to 0.95 (95%) if conversion fails
             return 0.95
 
-    def _generate_unique_str(self) -> str:
-        """Generates a unique string for column naming based on timestamp."""
-        return str(hash(time.time()))
-
     def _convert_hex_to_rgba(self, hex_color: str) -> str:
         """
         Convert a hex color string to rgba format.
@@ -619,10 +552,6 @@ class CartesianTraceMaker:
     setup and trace models.
     """
     
-    SCALED_COLUMN_PATTERN = '__{col}_scaled_{axis}_{us}'
-    HEATMAP_PATTERN = '__{col}_heatmap_{us}'
-    SIZEMAP_PATTERN = '__{col}_sizemap_{us}'
-    
     def __init__(self):
         """Initialize the trace maker with filter strategies and molar calculator."""
         # Reuse the same calculator from TernaryTraceMaker
@@ -649,19 +578,45 @@ class CartesianTraceMaker:
             'a < x <= b': LTLEFilterStrategy()
         }
     
-    def make_trace(self, setup_model, trace_model) -> go.Scatter:
+    def make_trace(
+            self,
+            setup_model,
+            trace_model,
+            max_points: Optional[int] = None,
+            source_trace_id: Optional[str] = None) -> go.Scatter:
         """
         Creates a Plotly Scatter trace based on the provided setup and trace models.
         
         Args:
             setup_model: The SetupMenuModel containing global plot settings
             trace_model: The TraceEditorModel containing trace-specific settings
+            max_points: Optional cap on the number of points drawn
+            source_trace_id: Optional ID of the trace's tab, which keeps its
+                store keys the same from one render to the next
             
         Returns:
-            A Plotly Scatter trace object
+            A Plotly Scatter trace object, or a Scattergl trace above the
+            WebGL point threshold
+        """
+        return self.build_trace(self.prepare_trace(setup_model, trace_model, source_trace_id), max_points)
+
+    def prepare_trace(self, setup_model, trace_model, source_trace_id: Optional[str] = None) -> dict:
+        """
+        Computes the final point arrays and styling of a trace without building it.
+
+        Splitting this from build_trace lets the plot maker size every trace
+        before sharing a point budget between them.
+
+        Args:
+            setup_model: The SetupMenuModel containing global plot settings
+            trace_model: The TraceEditorModel containing trace-specific settings
+            source_trace_id: Optional ID of the trace's tab (see make_trace)
+
+        Returns:
+            Dictionary of Scatter properties, plus the 'webgl_threshold',
+            'line_points' and 'marker_points' render limits and the
+            'source_trace_id'
         """
-        unique_str = self._generate_unique_str()
-        
         # Get the column lists for x and y axes
         x_columns = setup_model.axis_members.x_axis
         y_columns = setup_model.axis_members.y_axis
@@ -674,29 +629,18 @@ class CartesianTraceMaker:
         scaling_maps = self._get_scaling_maps(setup_model)
         
         # Prepare the data for plotting
-        marker, trace_data_df = self._prepare_data(
+        marker, trace_data = self._prepare_data(
             setup_model, 
             trace_model,
             x_columns, 
             y_columns,
-            unique_str,
             marker,
             scaling_maps
         )
         
-        # Get hover data and template
-        customdata, hovertemplate = self._get_hover_data_and_template(
-            setup_model, 
-            trace_model, 
-            trace_data_df,
-            x_columns, 
-            y_columns,
-            scaling_maps
-        )
-        
         # Get the x and y data (scaled sums)
-        x = trace_data_df[f'__x_scaled_sum_{unique_str}']
-        y = trace_data_df[f'__y_scaled_sum_{unique_str}']
+        x = trace_data.computed['x']
+        y = trace_data.computed['y']
         
         # # Create mode based on trace settings
         # mode = 'markers'
@@ -721,6 +665,19 @@ class CartesianTraceMaker:
             offset_value = getattr(trace_model, "vertical_offset_value", 0.0)
             y = y + offset_value
         
+        # Get hover data and template (or the hover store key); the on-demand
+        # hover shows the final x and y, like the template's %{x} and %{y}
+        hover_args = (setup_model, trace_model, trace_data, x_columns, y_columns, scaling_maps)
+        if lazy_hover_enabled(setup_model):
+            customdata, key = self._get_lazy_hover_data(
+                *hover_args, extra_columns=[('x', x), ('y', y)],
+                key=trace_store_key(source_trace_id, 'hover')
+            )
+            hover_kwargs = dict(hoverinfo='none', meta=key)
+        else:
+            customdata, hovertemplate = self._get_hover_data_and_template(*hover_args)
+            hover_kwargs = dict(hovertemplate=hovertemplate)
+
         # Determine the mode based on point_on and line_on settings
         mode = ''
         if getattr(trace_model, 'point_on', True):
@@ -745,16 +702,83 @@ class CartesianTraceMaker:
                 'dash': trace_model.line_style
             }
         
-        # Create the Scatter trace
-        return go.Scatter(
+        return dict(
             x=x, y=y,
             name=name,
             mode=mode,
             marker=marker,
             line=line,
             customdata=customdata,
-            hovertemplate=hovertemplate,
             showlegend=not getattr(trace_model, "exclude_from_legend", False),
+            hover_kwargs=hover_kwargs,
+            webgl_threshold=webgl_threshold(setup_model),
+            line_points=line_points_per_view(setup_model),
+            marker_points=marker_points_per_view(setup_model),
+            source_trace_id=source_trace_id,
+        )
+
+    def build_trace(self, prepared: dict, max_points: Optional[int] = None) -> go.Scatter:
+        """
+        Builds the plotly trace from prepare_trace's output.
+
+        Line traces over the per-view line point count (or ``max_points``) are
+        decimated with LTTB and their full arrays kept in LINE_STORE, so the
+        page can re-decimate the visible range on zoom. Marker traces over the
+        per-view marker point count are sampled the same way from VIEWPORT_STORE.
+        Otherwise, traces over ``max_points`` keep evenly spaced points in draw
+        order. All per-point arrays and on-demand hover rows are sliced alike.
+        Traces still over the WebGL threshold become Scattergl, with the same
+        properties.
+
+        Args:
+            prepared: The dictionary returned by prepare_trace
+            max_points: Optional cap on the number of points drawn
+
+        Returns:
+            A Plotly Scatter or Scattergl trace object
+        """
+        x, y = prepared['x'], prepared['y']
+        marker = prepared['marker']
+        customdata = prepared['customdata']
+        hover_kwargs = prepared['hover_kwargs']
+        n_rows = len(x)
+        uid = None
+
+        is_line = 'lines' in prepared['mode']
+        view_points = [n for n in (prepared['line_points' if is_line else 'marker_points'], max_points) if n]
+        if view_points and n_rows > min(view_points) and (is_line or prepared['marker_points']):
+            # Keep the full-resolution trace for zoom refinement: lines are
+            # decimated along x, markers sampled over the viewport
+            arrays = collect_point_arrays(n_rows, marker, customdata, x=x, y=y)
+            store = LINE_STORE if is_line else VIEWPORT_STORE
+            uid = store.register(
+                arrays, min(view_points), hover_kwargs.get('meta'),
+                trace_store_key(prepared.get('source_trace_id'), 'sample')
+            )
+            positions = store.positions(uid)
+        else:
+            positions = budget_positions(n_rows, max_points)
+
+        if positions is not None:
+            marker = slice_marker(marker, positions, n_rows)
+            customdata = customdata[positions] if customdata is not None else None
+            hover_kwargs = slice_hover_kwargs(
+                hover_kwargs, positions, trace_store_key(prepared.get('source_trace_id'), 'sample-hover')
+            )
+            x, y = x[positions], y[positions]
+
+        threshold = prepared['webgl_threshold']
+        trace_class = go.Scattergl if 0 < threshold < len(x) else go.Scatter
+        return trace_class(
+            x=x, y=y,
+            name=prepared['name'],
+            mode=prepared['mode'],
+            marker=marker,
+            line=prepared['line'],
+            customdata=customdata,
+            showlegend=prepared['showlegend'],
+            uid=uid,
+            **hover_kwargs
         )
     
     def _normalize_values(self, values, x_values=None, setup_model=None):
@@ -874,7 +898,7 @@ class CartesianTraceMaker:
         return scaling_maps
     
     def _prepare_data(self, setup_model, trace_model, x_columns, y_columns, 
-                  unique_str, marker, scaling_maps) -> Tuple[dict, pd.DataFrame]:
+                  marker, scaling_maps) -> Tuple[dict, TraceArrays]:
         """
         Prepares the data for plotting by applying filters, scaling, and configuring markers.
         
@@ -883,12 +907,11 @@ class CartesianTraceMaker:
             trace_model: The TraceEditorModel containing trace settings
             x_columns: List of columns for the x axis
             y_columns: List of columns for the y axis
-            unique_str: Unique string for column naming
             marker: Base marker dictionary
             scaling_maps: Dictionary mapping axis names to column scaling dictionaries
             
         Returns:
-            tuple: (marker, dataframe)
+            tuple: (marker, trace arrays with 'x' and 'y' computed)
         """
         # Get the dataframe using the DataframeManager
         if not hasattr(setup_model, 'data_library'):
@@ -899,73 +922,48 @@ class CartesianTraceMaker:
         
         if trace_data_df is None:
             raise ValueError(f"Failed to load data for trace: {trace_model.trace_name}")
-            
-        # Make a copy to avoid modifying the original
-        trace_data_df = trace_data_df.copy()
         
-        # Apply filters if enabled
+        # Apply filters if enabled (the filters never modify the cached frame)
         if trace_model.filters_on:
             trace_data_df = self._apply_filters(trace_data_df, trace_model)
         
-        # Apply scaling with axis-specific factors
-        trace_data_df = self._apply_axis_specific_scaling(
+        # Gather only the columns this trace reads
+        trace_data = TraceArrays.from_dataframe(
             trace_data_df,
+            self._get_working_columns(setup_model, trace_model, x_columns, y_columns)
+        )
+
+        # Scale, convert to molar (if enabled) and sum each axis in one projection
+        projection = self._get_projection(
+            setup_model,
+            trace_model,
             x_columns,
             y_columns,
-            scaling_maps,
-            unique_str
+            scaling_maps
         )
-        
-        # Apply molar conversion if enabled
-        if trace_model.convert_from_wt_to_molar:
-            trace_data_df = self._perform_molar_conversion(
-                trace_data_df,
-                setup_model,
-                x_columns,
-                y_columns,
-                unique_str
-            )
-        else:
-            # Sum the scaled columns for each axis
-            for axis_name, axis_cols_list in zip(['x', 'y'], [x_columns, y_columns]):
-                # Use the scaled column names
-                scaled_cols = [
-                    self.SCALED_COLUMN_PATTERN.format(col=col, axis=axis_name, us=unique_str)
-                    for col in axis_cols_list
-                ]
-                
-                # Sum the scaled columns
-                if scaled_cols:
-                    trace_data_df[f'__{axis_name}_scaled_sum_{unique_str}'] = \
-                        trace_data_df[scaled_cols].sum(axis=1)
-                else:
-                    # Handle empty column lists
-                    trace_data_df[f'__{axis_name}_scaled_sum_{unique_str}'] = 0
+        trace_data.computed.update(projection.project_arrays(trace_data))
         
         # Configure markers based on heatmap and sizemap settings
         if trace_model.heatmap_on and trace_model.sizemap_on:
             # Sort and style considering both heatmap and sizemap columns
-            marker, trace_data_df = self._integrated_sort(
+            marker, trace_data = self._integrated_sort(
                 marker,
-                trace_data_df,
-                trace_model,
-                unique_str
+                trace_data,
+                trace_model
             )
         else:
             if trace_model.heatmap_on:
-                marker, trace_data_df = self._update_marker_with_heatmap(
+                marker, trace_data = self._update_marker_with_heatmap(
                     marker,
                     trace_model,
-                    trace_data_df,
-                    unique_str
+                    trace_data
                 )
             
             if trace_model.sizemap_on:
-                marker, trace_data_df = self._update_marker_with_sizemap(
+                marker, trace_data = self._update_marker_with_sizemap(
                     marker,
                     trace_model,
-                    trace_data_df,
-                    unique_str
+                    trace_data
                 )
 
         # Add outline to markers if sizemap is not enabled
@@ -979,8 +977,30 @@ class CartesianTraceMaker:
                 )
             )
         
-        return marker, trace_data_df
+        return marker, trace_data
+
+    def _get_working_columns(self, setup_model, trace_model, x_columns: List[str],
+                             y_columns: List[str]) -> List[str]:
+        """
+        Returns the source columns this trace reads: axis, heatmap, sizemap and hover columns.
+        """
+        columns = list(x_columns) + list(y_columns)
 
+        if trace_model.heatmap_on and trace_model.heatmap_column:
+            columns.append(trace_model.heatmap_column)
+        if trace_model.sizemap_on and trace_model.sizemap_column:
+            columns.append(trace_model.sizemap_column)
+
+        hover_data = getattr(getattr(setup_model, 'axis_members', None), 'hover_data', None)
+        if hover_data:
+            columns.extend(hover_data)
+        elif trace_model.filters_on:
+            columns.extend(
+                filter_obj.filter_column for filter_obj in trace_model.filters
+                if hasattr(filter_obj, 'filter_column')
+            )
+
+        return list(dict.fromkeys(columns))
 
     def _apply_filters(self, data_df: pd.DataFrame, trace_model) -> pd.DataFrame:
         """
@@ -1104,28 +1124,23 @@ class CartesianTraceMaker:
         
         return filtered_df
     
-    def _apply_axis_specific_scaling(self, df, x_columns, y_columns, 
-                                    scaling_maps, unique_str) -> pd.DataFrame:
+    def _get_projection(self, setup_model, trace_model, x_columns: List[str],
+                        y_columns: List[str], scaling_maps: Dict[str, Dict[str, float]]) -> AxisProjection:
         """
-        Applies axis-specific scaling to columns and creates scaled columns.
+        Builds the projection from data columns to x and y values.
+
+        With molar conversion on, columns with a chemical formula are weighted by
+        1/molar mass; columns without one are summed as scaled values.
         """
-        # Process each axis
-        for axis_name, axis_cols_list in zip(['x', 'y'], [x_columns, y_columns]):
-            # Get scaling map for this axis
-            axis_scale_map = scaling_maps.get(axis_name, {})
-            
-            # Create scaled columns for each axis column
-            for col in axis_cols_list:
-                # Get the scale factor (default to 1.0)
-                scale_factor = axis_scale_map.get(col, 1.0)
-                
-                # Create a scaled column
-                scaled_col_name = self.SCALED_COLUMN_PATTERN.format(
-                    col=col, axis=axis_name, us=unique_str
-                )
-                df[scaled_col_name] = df[col] * scale_factor
+        molar_factors = None
+        if trace_model.convert_from_wt_to_molar:
+            axis_columns = x_columns + y_columns
+            formula_map = get_formula_map(setup_model, ['x_axis', 'y_axis'], axis_columns)
+            molar_factors = get_molar_factors(
+                axis_columns, formula_map or {}, self.calculator, missing=1.0
+            )
         
-        return df
+        return AxisProjection({'x': x_columns, 'y': y_columns}, scaling_maps, molar_factors)
         
     def _get_basic_marker_dict(self, trace_model) -> dict:
         """
@@ -1199,376 +1214,138 @@ class CartesianTraceMaker:
             # If the format is not recognized, return the original color
             return f"#{hex_color}"
             
-    def _generate_unique_str(self) -> str:
+    def _heatmap_values(self, trace_data: TraceArrays, trace_model) -> np.ndarray:
+        """Returns the (optionally log-transformed) heatmap color values."""
+        values = trace_data.numeric(trace_model.heatmap_column)
+        if getattr(trace_model, 'heatmap_log_transform', False):
+            values = log_transform(values)
+        return values
+
+    def _sizemap_values(self, trace_data: TraceArrays, trace_model) -> Tuple[np.ndarray, float]:
         """
-        Generates a unique string to use in column names.
+        Returns the marker sizes for the sizemap column and the matching sizeref.
+
+        Values are (optionally log-transformed and) normalized onto the
+        [sizemap_min, sizemap_max] range. Constant columns get the middle size
+        and missing values the minimum size.
         """
-        return str(hash(time.time()))
-    
-    def _update_marker_with_heatmap(self, marker: dict, trace_model, 
-                              data_df: pd.DataFrame, unique_str: str) -> Tuple[dict, pd.DataFrame]:
+        min_size = float(trace_model.sizemap_min)
+        max_size = float(trace_model.sizemap_max)
+
+        values = trace_data.numeric(trace_model.sizemap_column)
+        if getattr(trace_model, 'sizemap_log_transform', False):
+            values = log_transform(values)
+        return normalize_sizes(
+            values, min_size, max_size,
+            constant_size=(min_size + max_size) / 2,
+            missing_size=min_size
+        )
+
+    def _update_marker_with_heatmap(self, marker: dict, trace_model,
+                              trace_data: TraceArrays) -> Tuple[dict, TraceArrays]:
         """
         Updates the marker dictionary with heatmap configuration.
-        
+
         Args:
             marker: The marker dictionary to update
             trace_model: The TraceEditorModel containing heatmap settings
-            data_df: The dataframe containing the data
-            unique_str: Unique string for column naming
-            
+            trace_data: The trace arrays
+
         Returns:
-            tuple: (updated marker, updated dataframe)
+            tuple: (updated marker, reordered trace arrays)
         """
-        color_column = trace_model.heatmap_column
-        heatmap_sorted_col = self.HEATMAP_PATTERN.format(col=color_column, us=unique_str)
-        
-        # Copy the column
-        data_df[heatmap_sorted_col] = data_df[color_column].copy()
-        
-        # Apply log transform if enabled
-        if hasattr(trace_model, 'heatmap_log_transform') and trace_model.heatmap_log_transform:
-            data_df[heatmap_sorted_col] = data_df[color_column].apply(lambda x: np.log(x) if x > 0 else 0)
-        
+        trace_data.computed['heatmap'] = self._heatmap_values(trace_data, trace_model)
+
         # Apply sorting
-        if trace_model.heatmap_sort_mode == 'high on top':
-            data_df = data_df.sort_values(
-                by=heatmap_sorted_col,
-                ascending=True
-            )
-        elif trace_model.heatmap_sort_mode == 'low on top':
-            data_df = data_df.sort_values(
-                by=heatmap_sorted_col,
-                ascending=False
-            )
-        elif trace_model.heatmap_sort_mode == 'shuffled':
-            data_df = data_df.sample(frac=1)
-        
-        # Configure marker properties
-        colorscale = trace_model.heatmap_colorscale
-        if hasattr(trace_model, 'heatmap_reverse_colorscale') and trace_model.heatmap_reverse_colorscale:
-            colorscale += '_r'
-        
-        # Set color values from dataframe
-        marker['color'] = data_df[heatmap_sorted_col]
-        marker['colorscale'] = colorscale
-        
-        # Configure colorbar
-        marker['colorbar'] = dict(
-            title=dict(
-                text=color_column,
-                side=trace_model.heatmap_title_position if hasattr(trace_model, 'heatmap_title_position') else 'right',
-                font=dict(
-                    size=float(trace_model.heatmap_title_font_size) if hasattr(trace_model, 'heatmap_title_font_size') else 12,
-                    family=trace_model.heatmap_font if hasattr(trace_model, 'heatmap_font') else 'Arial'
-                )
-            ),
-            len=float(trace_model.heatmap_colorbar_len),
-            thickness=float(trace_model.heatmap_colorbar_thickness),
-            x=float(trace_model.heatmap_colorbar_x),
-            y=float(trace_model.heatmap_colorbar_y),
-            tickfont=dict(
-                size=float(trace_model.heatmap_tick_font_size) if hasattr(trace_model, 'heatmap_tick_font_size') else 10,
-                family=trace_model.heatmap_font if hasattr(trace_model, 'heatmap_font') else 'Arial'
-            ),
-            orientation='h' if hasattr(trace_model, 'heatmap_bar_orientation') and trace_model.heatmap_bar_orientation == 'horizontal' else 'v'
-        )
-        
-        # Set min and max values
-        marker['cmin'] = float(trace_model.heatmap_min)
-        marker['cmax'] = float(trace_model.heatmap_max)
+        order = sort_order(trace_data.computed['heatmap'], trace_model.heatmap_sort_mode)
+        if order is not None:
+            trace_data = trace_data.take(order)
+
+        # Color values are numeric and mapped through the colorscale by plotly
+        marker['color'] = trace_data.computed['heatmap']
+        marker.update(heatmap_marker(trace_model))
         
-        return marker, data_df
+        return marker, trace_data
 
     def _update_marker_with_sizemap(self, marker: dict, trace_model, 
-                                data_df: pd.DataFrame, unique_str: str) -> Tuple[dict, pd.DataFrame]:
+                                   trace_data: TraceArrays) -> Tuple[dict, TraceArrays]:
         """
         Updates the marker dictionary with sizemap configuration.
         
         Args:
             marker: The marker dictionary to update
             trace_model: The TraceEditorModel containing sizemap settings
-            data_df: The dataframe containing the data
-            unique_str: Unique string for column naming
+            trace_data: The trace arrays
             
         Returns:
-            tuple: (updated marker, updated dataframe)
+            tuple: (updated marker, reordered trace arrays)
         """
-        size_column = trace_model.sizemap_column
-        size_column_sorted = self.SIZEMAP_PATTERN.format(col=size_column, us=unique_str)
-        
-        # Extract min and max sizes
-        min_size = float(trace_model.sizemap_min)
-        max_size = float(trace_model.sizemap_max)
-        
-        # Copy the column
-        data_df[size_column_sorted] = data_df[size_column].copy()
-        
-        # Apply log transform if available
-        if hasattr(trace_model, 'sizemap_log_transform') and trace_model.sizemap_log_transform:
-            data_df[size_column_sorted] = data_df[size_column_sorted].apply(lambda x: np.log(x) if x > 0 else 0)
-        
-        # Normalize the size column to map between min_size and max_size
-        if len(data_df) > 0:
-            size_range = max_size - min_size
-            col_min = data_df[size_column_sorted].min()
-            col_max = data_df[size_column_sorted].max()
-            
-            # Avoid division by zero if all values are the same
-            if col_max > col_min:
-                size_normalized = ((data_df[size_column_sorted] - col_min) / 
-                                (col_max - col_min)) * size_range + min_size
-            else:
-                size_normalized = pd.Series([min_size + (size_range/2)] * len(data_df), index=data_df.index)
-                
-            sizeref = 2. * max(size_normalized) / (max_size**2)
-            data_df[size_column_sorted] = size_normalized
-            data_df[size_column_sorted].fillna(min_size, inplace=True)
-        else:
-            # Handle empty dataframe
-            sizeref = 1.0
+        trace_data.computed['sizemap'], sizeref = self._sizemap_values(trace_data, trace_model)
         
         # Apply sorting
-        if trace_model.sizemap_sort_mode == 'high on top':
-            data_df = data_df.sort_values(
-                by=size_column_sorted,
-                ascending=True
-            )
-        elif trace_model.sizemap_sort_mode == 'low on top':
-            data_df = data_df.sort_values(
-                by=size_column_sorted,
-                ascending=False
-            )
-        elif trace_model.sizemap_sort_mode == 'shuffled':
-            data_df = data_df.sample(frac=1)
+        order = sort_order(trace_data.computed['sizemap'], trace_model.sizemap_sort_mode)
+        if order is not None:
+            trace_data = trace_data.take(order)
         
         # Update marker properties
-        marker['size'] = data_df[size_column_sorted]
-        marker['sizemin'] = min_size
+        marker['size'] = trace_data.computed['sizemap']
+        marker['sizemin'] = float(trace_model.sizemap_min)
         marker['sizeref'] = sizeref
         
-        return marker, data_df
+        return marker, trace_data
 
-    def _integrated_sort(self, marker: dict, data_df: pd.DataFrame, 
-                        trace_model, unique_str: str) -> Tuple[dict, pd.DataFrame]:
+    def _integrated_sort(self, marker: dict, trace_data: TraceArrays,
+                    trace_model) -> Tuple[dict, TraceArrays]:
         """
         Performs integrated sorting considering both heatmap and sizemap.
         
         Args:
             marker: The marker dictionary to update
-            data_df: The dataframe to sort
+            trace_data: The trace arrays to sort
             trace_model: The TraceEditorModel containing sort settings
-            unique_str: Unique string for column naming
             
         Returns:
-            tuple: (updated marker, sorted dataframe)
+            tuple: (updated marker, sorted trace arrays)
         """
-        heatmap_column = trace_model.heatmap_column
-        sizemap_column = trace_model.sizemap_column
-        
-        heatmap_sorted_col = self.HEATMAP_PATTERN.format(col=heatmap_column, us=unique_str)
-        sizemap_sorted_col = self.SIZEMAP_PATTERN.format(col=sizemap_column, us=unique_str)
-        
-        # Process heatmap column
-        data_df[heatmap_sorted_col] = data_df[heatmap_column].copy()
-        if hasattr(trace_model, 'heatmap_log_transform') and trace_model.heatmap_log_transform:
-            data_df[heatmap_sorted_col] = data_df[heatmap_column].apply(lambda x: np.log(x) if x > 0 else 0)
-        
-        # Process sizemap column
-        data_df[sizemap_sorted_col] = data_df[sizemap_column].copy()
-        if hasattr(trace_model, 'sizemap_log_transform') and trace_model.sizemap_log_transform:
-            data_df[sizemap_sorted_col] = data_df[sizemap_column].apply(lambda x: np.log(x) if x > 0 else 0)
-        
-        # Normalize sizemap values
-        min_size = float(trace_model.sizemap_min)
-        max_size = float(trace_model.sizemap_max)
-        size_range = max_size - min_size
-        
-        if len(data_df) > 0:
-            col_min = data_df[sizemap_sorted_col].min()
-            col_max = data_df[sizemap_sorted_col].max()
-            
-            # Avoid division by zero if all values are the same
-            if col_max > col_min:
-                size_normalized = ((data_df[sizemap_sorted_col] - col_min) / 
-                                (col_max - col_min)) * size_range + min_size
-            else:
-                size_normalized = pd.Series([min_size + (size_range/2)] * len(data_df), index=data_df.index)
-                
-            data_df[sizemap_sorted_col] = size_normalized
-            data_df[sizemap_sorted_col].fillna(min_size, inplace=True)
-        
-        # Handle heatmap sort mode
-        if trace_model.heatmap_sort_mode == 'high on top':
-            data_df = data_df.sort_values(
-                by=heatmap_sorted_col,
-                ascending=True
-            )
-        elif trace_model.heatmap_sort_mode == 'low on top':
-            data_df = data_df.sort_values(
-                by=heatmap_sorted_col,
-                ascending=False
-            )
-        elif trace_model.heatmap_sort_mode == 'shuffled':
-            data_df = data_df.sample(frac=1)
-        
-        # Handle sizemap sort mode
-        if trace_model.sizemap_sort_mode == 'high on top':
-            data_df = data_df.sort_values(
-                by=sizemap_sorted_col,
-                ascending=True
-            )
-        elif trace_model.sizemap_sort_mode == 'low on top':
-            data_df = data_df.sort_values(
-                by=sizemap_sorted_col,
-                ascending=False
-            )
-        elif trace_model.sizemap_sort_mode == 'shuffled':
-            data_df = data_df.sample(frac=1)
+        trace_data.computed['heatmap'] = self._heatmap_values(trace_data, trace_model)
+        trace_data.computed['sizemap'], sizeref = self._sizemap_values(trace_data, trace_model)
+
+        # One draw order for both modes: sizemap first, ties broken by heatmap
+        order = z_order(
+            (trace_data.computed['heatmap'], trace_model.heatmap_sort_mode),
+            (trace_data.computed['sizemap'], trace_model.sizemap_sort_mode)
+        )
+        if order is not None:
+            trace_data = trace_data.take(order)
         
         # Update marker properties
-        if len(data_df) > 0:
-            sizeref = 2. * data_df[sizemap_sorted_col].max() / (max_size**2)
-        else:
-            sizeref = 1.0
-        
-        marker['size'] = data_df[sizemap_sorted_col]
-        marker['sizemin'] = min_size
+        marker['size'] = trace_data.computed['sizemap']
+        marker['sizemin'] = float(trace_model.sizemap_min)
         marker['sizeref'] = sizeref
-        marker['color'] = data_df[heatmap_sorted_col]
-        marker['colorscale'] = trace_model.heatmap_colorscale
-        
-        if hasattr(trace_model, 'heatmap_reverse_colorscale') and trace_model.heatmap_reverse_colorscale:
-            marker['colorscale'] += '_r'
-        
-        # Configure colorbar
-        marker['colorbar'] = dict(
-            title=dict(
-                text=heatmap_column,
-                side=trace_model.heatmap_title_position if hasattr(trace_model, 'heatmap_title_position') else 'right',
-                font=dict(
-                    size=float(trace_model.heatmap_title_font_size) if hasattr(trace_model, 'heatmap_title_font_size') else 12,
-                    family=trace_model.heatmap_font if hasattr(trace_model, 'heatmap_font') else 'Arial'
-                )
-            ),
-            len=float(trace_model.heatmap_colorbar_len),
-            thickness=float(trace_model.heatmap_colorbar_thickness),
-            x=float(trace_model.heatmap_colorbar_x),
-            y=float(trace_model.heatmap_colorbar_y),
-            tickfont=dict(
-                size=float(trace_model.heatmap_tick_font_size) if hasattr(trace_model, 'heatmap_tick_font_size') else 10,
-                family=trace_model.heatmap_font if hasattr(trace_model, 'heatmap_font') else 'Arial'
-            ),
-            orientation='h' if hasattr(trace_model, 'heatmap_bar_orientation') and trace_model.heatmap_bar_orientation == 'horizontal' else 'v'
-        )
-        
-        marker['cmin'] = float(trace_model.heatmap_min)
-        marker['cmax'] = float(trace_model.heatmap_max)
+        marker['color'] = trace_data.computed['heatmap']
+        marker.update(heatmap_marker(trace_model))
         
-        return marker, data_df
+        return marker, trace_data
     
-    def _perform_molar_conversion(self, df: pd.DataFrame, setup_model, 
-                             x_columns: List[str], y_columns: List[str], 
-                             unique_str: str) -> pd.DataFrame:
-        """
-        Performs molar conversion on the dataframe using scaled column values.
-        
-        Args:
-            df: The dataframe to convert
-            setup_model: The SetupMenuModel
-            x_columns: List of columns for the x axis
-            y_columns: List of columns for the y axis
-            unique_str: Unique string for column naming
-            
-        Returns:
-            The converted dataframe
-        """
-        # For cartesian plots, we convert scaled columns to molar values 
-        # and then sum them to get the axis values
-        
-        # Get formula mappings from setup model if available
-        formula_map = None
-        if hasattr(setup_model, 'chemical_formulas') and hasattr(setup_model.chemical_formulas, 'formulas'):
-            formula_map = {}
-            for axis_name, axis_cols in zip(
-                ['x_axis', 'y_axis'],
-                [x_columns, y_columns]
-            ):
-                if axis_name in setup_model.chemical_formulas.formulas:
-                    for col, formula in setup_model.chemical_formulas.formulas[axis_name].items():
-                        if col in x_columns + y_columns:
-                            formula_map[col] = formula
-        
-        # Process each axis
-        for axis_name, axis_cols_list in zip(['x', 'y'], [x_columns, y_columns]):
-            # Create a list to store molar columns
-            molar_columns = []
-            
-            # Process each column in this axis
-            for col in axis_cols_list:
-                if formula_map and col in formula_map:
-                    # Get the formula for this column
-                    formula = formula_map[col]
-                    
-                    # Get the scaled column name
-                    scaled_col_name = self.SCALED_COLUMN_PATTERN.format(
-                        col=col, axis=axis_name, us=unique_str
-                    )
-                    
-                    # Calculate molar mass using the calculator
-                    try:
-                        molar_mass = self.calculator.get_molar_mass(formula)
-                        
-                        # Create molar proportion column
-                        molar_col_name = f"__{col}_{axis_name}_molar_{unique_str}"
-                        df[molar_col_name] = df[scaled_col_name] / molar_mass
-                        
-                        # Add to list of molar columns
-                        molar_columns.append(molar_col_name)
-                    except Exception as e:
-                        # Skip this column if there's an error calculating molar mass
-                        print(f"\t\tWARNING: Error calculating molar mass for {formula}: {e}")
-                else:
-                    # If no formula mapping, use the scaled column directly
-                    scaled_col_name = self.SCALED_COLUMN_PATTERN.format(
-                        col=col, axis=axis_name, us=unique_str
-                    )
-                    molar_columns.append(scaled_col_name)
-            
-            # Sum columns to get the axis value
-            if molar_columns:
-                df[f'__{axis_name}_scaled_sum_{unique_str}'] = df[molar_columns].sum(axis=1)
-            else:
-                # If no molar columns, use 0
-                df[f'__{axis_name}_scaled_sum_{unique_str}'] = 0
-        
-        return df
-
-    def _get_hover_data_and_template(
+    def _get_hover_columns_and_labels(
             self, 
             setup_model: "SetupMenuModel", 
             trace_model: "TraceEditorModel", 
-            data_df: pd.DataFrame, 
-            x_columns: List[str], 
-            y_columns: List[str], 
+            axis_columns: List[str],
             scaling_maps: Dict[str, Dict[str, float]]
-        ) -> Tuple[np.ndarray, str]:
+        ) -> Tuple[List[str], List[str]]:
         """
-        Generates custom data for hover tooltips and an HTML template for the hover data.
+        Determines which columns the hover shows and their (scale-annotated) labels.
         
         Args:
             setup_model: The SetupMenuModel
             trace_model: The TraceEditorModel
-            data_df: The dataframe containing the data
-            x_columns: List of columns for the x axis
-            y_columns: List of columns for the y axis
+            axis_columns: All columns summed on the plot axes
             scaling_maps: Dictionary mapping axis names to column scaling dictionaries
             
         Returns:
-            tuple: (customdata array, hovertemplate string)
+            tuple: (hover column names, hover labels)
         """
-        # Collect all axis columns
-        axis_columns = x_columns + y_columns
-        
         # Create a merged scaling map for hover display
         merged_scale_map = {}
         for axis, col_map in scaling_maps.items():
@@ -1582,7 +1359,7 @@ class CartesianTraceMaker:
             hover_cols = setup_model.axis_members.hover_data
         else:
             # Default to apex columns and heatmap/sizemap columns
-            hover_cols = axis_columns.copy()
+            hover_cols = list(axis_columns)
             
             if trace_model.heatmap_on and trace_model.heatmap_column not in hover_cols:
                 hover_cols.append(trace_model.heatmap_column)
@@ -1595,11 +1372,44 @@ class CartesianTraceMaker:
                     if hasattr(filter_obj, 'filter_column') and filter_obj.filter_column not in hover_cols:
                         hover_cols.append(filter_obj.filter_column)
         
+        labels = [
+            f"{f'{format_scale_factor(merged_scale_map.get(header, 1.0))}×' if header in merged_scale_map and merged_scale_map.get(header, 1.0) != 1 else ''}{header}"
+            for header in hover_cols
+        ]
+        return hover_cols, labels
+
+    def _get_hover_data_and_template(
+            self,
+            setup_model: "SetupMenuModel",
+            trace_model: "TraceEditorModel",
+            data_df: TraceArrays,
+            x_columns: List[str],
+            y_columns: List[str],
+            scaling_maps: Dict[str, Dict[str, float]]
+        ) -> Tuple[np.ndarray, str]:
+        """
+        Generates custom data for hover tooltips and an HTML template for the hover data.
+
+        Args:
+            setup_model: The SetupMenuModel
+            trace_model: The TraceEditorModel
+            data_df: The trace arrays containing the data
+            x_columns: List of columns for the x axis
+            y_columns: List of columns for the y axis
+            scaling_maps: Dictionary mapping axis names to column scaling dictionaries
+
+        Returns:
+            tuple: (customdata array, hovertemplate string)
+        """
+        hover_cols, labels = self._get_hover_columns_and_labels(
+            setup_model, trace_model, x_columns + y_columns, scaling_maps
+        )
+
         # Construct the hover template
         hovertemplate = "<b>x</b>: %{x}<br><b>y</b>: %{y}"
         hovertemplate += "".join(
-            f"<br><b>{f'{format_scale_factor(merged_scale_map.get(header, 1.0))}×' if header in merged_scale_map and merged_scale_map.get(header, 1.0) != 1 else ''}{header}:</b> %{{customdata[{i}]}}"
-            for i, header in enumerate(hover_cols)
+            f"<br><b>{label}:</b> %{{customdata[{i}]}}"
+            for i, label in enumerate(labels)
         )
         
         # Construct customdata with rounded values
@@ -1607,10 +1417,10 @@ class CartesianTraceMaker:
         for header in hover_cols:
             try:
                 # Try to round numeric values
-                rounded_values = np.round(data_df[header].values.astype(float), 4)
+                rounded_values = np.round(np.asarray(data_df[header]).astype(float), 4)
             except (ValueError, TypeError):
                 # Use raw values for non-numeric columns
-                rounded_values = data_df[header].values
+                rounded_values = np.asarray(data_df[header])
             customdata.append(rounded_values)
         
         # If no hover columns, create a placeholder column
@@ -1628,3 +1438,48 @@ class CartesianTraceMaker:
         hovertemplate += "<extra></extra>"
         
         return customdata, hovertemplate
+
+    def _get_lazy_hover_data(
+            self,
+            setup_model: "SetupMenuModel",
+            trace_model: "TraceEditorModel",
+            data_df: TraceArrays,
+            x_columns: List[str],
+            y_columns: List[str],
+            scaling_maps: Dict[str, Dict[str, float]],
+            extra_columns: Sequence[Tuple[str, np.ndarray]] = (),
+            key: Optional[str] = None
+        ) -> Tuple[np.ndarray, str]:
+        """
+        Registers the hover columns in the hover store instead of embedding them.
+
+        The page only carries each point's row index; the hover HTML is fetched
+        from the store over QWebChannel when a point is hovered.
+
+        Args:
+            setup_model: The SetupMenuModel
+            trace_model: The TraceEditorModel
+            data_df: The trace arrays containing the data
+            x_columns: List of columns for the x axis
+            y_columns: List of columns for the y axis
+            scaling_maps: Dictionary mapping axis names to column scaling dictionaries
+            extra_columns: (label, values) pairs shown before the hover columns
+            key: Hover store key (see trace_store_key); random by default
+
+        Returns:
+            tuple: (customdata array of row indices, hover store key)
+        """
+        hover_cols, labels = self._get_hover_columns_and_labels(
+            setup_model, trace_model, x_columns + y_columns, scaling_maps
+        )
+
+        key = HOVER_STORE.register(
+            [label for label, _ in extra_columns] + labels,
+            [values for _, values in extra_columns] + [data_df[header] for header in hover_cols],
+            key
+        )
+
+        # Only the row indices (for selection) go into the page
+        customdata = data_df.index.to_numpy().reshape(-1, 1)
+
+        return customdata, key
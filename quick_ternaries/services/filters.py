@@ -8,97 +8,101 @@ import pandas as pd
 class FilterStrategy(ABC):
 
     @abstractmethod
-    def filter(self, data: pd.DataFrame, params: Dict):
+    def mask(self, data: pd.DataFrame, params: Dict) -> pd.Series:
+        """Returns a boolean Series selecting the rows that pass the filter"""
         pass
 
+    def filter(self, data: pd.DataFrame, params: Dict):
+        return data[self.mask(data, params)].copy()
+
 
 class EqualsFilterStrategy(FilterStrategy):
     """X == value"""
 
-    def filter(self, data: pd.DataFrame, params: Dict):
-        return data[data[params['column']] == params['value 1']].copy()
+    def mask(self, data: pd.DataFrame, params: Dict) -> pd.Series:
+        return data[params['column']] == params['value 1']
 
 
 class OneOfFilterStrategy(FilterStrategy):
     """X is in [*values]"""
 
-    def filter(self, data: pd.DataFrame, params: Dict):
-        return data[data[params['column']].isin(params['selected values'])].copy()
+    def mask(self, data: pd.DataFrame, params: Dict) -> pd.Series:
+        return data[params['column']].isin(params['selected values'])
 
 
 class ExcludeOneFilterStrategy(FilterStrategy):
     """X != value"""
     
-    def filter(self, data: pd.DataFrame, params: Dict):
-        return data[data[params['column']] != params['value 1']].copy()
+    def mask(self, data: pd.DataFrame, params: Dict) -> pd.Series:
+        return data[params['column']] != params['value 1']
 
 
 class ExcludeMultipleFilterStrategy(FilterStrategy):
     """X is not in [*values]"""
     
-    def filter(self, data: pd.DataFrame, params: Dict):
-        return data[~data[params['column']].isin(params['selected values'])].copy()
+    def mask(self, data: pd.DataFrame, params: Dict) -> pd.Series:
+        return ~data[params['column']].isin(params['selected values'])
 
 
 class GreaterThanFilterStrategy(FilterStrategy):
     """X > value"""
 
-    def filter(self, data: pd.DataFrame, params: Dict):
-        return data[data[params['column']] > float(params['value 1'])].copy()
+    def mask(self, data: pd.DataFrame, params: Dict) -> pd.Series:
+        return data[params['column']] > float(params['value 1'])
 
 
 class LessThanFilterStrategy(FilterStrategy):
     """X < value"""
 
-    def filter(self, data: pd.DataFrame, params: Dict):
-        return data[data[params['column']] < float(params['value 1'])].copy()
+    def mask(self, data: pd.DataFrame, params: Dict) -> pd.Series:
+        return data[params['column']] < float(params['value 1'])
 
 
 class GreaterEqualFilterStrategy(FilterStrategy):
     """X >= value"""
 
-    def filter(self, data: pd.DataFrame, params: Dict):
-        return data[data[params['column']] >= float(params['value 1'])].copy()
+    def mask(self, data: pd.DataFrame, params: Dict) -> pd.Series:
+        return data[params['column']] >= float(params['value 1'])
 
 
 class LessEqualFilterStrategy(FilterStrategy):
     """X <= value"""
 
-    def filter(self, data: pd.DataFrame, params: Dict):
-        return data[data[params['column']] <= float(params['value 1'])].copy()
+    def mask(self, data: pd.DataFrame, params: Dict) -> pd.Series:
+        return data[params['column']] <= float(params['value 1'])
 
 
 class LTLTFilterStrategy(FilterStrategy):
     """value1 < X < value2"""
 
-    def filter(self, data: pd.DataFrame, params: Dict):
-        return data[
-            (data[params['column']] > params['value a']) &\
-            (data[params['column']] < params['value b'])].copy()
+    def mask(self, data: pd.DataFrame, params: Dict) -> pd.Series:
+        return (
+            (data[params['column']] > params['value a']) &
+            (data[params['column']] < params['value b']))
 
 
 class LELEFilterStrategy(FilterStrategy):
     """value1 <= X <= value2"""
 
-    def filter(self, data: pd.DataFrame, params: Dict):
-        return data[
-            (data[params['column']] >= params['value a']) &\
-            (data[params['column']] <= params['value b'])].copy()
+    def mask(self, data: pd.DataFrame, params: Dict) -> pd.Series:
+        return (
+            (data[params['column']] >= params['value a']) &
+            (data[params['column']] <= params['value b']))
 
 
 class LELTFilterStrategy(FilterStrategy):
     """value1 <= X < value2"""
 
-    def filter(self, data: pd.DataFrame, params: Dict):
-        return data[
-            (data[params['column']] >= params['value a']) &\
-            (data[params['column']] <  params['value b'])].copy()
+    def mask(self, data: pd.DataFrame, params: Dict) -> pd.Series:
+        return (
+            (data[params['column']] >= params['value a']) &
+            (data[params['column']] <  params['value b']))
 
 
 class LTLEFilterStrategy(FilterStrategy):
     """value1 < X <= value2"""
 
-    def filter(self, data: pd.DataFrame, params: Dict):
-        return data[
-            (data[params['column']] >  params['value a']) &\
-            (data[params['column']] <= params['value b'])].copy()
+    def mask(self, data: pd.DataFrame, params: Dict) -> pd.Series:
+        return (
+            (data[params['column']] >  params['value a']) &
+            (data[params['column']] <= params['value b']))
@@ -0,0 +1,160 @@
+"""Row store for hover details that the plot page fetches on demand over QWebChannel"""
+
+import threading
+import uuid
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+def lazy_hover_enabled(setup_model) -> bool:
+    """Returns True if the setup model asks for hover data to be loaded on demand."""
+    advanced_settings = getattr(setup_model, 'advanced_settings', None)
+    # Compare against True so that only a real checkbox value turns it on
+    return getattr(advanced_settings, 'lazy_hover_on', False) is True
+
+
+def trace_store_key(source_trace_id: Optional[str], kind: str) -> Optional[str]:
+    """
+    Returns the store key of one kind of entry of a trace, or None for a random key.
+
+    Keys that stay the same from one render to the next keep an unchanged
+    trace's JSON (uid and meta) the same, so the plot page does not resend it
+    and Plotly.react keeps its UI state (e.g. legend visibility).
+
+    Args:
+        source_trace_id: ID of the trace's tab, or None if it has none
+        kind: What the entry holds, unique among the trace's entries (e.g. 'hover')
+    """
+    if source_trace_id is None:
+        return None
+    return f"{source_trace_id}-{kind}"
+
+
+def format_hover_value(value) -> str:
+    """Formats one hover value the way the embedded customdata showed it (4 decimals)."""
+    if isinstance(value, (float, np.floating)):
+        if np.isnan(value):
+            return 'NaN'
+        value = round(float(value), 4)
+        return str(int(value)) if value.is_integer() else str(value)
+    return str(value)
+
+
+class HoverStore:
+    """
+    Keeps the hover columns of every rendered trace so the page only needs a point ID.
+
+    Each trace registers its hover labels and column arrays (in the trace's
+    final point order) under a key, which goes into the trace's ``meta``.
+    On hover, the page sends back (key, point number) and gets the HTML for
+    that single point.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, dict] = {}
+        # Traces are built on worker threads
+        self._lock = threading.Lock()
+
+    def register(
+            self,
+            labels: Sequence[str],
+            columns: Sequence[np.ndarray],
+            key: Optional[str] = None) -> str:
+        """
+        Stores the hover columns of a trace.
+
+        Args:
+            labels: HTML label for each column
+            columns: One array per label, ordered like the trace's points
+            key: Key to store them under (see trace_store_key); random by default
+
+        Returns:
+            The key identifying this trace's hover rows
+        """
+        key = key or uuid.uuid4().hex
+        with self._lock:
+            self._entries[key] = {
+                'labels': list(labels),
+                'columns': [np.asarray(col) for col in columns],
+                'positions': None,
+            }
+        return key
+
+    def view(self, key: str, positions: np.ndarray, view_key: Optional[str] = None) -> str:
+        """
+        Registers a subset of a stored trace (e.g. one category of a split trace)
+        without copying its columns.
+
+        Args:
+            key: Key of the full trace
+            positions: Row positions of the subset's points, in point order
+            view_key: Key to store the subset under; random by default
+
+        Returns:
+            The key identifying the subset
+        """
+        view_key = view_key or uuid.uuid4().hex
+        with self._lock:
+            entry = self._entries[key]
+            base_positions = entry['positions']
+            self._entries[view_key] = {
+                'labels': entry['labels'],
+                'columns': entry['columns'],
+                'positions': positions if base_positions is None else base_positions[positions],
+            }
+        return view_key
+
+    def rows(self, key: str) -> Optional[int]:
+        """Returns the number of points stored under a key, or None for unknown keys."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry['positions'] is not None:
+            return len(entry['positions'])
+        return len(entry['columns'][0]) if entry['columns'] else 0
+
+    def hover_html(self, key: str, point_number: int) -> str:
+        """
+        Builds the hover HTML of one point.
+
+        Args:
+            key: Key of the trace (from the trace's ``meta``)
+            point_number: Index of the point within the trace
+
+        Returns:
+            HTML with one '<b>label:</b> value' line per hover column, or an
+            empty string for unknown keys or points
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return ''
+
+        row = point_number
+        if entry['positions'] is not None:
+            if not 0 <= point_number < len(entry['positions']):
+                return ''
+            row = entry['positions'][point_number]
+
+        lines: List[str] = []
+        for label, column in zip(entry['labels'], entry['columns']):
+            if not 0 <= row < len(column):
+                return ''
+            lines.append(f"<b>{label}:</b> {format_hover_value(column[row])}")
+        return "<br>".join(lines)
+
+    def clear(self):
+        """Drops all stored rows, e.g. before a new plot is rendered."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by the trace makers (which register rows) and the page bridge (which reads them)
+HOVER_STORE = HoverStore()
+
+
+def slice_hover_kwargs(hover_kwargs: dict, positions: np.ndarray, key: Optional[str] = None) -> dict:
+    """Restricts on-demand hover rows to the given row positions (for split or decimated traces)."""
+    if 'meta' not in hover_kwargs:
+        return hover_kwargs
+    return dict(hover_kwargs, meta=HOVER_STORE.view(hover_kwargs['meta'], positions, key))
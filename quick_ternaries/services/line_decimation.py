@@ -0,0 +1,171 @@
+"""Largest-Triangle-Three-Buckets decimation of line traces, refined on zoom over QWebChannel"""
+
+import threading
+import uuid
+from typing import Dict, Optional
+
+import numpy as np
+
+from quick_ternaries.services.hover_store import HOVER_STORE
+
+# Prefix of the plotly uid of decimated traces, which the page looks for on zoom
+DECIMATED_UID_PREFIX = 'decimated-'
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Picks ``n_out`` rows that keep the visual shape of a line (Largest-Triangle-Three-Buckets).
+
+    The first and last rows are always kept. The rows in between are split into
+    n_out - 2 equal buckets, and from each bucket the row forming the largest
+    triangle with the previously kept row and the next bucket's average is kept,
+    so peaks and troughs survive.
+
+    Args:
+        x: X values, in line order
+        y: Y values, in line order
+        n_out: Number of rows to keep
+
+    Returns:
+        Increasing integer row positions
+    """
+    n = len(x)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])[:max(n_out, 0)]
+
+    x = np.asarray(x, dtype=float)
+    # Missing y values cannot win a bucket, but are still drawn as gaps if kept
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+
+    # Bucket boundaries of the interior rows 1 .. n-2
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    cum_x = np.concatenate([[0.0], np.cumsum(x)])
+    cum_y = np.concatenate([[0.0], np.cumsum(y)])
+    widths = np.diff(edges)
+    avg_x = (cum_x[edges[1:]] - cum_x[edges[:-1]]) / widths
+    avg_y = (cum_y[edges[1:]] - cum_y[edges[:-1]]) / widths
+    # The bucket after the last one is the final row
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs(
+            (x[previous] - next_x[bucket]) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y[bucket] - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+
+class DecimatedLineStore:
+    """
+    Keeps the full-resolution arrays of decimated line traces for zoom refinement.
+
+    A decimated trace registers its per-point arrays (keyed by their plotly
+    property path, e.g. 'x', 'marker.color') and gets a key, which goes into the
+    trace's uid. When the page zooms, it sends back the key and the visible x
+    range, and gets the re-decimated rows of that range.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, dict] = {}
+        # Traces are built on worker threads
+        self._lock = threading.Lock()
+
+    def register(
+            self,
+            arrays: Dict[str, np.ndarray],
+            n_out: int,
+            hover_key: Optional[str] = None,
+            key: Optional[str] = None) -> str:
+        """
+        Stores the full arrays of a line trace.
+
+        Args:
+            arrays: Per-point arrays by plotly property path; must include 'x' and 'y'
+            n_out: Number of points to send per view
+            hover_key: On-demand hover key of the full trace, if any
+            key: Key to store the trace under (see trace_store_key); random by default
+
+        Returns:
+            The trace's plotly uid
+        """
+        x = np.asarray(arrays['x'])
+        key = DECIMATED_UID_PREFIX + (key or uuid.uuid4().hex)
+        with self._lock:
+            self._entries[key] = {
+                'arrays': arrays,
+                'n_out': n_out,
+                'hover_key': hover_key,
+                # Sorted x (the usual case for spectra) allows a binary search per zoom
+                'sorted': bool(np.all(x[1:] >= x[:-1])) if np.issubdtype(x.dtype, np.number) else False,
+            }
+        return key
+
+    def arrays(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """Returns the full per-point arrays of a trace, or None for unknown keys."""
+        entry = self._entries.get(key)
+        return entry['arrays'] if entry is not None else None
+
+    def positions(self, key: str, x0: Optional[float] = None, x1: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Returns the rows to draw for an x range (the whole line if no range).
+
+        One row beyond each end of the range is included, so the line runs
+        off the edges of the view instead of stopping short.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        x = np.asarray(entry['arrays']['x'])
+        y = np.asarray(entry['arrays']['y'])
+
+        if x0 is None or x1 is None:
+            rows = np.arange(len(x))
+        elif entry['sorted']:
+            start = max(int(np.searchsorted(x, x0, side='left')) - 1, 0)
+            end = min(int(np.searchsorted(x, x1, side='right')) + 1, len(x))
+            rows = np.arange(start, end)
+        else:
+            in_range = (x >= x0) & (x <= x1)
+            # Widen by one row on each side of every in-range run
+            inside = in_range.copy()
+            inside[:-1] |= in_range[1:]
+            inside[1:] |= in_range[:-1]
+            rows = np.flatnonzero(inside)
+
+        return rows[lttb_indices(x[rows], y[rows], entry['n_out'])]
+
+    def refine(self, key: str, x0: Optional[float] = None, x1: Optional[float] = None) -> Optional[dict]:
+        """
+        Re-decimates a registered trace for the visible x range.
+
+        Returns:
+            Plotly restyle update ({property path: [array]}), or None for unknown keys
+        """
+        positions = self.positions(key, x0, x1)
+        if positions is None:
+            return None
+        entry = self._entries[key]
+        update = {name: [np.asarray(values)[positions]] for name, values in entry['arrays'].items()}
+        if entry['hover_key'] is not None:
+            update['meta'] = [HOVER_STORE.view(entry['hover_key'], positions)]
+        return update
+
+    def clear(self):
+        """Drops all stored traces, e.g. before a new plot is rendered."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by the trace makers (which register lines) and the page bridge (which refines them)
+LINE_STORE = DecimatedLineStore()
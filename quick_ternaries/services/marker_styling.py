@@ -0,0 +1,219 @@
+"""Vectorized marker styling (heatmap, sizemap, custom RGB colorscale) shared by the trace makers"""
+
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# ASCII codes of the hex digits, indexed by nibble value
+_HEX_DIGITS = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+
+
+def log_transform(values: np.ndarray) -> np.ndarray:
+    """Natural log of positive values; non-positive and missing values map to 0."""
+    values = np.asarray(values, dtype=float)
+    out = np.zeros(len(values))
+    np.log(values, out=out, where=values > 0)
+    return out
+
+
+# Sort modes that reorder the points; any other mode keeps the data order
+SORT_MODES = ('high on top', 'low on top', 'shuffled')
+
+# Seed of the 'shuffled' draw order, so re-rendering a plot keeps the same order
+SHUFFLE_SEED = 0
+
+
+@lru_cache(maxsize=32)
+def shuffled_order(n_rows: int, seed: int = SHUFFLE_SEED) -> np.ndarray:
+    """Returns a cached, read-only random permutation of ``n_rows`` rows."""
+    order = np.random.default_rng(seed).permutation(n_rows)
+    order.flags.writeable = False
+    return order
+
+
+def sort_key(values: np.ndarray, sort_mode: str) -> Optional[np.ndarray]:
+    """
+    Returns the ascending sort key for a heatmap/sizemap sort mode, or None to keep the order.
+
+    'high on top' draws high values last, 'low on top' draws them first, and
+    'shuffled' draws the rows in a seeded random order. NaN values always sort last.
+    """
+    if sort_mode == 'high on top':
+        return values
+    elif sort_mode == 'low on top':
+        return -values
+    elif sort_mode == 'shuffled':
+        # The rank of each row in the permutation
+        ranks = np.empty(len(values), dtype=np.intp)
+        ranks[shuffled_order(len(values))] = np.arange(len(values))
+        return ranks
+    return None
+
+
+def z_order(*sort_specs: Tuple[np.ndarray, str]) -> Optional[np.ndarray]:
+    """
+    Returns one stable draw-order permutation for several (values, sort_mode) pairs.
+
+    Later pairs take precedence and earlier ones break ties, exactly like
+    sorting by each pair in turn with a stable sort, but in a single pass.
+
+    Returns:
+        Integer row order, or None if no pair asks for sorting
+    """
+    active = [(values, mode) for values, mode in sort_specs if mode in SORT_MODES]
+    if not active:
+        return None
+    if len(active) == 1:
+        values, mode = active[0]
+        if mode == 'shuffled':
+            return shuffled_order(len(values))
+        return np.argsort(sort_key(values, mode), kind='stable')
+    # np.lexsort sorts by its last key first
+    return np.lexsort([sort_key(values, mode) for values, mode in active])
+
+
+def sort_order(values: np.ndarray, sort_mode: str) -> Optional[np.ndarray]:
+    """Returns the draw order for a single heatmap/sizemap sort mode, or None to keep the order."""
+    return z_order((values, sort_mode))
+
+
+def normalize_sizes(
+        values: np.ndarray,
+        min_size: float,
+        max_size: float,
+        constant_size: Optional[float] = None,
+        missing_size: float = 0.0) -> Tuple[np.ndarray, float]:
+    """
+    Maps values linearly onto the [min_size, max_size] marker size range.
+
+    Args:
+        values: Sizemap column values
+        min_size: Size of the smallest value
+        max_size: Size of the largest value
+        constant_size: Size for every point when the column has no spread
+            (all values equal or missing); None gives every point missing_size
+        missing_size: Size for missing values
+
+    Returns:
+        (sizes, sizeref) where sizeref is the plotly 'area' sizeref for max_size
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return values, 1.0
+
+    finite = ~np.isnan(values)
+    col_min = values[finite].min() if finite.any() else np.nan
+    col_max = values[finite].max() if finite.any() else np.nan
+
+    if col_max > col_min:
+        size_range = max_size - min_size
+        sizes = (values - col_min) * (size_range / (col_max - col_min)) + min_size
+        sizes[~finite] = missing_size
+    else:
+        sizes = np.full(len(values), missing_size if constant_size is None else constant_size)
+
+    largest = sizes.max()
+    sizeref = 2. * largest / (max_size**2) if largest > 0 else 1.0
+    return sizes, sizeref
+
+
+def heatmap_colorbar(trace_model) -> dict:
+    """Builds the colorbar dictionary for the heatmap settings."""
+    return dict(
+        title=dict(
+            text=trace_model.heatmap_column,
+            side=getattr(trace_model, 'heatmap_title_position', 'right'),
+            font=dict(
+                size=float(getattr(trace_model, 'heatmap_title_font_size', 12)),
+                family=getattr(trace_model, 'heatmap_font', 'Arial')
+            )
+        ),
+        len=float(trace_model.heatmap_colorbar_len),
+        thickness=float(trace_model.heatmap_colorbar_thickness),
+        x=float(trace_model.heatmap_colorbar_x),
+        y=float(trace_model.heatmap_colorbar_y),
+        tickfont=dict(
+            size=float(getattr(trace_model, 'heatmap_tick_font_size', 10)),
+            family=getattr(trace_model, 'heatmap_font', 'Arial')
+        ),
+        orientation='h' if getattr(trace_model, 'heatmap_bar_orientation', 'vertical') == 'horizontal' else 'v'
+    )
+
+
+def heatmap_marker(trace_model) -> dict:
+    """Returns the marker properties (colorscale, colorbar, color range) of a heatmap."""
+    colorscale = trace_model.heatmap_colorscale
+    if getattr(trace_model, 'heatmap_reverse_colorscale', False):
+        colorscale += '_r'
+    return dict(
+        colorscale=colorscale,
+        colorbar=heatmap_colorbar(trace_model),
+        cmin=float(trace_model.heatmap_min),
+        cmax=float(trace_model.heatmap_max),
+    )
+
+
+def scale_to_channel(values: np.ndarray) -> np.ndarray:
+    """
+    Min-max scales values onto the 0-255 range of a color channel.
+
+    Constant columns and missing values map to 0.
+    """
+    values = np.asarray(values, dtype=float)
+    finite = ~np.isnan(values)
+    channel = np.zeros(len(values), dtype=np.uint8)
+    if not finite.any():
+        return channel
+
+    vmin = values[finite].min()
+    vmax = values[finite].max()
+    if vmax > vmin:
+        scaled = (values[finite] - vmin) * (255.0 / (vmax - vmin))
+        channel[finite] = scaled.astype(np.uint8)
+    return channel
+
+
+def rgb_to_hex(red: np.ndarray, green: np.ndarray, blue: np.ndarray) -> np.ndarray:
+    """
+    Packs 0-255 channel arrays into '#rrggbb' color strings without a per-point loop.
+
+    The hex digits are written into a (n, 7) byte buffer and reinterpreted as
+    fixed-width strings.
+
+    Returns:
+        Array of '#rrggbb' strings
+    """
+    channels = np.stack([red, green, blue], axis=1).astype(np.uint8)
+    chars = np.empty((len(channels), 7), dtype=np.uint8)
+    chars[:, 0] = ord('#')
+    chars[:, 1::2] = _HEX_DIGITS[channels >> 4]
+    chars[:, 2::2] = _HEX_DIGITS[channels & 0x0F]
+    return chars.view('S7').ravel().astype('U7')
+
+
+def slice_marker(marker: dict, positions: np.ndarray, n_rows: int) -> dict:
+    """
+    Returns a copy of a marker dictionary restricted to the given row positions.
+
+    Per-point marker properties (color, size) are sliced; scalar properties are
+    copied as-is.
+
+    Args:
+        marker: The marker dictionary built for all rows
+        positions: Integer row positions to keep
+        n_rows: Number of rows the marker was built for
+
+    Returns:
+        The sliced marker dictionary
+    """
+    sliced = {}
+    for key, value in marker.items():
+        if isinstance(value, (list, np.ndarray, pd.Series)) and len(value) == n_rows:
+            sliced[key] = np.asarray(value)[positions]
+        elif isinstance(value, dict):
+            sliced[key] = dict(value)
+        else:
+            sliced[key] = value
+    return sliced
@@ -1,6 +1,85 @@
 """Class responsible for calculating molar masses"""
 
-from molmass import Formula, FormulaError
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+from molmass import ELEMENTS, Formula
+
+# Upper bound on distinct formulas remembered by the memo cache
+FORMULA_CACHE_SIZE = 4096
+
+# Oxides (and other species) commonly plotted in ternary/cartesian diagrams
+COMMON_FORMULAS = (
+    'SiO2', 'TiO2', 'Al2O3', 'Cr2O3', 'Fe2O3', 'FeO', 'MnO', 'MgO', 'NiO',
+    'CaO', 'SrO', 'BaO', 'Na2O', 'K2O', 'Li2O', 'P2O5', 'ZrO2', 'V2O3',
+    'CoO', 'ZnO', 'Rb2O', 'Cs2O', 'H2O', 'CO2', 'SO2', 'SO3', 'NO3',
+    'Cl', 'F',
+)
+
+
+def _build_formula_table() -> Dict[str, float]:
+    """Precomputes the molar masses of the common oxides and all element symbols."""
+    table = {element.symbol: Formula(element.symbol).mass for element in ELEMENTS}
+    table.update({formula: Formula(formula).mass for formula in COMMON_FORMULAS})
+    return table
+
+
+# Built once at import, so the formulas users actually pick never hit molmass
+FORMULA_TABLE = _build_formula_table()
+
+
+@lru_cache(maxsize=FORMULA_CACHE_SIZE)
+def _parse_formula(formula: str) -> Tuple[Optional[float], str]:
+    """
+    Parses a formula with molmass, remembering the result.
+
+    Returns:
+        (mass, '') for a parseable formula, or (None, error message) otherwise,
+        so that invalid formulas are remembered as well
+    """
+    try:
+        return Formula(formula).mass, ''
+    except Exception as e:
+        return None, str(e)
+
+
+def lookup_mass(formula: str) -> Tuple[Optional[float], str]:
+    """
+    Looks up the molar mass of a formula, exactly as written.
+
+    Returns:
+        (mass, '') for a parseable formula, or (None, error message) otherwise
+    """
+    mass = FORMULA_TABLE.get(formula)
+    if mass is not None:
+        return mass, ''
+    return _parse_formula(formula)
+
+
+def is_valid_formula(formula: str) -> bool:
+    """
+    Checks if the provided chemical formula is valid, i.e. has a positive molar mass.
+
+    Results are memoized, so this is cheap to call on every keystroke.
+    """
+    if not isinstance(formula, str):
+        return False
+    mass, _ = lookup_mass(formula)
+    return mass is not None and mass > 0
+
+
+def validate_formulas(formulas: Iterable[str]) -> Dict[str, bool]:
+    """
+    Validates many formulas at once.
+
+    Args:
+        formulas: Formulas to check; duplicates are only checked once
+
+    Returns:
+        Dictionary mapping each distinct formula to whether it is valid
+    """
+    return {formula: is_valid_formula(formula) for formula in dict.fromkeys(formulas)}
+
 
 class MolarMassCalculatorException(Exception):
     """Exception raised for errors in the MolarMassCalculator."""
@@ -12,12 +91,12 @@ class MolarMassCalculatorException(Exception):
 class MolarMassCalculator:
 
     def get_molar_mass(self, formula: str):
-        try:
-            if not isinstance(formula, str) or not formula.strip():
-                raise FormulaError("formula is empty")
-            formula = formula.strip()
-            if formula.lower() == 'feot':
-                formula = 'FeO'
-            return Formula(formula).mass
-        except FormulaError as e:
-            raise MolarMassCalculatorException(f"Invalid chemical formula '{formula}': {e}")
+        if not isinstance(formula, str) or not formula.strip():
+            raise MolarMassCalculatorException(f"Invalid chemical formula '{formula}': formula is empty")
+        formula = formula.strip()
+        if formula.lower() == 'feot':
+            formula = 'FeO'
+        mass, error = lookup_mass(formula)
+        if mass is None:
+            raise MolarMassCalculatorException(f"Invalid chemical formula '{formula}': {error}")
+        return mass
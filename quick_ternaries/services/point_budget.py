@@ -0,0 +1,84 @@
+"""Render limits for large figures: the WebGL switch-over, per-view point counts and the per-figure point budget"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+def _int_setting(setup_model, name: str) -> int:
+    """Returns an integer advanced setting, or 0 if it is missing or not an int."""
+    advanced_settings = getattr(setup_model, 'advanced_settings', None)
+    value = getattr(advanced_settings, name, 0)
+    return value if isinstance(value, int) else 0
+
+
+def webgl_threshold(setup_model) -> int:
+    """Returns the point count above which traces are drawn with WebGL (0 = never)."""
+    return _int_setting(setup_model, 'webgl_point_threshold')
+
+
+def point_budget(setup_model) -> int:
+    """Returns the maximum number of points drawn per figure (0 = unlimited)."""
+    return _int_setting(setup_model, 'point_budget')
+
+
+def line_points_per_view(setup_model) -> int:
+    """Returns the number of points line traces are decimated to per view (0 = all)."""
+    return _int_setting(setup_model, 'line_points_per_view')
+
+
+def marker_points_per_view(setup_model) -> int:
+    """Returns the number of points marker traces send per view (0 = all)."""
+    return _int_setting(setup_model, 'marker_points_per_view')
+
+
+def allocate_point_budget(counts: Sequence[int], budget: int) -> List[Optional[int]]:
+    """
+    Splits a figure's point budget between its traces.
+
+    Traces smaller than an even share keep all their points, and what they
+    leave unused is shared by the larger traces.
+
+    Args:
+        counts: Number of points in each trace
+        budget: Total points allowed in the figure (0 or less = unlimited)
+
+    Returns:
+        Maximum points per trace, in the order of ``counts``; None where a
+        trace is drawn in full
+    """
+    if budget <= 0 or sum(counts) <= budget:
+        return [None] * len(counts)
+
+    shares: List[Optional[int]] = [None] * len(counts)
+    remaining = budget
+    # Smallest traces first, so each gets min(its size, an even share of what is left)
+    order = sorted(range(len(counts)), key=lambda i: counts[i])
+    for n_left, i in zip(range(len(counts), 0, -1), order):
+        share = remaining // n_left
+        if counts[i] > share:
+            shares[i] = share
+            remaining -= share
+        else:
+            remaining -= counts[i]
+    return shares
+
+
+def budget_positions(n_rows: int, max_points: Optional[int]) -> Optional[np.ndarray]:
+    """
+    Picks evenly spaced row positions to keep at most ``max_points`` points.
+
+    The first and last rows are always kept, so lines keep their extent, and
+    the rows stay in draw order.
+
+    Returns:
+        Integer row positions, or None if all rows fit
+    """
+    if max_points is None or n_rows <= max_points:
+        return None
+    if max_points <= 0:
+        return np.empty(0, dtype=np.intp)
+    if max_points == 1:
+        return np.zeros(1, dtype=np.intp)
+    # The step is at least 1, so flooring never repeats a row
+    return np.linspace(0, n_rows - 1, max_points).astype(np.intp)
@@ -0,0 +1,207 @@
+"""Plot coordinates and row identities of rendered traces, so lasso and box selections are resolved in Python"""
+
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from matplotlib.path import Path
+
+from quick_ternaries.services.line_decimation import DECIMATED_UID_PREFIX, LINE_STORE
+from quick_ternaries.services.viewport_lod import VIEWPORT_UID_PREFIX, VIEWPORT_STORE
+from quick_ternaries.utils.fast_figure import figure_properties
+
+
+def points_in_polygon(
+        x: np.ndarray,
+        y: np.ndarray,
+        polygon_x: Sequence[float],
+        polygon_y: Sequence[float]) -> np.ndarray:
+    """
+    Tests which points lie inside a polygon.
+
+    Args:
+        x, y: Point coordinates (NaN points are never inside)
+        polygon_x, polygon_y: Polygon vertices; the polygon is closed implicitly
+
+    Returns:
+        Boolean mask over the points
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    polygon = np.column_stack([np.asarray(polygon_x, dtype=float), np.asarray(polygon_y, dtype=float)])
+    inside = np.zeros(len(x), dtype=bool)
+    if len(polygon) < 3 or not np.all(np.isfinite(polygon)):
+        return inside
+
+    # Only points inside the polygon's bounding box go through the exact test
+    (x_min, y_min), (x_max, y_max) = polygon.min(axis=0), polygon.max(axis=0)
+    candidates = np.flatnonzero((x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max))
+    if len(candidates):
+        points = np.column_stack([x[candidates], y[candidates]])
+        inside[candidates] = Path(polygon).contains_points(points)
+    return inside
+
+
+def region_polygon(region: dict) -> Optional[tuple]:
+    """
+    Converts a selection region sent by the page into polygon vertices.
+
+    Args:
+        region: {'lasso': [xs, ys]} for a lasso, or {'range': [[x0, x1], [y0, y1]]}
+            for a box, in the coordinates plotly reports for the subplot
+
+    Returns:
+        (polygon_x, polygon_y) arrays, or None if the region is not understood
+    """
+    if region.get('lasso'):
+        polygon_x, polygon_y = region['lasso']
+    elif region.get('range'):
+        (x0, x1), (y0, y1) = region['range']
+        polygon_x, polygon_y = [x0, x1, x1, x0], [y0, y0, y1, y1]
+    else:
+        return None
+    return np.asarray(polygon_x, dtype=float), np.asarray(polygon_y, dtype=float)
+
+
+def _row_labels(column: np.ndarray) -> np.ndarray:
+    """Returns row index labels from a customdata column, as integers when they all are."""
+    try:
+        numeric = column.astype(float)
+    except (TypeError, ValueError):
+        return column
+    if np.all(np.isfinite(numeric) & (numeric == np.round(numeric))):
+        return numeric.astype(np.int64)
+    return column
+
+
+class SelectionStore:
+    """
+    Keeps the plot coordinates and row labels of every selectable trace in the shown figure.
+
+    Instead of the page sending every selected point, it sends the lasso or
+    box region and the curve numbers that can be selected, and the points
+    inside the region are found here. Each point is identified by the row
+    index label of its dataframe (the customdata column the traces already
+    carry), so filtering and draw order do not change which row it is.
+    Level-of-detail and decimated traces are matched on all their points,
+    not only the ones on the page.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, dict] = {}
+        self._log_axes = (False, False)
+        self._lock = threading.Lock()
+
+    def register_figure(self, fig):
+        """
+        Replaces the stored traces with those of a figure about to be shown.
+
+        Traces with markers and a customdata row index (customdata ending with
+        the row index, optionally followed by the source trace ID) are stored;
+        the others cannot be selected.
+        """
+        figure = figure_properties(fig)
+        layout = figure.get('layout', {})
+        ternary_sum = (layout.get('ternary') or {}).get('sum') or 1
+        log_axes = tuple(
+            (layout.get(axis) or {}).get('type') == 'log' for axis in ('xaxis', 'yaxis')
+        )
+
+        entries = {}
+        for curve_number, trace in enumerate(figure.get('data', [])):
+            entry = self._trace_entry(trace, ternary_sum, log_axes)
+            if entry is not None:
+                entries[curve_number] = entry
+
+        with self._lock:
+            self._entries = entries
+            self._log_axes = log_axes
+
+    @staticmethod
+    def _trace_entry(trace: dict, ternary_sum: float, log_axes: tuple) -> Optional[dict]:
+        """Builds the stored coordinates and row labels of one trace, or None if it is not selectable."""
+        if 'markers' not in (trace.get('mode') or 'markers'):
+            return None
+
+        # Traces that only carry a sample on the page are matched on their full arrays
+        uid = trace.get('uid') or ''
+        arrays = None
+        if uid.startswith(VIEWPORT_UID_PREFIX):
+            arrays = VIEWPORT_STORE.arrays(uid)
+        elif uid.startswith(DECIMATED_UID_PREFIX):
+            arrays = LINE_STORE.arrays(uid)
+
+        def values(name):
+            value = (arrays if arrays is not None else trace).get(name)
+            return np.asarray(value) if value is not None else None
+
+        customdata = values('customdata')
+        if customdata is None or customdata.ndim != 2 or len(customdata) == 0:
+            return None
+
+        if trace.get('type') == 'scatterternary':
+            a, b, c = (np.asarray(values(name), dtype=float) for name in ('a', 'b', 'c'))
+            # Plotly's ternary plane, in which it reports lasso points: x = c - b, y = a
+            with np.errstate(invalid='ignore', divide='ignore'):
+                scale = ternary_sum / (a + b + c)
+            x, y = (c - b) * scale, a * scale
+        else:
+            x, y = (np.asarray(values(name), dtype=float) for name in ('x', 'y'))
+            # Plotly reports data values on log axes; test them in log space where edges are straight
+            with np.errstate(invalid='ignore', divide='ignore'):
+                x = np.log10(x) if log_axes[0] else x
+                y = np.log10(y) if log_axes[1] else y
+
+        # The source trace ID, if any, is appended after the row index
+        trace_id = None
+        row_column = customdata[:, -1]
+        if isinstance(row_column[0], str) and customdata.shape[1] >= 2:
+            trace_id = row_column[0]
+            row_column = customdata[:, -2]
+
+        return {'x': x, 'y': y, 'rows': _row_labels(row_column), 'trace_id': trace_id}
+
+    def select(self, region: dict, curve_numbers: Optional[Sequence[int]] = None) -> List[dict]:
+        """
+        Finds the points inside a selection region.
+
+        Args:
+            region: The selection region (see ``region_polygon``)
+            curve_numbers: Curves that can be selected (e.g. those not hidden
+                from the legend); all stored curves if None
+
+        Returns:
+            One {'curveNumber', 'traceID', 'rows'} dict per curve with selected
+            points, where 'rows' holds their row index labels
+        """
+        polygon = region_polygon(region) if region else None
+        if polygon is None:
+            return []
+        polygon_x, polygon_y = polygon
+        with np.errstate(invalid='ignore', divide='ignore'):
+            polygon_x = np.log10(polygon_x) if self._log_axes[0] else polygon_x
+            polygon_y = np.log10(polygon_y) if self._log_axes[1] else polygon_y
+
+        allowed = set(curve_numbers) if curve_numbers is not None else None
+        selection = []
+        for curve_number, entry in sorted(self._entries.items()):
+            if allowed is not None and curve_number not in allowed:
+                continue
+            inside = points_in_polygon(entry['x'], entry['y'], polygon_x, polygon_y)
+            if inside.any():
+                selection.append({
+                    'curveNumber': curve_number,
+                    'traceID': entry['trace_id'],
+                    'rows': entry['rows'][inside],
+                })
+        return selection
+
+    def clear(self):
+        """Drops all stored traces, e.g. before a new plot is rendered."""
+        with self._lock:
+            self._entries = {}
+            self._log_axes = (False, False)
+
+
+# Shared by the app (which registers the shown figure) and the page bridge (which resolves selections)
+SELECTION_STORE = SelectionStore()
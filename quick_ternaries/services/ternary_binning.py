@@ -0,0 +1,165 @@
+"""Aggregates ternary points into a triangular grid of bins in barycentric space"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Reducers a bin can be colored by; all but 'count' reduce the heatmap column
+BIN_STATISTICS = ('count', 'mean', 'sum', 'min', 'max')
+
+# Number of colors the bins are quantized to (one filled trace per color)
+BIN_COLOR_LEVELS = 32
+
+
+def triangular_bin_ids(a: np.ndarray, b: np.ndarray, c: np.ndarray, resolution: int) -> np.ndarray:
+    """
+    Assigns every point to a cell of a triangular grid with ``resolution`` cells per side.
+
+    The grid has resolution**2 triangles: each (i, j) parallelogram of the
+    top/left fractions holds an upward triangle and, unless it is on the right
+    edge, a downward one. A bin ID is ``(i * resolution + j) * 2 + is_down``.
+
+    Args:
+        a: Top apex values
+        b: Left apex values
+        c: Right apex values
+        resolution: Number of bins along each side of the triangle
+
+    Returns:
+        Integer bin ID per point; -1 for points without a valid composition
+        (missing values or a non-positive total)
+    """
+    n = max(int(resolution), 1)
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    c = np.asarray(c, dtype=float)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        total = a + b + c
+        scaled_a = a / total * n
+        scaled_b = b / total * n
+    valid = (total > 0) & np.isfinite(scaled_a) & np.isfinite(scaled_b)
+    scaled_a = np.where(valid, np.clip(scaled_a, 0, n), 0)
+    scaled_b = np.where(valid, np.clip(scaled_b, 0, n), 0)
+
+    i = np.minimum(np.floor(scaled_a), n - 1).astype(np.intp)
+    j = np.minimum(np.floor(scaled_b), n - 1).astype(np.intp)
+
+    # Points on the right edge (or a rounding step past it) overflow the grid;
+    # pull them back into the last upward triangle of their row
+    overflow = np.maximum(i + j - (n - 1), 0)
+    i_shift = np.minimum(overflow, i)
+    i -= i_shift
+    j -= overflow - i_shift
+
+    # Within a parallelogram, the lower-left half is the upward triangle
+    is_down = ((scaled_a - i) + (scaled_b - j) > 1) & (i + j <= n - 2)
+
+    ids = (i * n + j) * 2 + is_down
+    ids[~valid] = -1
+    return ids
+
+
+def bin_statistic(
+        bin_ids: np.ndarray,
+        resolution: int,
+        values: Optional[np.ndarray] = None,
+        statistic: str = 'count') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Reduces the points of each occupied bin in one pass.
+
+    Args:
+        bin_ids: Bin ID per point from triangular_bin_ids
+        resolution: Number of bins along each side of the triangle
+        values: Values to reduce (ignored for 'count'); missing values are skipped
+        statistic: One of BIN_STATISTICS
+
+    Returns:
+        (occupied bin IDs, point count per bin, statistic per bin); bins whose
+        values are all missing get NaN
+    """
+    if statistic not in BIN_STATISTICS:
+        raise ValueError(f"Unknown bin statistic: {statistic}")
+
+    n_bins = 2 * max(int(resolution), 1) ** 2
+    in_grid = bin_ids >= 0
+    ids = bin_ids[in_grid]
+    counts = np.bincount(ids, minlength=n_bins)
+    occupied = np.flatnonzero(counts)
+
+    if statistic == 'count' or values is None:
+        return occupied, counts[occupied], counts[occupied].astype(float)
+
+    values = np.asarray(values, dtype=float)[in_grid]
+    finite = ~np.isnan(values)
+    ids, values = ids[finite], values[finite]
+    finite_counts = np.bincount(ids, minlength=n_bins)
+
+    if statistic in ('mean', 'sum'):
+        result = np.bincount(ids, weights=values, minlength=n_bins)
+        if statistic == 'mean':
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result = result / finite_counts
+    else:
+        reducer = np.minimum if statistic == 'min' else np.maximum
+        result = np.full(n_bins, np.inf if statistic == 'min' else -np.inf)
+        reducer.at(result, ids, values)
+    result[finite_counts == 0] = np.nan
+
+    return occupied, counts[occupied], result[occupied]
+
+
+def bin_corners(bin_ids: np.ndarray, resolution: int) -> np.ndarray:
+    """
+    Returns the (top, left, right) fractions of the three corners of each bin.
+
+    Returns:
+        (n_bins, 3 corners, 3 components) array; each corner sums to 1
+    """
+    n = max(int(resolution), 1)
+    cell, is_down = np.divmod(np.asarray(bin_ids), 2)
+    i, j = np.divmod(cell, n)
+    k = n - 1 - i - j
+
+    # Upward: (i+1, j, k), (i, j+1, k), (i, j, k+1)
+    # Downward: (i+1, j+1, k-1), (i+1, j, k), (i, j+1, k)
+    corners = np.empty((len(cell), 3, 3))
+    corners[:, 0] = np.stack([i + 1, j + is_down, k - is_down], axis=1)
+    corners[:, 1] = np.stack([i + is_down, j + 1 - is_down, k], axis=1)
+    corners[:, 2] = np.stack([i, j + is_down, k + 1 - is_down], axis=1)
+    return corners / n
+
+
+def polygon_paths(corners: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flattens bin corners into NaN-separated outlines, one closed triangle per bin.
+
+    A fill='toself' trace fills each NaN-separated segment on its own, so one
+    trace can draw any number of bins.
+
+    Returns:
+        (a, b, c) vertex arrays of length 4 * n_bins
+    """
+    n_bins = len(corners)
+    path = np.full((n_bins, 4, 3), np.nan)
+    path[:, :3] = corners
+    path = path.reshape(-1, 3)
+    return path[:, 0], path[:, 1], path[:, 2]
+
+
+def color_levels(values: np.ndarray, cmin: float, cmax: float, n_levels: int) -> np.ndarray:
+    """
+    Quantizes bin values onto ``n_levels`` evenly spaced colorscale levels.
+
+    Returns:
+        Level index per bin; -1 for missing values
+    """
+    values = np.asarray(values, dtype=float)
+    levels = np.full(len(values), -1, dtype=np.intp)
+    finite = ~np.isnan(values)
+    if cmax > cmin:
+        scaled = (np.clip(values[finite], cmin, cmax) - cmin) / (cmax - cmin)
+    else:
+        scaled = np.zeros(finite.sum())
+    levels[finite] = np.minimum((scaled * n_levels).astype(np.intp), n_levels - 1)
+    return levels
@@ -8,7 +8,9 @@ from plotly.graph_objects import Figure, Layout
 
 from quick_ternaries.services.ternary_trace_maker import TernaryTraceMaker
 from quick_ternaries.services.axis_formatter import AxisFormatter
+from quick_ternaries.utils.fast_figure import FastFigure
 from quick_ternaries.utils.legend_layout import build_legend_layout
+from quick_ternaries.utils.parallel import ordered_map
 
 class LayoutCreator:
     """
@@ -119,21 +121,27 @@ class TernaryPlotMaker:
         self.trace_maker = TernaryTraceMaker()
         self.axis_formatter = AxisFormatter()
         self.layout_creator = LayoutCreator()
+        # Number of plotly traces produced for each (uid, model) item
+        self.trace_counts = {}
 
-    def make_plot(self, setup_model, trace_models) -> Figure:
+    def make_plot(self, setup_model, trace_models, validate: bool = True) -> Figure:
         """
         Creates a complete Plotly figure for a ternary diagram.
         
         Args:
             setup_model: The SetupMenuModel containing global plot settings
             trace_models: List of (uid, model) tuples or just models
+            validate: If False, assemble a FastFigure instead of a go.Figure,
+                which skips the figure's validation and copies of the traces
+                (for the preview)
             
         Returns:
-            A Plotly Figure object
+            A Plotly Figure object (or a FastFigure)
         """
         layout = self._create_layout(setup_model)
         traces = self._create_traces(setup_model, trace_models)
-        fig = Figure(data=traces, layout=layout)
+        figure_class = Figure if validate else FastFigure
+        fig = figure_class(data=traces, layout=layout)
         return fig
 
     def _create_layout(self, setup_model) -> Layout:
@@ -222,18 +230,34 @@ class TernaryPlotMaker:
         Returns:
             List of Plotly Scatterternary objects
         """
-        traces = []
-        
+        items = []
         for item in trace_models:
             # Check if item is a tuple (uid, model) or just model
             if isinstance(item, tuple) and len(item) == 2:
-                uid, trace_model = item
-                trace = self.trace_maker.make_trace(setup_model, trace_model, source_trace_id=uid)
+                items.append(item)
             else:
-                trace_model = item
-                trace = self.trace_maker.make_trace(setup_model, trace_model)
-            
-            traces.append(trace)
+                items.append((None, item))
+
+        def build(item):
+            uid, trace_model = item
+            # A binned trace is drawn as filled bins (one plotly trace per bin color)
+            if getattr(trace_model, 'binning_on', False):
+                return self.trace_maker.make_binned_traces(setup_model, trace_model)
+            # A split trace expands into one plotly trace per category
+            if getattr(trace_model, 'split_by_category_on', False) and trace_model.split_category_column:
+                return self.trace_maker.make_category_traces(
+                    setup_model, trace_model, source_trace_id=uid
+                )
+            return [self.trace_maker.make_trace(setup_model, trace_model, source_trace_id=uid)]
+
+        # Traces are independent, so build them concurrently; results come back
+        # in tab order, which the app's plotly trace mapping relies on
+        traces = []
+        self.trace_counts = {}
+        for (uid, _), new_traces in zip(items, ordered_map(build, items)):
+            if uid is not None:
+                self.trace_counts[uid] = len(new_traces)
+            traces.extend(new_traces)
             
         return traces
 
@@ -2,13 +2,46 @@
 TODO identify rendundant methods and use inheritance to resolve
 """
 
-import time
 from typing import Dict, List, Tuple, Optional, TYPE_CHECKING
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+from plotly.colors import get_colorscale, sample_colorscale
 
 from quick_ternaries.services.molar_mass_calculator import MolarMassCalculator
+from quick_ternaries.services.trace_arrays import TraceArrays
+from quick_ternaries.services.hover_store import (
+    HOVER_STORE,
+    format_hover_value,
+    lazy_hover_enabled,
+    slice_hover_kwargs,
+    trace_store_key
+)
+from quick_ternaries.services.marker_styling import (
+    heatmap_marker,
+    log_transform,
+    normalize_sizes,
+    rgb_to_hex,
+    scale_to_channel,
+    slice_marker,
+    sort_order,
+    z_order
+)
+from quick_ternaries.services.point_budget import marker_points_per_view
+from quick_ternaries.services.viewport_lod import VIEWPORT_STORE, collect_point_arrays
+from quick_ternaries.services.ternary_binning import (
+    BIN_COLOR_LEVELS,
+    bin_corners,
+    bin_statistic,
+    color_levels,
+    polygon_paths,
+    triangular_bin_ids
+)
+from quick_ternaries.services.axis_projection import (
+    AxisProjection,
+    get_formula_map,
+    get_molar_factors
+)
 from quick_ternaries.services.filters import (
     EqualsFilterStrategy, 
     OneOfFilterStrategy, 
@@ -30,9 +63,13 @@ from quick_ternaries.utils.functions import (
 )
 from quick_ternaries.utils.contour_utils import (
     transform_to_cartesian, 
+    ternary_to_cartesian,
     compute_kde_contours, 
+    compute_kde_contours_job,
     convert_contour_to_ternary
 )
+from quick_ternaries.utils.parallel import ordered_map, process_map
+from quick_ternaries.utils.utils import ColorPalette
 
 
 if TYPE_CHECKING:
@@ -53,10 +90,6 @@ class DensityContourMaker:
     Now supports multiple contours with custom names and line styles.
     """
     
-    # Pattern constants (match those in TernaryTraceMaker)
-    APEX_PATTERN = '__{apex}_{us}'
-    SCALED_COLUMN_PATTERN = '__{col}_scaled_{apex}_{us}'
-    
     def __init__(self):
         """Initialize the density contour maker."""
         
@@ -98,8 +131,55 @@ class DensityContourMaker:
         Returns:
             A list of Plotly Scatterternary traces for the density contours, or None if generation fails
         """
+        job = self.prepare_contour_job(setup_model, trace_model)
+        if job is None:
+            return None
+        kde_result = compute_kde_contours_job((job['points'], job['levels']))
+        return self.build_contour_traces(trace_model, trace_id, job, kde_result)
+
+    def make_traces(self, setup_model, items, use_processes: bool = True) -> List[Optional[List[go.Scatterternary]]]:
+        """
+        Creates the density contours of many traces at once.
+
+        Data preparation runs on a thread pool, and the KDE contouring (the
+        expensive part) on a process pool when ``use_processes`` is set.
+
+        Args:
+            setup_model: The SetupMenuModel containing global plot settings
+            items: List of (trace_model, trace_id) tuples
+            use_processes: Compute the KDEs in worker processes instead of threads
+
+        Returns:
+            One entry per item, in the same order: a list of contour traces, or None
+        """
+        items = list(items)
+        jobs = ordered_map(lambda item: self.prepare_contour_job(setup_model, item[0]), items)
+
+        pending = [i for i, job in enumerate(jobs) if job is not None]
+        kde_args = [(jobs[i]['points'], jobs[i]['levels']) for i in pending]
+        run = process_map if use_processes else ordered_map
+        kde_results = dict(zip(pending, run(compute_kde_contours_job, kde_args)))
+
+        return [
+            self.build_contour_traces(trace_model, trace_id, jobs[i], kde_results[i]) if i in kde_results else None
+            for i, (trace_model, trace_id) in enumerate(items)
+        ]
+
+    def prepare_contour_job(self, setup_model, trace_model) -> Optional[dict]:
+        """
+        Gathers everything needed to contour a trace: its points in cartesian
+        coordinates, the coverage levels and the legend/line settings.
+
+        Args:
+            setup_model: The SetupMenuModel containing global plot settings
+            trace_model: The TraceEditorModel with density contour settings enabled
+
+        Returns:
+            Dictionary with 'points', 'levels', 'percentiles', 'legend_name' and
+            'line_style', or None if there is nothing to contour
+        """
         # Debug info
-        print(f"DensityContourMaker.make_trace called for trace: {trace_model.trace_name}")
+        print(f"DensityContourMaker.prepare_contour_job called for trace: {trace_model.trace_name}")
         print(f"Density contour on: {getattr(trace_model, 'density_contour_on', False)}")
         print(f"Multiple contours: {getattr(trace_model, 'density_contour_multiple', False)}")
         
@@ -116,19 +196,14 @@ class DensityContourMaker:
                 
             print(f"Got dataframe with {len(df)} rows")
                 
-            # Apply filters if enabled
-            filtered_df = df.copy()
-            if getattr(trace_model, 'filters_on', False) and hasattr(trace_model, 'filters'):
-                filtered_df = self._apply_filters(filtered_df, trace_model)
-            
-            if filtered_df.empty:
-                print(f"No data left after filtering for density contour on trace: {trace_model.trace_name}")
-                return None
-                
-            print(f"After filtering: {len(filtered_df)} rows")
-            
-            # Generate a unique string for column naming
-            unique_str = self._generate_unique_str()
+            # Filter with a row mask instead of copying the cached frame
+            mask = None
+            if getattr(trace_model, 'filters_on', False) and getattr(trace_model, 'filters', None):
+                mask = self._build_filter_mask(df, trace_model)
+                if not mask.any():
+                    print(f"No data left after filtering for density contour on trace: {trace_model.trace_name}")
+                    return None
+                print(f"After filtering: {int(mask.sum())} rows")
             
             # Get column lists for each apex
             top_columns = getattr(setup_model.axis_members, 'top_axis', [])
@@ -136,14 +211,14 @@ class DensityContourMaker:
             right_columns = getattr(setup_model.axis_members, 'right_axis', [])
             
             # Process the data to get ternary coordinates
-            prepared_df = self._prepare_data(
-                filtered_df,
+            trace_data = self._prepare_data(
+                df,
                 setup_model,
                 trace_model,
                 top_columns,
                 left_columns,
                 right_columns,
-                unique_str
+                mask
             )
             
             # Determine which percentiles to use
@@ -190,39 +265,59 @@ class DensityContourMaker:
             # Get line style
             line_style = getattr(trace_model, 'density_contour_line_style', 'solid')
             
-            # Create a list to store all contour traces
-            contour_traces = []
-            
-            # Generate cartesian coordinates once for efficiency
-            trace_data_df_for_transformation = prepared_df[
-                [self.APEX_PATTERN.format(apex='top',   us=unique_str),
-                self.APEX_PATTERN.format(apex='left',  us=unique_str),
-                self.APEX_PATTERN.format(apex='right', us=unique_str)]
-            ]
-            
-            # Transform to cartesian coordinates for KDE
-            trace_data_cartesian = self.transform_to_cartesian(
-                trace_data_df_for_transformation,
-                self.APEX_PATTERN.format(apex='top',   us=unique_str),
-                self.APEX_PATTERN.format(apex='left',  us=unique_str),
-                self.APEX_PATTERN.format(apex='right', us=unique_str)
+            # Transform to cartesian coordinates for KDE (once for all contours)
+            points = ternary_to_cartesian(
+                trace_data.computed['top'],
+                trace_data.computed['left'],
+                trace_data.computed['right']
             )
+
+            return {
+                'points': points,
+                # Normalize percentiles to 0-1 scale
+                'levels': [p/100 if p > 1 else p for p in percentiles],
+                'percentiles': percentiles,
+                'legend_name': legend_name,
+                'line_style': line_style,
+            }
+
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            print(f"Error creating density contour for trace {trace_model.trace_name}: {e}")
+            return None
+
+    def build_contour_traces(self, trace_model, trace_id: str, job: dict, kde_result) -> Optional[List[go.Scatterternary]]:
+        """
+        Turns computed KDE contours into Scatterternary traces.
+
+        Args:
+            trace_model: The TraceEditorModel with density contour settings enabled
+            trace_id: Unique identifier for the trace
+            job: The dictionary returned by ``prepare_contour_job``
+            kde_result: The (success, contours) pair returned by ``compute_kde_contours``
+
+        Returns:
+            A list of Plotly Scatterternary traces, or None if contouring failed
+        """
+        success, contours = kde_result
+        if not success or not contours:
+            print("KDE contour computation failed")
+            return None
+
+        percentiles = job['percentiles']
+        legend_name = job['legend_name']
+        line_style = job['line_style']
+        trace_name = trace_model.trace_name
+
+        try:
+            contour_traces = []
             
-            # Normalize percentiles to 0-1 scale
-            normalized_percentiles = [p/100 if p > 1 else p for p in percentiles]
-            
-            # Compute all contours at once
-            success, contours = self.compute_kde_contours(trace_data_cartesian, normalized_percentiles)
-            
-            if not success or not contours:
-                print("KDE contour computation failed")
-                return None
-                
             # Convert all contours to ternary coordinates
             ternary_contours = self.convert_contour_to_ternary(contours)
             
             # Use same legendgroup for all contours to group them
-            legendgroup = f"density-{trace_id}-{unique_str}"
+            legendgroup = f"density-{trace_id}"
             
             # Create a trace for each contour
             for i, (percentile, contour) in enumerate(zip(percentiles, ternary_contours)):
@@ -264,131 +359,31 @@ class DensityContourMaker:
             print(f"Error creating density contour for trace {trace_model.trace_name}: {e}")
             return None
 
-    def _apply_filters(self, data_df: pd.DataFrame, trace_model) -> pd.DataFrame:
+    def _build_filter_mask(self, data_df: pd.DataFrame, trace_model) -> np.ndarray:
         """
-        Applies filters to the dataframe.
-        
+        Builds a single boolean row mask combining all of the trace's filters.
+
+        Uses the same filter strategies (and the same handling of filters that
+        would leave zero rows) as the scatter traces; see
+        TernaryTraceMaker._build_filter_mask.
+
         Args:
             data_df: The dataframe to filter
             trace_model: The TraceEditorModel containing filter settings
-            
+
         Returns:
-            The filtered dataframe
+            Boolean NumPy array with one entry per row of data_df
         """
-        # If filters are not enabled or no filters exist, return original dataframe
-        if not trace_model.filters_on or not trace_model.filters:
-            return data_df
-        
-        # Make a copy to avoid modifying the original
-        filtered_df = data_df.copy()
-        
-        # Track filters with issues for reporting
-        filter_issues = []
-        
-        # Apply each filter in sequence
-        for filter_obj in trace_model.filters:
-            # Skip if filter is not configured properly
-            if not hasattr(filter_obj, 'filter_column') or not hasattr(filter_obj, 'filter_operation'):
-                filter_issues.append(f"Filter '{getattr(filter_obj, 'filter_name', 'Unknown')}' is missing required attributes")
-                continue
-            
-            column = filter_obj.filter_column
-            operation = filter_obj.filter_operation
-            
-            # Skip if column not in dataframe
-            if column not in filtered_df.columns:
-                filter_issues.append(f"Column '{column}' not found for filter '{filter_obj.filter_name}'")
-                continue
-            
-            # Get column data type
-            column_dtype = filtered_df[column].dtype
-            is_numeric = pd.api.types.is_numeric_dtype(column_dtype)
-            
-            # Prepare filter parameters
-            filter_params = {
-                'column': column,
-                'operation': operation,
-            }
-            
-            try:
-                # Single value operations
-                if operation in ['==', '<', '>', '<=', '>=', 'is', 'is not']:
-                    value = filter_obj.filter_value1
-                    if is_numeric and value:
-                        try:
-                            value = float(value)
-                        except ValueError:
-                            raise ValueError(f"Cannot convert '{value}' to a number for filter '{filter_obj.filter_name}'")
-                    filter_params['value 1'] = value
-                    
-                # Multi-value operations
-                elif operation in ['is one of', 'is not one of']:
-                    values = filter_obj.filter_value1
-                    # Handle both list and string cases
-                    if isinstance(values, str):
-                        values = [v.strip() for v in values.split(',') if v.strip()]
-                    elif not isinstance(values, list):
-                        values = [values] if values else []
-                    
-                    if is_numeric and values:
-                        try:
-                            values = [float(v) for v in values]
-                        except ValueError:
-                            raise ValueError(f"Cannot convert one or more values to numbers for filter '{filter_obj.filter_name}'")
-                    
-                    filter_params['selected values'] = values
-                    
-                # Range operations
-                elif operation in ['a < x < b', 'a <= x <= b', 'a <= x < b', 'a < x <= b']:
-                    if not is_numeric:
-                        raise ValueError(f"Cannot apply range operation '{operation}' to non-numeric column '{column}'")
-                    
-                    value_a = filter_obj.filter_value1
-                    value_b = filter_obj.filter_value2
-                    
-                    try:
-                        if value_a:
-                            value_a = float(value_a)
-                        if value_b:
-                            value_b = float(value_b)
-                    except ValueError:
-                        raise ValueError(f"Cannot convert range values to numbers for filter '{filter_obj.filter_name}'")
-                    
-                    filter_params['value a'] = value_a
-                    filter_params['value b'] = value_b
-                
-                else:
-                    raise ValueError(f"Unsupported filter operation: '{operation}'")
-                
-                # Apply the filter using appropriate strategy
-                filter_strategy = self.operation_strategies.get(operation)
-                if filter_strategy:
-                    try:
-                        # Apply filter and handle empty result case
-                        result_df = filter_strategy.filter(filtered_df, filter_params)
-                        if len(result_df) > 0:
-                            filtered_df = result_df
-                        else:
-                            print(f"Warning: Filter '{filter_obj.filter_name}' resulted in zero rows")
-                    except Exception as e:
-                        raise ValueError(f"Error applying filter '{filter_obj.filter_name}': {str(e)}")
-                else:
-                    filter_issues.append(f"No strategy found for operation '{operation}' in filter '{filter_obj.filter_name}'")
-                    
-            except ValueError as e:
-                filter_issues.append(str(e))
-        
-        # Log filter issues if any
-        if filter_issues:
-            print("Filter application issues:")
-            for issue in filter_issues:
-                print(f"  - {issue}")
-        
-        return filtered_df
+        return TernaryTraceMaker._build_filter_mask(self, data_df, trace_model)
     
-    def _prepare_data(self, df, setup_model, trace_model, top_columns, left_columns, right_columns, unique_str):
+    def _prepare_data(self, df, setup_model, trace_model, top_columns, left_columns, right_columns, mask=None) -> TraceArrays:
         """
         Prepares the data for contour generation.
+
+        Only the apex columns of the rows in ``mask`` are read from ``df``.
+
+        Returns:
+            Trace arrays with the 'top', 'left' and 'right' apex values computed
         """
         # Get the scaling maps
         scaling_maps = {}
@@ -397,131 +392,26 @@ class DensityContourMaker:
                 if axis_name in setup_model.column_scaling.scaling_factors:
                     scaling_maps[apex_name] = setup_model.column_scaling.scaling_factors[axis_name]
         
-        # Apply scaling with apex-specific factors
-        df = self._apply_apex_specific_scaling(
-            df,
-            top_columns,
-            left_columns,
-            right_columns,
-            scaling_maps,
-            unique_str
-        )
-        
-        # Apply molar conversion if enabled
+        # Only the apex columns are needed for the contour
+        trace_data = TraceArrays.from_dataframe(df, top_columns + left_columns + right_columns, mask)
+
+        # Scale, convert to molar (if enabled) and sum each apex in one projection
+        axis_columns = {'top': top_columns, 'left': left_columns, 'right': right_columns}
+        molar_factors = None
         if getattr(trace_model, 'convert_from_wt_to_molar', False):
-            df = self._perform_molar_conversion(
-                df,
-                setup_model,
-                top_columns,
-                left_columns,
-                right_columns,
-                unique_str
+            apex_columns = top_columns + left_columns + right_columns
+            formula_map = get_formula_map(
+                setup_model, ['top_axis', 'left_axis', 'right_axis'], apex_columns
             )
-        else:
-            # Sum the scaled columns for each apex
-            for apex_name, apex_cols_list in zip(
-                ['top', 'left', 'right'], 
-                [top_columns, left_columns, right_columns]
-            ):
-                # Use the scaled column names
-                scaled_cols = [
-                    self.SCALED_COLUMN_PATTERN.format(col=col, apex=apex_name, us=unique_str)
-                    for col in apex_cols_list
-                ]
-                
-                df[self.APEX_PATTERN.format(apex=apex_name, us=unique_str)] = \
-                    df[scaled_cols].sum(axis=1)
-        
-        return df
-    
-    def _apply_apex_specific_scaling(self, df, top_columns, left_columns, right_columns, 
-                                    scaling_maps, unique_str):
-        """
-        Applies apex-specific scaling to columns and creates scaled columns.
-        """
-        # Process each apex
-        for apex_name, apex_cols_list in zip(
-            ['top', 'left', 'right'], 
-            [top_columns, left_columns, right_columns]
-        ):
-            # Get scaling map for this apex
-            apex_scale_map = scaling_maps.get(apex_name, {})
-            
-            # Create scaled columns for each apex column
-            for col in apex_cols_list:
-                # Get the scale factor (default to 1.0)
-                scale_factor = apex_scale_map.get(col, 1.0)
-                
-                # Create a scaled column
-                scaled_col_name = self.SCALED_COLUMN_PATTERN.format(col=col, apex=apex_name, us=unique_str)
-                df[scaled_col_name] = df[col] * scale_factor
+            # Columns without a formula contribute nothing to their apex
+            molar_factors = get_molar_factors(apex_columns, formula_map or {}, self.calculator)
         
-        return df
-    
-    def _perform_molar_conversion(self, df, setup_model, top_columns, left_columns, right_columns, unique_str):
-        """
-        Performs molar conversion on the dataframe using scaled column values.
-        """
-        # Create a simplified molar converter
-        apex_columns = top_columns + left_columns + right_columns
-        formula_map = {}
-        
-        # Get formulas from setup model if available
-        if hasattr(setup_model, 'chemical_formulas') and hasattr(setup_model.chemical_formulas, 'formulas'):
-            for axis_name, axis_cols in zip(
-                ['top_axis', 'left_axis', 'right_axis'],
-                [top_columns, left_columns, right_columns]
-            ):
-                if axis_name in setup_model.chemical_formulas.formulas:
-                    for col, formula in setup_model.chemical_formulas.formulas[axis_name].items():
-                        if col in top_columns + left_columns + right_columns:
-                            formula_map[col] = formula
-        
-        # Process each apex
-        for apex_name, apex_cols_list in zip(
-            ['top', 'left', 'right'], 
-            [top_columns, left_columns, right_columns]
-        ):
-            # Create a list to store molar columns
-            molar_columns = []
-            
-            # Process each column in this apex
-            for col in apex_cols_list:
-                if col in formula_map:
-                    # Get the formula for this column
-                    formula = formula_map[col]
-                    
-                    # Get the scaled column name
-                    scaled_col_name = self.SCALED_COLUMN_PATTERN.format(
-                        col=col, apex=apex_name, us=unique_str
-                    )
-                    
-                    # Calculate molar mass using the calculator
-                    try:
-                        molar_mass = self.calculator.get_molar_mass(formula)
-                        
-                        # Create molar proportion column
-                        molar_col_name = f"__{col}_{apex_name}_molar_{unique_str}"
-                        df[molar_col_name] = df[scaled_col_name] / molar_mass
-                        
-                        # Add to list of molar columns
-                        molar_columns.append(molar_col_name)
-                    except Exception as e:
-                        # Skip this column if there's an error calculating molar mass
-                        print(f"Warning: Error calculating molar mass for {formula}: {e}")
-            
-            # Sum molar columns to get the apex value
-            if molar_columns:
-                df[self.APEX_PATTERN.format(apex=apex_name, us=unique_str)] = \
-                    df[molar_columns].sum(axis=1)
-            else:
-                # If no molar columns, use 0
-                df[self.APEX_PATTERN.format(apex=apex_name, us=unique_str)] = 0
+        projection = AxisProjection(axis_columns, scaling_maps, molar_factors)
+        trace_data.computed.update(projection.project_arrays(trace_data))
         
-        return df
+        return trace_data
     
-
-    def _generate_contour(self, df, unique_str, percentile):
+    def _generate_contour(self, trace_data, percentile):
         """
         Generate contour from trace data.
         This method is now deprecated in favor of generating multiple contours at once.
@@ -529,21 +419,11 @@ class DensityContourMaker:
         try:
             print(f"Generating contour with percentile: {percentile}")
             
-            # Extract ternary coordinates
-            trace_data_df_for_transformation = df[
-                [self.APEX_PATTERN.format(apex='top',   us=unique_str),
-                 self.APEX_PATTERN.format(apex='left',  us=unique_str),
-                 self.APEX_PATTERN.format(apex='right', us=unique_str)]
-            ]
-            
-            print(f"Extracted ternary coordinates, shape: {trace_data_df_for_transformation.shape}")
-            
             # Transform to cartesian coordinates for KDE
-            trace_data_cartesian = self.transform_to_cartesian(
-                trace_data_df_for_transformation,
-                self.APEX_PATTERN.format(apex='top',   us=unique_str),
-                self.APEX_PATTERN.format(apex='left',  us=unique_str),
-                self.APEX_PATTERN.format(apex='right', us=unique_str)
+            trace_data_cartesian = ternary_to_cartesian(
+                trace_data.computed['top'],
+                trace_data.computed['left'],
+                trace_data.computed['right']
             )
             
             print(f"Transformed to cartesian, shape: {trace_data_cartesian.shape}")
@@ -577,11 +457,6 @@ class DensityContourMaker:
             traceback.print_exc()
             return None, None, None
     
-    def _generate_unique_str(self):
-        """Generate a unique string for column naming."""
-        from time import time
-        return str(hash(time()))
-    
     
 class TernaryContourTraceMaker:
     """
@@ -589,10 +464,6 @@ class TernaryContourTraceMaker:
     This class handles specifically the contour generation logic.
     """
     
-    # Pattern constants
-    APEX_PATTERN = '__{apex}_{us}'
-    SIMULATED_PATTERN = '__{col}_simulated_{us}'
-    
     # Number of simulation points for bootstrap
     N_SIMULATION_POINTS = 10_000
     
@@ -627,8 +498,6 @@ class TernaryContourTraceMaker:
             
         series = source_data["series"]
         
-        unique_str = self._generate_unique_str()
-        
         # Get ternary type from setup model
         ternary_type = self._get_ternary_type_from_setup(setup_model)
         
@@ -650,14 +519,13 @@ class TernaryContourTraceMaker:
         marker = self._get_basic_marker_dict(model)
         
         # Prepare the bootstrap data for contour generation
-        marker, trace_data_df = self._prepare_bootstrap_data(
+        marker, trace_data = self._prepare_bootstrap_data(
             model,
             setup_model,
             ternary_type,
             top_columns,
             left_columns,
             right_columns,
-            unique_str,
             trace_id,
             marker,
             scaling_map,
@@ -675,7 +543,7 @@ class TernaryContourTraceMaker:
             contour_level = str(model.contour_percentile)
         
         # try:
-        a, b, c = self._generate_contours(trace_id, trace_data_df, unique_str, contour_level)
+        a, b, c = self._generate_contours(trace_id, trace_data, contour_level)
         # except Exception as e:
         #     # If contour generation fails, raise a custom exception
         #     raise BootstrapTraceContourException(trace_id, f"Failed to generate contour: {str(e)}")
@@ -753,11 +621,10 @@ class TernaryContourTraceMaker:
             top_columns: List[str],
             left_columns: List[str],
             right_columns: List[str],
-            unique_str: str,
             trace_id: str,
             marker: dict,
             scaling_map: dict,
-            series: pd.Series) -> Tuple[dict, pd.DataFrame]:
+            series: pd.Series) -> Tuple[dict, TraceArrays]:
         """
         Prepare data for bootstrap contour generation.
         
@@ -768,72 +635,59 @@ class TernaryContourTraceMaker:
             top_columns: List of columns for top apex
             left_columns: List of columns for left apex
             right_columns: List of columns for right apex
-            unique_str: Unique string for column naming
             trace_id: Trace identifier
             marker: Marker dictionary for styling
             scaling_map: Dictionary of column scaling factors
             series: The pandas Series containing the point data
             
         Returns:
-            Tuple of (marker dict, processed dataframe)
+            Tuple of (marker dict, simulated trace arrays with apex values computed)
         """
-        # Create a dataframe from the series
-        trace_data_df = series.to_frame().T
-        
         # Apply scaling if necessary
         if scaling_map:
-            trace_data_df = self._apply_scale_factors(trace_data_df, scaling_map)
+            point = self._apply_scale_factors(series.to_frame().T, scaling_map).iloc[0]
             err_repr = self._generate_error_repr(model, series, scaling_map)
         else:
+            point = series
             err_repr = self._generate_error_repr(model, series)
         
-        # Expand the dataframe to make room for simulated points
-        trace_data_df = pd.DataFrame(
-            data=np.repeat(
-                trace_data_df.values, 
-                self.N_SIMULATION_POINTS, 
-                axis=0), 
-            columns=trace_data_df.columns)
-        
-        # Fill the expanded dataframe with simulated data
-        for col, err in err_repr.items():
-            if col in trace_data_df.columns:
-                sim_col_fmt = self.SIMULATED_PATTERN.format(col=col, us=unique_str)
-                # Normal distribution simulation
-                trace_data_df[sim_col_fmt] = np.random.normal(
-                    trace_data_df[col].values[0], err, self.N_SIMULATION_POINTS)
+        # Simulate each column with an error around the (scaled) point value
+        simulated = {
+            col: np.random.normal(float(point[col]), err, self.N_SIMULATION_POINTS)
+            for col, err in err_repr.items()
+            if col in point.index
+        }
+        trace_data = TraceArrays(simulated, pd.RangeIndex(self.N_SIMULATION_POINTS))
         
         # Apply molar conversion if needed
         convert_to_molar = getattr(model, 'convert_from_wt_to_molar', False)
         
         # Call appropriate conversion method
         if convert_to_molar:
-            trace_data_df = self._molar_calibration(
+            trace_data = self._molar_calibration(
                 setup_model,
                 ternary_type,
-                trace_data_df,
+                trace_data,
                 top_columns,
                 left_columns,
                 right_columns,
-                unique_str,
                 trace_id,
                 convert_to_molar,
                 bootstrap=True
             )
         else:
             # Simple normalization for non-molar conversion
-            for apex_name, apex_cols_list in zip(['top', 'left', 'right'], 
-                                              [top_columns, left_columns, right_columns]):
-                apex_cols_sim = [self.SIMULATED_PATTERN.format(col=c, us=unique_str) for c in apex_cols_list]
-                try:
-                    trace_data_df[self.APEX_PATTERN.format(apex=apex_name, us=unique_str)] = \
-                        trace_data_df[apex_cols_sim].sum(axis=1)
-                except KeyError as err:
-                    # Handle missing columns error
-                    missing = [x for x in apex_cols_sim if x not in trace_data_df.columns]
-                    raise Exception(f"Missing simulated columns: {missing}") from err
-        
-        return marker, trace_data_df
+            for apex_cols_list in (top_columns, left_columns, right_columns):
+                # Handle missing columns error
+                missing = [c for c in apex_cols_list if c not in trace_data]
+                if missing:
+                    raise Exception(f"Missing simulated columns: {missing}")
+
+            # Scale factors were applied before simulating, so this is a plain apex sum
+            projection = AxisProjection({'top': top_columns, 'left': left_columns, 'right': right_columns})
+            trace_data.computed.update(projection.project_arrays(trace_data))
+
+        return marker, trace_data
     
     def _generate_error_repr(self, model, series: pd.Series, scaling_map: Dict[str, float]=None) -> Dict[str, float]:
         """
@@ -937,142 +791,69 @@ class TernaryContourTraceMaker:
             self,
             setup_model,
             ternary_type,
-            trace_data_df: pd.DataFrame,
+            trace_data: TraceArrays,
             top_columns: List[str],
             left_columns: List[str],
             right_columns: List[str],
-            unique_str: str,
             trace_id: str,
             convert_to_molar: bool,
-            bootstrap: bool = True):
+            bootstrap: bool = True) -> TraceArrays:
         """
         Convert weight percentages to molar proportions.
         
         This is a simplified adaptation that would need to be expanded based on
         your specific implementation of molar conversion.
         """
-        # Create a simplified MolarConverter for this function
-        class MolarConverter:
-            def __init__(self, df, top, left, right, apex_pattern, unique_str, calculator):
-                self.df = df
-                self.top = top
-                self.left = left
-                self.right = right
-                self.apex_pattern = apex_pattern
-                self.unique_str = unique_str
-                self.calculator = calculator
-                self.SIMULATED_PATTERN = '__{col}_simulated_{us}'
-                self.MOLAR_PATTERN = '__{col}_molar_{us}'
-                
-            def molar_conversion(self, formula_map=None):
-                """Convert to molar proportions using chemical formulas."""
-                apex_columns = self.top + self.left + self.right
-                
-                # Default to using column name as formula if no map provided
-                if formula_map is None:
-                    formula_map = {c: c for c in apex_columns}
-                
-                # Process each apex
-                for apex_name, cols in zip(['top', 'left', 'right'], [self.top, self.left, self.right]):
-                    molar_cols = []
-                    
-                    for col in cols:
-                        if col in formula_map:
-                            formula = formula_map[col]
-                            
-                            # For bootstrap, use simulated columns
-                            sim_col = self.SIMULATED_PATTERN.format(col=col, us=self.unique_str)
-                            if sim_col in self.df.columns:
-                                # try:
-                                molar_mass = self.calculator.get_molar_mass(formula)
-                                molar_col = self.MOLAR_PATTERN.format(col=col, us=self.unique_str)
-                                self.df[molar_col] = self.df[sim_col] / molar_mass
-                                molar_cols.append(molar_col)
-                                # except Exception:
-                                #     # Skip columns with invalid formulas
-                                #     pass
-                    
-                    # Sum molar values for the apex
-                    if molar_cols:
-                        self.df[self.apex_pattern.format(apex=apex_name, us=self.unique_str)] = \
-                            self.df[molar_cols].sum(axis=1)
-                    else:
-                        # If no molar columns, use zeros
-                        self.df[self.apex_pattern.format(apex=apex_name, us=self.unique_str)] = 0
-                
-                return self.df
-                
-            def nonmolar_conversion(self):
-                """Simple normalization without molar conversion."""
-                for apex_name, cols in zip(['top', 'left', 'right'], [self.top, self.left, self.right]):
-                    # For bootstrap, use simulated columns
-                    sim_cols = [self.SIMULATED_PATTERN.format(col=c, us=self.unique_str) for c in cols]
-                    self.df[self.apex_pattern.format(apex=apex_name, us=self.unique_str)] = \
-                        self.df[sim_cols].sum(axis=1)
-                return self.df
-        
-        # Create converter instance
-        converter = MolarConverter(
-            trace_data_df,
-            top_columns,
-            left_columns,
-            right_columns,
-            self.APEX_PATTERN,
-            unique_str,
-            self.calculator
+        apex_columns = top_columns + left_columns + right_columns
+
+        # Get formula mappings from setup model if available, defaulting to
+        # using column names as formulas if no mapping is provided
+        formula_map = get_formula_map(
+            setup_model, ['top_axis', 'left_axis', 'right_axis'], apex_columns
         )
+        if formula_map is None:
+            formula_map = {c: c for c in apex_columns}
         
-        # Get formula mappings from setup model if available
-        formula_map = None
-        if hasattr(setup_model, 'chemical_formulas') and hasattr(setup_model.chemical_formulas, 'formulas'):
-            formula_map = {}
-            for axis_name, axis_cols in zip(
-                ['top_axis', 'left_axis', 'right_axis'],
-                [top_columns, left_columns, right_columns]
-            ):
-                if axis_name in setup_model.chemical_formulas.formulas:
-                    for col, formula in setup_model.chemical_formulas.formulas[axis_name].items():
-                        if col in top_columns + left_columns + right_columns:
-                            formula_map[col] = formula
+        # For bootstrap, only the simulated columns contribute
+        axis_columns = {
+            apex_name: [c for c in cols if c in trace_data]
+            for apex_name, cols in zip(['top', 'left', 'right'], [top_columns, left_columns, right_columns])
+        }
         
         # Use molar conversion or simple normalization
+        molar_factors = None
         if convert_to_molar:
-            return converter.molar_conversion(formula_map)
-        else:
-            return converter.nonmolar_conversion()
+            simulated_columns = [c for c in apex_columns if c in trace_data]
+            molar_factors = get_molar_factors(
+                simulated_columns, formula_map, self.calculator, raise_errors=True
+            )
+
+        projection = AxisProjection(axis_columns, molar_factors=molar_factors)
+        trace_data.computed.update(projection.project_arrays(trace_data))
+        return trace_data
     
     def _generate_contours(
             self, 
             trace_id: str, 
-            trace_data_df: pd.DataFrame,
-            unique_str: str, 
+            trace_data: TraceArrays,
             contour_level: str):
         """
         Generate contour data from the simulated points.
         
         Args:
             trace_id: Identifier for the trace
-            trace_data_df: DataFrame with simulated points data
-            unique_str: Unique string for column naming
+            trace_data: Simulated trace arrays with apex values computed
             contour_level: Contour level (percentile) as a string
             
         Returns:
             tuple: (a, b, c) coordinates for the contour
         """
         # try:
-        # Extract ternary coordinates
-        trace_data_df_for_transformation = trace_data_df[
-            [self.APEX_PATTERN.format(apex='top',   us=unique_str),
-                self.APEX_PATTERN.format(apex='left',  us=unique_str),
-                self.APEX_PATTERN.format(apex='right', us=unique_str)]
-        ]
-        
         # Transform to cartesian coordinates for KDE
-        trace_data_cartesian = transform_to_cartesian(
-            trace_data_df_for_transformation,
-            self.APEX_PATTERN.format(apex='top',   us=unique_str),
-            self.APEX_PATTERN.format(apex='left',  us=unique_str),
-            self.APEX_PATTERN.format(apex='right', us=unique_str)
+        trace_data_cartesian = ternary_to_cartesian(
+            trace_data.computed['top'],
+            trace_data.computed['left'],
+            trace_data.computed['right']
         )
         
         # Compute contours
@@ -1153,10 +934,7 @@ class TernaryContourTraceMaker:
         except ValueError:
             # Default to 0.95 (95%) if conversion fails
             return 0.95
-    
-    def _generate_unique_str(self) -> str:
-        """Generates a unique string for column naming based on timestamp."""
-        return str(hash(time.time()))
+
 
 class TernaryTraceMaker:
     """
@@ -1164,11 +942,6 @@ class TernaryTraceMaker:
     setup and trace models.
     """
     
-    APEX_PATTERN = '__{apex}_{us}'
-    HEATMAP_PATTERN = '__{col}_heatmap_{us}'
-    SIZEMAP_PATTERN = '__{col}_sizemap_{us}'
-    SCALED_COLUMN_PATTERN = '__{col}_scaled_{apex}_{us}'
-    
     def __init__(self):
         """Initialize the trace maker with filter strategies and molar calculator."""
         self.calculator = MolarMassCalculator()
@@ -1203,8 +976,6 @@ class TernaryTraceMaker:
         Returns:
             A Plotly Scatterternary trace object
         """
-        unique_str = self._generate_unique_str()
-        
         # Get the column lists for each apex
         top_columns = setup_model.axis_members.top_axis
         left_columns = setup_model.axis_members.left_axis
@@ -1218,26 +989,26 @@ class TernaryTraceMaker:
         scaling_maps = self._get_scaling_maps(setup_model)
         
         # Prepare the data for plotting
-        marker, trace_data_df = self._prepare_data(
+        marker, trace_data = self._prepare_data(
             setup_model, 
             trace_model,
             top_columns, 
             left_columns, 
             right_columns,
-            unique_str,
             marker,
             scaling_maps
         )
         
-        # Get hover data and template
-        customdata, hovertemplate = self._get_hover_data_and_template(
+        # Get hover data and template (or the hover store key)
+        customdata, hover_kwargs = self._get_hover(
             setup_model, 
             trace_model, 
-            trace_data_df,
+            trace_data,
             top_columns, 
             left_columns, 
             right_columns,
-            scaling_maps
+            scaling_maps,
+            hover_key=trace_store_key(source_trace_id, 'hover')
         )
         
         # Add source_trace_id to customdata if provided
@@ -1248,10 +1019,16 @@ class TernaryTraceMaker:
             customdata = np.hstack((customdata, source_ids))
         
         # Get the values for each apex
-        a = trace_data_df[self.APEX_PATTERN.format(apex='top', us=unique_str)]
-        b = trace_data_df[self.APEX_PATTERN.format(apex='left', us=unique_str)]
-        c = trace_data_df[self.APEX_PATTERN.format(apex='right', us=unique_str)]
-        
+        a = trace_data.computed['top']
+        b = trace_data.computed['left']
+        c = trace_data.computed['right']
+
+        # Very large traces send a sample and stream the rest on zoom
+        a, b, c, marker, customdata, hover_kwargs, uid = self._viewport_sample(
+            setup_model, a, b, c, marker, customdata, hover_kwargs,
+            key=trace_store_key(source_trace_id, 'sample')
+        )
+
         # Create the Scatterternary trace
         return go.Scatterternary(
             a=a, b=b, c=c,
@@ -1259,55 +1036,284 @@ class TernaryTraceMaker:
             mode='markers',
             marker=marker,
             customdata=customdata,
-            hovertemplate=hovertemplate,
-            showlegend=True
+            showlegend=True,
+            uid=uid,
+            **hover_kwargs
         )
-    
-    def _apply_custom_colorscale(self, marker, data_df, trace_model, unique_str):
+
+    def make_category_traces(self, setup_model, trace_model, source_trace_id=None) -> List[go.Scatterternary]:
         """
-        Apply custom RGB colorscale based on ternary apex values.
-        
-        Args:
+        Creates one Scatterternary trace per value of the trace's split category column.
+
+        The data is fetched, filtered, scaled, converted and styled once for the whole
+        datafile; the per-category traces are then sliced out of that single result
+        using the row positions from one groupby pass.
+
+        Args:
+            setup_model: The SetupMenuModel containing global plot settings
+            trace_model: The TraceEditorModel containing trace-specific settings
+            source_trace_id: Optional unique ID for the source trace (for bootstrapping)
+
+        Returns:
+            List of Plotly Scatterternary trace objects, one per category
+        """
+        category_column = trace_model.split_category_column
+
+        top_columns = setup_model.axis_members.top_axis
+        left_columns = setup_model.axis_members.left_axis
+        right_columns = setup_model.axis_members.right_axis
+
+        marker = self._get_basic_marker_dict(trace_model)
+        scaling_maps = self._get_scaling_maps(setup_model)
+
+        marker, trace_data = self._prepare_data(
+            setup_model,
+            trace_model,
+            top_columns,
+            left_columns,
+            right_columns,
+            marker,
+            scaling_maps
+        )
+
+        if category_column not in trace_data:
+            raise ValueError(
+                f"Category column '{category_column}' not found for trace: {trace_model.trace_name}"
+            )
+
+        customdata, hover_kwargs = self._get_hover(
+            setup_model,
+            trace_model,
+            trace_data,
+            top_columns,
+            left_columns,
+            right_columns,
+            scaling_maps,
+            hover_key=trace_store_key(source_trace_id, 'hover')
+        )
+
+        if source_trace_id is not None and customdata is not None and len(customdata) > 0:
+            source_ids = np.full((customdata.shape[0], 1), source_trace_id, dtype=object)
+            customdata = np.hstack((customdata, source_ids))
+
+        a = trace_data.computed['top']
+        b = trace_data.computed['left']
+        c = trace_data.computed['right']
+
+        # Row positions for every category from a single groupby pass
+        categories = pd.Series(trace_data[category_column])
+        groups = categories.groupby(categories, sort=True, dropna=False).indices
+
+        # Categories get palette colors unless the color already encodes data
+        color_is_data = trace_model.heatmap_on or getattr(trace_model, "custom_colorscale_on", False)
+        palette = ColorPalette.TAB10_COLORS
+        legendgroup = f"split-{source_trace_id if source_trace_id is not None else trace_model.trace_name}"
+
+        traces = []
+        for i, (category, positions) in enumerate(groups.items()):
+            group_marker = slice_marker(marker, positions, len(trace_data))
+            if not color_is_data:
+                group_marker['color'] = self._convert_hex_to_rgba(palette[i % len(palette)])
+            elif i > 0 and 'colorbar' in group_marker:
+                # Every group shares one color axis, so only the first draws the colorbar
+                group_marker['showscale'] = False
+
+            group_a, group_b, group_c, group_marker, group_customdata, group_hover_kwargs, uid = self._viewport_sample(
+                setup_model,
+                a[positions], b[positions], c[positions],
+                group_marker,
+                customdata[positions] if customdata is not None else None,
+                slice_hover_kwargs(hover_kwargs, positions, trace_store_key(source_trace_id, f'category-{i}-hover')),
+                key=trace_store_key(source_trace_id, f'category-{i}-sample')
+            )
+
+            traces.append(
+                go.Scatterternary(
+                    a=group_a, b=group_b, c=group_c,
+                    name=f"{trace_model.trace_name}: {category}",
+                    legendgroup=legendgroup,
+                    mode='markers',
+                    marker=group_marker,
+                    customdata=group_customdata,
+                    showlegend=True,
+                    uid=uid,
+                    **group_hover_kwargs
+                )
+            )
+
+        return traces
+
+    def make_binned_traces(self, setup_model, trace_model) -> List[go.Scatterternary]:
+        """
+        Aggregates a trace's points into a triangular grid of bins and draws the bins.
+
+        Every point is assigned to a bin in one vectorized pass, so the browser
+        draws one polygon per occupied bin instead of one marker per point.
+        Bins are colored by their point count, or by a reduction (mean, sum, min,
+        max) of the heatmap column, using the trace's heatmap colorscale settings.
+
+        The polygons are grouped into BIN_COLOR_LEVELS filled traces (one per
+        color), followed by one invisible marker trace at the bin centers that
+        carries the hover text and the colorbar.
+
+        Args:
+            setup_model: The SetupMenuModel containing global plot settings
+            trace_model: The TraceEditorModel containing trace-specific settings
+
+        Returns:
+            List of Plotly Scatterternary trace objects
+        """
+        top_columns = setup_model.axis_members.top_axis
+        left_columns = setup_model.axis_members.left_axis
+        right_columns = setup_model.axis_members.right_axis
+
+        marker = self._get_basic_marker_dict(trace_model)
+        scaling_maps = self._get_scaling_maps(setup_model)
+
+        _, trace_data = self._prepare_data(
+            setup_model,
+            trace_model,
+            top_columns,
+            left_columns,
+            right_columns,
+            marker,
+            scaling_maps
+        )
+
+        # Reducing a column needs the heatmap column; otherwise fall back to counts
+        statistic = getattr(trace_model, 'binning_statistic', 'count')
+        if statistic != 'count' and not trace_model.heatmap_on:
+            print(f"Binning by '{statistic}' needs a heatmap column; coloring {trace_model.trace_name} by count")
+            statistic = 'count'
+        values = trace_data.computed['heatmap'] if statistic != 'count' else None
+
+        resolution = max(int(getattr(trace_model, 'binning_resolution', 40)), 1)
+        bin_ids = triangular_bin_ids(
+            trace_data.computed['top'],
+            trace_data.computed['left'],
+            trace_data.computed['right'],
+            resolution
+        )
+        occupied, counts, bin_values = bin_statistic(bin_ids, resolution, values, statistic)
+        corners = bin_corners(occupied, resolution)
+
+        # Colorscale and colorbar come from the heatmap settings; counts use their own range
+        color_props = heatmap_marker(trace_model)
+        if statistic == 'count':
+            color_props['cmin'] = float(bin_values.min()) if len(bin_values) else 0.0
+            color_props['cmax'] = float(bin_values.max()) if len(bin_values) else 1.0
+            color_props['colorbar']['title']['text'] = 'Count'
+        else:
+            color_props['colorbar']['title']['text'] = f"{statistic.capitalize()} {trace_model.heatmap_column}"
+
+        levels = color_levels(bin_values, color_props['cmin'], color_props['cmax'], BIN_COLOR_LEVELS)
+        level_colors = sample_colorscale(
+            get_colorscale(color_props['colorscale']),
+            (np.arange(BIN_COLOR_LEVELS) + 0.5) / BIN_COLOR_LEVELS
+        )
+
+        name = trace_model.trace_name
+        legendgroup = f"bins-{name}"
+        traces = []
+        for level in np.unique(levels[levels >= 0]):
+            a, b, c = polygon_paths(corners[levels == level])
+            color = level_colors[level]
+            traces.append(
+                go.Scatterternary(
+                    a=a, b=b, c=c,
+                    name=name,
+                    legendgroup=legendgroup,
+                    mode='lines',
+                    fill='toself',
+                    fillcolor=color,
+                    # A hairline in the fill color hides the seams between bins
+                    line=dict(color=color, width=0.5),
+                    hoverinfo='skip',
+                    showlegend=not traces,
+                )
+            )
+
+        # Invisible bin centers for hover and the colorbar
+        centers = corners.mean(axis=1)
+        hover_text = [f"Count: {count}" for count in counts]
+        if statistic != 'count':
+            label = f"{statistic.capitalize()} {trace_model.heatmap_column}"
+            hover_text = [
+                f"{text}<br>{label}: {format_hover_value(value)}"
+                for text, value in zip(hover_text, bin_values)
+            ]
+        traces.append(
+            go.Scatterternary(
+                a=centers[:, 0], b=centers[:, 1], c=centers[:, 2],
+                name=name,
+                legendgroup=legendgroup,
+                mode='markers',
+                marker=dict(color=bin_values, size=8, opacity=0, **color_props),
+                text=hover_text,
+                hovertemplate="%{text}<extra>" + name + "</extra>",
+                showlegend=False,
+            )
+        )
+
+        return traces
+
+    def _viewport_sample(self, setup_model, a, b, c, marker: dict, customdata, hover_kwargs: dict, key: Optional[str] = None):
+        """
+        Replaces a trace's points by a representative sample when it has more
+        points than the per-view marker point count.
+
+        The full arrays are kept in VIEWPORT_STORE under the returned uid, so the
+        page can stream in the points of the viewport when the user zooms. With
+        a ``key`` (see trace_store_key), the uid and hover key are the same on
+        every render.
+
+        Returns:
+            (a, b, c, marker, customdata, hover_kwargs, uid); uid is None and
+            the inputs are returned unchanged if the trace is small enough
+        """
+        n_rows = len(a)
+        n_out = marker_points_per_view(setup_model)
+        if n_out <= 0 or n_rows <= n_out:
+            return a, b, c, marker, customdata, hover_kwargs, None
+
+        arrays = collect_point_arrays(n_rows, marker, customdata, a=a, b=b, c=c)
+        uid = VIEWPORT_STORE.register(arrays, n_out, hover_kwargs.get('meta'), key)
+        positions = VIEWPORT_STORE.positions(uid)
+        return (
+            a[positions], b[positions], c[positions],
+            slice_marker(marker, positions, n_rows),
+            customdata[positions] if customdata is not None else None,
+            slice_hover_kwargs(hover_kwargs, positions, key and f"{key}-hover"),
+            uid
+        )
+
+    def _apply_custom_colorscale(self, marker, trace_data: TraceArrays, trace_model):
+        """
+        Apply custom RGB colorscale based on ternary apex values.
+
+        Args:
             marker: The marker dictionary to update
-            data_df: The dataframe with the data
+            trace_data: The trace arrays with computed apex values
             trace_model: The TraceEditorModel containing custom colorscale settings
-            unique_str: Unique string for column naming
         
         Returns:
-            tuple: (updated marker, updated dataframe)
+            tuple: (updated marker, trace arrays)
         """
         # Get the mapping from color channels to apexes
         red_apex = getattr(trace_model, "apex_red_mapping", "top_axis")
         green_apex = getattr(trace_model, "apex_green_mapping", "left_axis")
         blue_apex = getattr(trace_model, "apex_blue_mapping", "right_axis")
         
-        # Get the shortened apex names (top, left, right)
-        red_apex_short = red_apex.split('_')[0]
-        green_apex_short = green_apex.split('_')[0]
-        blue_apex_short = blue_apex.split('_')[0]
-        
-        # Get apex values from dataframe
-        red_vals = data_df[self.APEX_PATTERN.format(apex=red_apex_short, us=unique_str)]
-        green_vals = data_df[self.APEX_PATTERN.format(apex=green_apex_short, us=unique_str)]
-        blue_vals = data_df[self.APEX_PATTERN.format(apex=blue_apex_short, us=unique_str)]
-        
-        # Normalize values to 0-1 range for each channel
-        red_norm = (red_vals - red_vals.min()) / (red_vals.max() - red_vals.min()) if red_vals.max() > red_vals.min() else red_vals * 0
-        green_norm = (green_vals - green_vals.min()) / (green_vals.max() - green_vals.min()) if green_vals.max() > green_vals.min() else green_vals * 0
-        blue_norm = (blue_vals - blue_vals.min()) / (blue_vals.max() - blue_vals.min()) if blue_vals.max() > blue_vals.min() else blue_vals * 0
-        
-        # Scale to 0-255 range and compute RGB colors
-        red_color = (red_norm * 255).astype(int)
-        green_color = (green_norm * 255).astype(int)
-        blue_color = (blue_norm * 255).astype(int)
-        
-        # Create rgba strings for each point
-        colors = [f"rgba({r}, {g}, {b}, 1)" for r, g, b in zip(red_color, green_color, blue_color)]
+        # Scale each mapped apex (top, left, right) onto a 0-255 channel
+        channels = [
+            scale_to_channel(trace_data.computed[apex.split('_')[0]])
+            for apex in (red_apex, green_apex, blue_apex)
+        ]
         
-        # Add colors to the marker
-        marker['color'] = colors
+        # Pack the channels into one '#rrggbb' color per point
+        marker['color'] = rgb_to_hex(*channels)
         
-        return marker, data_df
+        return marker, trace_data
     
     def _get_scaling_maps(self, setup_model) -> Dict[str, Dict[str, float]]:
         """
@@ -1358,10 +1364,9 @@ class TernaryTraceMaker:
             top_columns, 
             left_columns, 
             right_columns, 
-            unique_str, 
             marker, 
             scaling_maps
-        ) -> Tuple[dict, pd.DataFrame]:
+        ) -> Tuple[dict, TraceArrays]:
         """
         Prepares the data for plotting by applying filters, scaling, and configuring markers.
         
@@ -1371,105 +1376,70 @@ class TernaryTraceMaker:
             top_columns: List of columns for the top apex
             left_columns: List of columns for the left apex
             right_columns: List of columns for the right apex
-            unique_str: Unique string for column naming
             marker: Base marker dictionary
             scaling_maps: Dictionary mapping apex names to column scaling dictionaries
             
         Returns:
-            tuple: (marker, dataframe)
+            tuple: (marker, trace arrays with 'top', 'left' and 'right' computed)
         """
         # Get the dataframe using the DataframeManager
         if not hasattr(setup_model, 'data_library'):
             raise ValueError("Setup model must have a data_library attribute")
             
         # Get the dataframe for this trace using the metadata
-        trace_data_df = setup_model.data_library.dataframe_manager.get_dataframe_by_metadata(trace_model.datafile)
+        source_df = setup_model.data_library.dataframe_manager.get_dataframe_by_metadata(trace_model.datafile)
         
-        if trace_data_df is None:
+        if source_df is None:
             raise ValueError(f"Failed to load data for trace: {trace_model.trace_name}")
             
-        # Make a copy to avoid modifying the original
-        trace_data_df = trace_data_df.copy()
-        
-        # Apply filters if enabled
-        if trace_model.filters_on:
-            trace_data_df = self._apply_filters(trace_data_df, trace_model)
+        # Build the working set: only the columns this trace reads, and only the
+        # rows that pass the filters, gathered from the cached frame in one step
+        working_columns = self._get_working_columns(
+            setup_model, trace_model, top_columns, left_columns, right_columns
+        )
+        mask = None
+        if trace_model.filters_on and trace_model.filters:
+            mask = self._build_filter_mask(source_df, trace_model)
+        trace_data = TraceArrays.from_dataframe(source_df, working_columns, mask)
         
-        # Apply scaling with apex-specific factors and create normalized data
-        trace_data_df = self._apply_apex_specific_scaling(
-            trace_data_df,
+        # Scale, convert to molar (if enabled) and sum each apex in one projection
+        projection = self._get_projection(
+            setup_model,
+            trace_model,
             top_columns,
             left_columns,
             right_columns,
-            scaling_maps,
-            unique_str
+            scaling_maps
         )
-        
-        # Apply molar conversion if enabled
-        if trace_model.convert_from_wt_to_molar:
-            trace_data_df = self._perform_molar_conversion(
-                trace_data_df,
-                setup_model,
-                top_columns,
-                left_columns,
-                right_columns,
-                unique_str
-            )
-        else:
-            # Sum the scaled columns for each apex
-            for apex_name, apex_cols_list in zip(
-                ['top', 'left', 'right'], 
-                [top_columns, left_columns, right_columns]
-            ):
-                # Use the scaled column names
-                scaled_cols = [
-                    self.SCALED_COLUMN_PATTERN.format(col=col, apex=apex_name, us=unique_str)
-                    for col in apex_cols_list
-                ]
-                
-                trace_data_df[self.APEX_PATTERN.format(apex=apex_name, us=unique_str)] = \
-                    trace_data_df[scaled_cols].sum(axis=1)
+        trace_data.computed.update(projection.project_arrays(trace_data))
         
         # First, check for custom colorscale, then fallback to heatmap
         if getattr(trace_model, "custom_colorscale_on", False):
-            marker, trace_data_df = self._apply_custom_colorscale(
+            marker, trace_data = self._apply_custom_colorscale(
                 marker,
-                trace_data_df,
-                trace_model,
-                unique_str
+                trace_data,
+                trace_model
             )
         elif trace_model.heatmap_on and trace_model.sizemap_on:
-            # Existing code for integrated sort
-            marker, trace_data_df = self._integrated_sort(
+            # Sort considering both heatmap and sizemap columns
+            marker, trace_data = self._integrated_sort(
                 marker,
-                trace_data_df,
-                trace_model,
-                unique_str
+                trace_data,
+                trace_model
             )
-        # # Configure markers based on heatmap and sizemap settings
-        # if trace_model.heatmap_on and trace_model.sizemap_on:
-        #     # Sort considering both heatmap and sizemap columns
-        #     marker, trace_data_df = self._integrated_sort(
-        #         marker,
-        #         trace_data_df,
-        #         trace_model,
-        #         unique_str
-        #     )
         else:
             if trace_model.heatmap_on:
-                marker, trace_data_df = self._update_marker_with_heatmap(
+                marker, trace_data = self._update_marker_with_heatmap(
                     marker,
                     trace_model,
-                    trace_data_df,
-                    unique_str
+                    trace_data
                 )
             
             if trace_model.sizemap_on:
-                marker, trace_data_df = self._update_marker_with_sizemap(
+                marker, trace_data = self._update_marker_with_sizemap(
                     marker,
                     trace_model,
-                    trace_data_df,
-                    unique_str
+                    trace_data
                 )
 
         if not trace_model.sizemap_on:
@@ -1483,8 +1453,44 @@ class TernaryTraceMaker:
                 )
             )
         
-        return marker, trace_data_df
+        return marker, trace_data
     
+    def _get_working_columns(self, setup_model, trace_model, top_columns: List[str],
+                             left_columns: List[str], right_columns: List[str]) -> List[str]:
+        """
+        Lists the source columns a trace reads while being built.
+
+        Args:
+            setup_model: The SetupMenuModel containing global settings
+            trace_model: The TraceEditorModel containing trace settings
+            top_columns: List of columns for the top apex
+            left_columns: List of columns for the left apex
+            right_columns: List of columns for the right apex
+
+        Returns:
+            Ordered list of unique column names
+        """
+        columns = list(top_columns) + list(left_columns) + list(right_columns)
+
+        if trace_model.heatmap_on:
+            columns.append(trace_model.heatmap_column)
+        if trace_model.sizemap_on:
+            columns.append(trace_model.sizemap_column)
+        if getattr(trace_model, 'split_by_category_on', False):
+            columns.append(trace_model.split_category_column)
+
+        # Hover columns (user selected, or the filter columns shown by default)
+        hover_data = getattr(getattr(setup_model, 'axis_members', None), 'hover_data', None)
+        if hover_data:
+            columns.extend(hover_data)
+        elif trace_model.filters_on:
+            columns.extend(
+                filter_obj.filter_column for filter_obj in trace_model.filters
+                if hasattr(filter_obj, 'filter_column')
+            )
+
+        return list(dict.fromkeys(columns))
+
     def _apply_filters(self, data_df: pd.DataFrame, trace_model) -> pd.DataFrame:
         """
         Applies filters to the dataframe.
@@ -1500,8 +1506,26 @@ class TernaryTraceMaker:
         if not trace_model.filters_on or not trace_model.filters:
             return data_df
         
-        # Make a copy to avoid modifying the original
-        filtered_df = data_df.copy()
+        return data_df[self._build_filter_mask(data_df, trace_model)].copy()
+
+    def _build_filter_mask(self, data_df: pd.DataFrame, trace_model) -> np.ndarray:
+        """
+        Builds a single boolean row mask combining all of the trace's filters.
+
+        Only the filter columns are read, so no part of the dataframe is copied.
+        A filter that would leave zero rows is skipped with a warning.
+
+        Args:
+            data_df: The dataframe to filter
+            trace_model: The TraceEditorModel containing filter settings
+
+        Returns:
+            Boolean NumPy array with one entry per row of data_df
+        """
+        mask = np.ones(len(data_df), dtype=bool)
+
+        if not trace_model.filters_on or not trace_model.filters:
+            return mask
         
         # Track filters with issues for reporting
         filter_issues = []
@@ -1517,12 +1541,12 @@ class TernaryTraceMaker:
             operation = filter_obj.filter_operation
             
             # Skip if column not in dataframe
-            if column not in filtered_df.columns:
+            if column not in data_df.columns:
                 filter_issues.append(f"Column '{column}' not found for filter '{filter_obj.filter_name}'")
                 continue
             
             # Get column data type
-            column_dtype = filtered_df[column].dtype
+            column_dtype = data_df[column].dtype
             is_numeric = pd.api.types.is_numeric_dtype(column_dtype)
             
             # Prepare filter parameters
@@ -1581,14 +1605,14 @@ class TernaryTraceMaker:
                 else:
                     raise ValueError(f"Unsupported filter operation: '{operation}'")
                 
-                # Apply the filter using appropriate strategy
+                # Combine the filter's mask using the appropriate strategy
                 filter_strategy = self.operation_strategies.get(operation)
                 if filter_strategy:
                     try:
-                        # Apply filter and handle empty result case
-                        result_df = filter_strategy.filter(filtered_df, filter_params)
-                        if len(result_df) > 0:
-                            filtered_df = result_df
+                        # Combine masks and handle empty result case
+                        combined = mask & np.asarray(filter_strategy.mask(data_df, filter_params), dtype=bool)
+                        if combined.any():
+                            mask = combined
                         else:
                             print(f"Warning: Filter '{filter_obj.filter_name}' resulted in zero rows")
                     except Exception as e:
@@ -1605,358 +1629,196 @@ class TernaryTraceMaker:
             for issue in filter_issues:
                 print(f"  - {issue}")
         
-        return filtered_df
+        return mask
     
-    def _apply_apex_specific_scaling(self, df, top_columns, left_columns, right_columns, 
-                                    scaling_maps, unique_str) -> pd.DataFrame:
+    def _get_projection(self, setup_model, trace_model, top_columns: List[str],
+                        left_columns: List[str], right_columns: List[str],
+                        scaling_maps: Dict[str, Dict[str, float]]) -> AxisProjection:
         """
-        Applies apex-specific scaling to columns and creates scaled columns.
+        Builds the projection from data columns to apex values.
+
+        With molar conversion on, each column is weighted by 1/molar mass, using its
+        chemical formula (or the column name if no formulas are set). Columns whose
+        molar mass can't be calculated contribute nothing to their apex.
         
         Args:
-            df: The dataframe to scale
+            setup_model: The SetupMenuModel
+            trace_model: The TraceEditorModel
             top_columns: List of columns for the top apex
             left_columns: List of columns for the left apex
             right_columns: List of columns for the right apex
             scaling_maps: Dictionary mapping apex names to column scaling dictionaries
-            unique_str: Unique string for column naming
             
         Returns:
-            The dataframe with added scaled columns
-        """
-        # Process each apex
-        for apex_name, apex_cols_list in zip(
-            ['top', 'left', 'right'], 
-            [top_columns, left_columns, right_columns]
-        ):
-            # Get scaling map for this apex
-            apex_scale_map = scaling_maps.get(apex_name, {})
-            
-            # Create scaled columns for each apex column
-            for col in apex_cols_list:
-                # Get the scale factor (default to 1.0)
-                scale_factor = apex_scale_map.get(col, 1.0)
-                
-                # Create a scaled column
-                scaled_col_name = self.SCALED_COLUMN_PATTERN.format(col=col, apex=apex_name, us=unique_str)
-                df[scaled_col_name] = df[col] * scale_factor
+            The AxisProjection for the 'top', 'left' and 'right' apices
+        """
+        axis_columns = {'top': top_columns, 'left': left_columns, 'right': right_columns}
         
-        return df
+        molar_factors = None
+        if trace_model.convert_from_wt_to_molar:
+            apex_columns = top_columns + left_columns + right_columns
+            formula_map = get_formula_map(
+                setup_model, ['top_axis', 'left_axis', 'right_axis'], apex_columns
+            )
+            # Default to using column names as formulas if no mapping is provided
+            molar_factors = get_molar_factors(
+                apex_columns, formula_map or {c: c for c in apex_columns}, self.calculator
+            )
+
+        return AxisProjection(axis_columns, scaling_maps, molar_factors)
     
-    def _perform_molar_conversion(self, df: pd.DataFrame, setup_model, 
-                                 top_columns: List[str], left_columns: List[str], 
-                                 right_columns: List[str], unique_str: str) -> pd.DataFrame:
+    def _heatmap_values(self, trace_data: TraceArrays, trace_model) -> np.ndarray:
+        """Returns the (optionally log-transformed) heatmap color values."""
+        values = trace_data.numeric(trace_model.heatmap_column)
+        if getattr(trace_model, 'heatmap_log_transform', False):
+            values = log_transform(values)
+        return values
+
+    def _sizemap_values(self, trace_data: TraceArrays, trace_model) -> Tuple[np.ndarray, float]:
         """
-        Performs molar conversion on the dataframe using scaled column values.
+        Returns the marker sizes for the sizemap column and the matching sizeref.
         
-        Args:
-            df: The dataframe to convert
-            setup_model: The SetupMenuModel
-            top_columns: List of columns for the top apex
-            left_columns: List of columns for the left apex
-            right_columns: List of columns for the right apex
-            unique_str: Unique string for column naming
-            
-        Returns:
-            The converted dataframe
+        Values are (optionally log-transformed and) normalized onto the
+        [sizemap_min, sizemap_max] range; missing values get size 0.
         """
-        # Create molar converter with the scaled columns
-        molar_converter = MolarConverter(
-            df,
-            top_columns,
-            left_columns,
-            right_columns,
-            self.APEX_PATTERN,
-            self.SCALED_COLUMN_PATTERN,
-            unique_str,
-            self.calculator
-        )
-        
-        # Get formula mappings from setup model if available
-        formula_map = None
-        if hasattr(setup_model, 'chemical_formulas') and hasattr(setup_model.chemical_formulas, 'formulas'):
-            formula_map = {}
-            for axis_name, axis_cols in zip(
-                ['top_axis', 'left_axis', 'right_axis'],
-                [top_columns, left_columns, right_columns]
-            ):
-                if axis_name in setup_model.chemical_formulas.formulas:
-                    for col, formula in setup_model.chemical_formulas.formulas[axis_name].items():
-                        if col in top_columns + left_columns + right_columns:
-                            formula_map[col] = formula
-        
-        if formula_map:
-            return molar_converter.molar_conversion(formula_map)
-        else:
-            # Default conversion if no mapping is provided
-            return molar_converter.molar_conversion()
-    
-    def _update_marker_with_heatmap(self, marker: dict, trace_model, 
-                              data_df: pd.DataFrame, unique_str: str) -> Tuple[dict, pd.DataFrame]:
+        values = trace_data.numeric(trace_model.sizemap_column)
+        if getattr(trace_model, 'sizemap_log_transform', False):
+            values = log_transform(values)
+        return normalize_sizes(values, float(trace_model.sizemap_min), float(trace_model.sizemap_max))
+
+    def _update_marker_with_heatmap(self, marker: dict, trace_model,
+                              trace_data: TraceArrays) -> Tuple[dict, TraceArrays]:
         """
         Updates the marker dictionary with heatmap configuration.
-        
+
         Args:
             marker: The marker dictionary to update
             trace_model: The TraceEditorModel containing heatmap settings
-            data_df: The dataframe containing the data
-            unique_str: Unique string for column naming
-            
+            trace_data: The trace arrays
+
         Returns:
-            tuple: (updated marker, updated dataframe)
+            tuple: (updated marker, reordered trace arrays)
         """
-        # Original implementation remains the same...
-        color_column = trace_model.heatmap_column
-        heatmap_sorted_col = self.HEATMAP_PATTERN.format(col=color_column, us=unique_str)
-        
-        # Copy the column
-        data_df[heatmap_sorted_col] = data_df[color_column].copy()
-        
-        # Apply log transform if enabled
-        if trace_model.heatmap_log_transform:
-            data_df[heatmap_sorted_col] = data_df[color_column].apply(lambda x: np.log(x) if x > 0 else 0)
-        
+        trace_data.computed['heatmap'] = self._heatmap_values(trace_data, trace_model)
+
         # Apply sorting
-        if trace_model.heatmap_sort_mode == 'high on top':
-            data_df = data_df.sort_values(
-                by=heatmap_sorted_col,
-                ascending=True
-            )
-        elif trace_model.heatmap_sort_mode == 'low on top':
-            data_df = data_df.sort_values(
-                by=heatmap_sorted_col,
-                ascending=False
-            )
-        elif trace_model.heatmap_sort_mode == 'shuffled':
-            data_df = data_df.sample(frac=1)
-        
-        # Configure marker properties
-        colorscale = trace_model.heatmap_colorscale
-        if trace_model.heatmap_reverse_colorscale:
-            colorscale += '_r'
-        
-        # Set color values from dataframe - this doesn't need conversion as it's numeric data
-        marker['color'] = data_df[heatmap_sorted_col]
-        marker['colorscale'] = colorscale
-        
-        # Configure colorbar
-        marker['colorbar'] = dict(
-            title=dict(
-                text=color_column,
-                side=trace_model.heatmap_title_position if hasattr(trace_model, 'heatmap_title_position') else 'right',
-                font=dict(
-                    size=float(trace_model.heatmap_title_font_size) if hasattr(trace_model, 'heatmap_title_font_size') else 12,
-                    family=trace_model.heatmap_font if hasattr(trace_model, 'heatmap_font') else 'Arial'
-                )
-            ),
-            len=float(trace_model.heatmap_colorbar_len),
-            thickness=float(trace_model.heatmap_colorbar_thickness),
-            x=float(trace_model.heatmap_colorbar_x),
-            y=float(trace_model.heatmap_colorbar_y),
-            tickfont=dict(
-                size=float(trace_model.heatmap_tick_font_size) if hasattr(trace_model, 'heatmap_tick_font_size') else 10,
-                family=trace_model.heatmap_font if hasattr(trace_model, 'heatmap_font') else 'Arial'
-            ),
-            orientation='h' if trace_model.heatmap_bar_orientation == 'horizontal' else 'v'
-        )
-        
-        # Set min and max values
-        marker['cmin'] = float(trace_model.heatmap_min)
-        marker['cmax'] = float(trace_model.heatmap_max)
+        order = sort_order(trace_data.computed['heatmap'], trace_model.heatmap_sort_mode)
+        if order is not None:
+            trace_data = trace_data.take(order)
+
+        # Color values are numeric and mapped through the colorscale by plotly
+        marker['color'] = trace_data.computed['heatmap']
+        marker.update(heatmap_marker(trace_model))
         
-        return marker, data_df
+        return marker, trace_data
     
     def _update_marker_with_sizemap(self, marker: dict, trace_model, 
-                                   data_df: pd.DataFrame, unique_str: str) -> Tuple[dict, pd.DataFrame]:
+                                   trace_data: TraceArrays) -> Tuple[dict, TraceArrays]:
         """
         Updates the marker dictionary with sizemap configuration.
         
         Args:
             marker: The marker dictionary to update
             trace_model: The TraceEditorModel containing sizemap settings
-            data_df: The dataframe containing the data
-            unique_str: Unique string for column naming
+            trace_data: The trace arrays
             
         Returns:
-            tuple: (updated marker, updated dataframe)
+            tuple: (updated marker, reordered trace arrays)
         """
-        size_column = trace_model.sizemap_column
-        size_column_sorted = self.SIZEMAP_PATTERN.format(col=size_column, us=unique_str)
-        
-        # Extract min and max sizes
-        min_size = float(trace_model.sizemap_min)
-        max_size = float(trace_model.sizemap_max)
-        
-        # Copy the column
-        data_df[size_column_sorted] = data_df[size_column].copy()
-        
-        # Apply log transform if available
-        if hasattr(trace_model, 'sizemap_log_transform') and trace_model.sizemap_log_transform:
-            data_df[size_column_sorted] = data_df[size_column_sorted].apply(lambda x: np.log(x) if x > 0 else 0)
-        
-        # Normalize the size column
-        size_range = max_size - min_size
-        size_normalized = ((data_df[size_column_sorted] - data_df[size_column_sorted].min()) /
-                         (data_df[size_column_sorted].max() - data_df[size_column_sorted].min())) * size_range + min_size
-        sizeref = 2. * max(size_normalized) / (max_size**2)
-        data_df[size_column_sorted] = size_normalized
-        data_df[size_column_sorted].fillna(0.0, inplace=True)
+        trace_data.computed['sizemap'], sizeref = self._sizemap_values(trace_data, trace_model)
         
         # Apply sorting
-        if trace_model.sizemap_sort_mode == 'high on top':
-            data_df = data_df.sort_values(
-                by=size_column_sorted,
-                ascending=True
-            )
-        elif trace_model.sizemap_sort_mode == 'low on top':
-            data_df = data_df.sort_values(
-                by=size_column_sorted,
-                ascending=False
-            )
-        elif trace_model.sizemap_sort_mode == 'shuffled':
-            data_df = data_df.sample(frac=1)
+        order = sort_order(trace_data.computed['sizemap'], trace_model.sizemap_sort_mode)
+        if order is not None:
+            trace_data = trace_data.take(order)
         
         # Update marker properties
-        marker['size'] = data_df[size_column_sorted]
-        marker['sizemin'] = min_size
+        marker['size'] = trace_data.computed['sizemap']
+        marker['sizemin'] = float(trace_model.sizemap_min)
         marker['sizeref'] = sizeref
         
-        return marker, data_df
+        return marker, trace_data
     
-    def _integrated_sort(self, marker: dict, data_df: pd.DataFrame, 
-                    trace_model, unique_str: str) -> Tuple[dict, pd.DataFrame]:
+    def _integrated_sort(self, marker: dict, trace_data: TraceArrays,
+                    trace_model) -> Tuple[dict, TraceArrays]:
         """
         Performs integrated sorting considering both heatmap and sizemap.
         
         Args:
             marker: The marker dictionary to update
-            data_df: The dataframe to sort
+            trace_data: The trace arrays to sort
             trace_model: The TraceEditorModel containing sort settings
-            unique_str: Unique string for column naming
             
         Returns:
-            tuple: (updated marker, sorted dataframe)
-        """
-        # Original implementation remains mostly the same...
-        heatmap_column = trace_model.heatmap_column
-        sizemap_column = trace_model.sizemap_column
-        
-        heatmap_sorted_col = self.HEATMAP_PATTERN.format(col=heatmap_column, us=unique_str)
-        sizemap_sorted_col = self.SIZEMAP_PATTERN.format(col=sizemap_column, us=unique_str)
-        
-        # Process heatmap column
-        data_df[heatmap_sorted_col] = data_df[heatmap_column].copy()
-        if trace_model.heatmap_log_transform:
-            data_df[heatmap_sorted_col] = data_df[heatmap_column].apply(lambda x: np.log(x) if x > 0 else 0)
-        
-        # Process sizemap column
-        data_df[sizemap_sorted_col] = data_df[sizemap_column].copy()
-        if hasattr(trace_model, 'sizemap_log_transform') and trace_model.sizemap_log_transform:
-            data_df[sizemap_sorted_col] = data_df[sizemap_column].apply(lambda x: np.log(x) if x > 0 else 0)
-        
-        # Normalize sizemap values
-        min_size = float(trace_model.sizemap_min)
-        max_size = float(trace_model.sizemap_max)
-        size_range = max_size - min_size
-        
-        size_normalized = ((data_df[sizemap_sorted_col] - data_df[sizemap_sorted_col].min()) /
-                        (data_df[sizemap_sorted_col].max() - data_df[sizemap_sorted_col].min())) * size_range + min_size
-        data_df[sizemap_sorted_col] = size_normalized
-        data_df[sizemap_sorted_col].fillna(0.0, inplace=True)
-        
-        # Handle heatmap sort mode
-        if trace_model.heatmap_sort_mode == 'high on top':
-            data_df = data_df.sort_values(
-                by=heatmap_sorted_col,
-                ascending=True
-            )
-        elif trace_model.heatmap_sort_mode == 'low on top':
-            data_df = data_df.sort_values(
-                by=heatmap_sorted_col,
-                ascending=False
-            )
-        elif trace_model.heatmap_sort_mode == 'shuffled':
-            data_df = data_df.sample(frac=1)
-        
-        # Handle sizemap sort mode
-        if trace_model.sizemap_sort_mode == 'high on top':
-            data_df = data_df.sort_values(
-                by=sizemap_sorted_col,
-                ascending=True
-            )
-        elif trace_model.sizemap_sort_mode == 'low on top':
-            data_df = data_df.sort_values(
-                by=sizemap_sorted_col,
-                ascending=False
-            )
-        elif trace_model.sizemap_sort_mode == 'shuffled':
-            data_df = data_df.sample(frac=1)
-        
-        # Update marker properties
-        sizeref = 2. * max(size_normalized) / (max_size**2)
+            tuple: (updated marker, sorted trace arrays)
+        """
+        trace_data.computed['heatmap'] = self._heatmap_values(trace_data, trace_model)
+        trace_data.computed['sizemap'], sizeref = self._sizemap_values(trace_data, trace_model)
         
-        marker['size'] = data_df[sizemap_sorted_col]
-        marker['sizemin'] = min_size
-        marker['sizeref'] = sizeref
-        marker['color'] = data_df[heatmap_sorted_col]
-        marker['colorscale'] = trace_model.heatmap_colorscale
-        
-        if trace_model.heatmap_reverse_colorscale:
-            marker['colorscale'] += '_r'
-        
-        # Configure colorbar
-        marker['colorbar'] = dict(
-            title=dict(
-                text=heatmap_column,
-                side=trace_model.heatmap_title_position if hasattr(trace_model, 'heatmap_title_position') else 'right',
-                font=dict(
-                    size=float(trace_model.heatmap_title_font_size) if hasattr(trace_model, 'heatmap_title_font_size') else 12,
-                    family=trace_model.heatmap_font if hasattr(trace_model, 'heatmap_font') else 'Arial'
-                )
-            ),
-            len=float(trace_model.heatmap_colorbar_len),
-            thickness=float(trace_model.heatmap_colorbar_thickness),
-            x=float(trace_model.heatmap_colorbar_x),
-            y=float(trace_model.heatmap_colorbar_y),
-            tickfont=dict(
-                size=float(trace_model.heatmap_tick_font_size) if hasattr(trace_model, 'heatmap_tick_font_size') else 10,
-                family=trace_model.heatmap_font if hasattr(trace_model, 'heatmap_font') else 'Arial'
-            ),
-            orientation='h' if trace_model.heatmap_bar_orientation == 'horizontal' else 'v'
+        # One draw order for both modes: sizemap first, ties broken by heatmap
+        order = z_order(
+            (trace_data.computed['heatmap'], trace_model.heatmap_sort_mode),
+            (trace_data.computed['sizemap'], trace_model.sizemap_sort_mode)
         )
+        if order is not None:
+            trace_data = trace_data.take(order)
         
-        marker['cmin'] = float(trace_model.heatmap_min)
-        marker['cmax'] = float(trace_model.heatmap_max)
+        # Update marker properties
+        marker['size'] = trace_data.computed['sizemap']
+        marker['sizemin'] = float(trace_model.sizemap_min)
+        marker['sizeref'] = sizeref
+        marker['color'] = trace_data.computed['heatmap']
+        marker.update(heatmap_marker(trace_model))
         
-        return marker, data_df
+        return marker, trace_data
     
-    def _get_hover_data_and_template(
+    def _get_hover(
             self, 
             setup_model: "SetupMenuModel", 
             trace_model: "TraceEditorModel", 
-            data_df: pd.DataFrame, 
+            data_df: TraceArrays,
             top_columns: List[str], 
             left_columns: List[str], 
             right_columns: List[str],
+            scaling_maps: Dict[str, Dict[str, float]],
+            hover_key: Optional[str] = None
+        ) -> Tuple[np.ndarray, dict]:
+        """
+        Builds the hover for a trace, embedded or served on demand depending on the setup.
+
+        Args:
+            hover_key: Hover store key for on-demand hover (see trace_store_key)
+
+        Returns:
+            tuple: (customdata array, hover keyword arguments for the plotly trace)
+        """
+        args = (setup_model, trace_model, data_df, top_columns, left_columns, right_columns, scaling_maps)
+        if lazy_hover_enabled(setup_model):
+            customdata, key = self._get_lazy_hover_data(*args, key=hover_key)
+            # 'none' still fires hover events, which the page uses to fetch the details
+            return customdata, dict(hoverinfo='none', meta=key)
+        customdata, hovertemplate = self._get_hover_data_and_template(*args)
+        return customdata, dict(hovertemplate=hovertemplate)
+
+    def _get_hover_columns_and_labels(
+            self,
+            setup_model: "SetupMenuModel",
+            trace_model: "TraceEditorModel",
+            apex_columns: List[str],
             scaling_maps: Dict[str, Dict[str, float]]
-        ) -> Tuple[np.ndarray, str]:
+        ) -> Tuple[List[str], List[str]]:
         """
-        Generates custom data for hover tooltips and an HTML template for the hover data.
+        Determines which columns the hover shows and their (scale-annotated) labels.
         
         Args:
             setup_model: The SetupMenuModel
             trace_model: The TraceEditorModel
-            data_df: The dataframe containing the data
-            top_columns: List of columns for the top apex
-            left_columns: List of columns for the left apex
-            right_columns: List of columns for the right apex
+            apex_columns: All columns summed on the plot axes
             scaling_maps: Dictionary mapping apex names to column scaling dictionaries
             
         Returns:
-            tuple: (customdata array, hovertemplate string)
+            tuple: (hover column names, hover labels)
         """
-        # Collect all apex columns
-        apex_columns = top_columns + left_columns + right_columns
-        
         # Create a merged scaling map for hover display
         merged_scale_map = {}
         for apex, col_map in scaling_maps.items():
@@ -1970,7 +1832,7 @@ class TernaryTraceMaker:
             hover_cols = setup_model.axis_members.hover_data
         else:
             # Default to apex columns and heatmap/sizemap columns
-            hover_cols = apex_columns.copy()
+            hover_cols = list(apex_columns)
             
             if trace_model.heatmap_on and trace_model.heatmap_column not in hover_cols:
                 hover_cols.append(trace_model.heatmap_column)
@@ -1983,10 +1845,45 @@ class TernaryTraceMaker:
                     if hasattr(filter_obj, 'filter_column') and filter_obj.filter_column not in hover_cols:
                         hover_cols.append(filter_obj.filter_column)
         
+        labels = [
+            f"{f'{format_scale_factor(merged_scale_map.get(header, 1.0))}×' if header in merged_scale_map and merged_scale_map.get(header, 1.0) != 1 else ''}{header}"
+            for header in hover_cols
+        ]
+        return hover_cols, labels
+
+    def _get_hover_data_and_template(
+            self,
+            setup_model: "SetupMenuModel",
+            trace_model: "TraceEditorModel",
+            data_df: TraceArrays,
+            top_columns: List[str],
+            left_columns: List[str],
+            right_columns: List[str],
+            scaling_maps: Dict[str, Dict[str, float]]
+        ) -> Tuple[np.ndarray, str]:
+        """
+        Generates custom data for hover tooltips and an HTML template for the hover data.
+
+        Args:
+            setup_model: The SetupMenuModel
+            trace_model: The TraceEditorModel
+            data_df: The trace arrays containing the data
+            top_columns: List of columns for the top apex
+            left_columns: List of columns for the left apex
+            right_columns: List of columns for the right apex
+            scaling_maps: Dictionary mapping apex names to column scaling dictionaries
+
+        Returns:
+            tuple: (customdata array, hovertemplate string)
+        """
+        hover_cols, labels = self._get_hover_columns_and_labels(
+            setup_model, trace_model, top_columns + left_columns + right_columns, scaling_maps
+        )
+
         # Construct the hover template
         hovertemplate = "".join(
-            f"<br><b>{f'{format_scale_factor(merged_scale_map.get(header, 1.0))}×' if header in merged_scale_map and merged_scale_map.get(header, 1.0) != 1 else ''}{header}:</b> %{{customdata[{i}]}}"
-            for i, header in enumerate(hover_cols)
+            f"<br><b>{label}:</b> %{{customdata[{i}]}}"
+            for i, label in enumerate(labels)
         )
         
         # Construct customdata with rounded values
@@ -1994,10 +1891,10 @@ class TernaryTraceMaker:
         for header in hover_cols:
             try:
                 # Try to round numeric values
-                rounded_values = np.round(data_df[header].values.astype(float), 4)
+                rounded_values = np.round(np.asarray(data_df[header]).astype(float), 4)
             except (ValueError, TypeError):
                 # Use raw values for non-numeric columns
-                rounded_values = data_df[header].values
+                rounded_values = np.asarray(data_df[header])
             customdata.append(rounded_values)
         
         # Transpose to match shape expected by Plotly
@@ -2012,6 +1909,47 @@ class TernaryTraceMaker:
         
         return customdata, hovertemplate
     
+    def _get_lazy_hover_data(
+            self,
+            setup_model: "SetupMenuModel",
+            trace_model: "TraceEditorModel",
+            data_df: TraceArrays,
+            top_columns: List[str],
+            left_columns: List[str],
+            right_columns: List[str],
+            scaling_maps: Dict[str, Dict[str, float]],
+            key: Optional[str] = None
+        ) -> Tuple[np.ndarray, str]:
+        """
+        Registers the hover columns in the hover store instead of embedding them.
+
+        The page only carries each point's row index; the hover HTML is fetched
+        from the store over QWebChannel when a point is hovered.
+
+        Args:
+            setup_model: The SetupMenuModel
+            trace_model: The TraceEditorModel
+            data_df: The trace arrays containing the data
+            top_columns: List of columns for the top apex
+            left_columns: List of columns for the left apex
+            right_columns: List of columns for the right apex
+            scaling_maps: Dictionary mapping apex names to column scaling dictionaries
+            key: Hover store key (see trace_store_key); random by default
+
+        Returns:
+            tuple: (customdata array of row indices, hover store key)
+        """
+        hover_cols, labels = self._get_hover_columns_and_labels(
+            setup_model, trace_model, top_columns + left_columns + right_columns, scaling_maps
+        )
+
+        key = HOVER_STORE.register(labels, [data_df[header] for header in hover_cols], key)
+
+        # Only the row indices (for selection) go into the page
+        customdata = data_df.index.to_numpy().reshape(-1, 1)
+
+        return customdata, key
+
     def _get_basic_marker_dict(self, trace_model) -> dict:
         """
         Returns a dictionary with basic marker properties.
@@ -2079,109 +2017,3 @@ class TernaryTraceMaker:
         else:
             # If the format is not recognized, return the original color
             return f"#{hex_color}"
-    
-    def _generate_unique_str(self) -> str:
-        """
-        Generates a unique string to use in column names.
-        
-        Returns:
-            A unique string based on current time
-        """
-        return str(hash(time.time()))
-
-
-class MolarConverter:
-    """
-    Handles conversion from weight percentages to molar proportions for ternary plots.
-    """
-    
-    MOLAR_PATTERN = '__{col}_molar_{us}'
-    
-    def __init__(self, 
-                trace_data_df: pd.DataFrame,
-                top_columns: List[str], 
-                left_columns: List[str], 
-                right_columns: List[str],
-                apex_pattern: str,
-                scaled_column_pattern: str,
-                unique_str: str,
-                calculator):
-        """
-        Initialize the molar converter.
-        
-        Args:
-            trace_data_df: The dataframe to convert
-            top_columns: List of columns for the top apex
-            left_columns: List of columns for the left apex
-            right_columns: List of columns for the right apex
-            apex_pattern: Pattern to use for apex column names
-            scaled_column_pattern: Pattern for scaled column names
-            unique_str: Unique string for column naming
-            calculator: MolarMassCalculator instance
-        """
-        self.trace_data_df = trace_data_df
-        self.top_columns = top_columns
-        self.left_columns = left_columns
-        self.right_columns = right_columns
-        self.apex_pattern = apex_pattern
-        self.scaled_column_pattern = scaled_column_pattern
-        self.unique_str = unique_str
-        self.calculator = calculator
-    
-    def molar_conversion(self, formula_map=None) -> pd.DataFrame:
-        """
-        Performs molar conversion on the dataframe using scaled columns.
-        
-        Args:
-            formula_map: Optional dictionary mapping column names to chemical formulas
-            
-        Returns:
-            The converted dataframe
-        """
-        apex_columns = self.top_columns + self.left_columns + self.right_columns
-        
-        # Use provided formula map or default to using column names as formulas
-        molar_mapping = formula_map or {c: c for c in apex_columns}
-        
-        # Process each apex
-        for apex_name, apex_cols_list in zip(
-            ['top', 'left', 'right'], 
-            [self.top_columns, self.left_columns, self.right_columns]
-        ):
-            # Create a list to store molar columns
-            molar_columns = []
-            
-            # Process each column in this apex
-            for col in apex_cols_list:
-                if col in molar_mapping:
-                    # Get the formula for this column
-                    formula = molar_mapping[col]
-                    
-                    # Get the scaled column name
-                    scaled_col_name = self.scaled_column_pattern.format(
-                        col=col, apex=apex_name, us=self.unique_str
-                    )
-                    
-                    # Calculate molar mass using the calculator
-                    try:
-                        molar_mass = self.calculator.get_molar_mass(formula)
-                        
-                        # Create molar proportion column
-                        molar_col_name = self.MOLAR_PATTERN.format(col=f"{col}_{apex_name}", us=self.unique_str)
-                        self.trace_data_df[molar_col_name] = self.trace_data_df[scaled_col_name] / molar_mass
-                        
-                        # Add to list of molar columns
-                        molar_columns.append(molar_col_name)
-                    except Exception as e:
-                        # Skip this column if there's an error calculating molar mass
-                        print(f"\t\tWARNING: Error calculating molar mass for {formula}: {e}")
-            
-            # Sum molar columns to get the apex value
-            if molar_columns:
-                self.trace_data_df[self.apex_pattern.format(apex=apex_name, us=self.unique_str)] = \
-                    self.trace_data_df[molar_columns].sum(axis=1)
-            else:
-                # If no molar columns, use 0
-                self.trace_data_df[self.apex_pattern.format(apex=apex_name, us=self.unique_str)] = 0
-        
-        return self.trace_data_df
@@ -0,0 +1,201 @@
+"""Draws a ternary figure on Cartesian WebGL axes for traces too large for SVG"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+import plotly.graph_objects as go
+
+from quick_ternaries.services.point_budget import webgl_threshold
+from quick_ternaries.services.viewport_lod import VIEWPORT_STORE, VIEWPORT_UID_PREFIX
+from quick_ternaries.utils.contour_utils import ternary_to_cartesian
+from quick_ternaries.utils.fast_figure import FastFigure, figure_properties
+
+# Height of the unit-side triangle
+TRIANGLE_HEIGHT = np.sqrt(3) / 2
+
+# Trace properties carried over from Scatterternary to Scatter/Scattergl unchanged
+_SHARED_TRACE_PROPERTIES = (
+    'name', 'legendgroup', 'showlegend', 'mode', 'marker', 'line', 'customdata',
+    'hovertemplate', 'hoverinfo', 'meta', 'opacity', 'visible', 'uid',
+    'text', 'fill', 'fillcolor',
+)
+
+
+def count_points(fig) -> int:
+    """Returns the number of ternary points across all traces of a figure (go.Figure or FastFigure)."""
+    return sum(len(trace['a']) for trace in figure_properties(fig)['data'] if trace.get('a') is not None)
+
+
+def barycentric_xy(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """
+    Projects ternary (top, left, right) values onto the unit triangle.
+
+    Like plotly's ternary, the top apex is at (0.5, sqrt(3)/2), the left apex
+    at (0, 0) and the right apex at (1, 0); values are normalized per point.
+
+    Returns:
+        (n, 2) array of x, y coordinates
+    """
+    # ternary_to_cartesian puts its third component at the top and its second on the right
+    return ternary_to_cartesian(b, c, a)
+
+
+def to_cartesian_trace(trace: dict, use_webgl: bool = True) -> dict:
+    """
+    Converts a Scatterternary trace dict into a Scattergl (markers) or Scatter (lines) trace dict.
+
+    Line-only traces such as density contours have few points, so they stay SVG;
+    that keeps dash styles, which WebGL lines do not fully support.
+    """
+    xy = barycentric_xy(*(np.asarray(trace.get(name), dtype=float) for name in ('a', 'b', 'c')))
+    uid = trace.get('uid')
+    if uid and uid.startswith(VIEWPORT_UID_PREFIX):
+        # Zoom updates must now send x/y instead of a/b/c
+        VIEWPORT_STORE.as_cartesian(uid)
+    properties = {prop: trace[prop] for prop in _SHARED_TRACE_PROPERTIES if trace.get(prop) is not None}
+    is_markers = 'markers' in (trace.get('mode') or 'markers')
+    trace_type = 'scattergl' if (use_webgl and is_markers) else 'scatter'
+    return dict(type=trace_type, x=xy[:, 0], y=xy[:, 1], **properties)
+
+
+def _edge_point(t_a: float, t_b: float, t_c: float) -> np.ndarray:
+    """Returns the x, y position of a single (a, b, c) point."""
+    return barycentric_xy(np.array([t_a]), np.array([t_b]), np.array([t_c]))[0]
+
+
+def _with_font(annotation: dict, font) -> dict:
+    """Adds an axis font to an annotation if it sets anything (unvalidated figures keep empty values)."""
+    font = font.to_plotly_json() if font else None
+    if font:
+        annotation['font'] = font
+    return annotation
+
+
+def _axis_shapes_and_annotations(ternary) -> Tuple[List[dict], List[dict]]:
+    """
+    Builds the triangle, gridlines, tick labels and axis titles of a ternary layout
+    as Cartesian layout shapes and annotations.
+    """
+    shapes = []
+    annotations = []
+
+    total = ternary.sum or 1
+    bgcolor = ternary.bgcolor or 'white'
+    corners = [_edge_point(1, 0, 0), _edge_point(0, 1, 0), _edge_point(0, 0, 1)]
+    outline = 'M {} {} L {} {} L {} {} Z'.format(*np.concatenate(corners))
+
+    # Filled triangle behind everything
+    shapes.append(dict(type='path', path=outline, fillcolor=bgcolor, line=dict(width=0), layer='below'))
+
+    # For each axis: which component is constant along its gridlines, the edge
+    # the tick labels sit on, and the direction the labels are pushed away from it
+    axes = (
+        ('aaxis', 0, (-1, 0), 'right'),
+        ('baxis', 1, (0, -1), 'center'),
+        ('caxis', 2, (1, 0), 'left'),
+    )
+    for axis_name, component, (dx, dy), xanchor in axes:
+        axis = ternary[axis_name]
+        step = axis.dtick
+        fraction_step = float(step) / total if step else 0.1
+        fractions = np.arange(fraction_step, 1.0, fraction_step) if fraction_step > 0 else []
+
+        for t in fractions:
+            # Gridline where this component equals t, between the two other edges
+            start = np.zeros(3)
+            end = np.zeros(3)
+            start[component] = end[component] = t
+            start[(component + 1) % 3] = 1 - t
+            end[(component + 2) % 3] = 1 - t
+            if axis.showgrid is not False:
+                (x0, y0), (x1, y1) = _edge_point(*start), _edge_point(*end)
+                shapes.append(dict(
+                    type='line', x0=x0, y0=y0, x1=x1, y1=y1, layer='below',
+                    line=dict(color=axis.gridcolor or '#888', width=1)
+                ))
+            if axis.showticklabels is not False:
+                x, y = _edge_point(*start)
+                annotations.append(_with_font(dict(
+                    x=x, y=y, xref='x', yref='y', showarrow=False,
+                    text=f"{t * total:g}", xanchor=xanchor,
+                    xshift=6 * dx, yshift=10 * dy,
+                ), axis.tickfont))
+
+    # Triangle outline on top of the grid
+    shapes.append(dict(
+        type='path', path=outline, layer='below',
+        line=dict(color=ternary.aaxis.linecolor or 'grey', width=ternary.aaxis.linewidth or 1)
+    ))
+
+    # Axis titles at the apices (top, bottom-left, bottom-right)
+    for axis_name, corner, yanchor, yshift in (
+        ('aaxis', corners[0], 'bottom', 8),
+        ('baxis', corners[1], 'top', -16),
+        ('caxis', corners[2], 'top', -16),
+    ):
+        title = ternary[axis_name].title
+        if title and title.text:
+            # The leading line break only spaces the title below a ternary axis
+            text = title.text[len('<br>'):] if title.text.startswith('<br>') else title.text
+            annotations.append(_with_font(dict(
+                x=corner[0], y=corner[1], xref='x', yref='y', showarrow=False,
+                text=text, yanchor=yanchor, yshift=yshift,
+            ), title.font))
+
+    return shapes, annotations
+
+
+def to_webgl_figure(fig):
+    """
+    Redraws a ternary figure on Cartesian axes with WebGL point traces.
+
+    The trace order is kept, so curve numbers (and the app's plotly trace
+    mapping and selection handling) are unchanged.
+
+    Args:
+        fig: A figure (go.Figure or FastFigure) of Scatterternary traces with a ternary layout
+
+    Returns:
+        A new figure of the same kind with Scattergl/Scatter traces and the
+        ternary axes drawn as layout shapes and annotations
+    """
+    figure = figure_properties(fig)
+    layout = dict(figure.get('layout', {}))
+    ternary = go.layout.Ternary(layout.pop('ternary', None))
+
+    shapes, annotations = _axis_shapes_and_annotations(ternary)
+    layout['shapes'] = shapes + list(layout.get('shapes', []))
+    layout['annotations'] = annotations + list(layout.get('annotations', []))
+
+    # Invisible axes with equal scaling, padded to leave room for labels
+    hidden_axis = dict(visible=False, showgrid=False, zeroline=False)
+    layout['xaxis'] = dict(hidden_axis, range=[-0.15, 1.15])
+    layout['yaxis'] = dict(hidden_axis, range=[-0.12, TRIANGLE_HEIGHT + 0.1], scaleanchor='x', scaleratio=1)
+    layout['plot_bgcolor'] = 'rgba(0,0,0,0)'
+    layout.setdefault('dragmode', 'lasso')
+
+    webgl_fig = FastFigure([to_cartesian_trace(trace) for trace in figure.get('data', [])], layout)
+    return webgl_fig if isinstance(fig, FastFigure) else webgl_fig.to_figure()
+
+
+def maybe_to_webgl_figure(fig, setup_model, threshold: Optional[int] = None):
+    """
+    Switches a ternary figure to WebGL rendering when it has more points than the threshold.
+
+    Args:
+        fig: The ternary figure
+        setup_model: The SetupMenuModel holding the threshold setting
+        threshold: Optional explicit threshold overriding the setting (0 = never)
+
+    Returns:
+        The WebGL figure, or the original figure if it is small enough
+    """
+    if threshold is None:
+        threshold = webgl_threshold(setup_model)
+    if threshold <= 0:
+        return fig
+    n_points = count_points(fig)
+    if n_points <= threshold:
+        return fig
+    print(f"Ternary figure has {n_points} points (> {threshold}), rendering with WebGL")
+    return to_webgl_figure(fig)
@@ -0,0 +1,98 @@
+"""Array container passed between the stages of the trace makers"""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class TraceArrays:
+    """
+    Named NumPy arrays for the rows of one trace, plus the source row index.
+
+    Source columns gathered from the datafile are read with ``data[column]``.
+    Values produced by the pipeline (apex sums, heatmap and sizemap values, ...)
+    are stored in the separate ``computed`` dictionary, so they never need
+    temporary column names and can never collide with user columns.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], index: Optional[pd.Index] = None):
+        """
+        Args:
+            columns: Mapping of source column names to 1-D arrays of equal length
+            index: Source row labels; defaults to a RangeIndex
+        """
+        self.columns = dict(columns)
+        if index is None:
+            n_rows = len(next(iter(self.columns.values()))) if self.columns else 0
+            index = pd.RangeIndex(n_rows)
+        self.index = index
+        self.computed: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_dataframe(
+            cls,
+            df: pd.DataFrame,
+            columns: Optional[Iterable[str]] = None,
+            mask: Optional[np.ndarray] = None) -> "TraceArrays":
+        """
+        Gathers columns (and optionally masked rows) of a dataframe.
+
+        Each column is read once; the dataframe itself is never copied or modified.
+
+        Args:
+            df: The source dataframe
+            columns: Columns to gather; missing columns are skipped. Defaults to all.
+            mask: Optional boolean row mask
+
+        Returns:
+            A new TraceArrays instance
+        """
+        if columns is None:
+            columns = df.columns
+        columns = [col for col in dict.fromkeys(columns) if col in df.columns]
+
+        if mask is None:
+            return cls({col: df[col].to_numpy(copy=True) for col in columns}, df.index)
+
+        rows = np.flatnonzero(mask)
+        return cls({col: df[col].to_numpy()[rows] for col in columns}, df.index[rows])
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.columns
+
+    def numeric(self, column: str) -> np.ndarray:
+        """Returns a source column as a float array."""
+        return np.asarray(self.columns[column], dtype=float)
+
+    def block(self, columns: Iterable[str]) -> np.ndarray:
+        """
+        Returns the given source columns stacked into an (n_rows, n_columns) float array.
+
+        The array is column-major (each column is one contiguous copy), which is
+        much cheaper to build than a row-major stack of many rows.
+        """
+        columns = list(columns)
+        stacked = np.empty((len(columns), len(self)))
+        for i, col in enumerate(columns):
+            stacked[i] = self.numeric(col)
+        return stacked.T
+
+    def take(self, positions: np.ndarray) -> "TraceArrays":
+        """
+        Returns a new container holding only the given row positions, in order.
+
+        Source columns, computed values and the index are all reordered together.
+        """
+        taken = TraceArrays(
+            {col: values[positions] for col, values in self.columns.items()},
+            self.index[positions]
+        )
+        taken.computed = {name: values[positions] for name, values in self.computed.items()}
+        return taken
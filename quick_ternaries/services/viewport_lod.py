@@ -0,0 +1,320 @@
+"""Viewport-dependent level of detail for large marker traces, served over QWebChannel"""
+
+import threading
+import uuid
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from quick_ternaries.services.hover_store import HOVER_STORE
+from quick_ternaries.services.marker_styling import SHUFFLE_SEED
+from quick_ternaries.utils.contour_utils import ternary_to_cartesian
+
+# Prefix of the plotly uid of level-of-detail traces, which the page looks for on zoom
+VIEWPORT_UID_PREFIX = 'viewport-'
+
+# Share of a sample reserved for the lowest and highest color values (each)
+EXTREME_FRACTION = 0.02
+
+# Cells per side of the grid used to spread a sample over the plot
+SAMPLE_GRID_SIZE = 64
+
+
+def collect_point_arrays(n_rows: int, marker: dict, customdata: Optional[np.ndarray], **coordinates) -> Dict[str, np.ndarray]:
+    """
+    Gathers a trace's per-point arrays by plotly property path.
+
+    Args:
+        n_rows: Number of points in the trace
+        marker: Marker dictionary; its per-point arrays become 'marker.<key>'
+        customdata: Per-point customdata, if any
+        **coordinates: Coordinate arrays by property name (x, y or a, b, c)
+
+    Returns:
+        Dictionary of property path -> array
+    """
+    arrays = dict(coordinates)
+    if customdata is not None:
+        arrays['customdata'] = customdata
+    for key, value in marker.items():
+        if isinstance(value, np.ndarray) and len(value) == n_rows:
+            arrays[f'marker.{key}'] = value
+    return arrays
+
+
+def _grid_cells(x: np.ndarray, y: np.ndarray, size: int, bounds: Tuple[float, float, float, float]) -> np.ndarray:
+    """Returns the flat cell ID of each point on a size x size grid over the bounds."""
+    x0, x1, y0, y1 = bounds
+    col = np.clip(((x - x0) / ((x1 - x0) or 1.0) * size).astype(np.intp), 0, size - 1)
+    row = np.clip(((y - y0) / ((y1 - y0) or 1.0) * size).astype(np.intp), 0, size - 1)
+    return row * size + col
+
+
+def representative_rows(
+        x: np.ndarray,
+        y: np.ndarray,
+        n_out: int,
+        values: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Picks at most ``n_out`` rows that cover the plot like the full set does.
+
+    Points are spread over a grid and every occupied cell keeps about the same
+    number of (randomly chosen) points at most, so sparse regions and outliers
+    are all kept while dense regions are thinned. The rows with the lowest and highest
+    color values are always kept too.
+
+    Args:
+        x: Plot x coordinates
+        y: Plot y coordinates
+        n_out: Maximum number of rows to keep
+        values: Optional numeric color values whose extremes must be kept
+
+    Returns:
+        Increasing row positions (so the draw order is unchanged)
+    """
+    n = len(x)
+    if n <= n_out:
+        return np.arange(n)
+
+    keep = []
+    if values is not None:
+        finite = np.flatnonzero(~np.isnan(values))
+        n_extreme = min(int(n_out * EXTREME_FRACTION), len(finite) // 2)
+        if n_extreme > 0:
+            finite_values = values[finite]
+            keep.append(finite[np.argpartition(finite_values, n_extreme)[:n_extreme]])
+            keep.append(finite[np.argpartition(-finite_values, n_extreme)[:n_extreme]])
+            n_out -= 2 * n_extreme
+
+    finite_xy = np.isfinite(x) & np.isfinite(y)
+    bounds = (
+        float(np.min(x[finite_xy])), float(np.max(x[finite_xy])),
+        float(np.min(y[finite_xy])), float(np.max(y[finite_xy]))
+    ) if finite_xy.any() else (0.0, 1.0, 0.0, 1.0)
+    cells = _grid_cells(np.nan_to_num(x), np.nan_to_num(y), SAMPLE_GRID_SIZE, bounds)
+
+    counts = np.bincount(cells, minlength=SAMPLE_GRID_SIZE ** 2)
+
+    # Largest per-cell quota that fits the budget
+    low, high = 0, int(counts.max())
+    while low < high:
+        quota = (low + high + 1) // 2
+        if np.minimum(counts, quota).sum() <= n_out:
+            low = quota
+        else:
+            high = quota - 1
+
+    # Each point is kept with probability quota / (points in its cell), so each
+    # cell keeps about min(count, quota) points in a single pass; a seeded draw
+    # keeps the sample the same across renders
+    rng = np.random.default_rng(SHUFFLE_SEED)
+    with np.errstate(divide='ignore'):
+        keep_probability = low / counts[cells]
+    sampled = np.flatnonzero(rng.random(n) < keep_probability)
+    if len(sampled) > n_out:
+        sampled = rng.choice(sampled, n_out, replace=False)
+    keep.append(sampled)
+
+    return np.unique(np.concatenate(keep))
+
+
+class GridIndex:
+    """
+    Uniform-grid spatial index of points in plot coordinates.
+
+    Rows are bucketed by grid cell once (in CSR layout: rows sorted by cell,
+    plus each cell's start offset), so a viewport query only touches the rows
+    of the cells it overlaps.
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, target_per_cell: int = 16, max_size: int = 1024):
+        self.x = x
+        self.y = y
+        finite = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+        self.size = int(np.clip(np.sqrt(len(finite) / target_per_cell), 1, max_size))
+        if len(finite):
+            self.bounds = (
+                float(x[finite].min()), float(x[finite].max()),
+                float(y[finite].min()), float(y[finite].max())
+            )
+        else:
+            self.bounds = (0.0, 1.0, 0.0, 1.0)
+        cells = _grid_cells(x[finite], y[finite], self.size, self.bounds)
+        # Queries sort their result, so the order within a cell does not matter
+        order = np.argsort(cells)
+        self.rows = finite[order]
+        counts = np.bincount(cells, minlength=self.size ** 2)
+        self.starts = np.concatenate([[0], np.cumsum(counts)])
+
+    def _cell_coordinate(self, value: float, low: float, high: float) -> int:
+        """Returns the grid column/row of a coordinate, clipped to the grid."""
+        position = (value - low) / ((high - low) or 1.0) * self.size
+        return int(np.clip(np.floor(position), 0, self.size - 1))
+
+    def query(self, x0: float, x1: float, y0: float, y1: float) -> np.ndarray:
+        """
+        Returns the rows inside a box, in increasing row order.
+        """
+        bx0, bx1, by0, by1 = self.bounds
+        if x1 < bx0 or x0 > bx1 or y1 < by0 or y0 > by1:
+            return np.empty(0, dtype=np.intp)
+        col0 = self._cell_coordinate(x0, bx0, bx1)
+        col1 = self._cell_coordinate(x1, bx0, bx1)
+        row0 = self._cell_coordinate(y0, by0, by1)
+        row1 = self._cell_coordinate(y1, by0, by1)
+
+        # Cells of one grid row are contiguous, so each grid row is one slice
+        candidates = np.concatenate([
+            self.rows[self.starts[row * self.size + col0]:self.starts[row * self.size + col1 + 1]]
+            for row in range(row0, row1 + 1)
+        ])
+        x, y = self.x[candidates], self.y[candidates]
+        inside = (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+        return np.sort(candidates[inside])
+
+
+class ViewportStore:
+    """
+    Keeps the full arrays of level-of-detail traces and serves the points of a viewport.
+
+    A trace registers its per-point arrays (keyed by plotly property path) and
+    its plot-plane coordinates and gets a key, which goes into the trace's
+    uid. When the page zooms, it sends back the key and the viewport, and gets
+    the points inside it (thinned to the same budget if still too many).
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, dict] = {}
+        # Traces are built on worker threads
+        self._lock = threading.Lock()
+
+    def register(
+            self,
+            arrays: Dict[str, np.ndarray],
+            n_out: int,
+            hover_key: Optional[str] = None,
+            key: Optional[str] = None) -> str:
+        """
+        Stores the full arrays of a marker trace and indexes its points.
+
+        Args:
+            arrays: Per-point arrays by plotly property path; must include
+                'x' and 'y' (cartesian) or 'a', 'b' and 'c' (ternary)
+            n_out: Maximum number of points to send per view
+            hover_key: On-demand hover key of the full trace, if any
+            key: Key to store the trace under (see trace_store_key); random by default
+
+        Returns:
+            The trace's plotly uid
+        """
+        entry = {'arrays': arrays, 'n_out': n_out, 'hover_key': hover_key}
+        self._index(entry)
+        key = VIEWPORT_UID_PREFIX + (key or uuid.uuid4().hex)
+        with self._lock:
+            self._entries[key] = entry
+        return key
+
+    @staticmethod
+    def _index(entry: dict):
+        """Computes the plot-plane coordinates of an entry and builds its grid index."""
+        arrays = entry['arrays']
+        if 'a' in arrays:
+            a, b, c = (np.asarray(arrays[k], dtype=float) for k in ('a', 'b', 'c'))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                total = a + b + c
+                entry['fractions'] = np.stack([a / total, b / total, c / total], axis=1)
+            # The plotly ternary layout has a at the top, b bottom-left and c bottom-right
+            xy = ternary_to_cartesian(b, c, a)
+            plane_x, plane_y = xy[:, 0], xy[:, 1]
+        else:
+            plane_x = np.asarray(arrays['x'], dtype=float)
+            plane_y = np.asarray(arrays['y'], dtype=float)
+        entry['plane'] = (plane_x, plane_y)
+        entry['index'] = GridIndex(plane_x, plane_y)
+        color = arrays.get('marker.color')
+        entry['values'] = color if color is not None and np.issubdtype(color.dtype, np.number) else None
+
+    def arrays(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """Returns the full per-point arrays of a trace, or None for unknown keys."""
+        entry = self._entries.get(key)
+        return entry['arrays'] if entry is not None else None
+
+    def as_cartesian(self, key: str):
+        """
+        Switches a ternary entry to serve Cartesian x/y arrays, for traces redrawn
+        on WebGL Cartesian axes (whose coordinates are the entry's plot plane).
+        """
+        entry = self._entries.get(key)
+        if entry is None or 'a' not in entry['arrays']:
+            return
+        for name in ('a', 'b', 'c'):
+            entry['arrays'].pop(name)
+        entry['arrays']['x'], entry['arrays']['y'] = entry['plane']
+        entry.pop('fractions', None)
+
+    def positions(self, key: str, viewport: Optional[dict] = None) -> Optional[np.ndarray]:
+        """
+        Returns the rows to draw for a viewport.
+
+        Args:
+            key: The trace's uid
+            viewport: None for the full extent, {'x': [x0, x1], 'y': [y0, y1]} for
+                Cartesian axes, or {'ternary': [a_min, b_min, c_min]} with the
+                ternary axis minimums as fractions of the sum
+
+        Returns:
+            Increasing row positions, or None for unknown keys
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        plane_x, plane_y = entry['plane']
+
+        if viewport is None:
+            rows = np.arange(len(plane_x))
+        elif 'ternary' in viewport:
+            a_min, b_min, c_min = viewport['ternary']
+            # Bounding box of the zoomed sub-triangle, then the exact test per point
+            corners = np.array([
+                [1 - b_min - c_min, b_min, c_min],
+                [a_min, 1 - a_min - c_min, c_min],
+                [a_min, b_min, 1 - a_min - b_min],
+            ])
+            xy = ternary_to_cartesian(corners[:, 1], corners[:, 2], corners[:, 0])
+            rows = entry['index'].query(xy[:, 0].min(), xy[:, 0].max(), xy[:, 1].min(), xy[:, 1].max())
+            if 'fractions' in entry:
+                fractions = entry['fractions'][rows]
+                rows = rows[(fractions >= np.array([a_min, b_min, c_min]) - 1e-12).all(axis=1)]
+        else:
+            (x0, x1), (y0, y1) = viewport['x'], viewport['y']
+            rows = entry['index'].query(min(x0, x1), max(x0, x1), min(y0, y1), max(y0, y1))
+
+        if len(rows) > entry['n_out']:
+            values = entry['values'][rows] if entry['values'] is not None else None
+            rows = rows[representative_rows(plane_x[rows], plane_y[rows], entry['n_out'], values)]
+        return rows
+
+    def refine(self, key: str, viewport: Optional[dict] = None) -> Optional[dict]:
+        """
+        Returns the points of a viewport as a plotly restyle update.
+
+        Returns:
+            {property path: [array]}, or None for unknown keys
+        """
+        positions = self.positions(key, viewport)
+        if positions is None:
+            return None
+        entry = self._entries[key]
+        update = {name: [np.asarray(values)[positions]] for name, values in entry['arrays'].items()}
+        if entry['hover_key'] is not None:
+            update['meta'] = [HOVER_STORE.view(entry['hover_key'], positions)]
+        return update
+
+    def clear(self):
+        """Drops all stored traces, e.g. before a new plot is rendered."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by the trace makers (which register traces) and the page bridge (which serves viewports)
+VIEWPORT_STORE = ViewportStore()
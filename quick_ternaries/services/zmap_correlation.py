@@ -0,0 +1,328 @@
+"""Grouped correlation engine for the Z-map: R and p-values between columns, for every category in one pass"""
+
+import hashlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from quick_ternaries.utils.parallel import default_worker_count, process_map
+
+
+CORRELATION_METHODS = ['spearman', 'pearson']
+
+# Plot titles per method
+CORRELATION_LABELS = {'spearman': "Spearman's R", 'pearson': "Pearson's R"}
+
+# Below this many categories, starting worker processes costs more than it saves
+PROCESS_POOL_MIN_GROUPS = 256
+
+
+class GroupedCorrelations:
+    """
+    Correlations between every pair of columns, within each category.
+
+    Attributes:
+        categories: The category values, in the order of the first axis
+        columns: The correlated columns, in the order of the other two axes
+        r: Correlation coefficients, shape (categories, columns, columns);
+            NaN for categories with fewer than two complete rows
+        p: Two-sided p-values, same shape as r
+        n: Number of complete rows used per category
+    """
+
+    def __init__(self, categories: list, columns: List[str], r: np.ndarray, p: np.ndarray, n: np.ndarray,
+                 blocks: Optional[list] = None):
+        self.categories = categories
+        self.columns = columns
+        self.r = r
+        self.p = p
+        self.n = n
+        # The cached block of each category (None for categories without enough data)
+        self._blocks = blocks if blocks is not None else [None] * len(categories)
+
+    def standardized(self, g: int) -> Optional[np.ndarray]:
+        """
+        Returns category g's standardized columns (ranks for Spearman), one per
+        column in ``columns``, whose dot products are the correlations; None if
+        the category has no correlations.
+        """
+        block = self._blocks[g]
+        if block is None:
+            return None
+        return block.standardized[:, [block.columns.index(column) for column in self.columns]]
+
+    def significant(self, alpha: float = 0.05) -> np.ndarray:
+        """Returns r where p <= alpha and NaN elsewhere."""
+        return np.where(self.p <= alpha, self.r, np.nan)
+
+    def heatmap(self, target: str, alpha: float = 0.05) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """
+        Returns the heatmap of one target against the other columns.
+
+        Args:
+            target: The target column
+            alpha: Significance level; other cells are NaN
+
+        Returns:
+            (z, others, customdata): z has a row per other column and a cell
+            per category; customdata holds [category, other column] per cell
+        """
+        t = self.columns.index(target)
+        others = [j for j in range(len(self.columns)) if j != t]
+        z = self.significant(alpha)[:, t, others].T
+        customdata = np.empty(z.shape + (2,), dtype=object)
+        customdata[..., 0] = np.asarray(self.categories, dtype=object)[None, :]
+        customdata[..., 1] = np.asarray([self.columns[j] for j in others], dtype=object)[:, None]
+        return z, [self.columns[j] for j in others], customdata
+
+
+def _average_ranks(block: np.ndarray) -> np.ndarray:
+    """Ranks each column of a block from 1, giving ties their average rank (as scipy.stats.rankdata)."""
+    # Sort along contiguous rows, one per column
+    columns = np.ascontiguousarray(block.T)
+    k, n = columns.shape
+    order = np.argsort(columns, axis=1)
+    ordered = np.take_along_axis(columns, order, axis=1)
+    positions = np.arange(n)
+    # Each run of equal values gets the mean of its first and last position
+    starts = np.ones((k, n), dtype=bool)
+    starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    ends = np.ones((k, n), dtype=bool)
+    ends[:, :-1] = starts[:, 1:]
+    first = np.maximum.accumulate(np.where(starts, positions, 0), axis=1)
+    last = np.minimum.accumulate(np.where(ends, positions, n)[:, ::-1], axis=1)[:, ::-1]
+    ranks = np.empty_like(columns)
+    np.put_along_axis(ranks, order, (first + last) / 2.0 + 1.0, axis=1)
+    return ranks.T
+
+
+def _standardize(block: np.ndarray, rank: bool) -> np.ndarray:
+    """
+    Centers a group's columns (ranked first for Spearman) and scales them to
+    unit length, so that Z^T Z is their correlation matrix and any two columns
+    correlate by a dot product.
+    """
+    if rank:
+        block = _average_ranks(block)
+    centered = block - block.mean(axis=0)
+    # Constant columns give NaN, as in SciPy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return centered / np.sqrt((centered ** 2).sum(axis=0))
+
+
+def _standardize_blocks(args: Tuple[List[np.ndarray], bool]) -> List[np.ndarray]:
+    """Standardizes a list of group blocks (module-level for the process pool)."""
+    blocks, rank = args
+    return [_standardize(block, rank) for block in blocks]
+
+
+def _standardize_all(blocks: List[np.ndarray], rank: bool, max_workers: Optional[int]) -> List[np.ndarray]:
+    """Standardizes group blocks, on a process pool when there are many."""
+    if len(blocks) < PROCESS_POOL_MIN_GROUPS:
+        return _standardize_blocks((blocks, rank))
+    # Each worker gets a run of groups
+    workers = max_workers if max_workers is not None else default_worker_count(len(blocks))
+    chunks = [
+        ([blocks[i] for i in chunk], rank)
+        for chunk in np.array_split(np.arange(len(blocks)), workers) if len(chunk)
+    ]
+    return [z for result in process_map(_standardize_blocks, chunks, max_workers=workers) for z in result]
+
+
+def _p_values(r: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Two-sided p-values of correlations (t-test with n - 2 degrees of freedom), for all groups at once."""
+    dof = (counts - 2).astype(float)[:, None, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = r * np.sqrt(dof / ((1.0 - r) * (1.0 + r)))
+        p = 2 * stats.t.sf(np.abs(t), dof)
+    p[np.isnan(r)] = np.nan
+    return p
+
+
+def source_fingerprint(df: pd.DataFrame, mask: Optional[np.ndarray]) -> tuple:
+    """
+    Identifies a trace's rows: its datafile's frame and its filter mask.
+
+    Loaded frames are not modified, so the frame's identity stands for its
+    content (the cache keeps the frames it has seen alive, so identities are
+    not reused).
+    """
+    mask_digest = None
+    if mask is not None:
+        mask_digest = hashlib.blake2b(np.packbits(mask).tobytes(), digest_size=16).hexdigest()
+    return (id(df), df.shape, mask_digest)
+
+
+class _GroupBlock:
+    """The cached correlation block of one category."""
+
+    def __init__(self, sources: tuple, rows: np.ndarray, columns: List[str], standardized: np.ndarray):
+        self.sources = sources  # Fingerprints of the sources with rows in the category
+        self.rows = rows  # Which of the category's rows were complete
+        self.columns = columns
+        self.standardized = standardized  # Standardized (rank) columns, one per column
+        self.matrix = standardized.T @ standardized
+
+    def extend(self, columns: List[str], standardized: np.ndarray):
+        """Adds columns: only their rows and columns of the matrix are computed."""
+        k = len(self.columns)
+        self.columns = self.columns + columns
+        self.standardized = np.hstack([self.standardized, standardized])
+        cross = standardized.T @ self.standardized
+        matrix = np.empty((len(self.columns), len(self.columns)))
+        matrix[:k, :k] = self.matrix
+        matrix[k:, :] = cross
+        matrix[:k, k:] = cross[:, :k].T
+        self.matrix = matrix
+
+    def matrix_for(self, columns: List[str]) -> np.ndarray:
+        """Returns the correlation matrix of some of the block's columns."""
+        positions = [self.columns.index(column) for column in columns]
+        return self.matrix[np.ix_(positions, positions)]
+
+
+class CorrelationCache:
+    """
+    Keeps each category's correlations between Z-map builds.
+
+    A category's block (its standardized rank columns and their correlation
+    matrix) is reused as long as the categorical column is the same, the same
+    sources have rows in the category and the same rows are complete. Adding a column only computes that column's row
+    and column of each matrix; adding or toggling a trace only recomputes the
+    categories it has rows in. Blocks not used by the latest build are dropped.
+    """
+
+    def __init__(self):
+        self._blocks: Dict[tuple, _GroupBlock] = {}
+        self._frames: List[pd.DataFrame] = []
+        # Categories computed, extended with new columns, and reused by the latest build
+        self.last_update = {'computed': 0, 'extended': 0, 'reused': 0}
+
+    def clear(self):
+        """Drops all cached blocks."""
+        self._blocks = {}
+        self._frames = []
+
+    def correlations(
+            self,
+            sources: Sequence[Tuple[pd.DataFrame, Optional[np.ndarray]]],
+            category_column: str,
+            columns: Sequence[str],
+            method: str = 'spearman',
+            max_workers: Optional[int] = None) -> GroupedCorrelations:
+        """
+        Correlates every pair of columns within each value of a categorical column.
+
+        The rows of all sources are grouped once (by sorting the category codes)
+        instead of masking the data per category; each group is ranked (for
+        Spearman) and standardized once, and its correlation matrix is one
+        matrix product. The p-values come from the t distribution for all
+        groups at once, as in scipy.stats.spearmanr and pearsonr. Rows with a
+        missing value in any of the columns are left out (like dropna per group).
+
+        Args:
+            sources: (frame, filter mask or None) of each trace
+            category_column: The categorical column
+            columns: The numerical columns to correlate (values that are not
+                numbers count as missing)
+            method: 'spearman' or 'pearson'
+            max_workers: Worker limit for the process pool used with many categories
+
+        Returns:
+            GroupedCorrelations over the sorted category values
+        """
+        if method not in CORRELATION_METHODS:
+            raise ValueError(f"Unknown correlation method: {method}")
+        columns = list(columns)
+        codes, categories, values, source_ids, fingerprints = self._combine(sources, category_column, columns)
+        n_groups, n_columns = len(categories), len(columns)
+
+        # Bring each group's rows together (rows without a category come first and are skipped)
+        order = np.argsort(codes, kind='stable')
+        codes, values, source_ids = codes[order], values[order], source_ids[order]
+        complete = ~np.isnan(values).any(axis=1)
+        bounds = np.searchsorted(codes, np.arange(n_groups + 1))
+
+        blocks = {}
+        pending = []
+        update = {'computed': 0, 'extended': 0, 'reused': 0}
+        counts = np.zeros(n_groups, dtype=int)
+        for g, category in enumerate(categories):
+            start, stop = bounds[g], bounds[g + 1]
+            rows = complete[start:stop]
+            counts[g] = rows.sum()
+            if counts[g] < 2:
+                continue
+            # The same value of another categorical column is a different group of rows
+            key = (method, category_column, category)
+            group_sources = tuple(fingerprints[i] for i in np.unique(source_ids[start:stop]))
+            block = self._blocks.get(key)
+            if block is not None and block.sources == group_sources and np.array_equal(block.rows, rows):
+                missing = [j for j, column in enumerate(columns) if column not in block.columns]
+                if missing:
+                    group_values = values[start:stop][rows]
+                    block.extend([columns[j] for j in missing], _standardize(group_values[:, missing], method == 'spearman'))
+                    update['extended'] += 1
+                else:
+                    update['reused'] += 1
+                blocks[key] = block
+            else:
+                pending.append((key, group_sources, rows, values[start:stop][rows]))
+
+        standardized = _standardize_all([group[3] for group in pending], method == 'spearman', max_workers)
+        for (key, group_sources, rows, _), z in zip(pending, standardized):
+            blocks[key] = _GroupBlock(group_sources, rows, list(columns), z)
+        update['computed'] = len(pending)
+
+        r = np.full((n_groups, n_columns, n_columns), np.nan)
+        group_blocks = [blocks.get((method, category_column, category)) for category in categories]
+        for g, block in enumerate(group_blocks):
+            if block is not None:
+                r[g] = block.matrix_for(columns)
+        np.clip(r, -1.0, 1.0, out=r)
+
+        # Keep only what this build used, and the frames its fingerprints refer to
+        self._blocks = blocks
+        self._frames = [df for df, _ in sources]
+        self.last_update = update
+
+        return GroupedCorrelations(list(categories), columns, r, _p_values(r, counts), counts, group_blocks)
+
+    @staticmethod
+    def _combine(sources, category_column, columns):
+        """Returns the category codes, categories, values, source of each row, and source fingerprints."""
+        category_parts, value_parts, id_parts, fingerprints = [], [], [], []
+        for i, (df, mask) in enumerate(sources):
+            fingerprints.append(source_fingerprint(df, mask))
+            if category_column not in df.columns:
+                continue
+            category_values = df[category_column].to_numpy()
+            values = np.column_stack([
+                pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float)
+                if column in df.columns else np.full(len(df), np.nan)
+                for column in columns
+            ]) if columns else np.empty((len(df), 0))
+            if mask is not None:
+                category_values, values = category_values[mask], values[mask]
+            category_parts.append(category_values)
+            value_parts.append(values)
+            id_parts.append(np.full(len(values), i))
+        if not category_parts:
+            return np.empty(0, dtype=int), [], np.empty((0, len(columns))), np.empty(0, dtype=int), fingerprints
+        codes, categories = pd.factorize(np.concatenate(category_parts), sort=True)
+        return codes, list(categories), np.concatenate(value_parts), np.concatenate(id_parts), fingerprints
+
+
+def grouped_correlations(
+        df: pd.DataFrame,
+        category_column: str,
+        columns: Sequence[str],
+        method: str = 'spearman',
+        max_workers: Optional[int] = None) -> GroupedCorrelations:
+    """
+    Correlates every pair of columns within each value of a categorical column
+    of one frame, without caching (see CorrelationCache.correlations).
+    """
+    return CorrelationCache().correlations([(df, None)], category_column, columns, method, max_workers)
@@ -1,12 +1,15 @@
 import pandas as pd
 import numpy as np
-from scipy.stats import spearmanr, pearsonr
 import plotly.graph_objects as go
-import json
-import os
+from typing import Optional
 
+from quick_ternaries.services.zmap_correlation import CORRELATION_LABELS, CorrelationCache
+from quick_ternaries.services.zmap_significance import adjust_p_values, resampled_p_values
+from quick_ternaries.utils.fast_figure import to_json
 from quick_ternaries.utils.functions import util_convert_hex_to_rgba
-from quick_ternaries.utils.plotly_html import figure_to_html
+from quick_ternaries.utils.page_store import PLOTLY_JS_PATH, PageStore
+from quick_ternaries.utils.typed_arrays import typed_array_spec
+from quick_ternaries.utils.zmap_page import zmap_page_html
 
 class ZmapPlotMaker:
     """
@@ -14,27 +17,39 @@ class ZmapPlotMaker:
     between one numerical column and all others, across different values of a categorical column.
     """
     
-    def __init__(self):
+    def __init__(self, page_store: Optional[PageStore] = None):
+        """
+        Args:
+            page_store: The window's in-memory page store, which serves the Z-map page
+        """
         self.current_index = 0
-        self.heatmap_files = []  # List of (file_path, target_element) tuples
+        self.targets = []  # Numerical columns, in the order the page shows them
+        self.page_url = None  # The Z-map page, which draws any target on demand
         self.current_target = None
-        
-        # Ensure plots directory exists
-        self.plots_dir = "plots"
-        if not os.path.exists(self.plots_dir):
-            os.makedirs(self.plots_dir)
+        self.page_store = page_store if page_store is not None else PageStore()
+        self.correlation_cache = CorrelationCache()
+        self.cancelled = False  # Whether the last make_plot was cancelled during significance testing
+        # Data of the current zmap, for the scatter plots of double-clicked cells
+        self.categorical_column = None
+        self.categories = []
+        self.combined_df = pd.DataFrame()
+        self.category_rows = []  # Row positions in combined_df of each category, in page order
     
-    def make_plot(self, setup_model, traces):
+    def make_plot(self, setup_model, traces, progress=None, cancelled=None):
         """
         Generate the Z-map plot based on the setup model and active traces.
         
         Args:
             setup_model: The SetupMenuModel containing plot configuration
             traces: List of trace models to include in the plot
+            progress: Optional callback with (jobs done, total jobs) of a resampling significance test
+            cancelled: Optional callback polled during a resampling significance test;
+                returning True stops it (and the plot is not generated)
             
         Returns:
             bool: True if plots were generated successfully
         """
+        self.cancelled = False
         # Get the categorical column and numerical columns from the setup model
         categorical_column = setup_model.axis_members.categorical_column
         numerical_columns = setup_model.axis_members.numerical_columns
@@ -43,40 +58,44 @@ class ZmapPlotMaker:
             print("Missing configuration - please select a categorical column and numerical columns")
             return False
         
-        # Concatenate data from all traces after applying filters
-        combined_df = self._concat_filtered_dataframes(setup_model, traces)
+        # Each trace's data and filter mask (correlations are cached per source)
+        sources = self._filtered_sources(setup_model, traces)
         
-        if combined_df.empty:
+        if not sources:
             print("No data available after filtering")
             return False
         
         # Generate correlation heatmaps
-        success = self._generate_heatmaps(combined_df, categorical_column, numerical_columns, setup_model)
+        success = self._generate_heatmaps(sources, categorical_column, numerical_columns, setup_model, progress, cancelled)
+
+        if self.cancelled:
+            print("Significance testing cancelled")
+            return False
         
         if not success:
             print("Failed to generate heatmaps")
             return False
         
         # Set the initial plot to show
-        if self.heatmap_files:
+        if self.targets:
             self.current_index = 0
-            self.current_target = self.heatmap_files[0][1]
+            self.current_target = self.targets[0]
             return True
             
         return False
     
-    def _concat_filtered_dataframes(self, setup_model, traces):
+    def _filtered_sources(self, setup_model, traces):
         """
-        Concatenate dataframes from all traces after applying filters.
+        Collect the dataframe and filter mask of each trace.
         
         Args:
             setup_model: The SetupMenuModel containing the DataLibraryModel
             traces: List of trace models to include
             
         Returns:
-            pd.DataFrame: Combined dataframe with all filtered data
+            list: (dataframe, boolean mask or None) for each trace with data
         """
-        dataframes = []
+        sources = []
         
         for trace in traces:
             # Skip traces with hiding enabled
@@ -90,18 +109,14 @@ class ZmapPlotMaker:
                 
             # Apply filters if enabled
             if getattr(trace, "filters_on", False) and hasattr(trace, "filters"):
-                filtered_df = self._apply_filters(df, trace.filters)
-                if not filtered_df.empty:
-                    dataframes.append(filtered_df)
+                mask = self._filter_mask(df, trace.filters)
+                if mask.any():
+                    sources.append((df, mask))
             else:
                 # No filtering needed
-                dataframes.append(df)
+                sources.append((df, None))
         
-        # Combine all dataframes
-        if not dataframes:
-            return pd.DataFrame()
-            
-        return pd.concat(dataframes, ignore_index=True)
+        return sources
     
     def _apply_filters(self, df, filters):
         """
@@ -114,7 +129,20 @@ class ZmapPlotMaker:
         Returns:
             pd.DataFrame: Filtered dataframe
         """
-        filtered_df = df.copy()
+        return df[self._filter_mask(df, filters)].copy()
+
+    def _filter_mask(self, df, filters):
+        """
+        Build the mask of the rows that pass a list of filters.
+
+        Args:
+            df: The dataframe to filter
+            filters: List of FilterModel objects
+
+        Returns:
+            np.ndarray: Boolean mask over the dataframe's rows
+        """
+        mask = pd.Series(True, index=df.index)
         
         for filter_model in filters:
             column = filter_model.filter_column
@@ -122,366 +150,277 @@ class ZmapPlotMaker:
             value1 = filter_model.filter_value1
             value2 = filter_model.filter_value2
             
-            if column not in filtered_df.columns:
+            if column not in df.columns:
                 continue
                 
             # Apply the filter based on operation
             # TODO fix this by making the filters an enum rather than checking on strings
             if operation == "<":
-                filtered_df = filtered_df[filtered_df[column] < float(value1)]
+                mask &= df[column] < float(value1)
             elif operation == ">":
-                filtered_df = filtered_df[filtered_df[column] > float(value1)]
+                mask &= df[column] > float(value1)
             elif operation == "<=":
-                filtered_df = filtered_df[filtered_df[column] <= float(value1)]
+                mask &= df[column] <= float(value1)
             elif operation == ">=":
-                filtered_df = filtered_df[filtered_df[column] >= float(value1)]
+                mask &= df[column] >= float(value1)
             elif operation == "==":
-                filtered_df = filtered_df[filtered_df[column] == float(value1)]
+                mask &= df[column] == float(value1)
             elif operation == "is":
-                filtered_df = filtered_df[filtered_df[column] == value1]
+                mask &= df[column] == value1
             elif operation == "is not":
-                filtered_df = filtered_df[filtered_df[column] != value1]
+                mask &= df[column] != value1
             elif operation == "is one of":
                 if isinstance(value1, list):
-                    filtered_df = filtered_df[filtered_df[column].isin(value1)]
+                    mask &= df[column].isin(value1)
                 else:
                     # If value1 is a string, split by comma
                     values = [v.strip() for v in str(value1).split(",")]
-                    filtered_df = filtered_df[filtered_df[column].isin(values)]
+                    mask &= df[column].isin(values)
             elif operation == "is not one of":
                 if isinstance(value1, list):
-                    filtered_df = filtered_df[~filtered_df[column].isin(value1)]
+                    mask &= ~df[column].isin(value1)
                 else:
                     # If value1 is a string, split by comma
                     values = [v.strip() for v in str(value1).split(",")]
-                    filtered_df = filtered_df[~filtered_df[column].isin(values)]
+                    mask &= ~df[column].isin(values)
             elif operation == "a < x < b":
-                filtered_df = filtered_df[(filtered_df[column] > float(value1)) & 
-                                         (filtered_df[column] < float(value2))]
+                mask &= ((df[column] > float(value1)) &
+                         (df[column] < float(value2)))
             elif operation == "a <= x < b":
-                filtered_df = filtered_df[(filtered_df[column] >= float(value1)) & 
-                                         (filtered_df[column] < float(value2))]
+                mask &= ((df[column] >= float(value1)) &
+                         (df[column] < float(value2)))
             elif operation == "a < x <= b":
-                filtered_df = filtered_df[(filtered_df[column] > float(value1)) & 
-                                         (filtered_df[column] <= float(value2))]
+                mask &= ((df[column] > float(value1)) &
+                         (df[column] <= float(value2)))
             elif operation == "a <= x <= b":
-                filtered_df = filtered_df[(filtered_df[column] >= float(value1)) & 
-                                         (filtered_df[column] <= float(value2))]
+                mask &= ((df[column] >= float(value1)) &
+                         (df[column] <= float(value2)))
         
-        return filtered_df
+        return mask.to_numpy(dtype=bool)
     
-    def _generate_heatmaps(self, df, category_column, numerical_columns, setup_model):
+    def _generate_heatmaps(self, sources, category_column, numerical_columns, setup_model, progress=None, cancelled=None):
         """
-        Generate correlation heatmaps between each numerical column and all others,
-        across different values of the categorical column. Writes HTML files to disk.
+        Compute the correlations between all numerical columns for each value of
+        the categorical column in one pass (incrementally, see CorrelationCache), and build the single Z-map page that
+        draws the heatmap of whichever target is selected. The page is kept in
+        the page store, nothing is written to disk.
         
         Args:
-            df: The dataframe containing the data
+            sources: (dataframe, filter mask or None) of each trace
             category_column: The name of the categorical column
             numerical_columns: List of numerical column names
             setup_model: The setup model containing styling information
+            progress: Optional progress callback of a resampling significance test
+            cancelled: Optional cancellation callback of a resampling significance test
             
         Returns:
-            bool: True if at least one heatmap was generated
+            bool: True if the page was generated
         """
-        # Clear existing heatmap files list
-        self.heatmap_files = []
-        
-        if not numerical_columns:
+        # Each target is drawn against the other columns, so there must be at least two
+        if len(numerical_columns) < 2:
+            self._clear_zmap()
             return False
             
-        # Get sorted category values
-        category_values = sorted(df[category_column].unique())
+        advanced = setup_model.advanced_settings
+        method = getattr(advanced, 'zmap_correlation_method', 'spearman')
         
-        if not category_values:
+        # One grouped pass over all categories, reusing the blocks of categories whose data did not change
+        correlations = self.correlation_cache.correlations(sources, category_column, numerical_columns, method=method)
+        update = self.correlation_cache.last_update
+        print(f"Z-map correlations: {update['computed']} categories computed, "
+              f"{update['extended']} extended with new columns, {update['reused']} reused")
+
+        if not correlations.categories:
+            self._clear_zmap()
             return False
-            
-        # Compute correlations for each category value
-        correlations = {}
-        pvals = {}
-        
-        for value in category_values:
-            group = df[df[category_column] == value]
-            data = group[numerical_columns].dropna()
-            
-            # Check if we have enough data points
-            if len(data) < 2:
-                print(f"Not enough data points for {category_column}={value}, skipping")
-                continue
-                
-            try:
-                corr_matrix, p_matrix = spearmanr(data)
-                
-                # Handle case when there's only one element
-                if len(numerical_columns) == 1:
-                    corr_df = pd.DataFrame([[1]], index=numerical_columns, columns=numerical_columns)
-                    pval_df = pd.DataFrame([[0]], index=numerical_columns, columns=numerical_columns)
-                else:
-                    corr_df = pd.DataFrame(corr_matrix, index=numerical_columns, columns=numerical_columns)
-                    pval_df = pd.DataFrame(p_matrix, index=numerical_columns, columns=numerical_columns)
-                    
-                correlations[value] = corr_df
-                pvals[value] = pval_df
-            except Exception as e:
-                print(f"Error computing correlation for {category_column}={value}: {str(e)}")
-        
+
         # Check if we computed any valid correlations
-        if not correlations:
+        for category, n in zip(correlations.categories, correlations.n):
+            if n < 2:
+                print(f"Not enough data points for {category_column}={category}, skipping")
+        if np.isnan(correlations.r).all():
+            self._clear_zmap()
             return False
-        
-        # Create one heatmap for each target element
-        for target in numerical_columns:
-            other_elements = [e for e in numerical_columns if e != target]
-            
-            # Skip if there are no other elements
-            if not other_elements:
-                continue
-                
-            z_matrix = []
-            customdata = []  # will hold [category_value, otherElement] for each cell
-            
-            for other in other_elements:
-                row = []
-                row_custom = []
-                for value in category_values:
-                    # Check if correlation exists for this category value
-                    if value not in correlations:
-                        row.append(None)
-                        row_custom.append([value, other])
-                        continue
-                        
-                    try:
-                        r = correlations[value].loc[target, other]
-                        p = pvals[value].loc[target, other]
-                        
-                        # Only display r if significant
-                        if p <= 0.05:
-                            row.append(r)
-                        else:
-                            row.append(None)
-                            
-                        row_custom.append([value, other])
-                    except Exception as e:
-                        print(f"Error accessing correlation for {target} vs {other} in {value}: {str(e)}")
-                        row.append(None)
-                        row_custom.append([value, other])
-                
-                z_matrix.append(row)
-                customdata.append(row_custom)
-
-            advanced = setup_model.advanced_settings
-            colorscale = getattr(advanced, 'zmap_colorscale', 'RdBu')
-            reverse = getattr(advanced, 'zmap_reverse_colorscale', True)
-            if reverse:
-                colorscale += '_r'
-            
 
-            # Build the heatmap figure
-            fig = go.Figure(data=go.Heatmap(
-                z=z_matrix,
-                x=category_values,
-                y=other_elements,
-                customdata=customdata,
-                colorscale=colorscale,
-                zmin=-1,
-                zmax=1,
-                showscale=True,
-                hoverongaps=False
-            ))
-
-            # Apply styling from setup model
-            self._apply_styling(fig, setup_model)
-            
-            fig.update_layout(
-                title=f"Spearman's R: {target} vs Other Elements by {category_column}",
-                xaxis_title=category_column,
-                yaxis_title="Element",
-                margin=dict(l=50, r=50, t=50, b=50)
+        # Resampled p-values instead of the t-test's, for small categories
+        p_values = correlations.p
+        significance = getattr(advanced, 'zmap_significance', 'asymptotic')
+        if significance != 'asymptotic':
+            p_values = resampled_p_values(
+                correlations,
+                significance,
+                n_resamples=int(getattr(advanced, 'zmap_resamples', 1000)),
+                progress=progress,
+                cancelled=cancelled,
             )
+            if p_values is None:
+                # The previous zmap stays shown, so its page and data are kept
+                self.cancelled = True
+                return False
+        correlations.p = adjust_p_values(p_values, getattr(advanced, 'zmap_correction', 'none'))
 
-            values_js = json.dumps(category_values, default=str)
-            elements_js = json.dumps(other_elements)
-            
-            webchannel_js = """
-            <script src="qrc:///qtwebchannel/qwebchannel.js"></script>
-            <script>
-            // Plot metadata
-            var TARGET_ELEMENT = "%s";
-            var CATEGORY_VALUES = %s;
-            var OTHER_ELEMENTS = %s;
-            var CATEGORY_COLUMN = "%s";
-            
-            // Variables to store hover data
-            var lastHoverData = null;
-            
-            // Set up web channel connection to Python
-            var zmapHandler;
-            new QWebChannel(qt.webChannelTransport, function(channel) {
-                zmapHandler = channel.objects.zmapHandler;
-                console.log("QWebChannel established", zmapHandler !== undefined);
-                
-                if (zmapHandler) {
-                    try {
-                        zmapHandler.debugLog("QWebChannel connected for " + TARGET_ELEMENT);
-                    } catch (e) {
-                        console.error("Error calling debugLog:", e);
-                    }
-                    
-                    // Set up the hover and click handlers once QWebChannel is ready
-                    document.addEventListener("DOMContentLoaded", setupHandlers);
-                    // Also try immediately in case DOM is already loaded
-                    if (document.readyState === "complete") {
-                        setupHandlers();
-                    }
-                }
-            });
-            
-            // Function to create hover and click handlers
-            function setupHandlers() {
-                if (!zmapHandler) {
-                    console.error("zmapHandler not available");
-                    setTimeout(setupHandlers, 100);
-                    return;
-                }
-                
-                try {
-                    zmapHandler.debugLog("Setting up handlers");
-                } catch (e) {
-                    console.error("Error calling debugLog:", e);
-                }
-                
-                // Get the plot div
-                var plotDiv = document.getElementById('plot');
-                if (!plotDiv) {
-                    console.error("Plot div not found");
-                    setTimeout(setupHandlers, 100);
-                    return;
-                }
-                
-                // Wait for Plotly to be fully loaded
-                var checkPlotly = function() {
-                    if (typeof Plotly === 'undefined' || !plotDiv._fullLayout) {
-                        setTimeout(checkPlotly, 50);
-                        return;
-                    }
-                    
-                    // Set up hover event handler to capture hover data
-                    plotDiv.on('plotly_hover', function(data) {
-                        // Store the hover points for later use
-                        lastHoverData = data.points[0];
-                    });
-                    
-                    // Set up click handler for double-clicks
-                    var lastClickTime = 0;
-                    plotDiv.onclick = function(event) {
-                        var currentTime = new Date().getTime();
-                        var isDoubleClick = (currentTime - lastClickTime < 300);
-                        lastClickTime = currentTime;
-                        
-                        if (!isDoubleClick) return; // Only process double-clicks
-                        
-                        try {
-                            if (lastHoverData) {
-                                // Use the hover data to get exact cell coordinates
-                                zmapHandler.debugLog("Using hover data for click: " + 
-                                                  "x=" + lastHoverData.x + ", " +
-                                                  "y=" + lastHoverData.y);
-                                
-                                // These values are directly from Plotly's hover data
-                                var categoryValue = lastHoverData.x;
-                                var otherElement = lastHoverData.y;
-                                
-                                zmapHandler.debugLog("Double-clicked cell: " + CATEGORY_COLUMN + "=" + categoryValue + 
-                                                  ", element=" + otherElement);
-                                
-                                // Call Python handler with the exact data from the hover
-                                zmapHandler.cellDoubleClicked(categoryValue, TARGET_ELEMENT, otherElement);
-                            } else {
-                                // Fallback to position-based detection if no hover data
-                                zmapHandler.debugLog("No hover data available for click, using position");
-                                
-                                // Get plot layout info for coordinate conversion
-                                var layout = plotDiv._fullLayout;
-                                var plotArea = {
-                                    left: layout.margin.l,
-                                    top: layout.margin.t,
-                                    width: layout.width - layout.margin.l - layout.margin.r,
-                                    height: layout.height - layout.margin.t - layout.margin.b
-                                };
-                                
-                                // Get mouse position relative to plot
-                                var rect = plotDiv.getBoundingClientRect();
-                                var x = event.clientX - rect.left;
-                                var y = event.clientY - rect.top;
-                                
-                                zmapHandler.debugLog("Click position: " + x + ", " + y);
-                                
-                                // Check if click is inside the actual plot area
-                                if (x < plotArea.left || x > (plotArea.left + plotArea.width) ||
-                                    y < plotArea.top || y > (plotArea.top + plotArea.height)) {
-                                    zmapHandler.debugLog("Click outside plot area");
-                                    return;
-                                }
-                                
-                                // Convert to relative position within the plot area (0-1)
-                                var relX = (x - plotArea.left) / plotArea.width;
-                                var relY = (y - plotArea.top) / plotArea.height;
-                                
-                                // Convert to data indices
-                                var valueIndex = Math.floor(relX * CATEGORY_VALUES.length);
-                                var elementIndex = Math.floor(relY * OTHER_ELEMENTS.length);
-                                
-                                // Invert Y index (Plotly's Y axis goes from bottom to top)
-                                elementIndex = OTHER_ELEMENTS.length - 1 - elementIndex;
-                                
-                                // Make sure indices are in bounds
-                                valueIndex = Math.min(Math.max(valueIndex, 0), CATEGORY_VALUES.length - 1);
-                                elementIndex = Math.min(Math.max(elementIndex, 0), OTHER_ELEMENTS.length - 1);
-                                
-                                var categoryValue = CATEGORY_VALUES[valueIndex];
-                                var otherElement = OTHER_ELEMENTS[elementIndex];
-                                
-                                zmapHandler.debugLog("Mapped to: " + CATEGORY_COLUMN + "=" + categoryValue + 
-                                                  " (index " + valueIndex + "), " +
-                                                  "element=" + otherElement +
-                                                  " (index " + elementIndex + ")");
-                                
-                                // Call Python handler
-                                zmapHandler.cellDoubleClicked(categoryValue, TARGET_ELEMENT, otherElement);
-                            }
-                        } catch (e) {
-                            zmapHandler.debugLog("Error in click handler: " + e.toString());
-                        }
-                    };
-                    
-                    zmapHandler.debugLog("Handlers installed successfully");
-                };
-                
-                checkPlotly();
-            }
-            </script>
-            """ % (target, values_js, elements_js, category_column)
-            
-            # Generate HTML with Plotly and add webchannel script
-            html_str = figure_to_html(
-                fig,
-                include_plotlyjs=True,
-                full_html=True,
-                div_id="plot",
-                config={"doubleClick": False},
-            )
-            html_str = html_str.replace("</head>", webchannel_js + "\n</head>")
-            
-            # Write to file
-            file_path = os.path.join(self.plots_dir, f"heatmap_{target}.html")
-            with open(file_path, "w") as f:
-                f.write(html_str)
-            
-            # Add to heatmap files list
-            self.heatmap_files.append((os.path.abspath(file_path), target))
-            print(f"Generated plot for {target} at {file_path}")
-        
-        return len(self.heatmap_files) > 0
+        # Only display r if significant
+        significant = correlations.significant(0.05)
+
+        colorscale = getattr(advanced, 'zmap_colorscale', 'RdBu')
+        reverse = getattr(advanced, 'zmap_reverse_colorscale', True)
+        if reverse:
+            colorscale += '_r'
+
+        # The heatmap properties shared by all targets; the page fills in z, x and y
+        trace = go.Heatmap(
+            colorscale=colorscale,
+            zmin=-1,
+            zmax=1,
+            showscale=True,
+            hoverongaps=False
+        ).to_plotly_json()
+
+        # The styled layout shared by all targets; the page sets the title
+        fig = go.Figure()
+        self._apply_styling(fig, setup_model)
+        fig.update_layout(
+            xaxis_title=category_column,
+            yaxis_title="Element",
+            margin=dict(l=50, r=50, t=50, b=50)
+        )
+
+        data = {
+            'categories': [self._json_category(value) for value in correlations.categories],
+            'columns': list(numerical_columns),
+            'category_column': category_column,
+            'titles': [
+                f"{CORRELATION_LABELS[method]}: {target} vs Other Elements by {category_column}"
+                for target in numerical_columns
+            ],
+            'r': typed_array_spec(significant.ravel()),
+            'trace': trace,
+            'layout': fig.layout.to_plotly_json(),
+            'config': {'doubleClick': False, 'responsive': True},
+            'initial_target': 0,
+        }
+        html_str = zmap_page_html(to_json(data), PLOTLY_JS_PATH)
+
+        # Replace the page and data of the previous zmap
+        self._clear_zmap()
+        self.page_url = self.page_store.put("zmap/zmap.html", html_str)
+        self.targets = list(numerical_columns)
+        self._index_rows(sources, category_column, numerical_columns, correlations.categories)
+        print(f"Generated Z-map page for {len(self.targets)} targets at {self.page_url}")
+
+        return True
+
+    def _clear_zmap(self):
+        """Drop the page and data of the previous zmap."""
+        self.targets = []
+        self.page_url = None
+        self.page_store.remove('zmap/')
+        self.categorical_column = None
+        self.categories = []
+        self.combined_df = pd.DataFrame()
+        self.category_rows = []
+
+    def _index_rows(self, sources, category_column, numerical_columns, categories):
+        """
+        Keep the zmap's data as one frame (only the columns it uses, concatenated
+        once) and the row positions of each category, so that a double-clicked
+        cell's scatter plot needs no filtering or type matching.
+
+        Args:
+            sources: (dataframe, filter mask or None) of each trace
+            category_column: The name of the categorical column
+            numerical_columns: List of numerical column names
+            categories: The category values, in the order of the page
+        """
+        frames = []
+        for df, mask in sources:
+            if category_column not in df.columns:
+                continue
+            columns = [category_column] + [c for c in numerical_columns if c in df.columns and c != category_column]
+            frames.append(df.loc[mask, columns] if mask is not None else df[columns])
+        if not frames:
+            return
+
+        self.combined_df = pd.concat(frames, ignore_index=True)
+        self.categorical_column = category_column
+        self.categories = list(categories)
+
+        # Group the rows by the page's category index in one sort
+        codes = pd.Index(self.categories).get_indexer(self.combined_df[category_column])
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(self.categories) + 1))
+        self.category_rows = [order[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    def scatter_figure(self, category_index, target, other):
+        """
+        Build the scatter plot of one zmap cell from the cached data.
+
+        Args:
+            category_index: Position of the category on the zmap's x axis
+            target: The target column
+            other: The other column
+
+        Returns:
+            go.Figure, or None if the cell has no data
+        """
+        if not 0 <= category_index < len(self.category_rows):
+            print(f"No zmap category at index {category_index}")
+            return None
+        category = self.categories[category_index]
+
+        if target not in self.combined_df.columns or other not in self.combined_df.columns:
+            print(f"Columns {target} and/or {other} not found in data")
+            return None
+
+        rows = self.category_rows[category_index]
+        if not len(rows):
+            print(f"No data for {self.categorical_column}={category}")
+            return None
+
+        x_data = pd.to_numeric(self.combined_df[target].iloc[rows], errors='coerce').to_numpy(dtype=float)
+        y_data = pd.to_numeric(self.combined_df[other].iloc[rows], errors='coerce').to_numpy(dtype=float)
+
+        print(f"Found {len(rows)} data points for plotting")
+
+        # Compute the best fit line on the points with both values
+        valid = np.isfinite(x_data) & np.isfinite(y_data)
+        x_line = np.array([np.nanmin(x_data), np.nanmax(x_data)]) if valid.any() else np.zeros(2)
+        try:
+            slope, intercept = np.polyfit(x_data[valid], y_data[valid], 1)
+            y_line = slope * x_line + intercept
+            r_value = np.corrcoef(x_data[valid], y_data[valid])[0, 1]
+        except Exception as e:
+            print(f"Error computing best fit: {e}")
+            # Default values if fit fails
+            y_line = np.zeros_like(x_line)
+            r_value = 0
+
+        scatter_fig = go.Figure()
+        scatter_fig.add_trace(go.Scatter(
+            x=x_data, y=y_data, mode='markers', name='Data Points'
+        ))
+        scatter_fig.add_trace(go.Scatter(
+            x=x_line, y=y_line, mode='lines',
+            name=f'Best Fit (r = {r_value:.3f})'
+        ))
+        scatter_fig.update_layout(
+            title=f"Scatter: {target} vs {other} for {self.categorical_column}={category}",
+            xaxis_title=target,
+            yaxis_title=other,
+            paper_bgcolor="white",
+            plot_bgcolor="white",
+            margin=dict(l=50, r=50, t=50, b=50)
+        )
+        return scatter_fig
+
+    @staticmethod
+    def _json_category(value):
+        """Returns a category value as a JSON-safe value for the page."""
+        if isinstance(value, np.generic):
+            value = value.item()
+        if value is None or isinstance(value, (str, bool, int, float)):
+            return value
+        return str(value)
     
     def _apply_styling(self, fig, setup_model):
         """
@@ -519,28 +458,28 @@ class ZmapPlotMaker:
             fig.update_yaxes(showticklabels=advanced.show_tick_marks)
     
     def load_current_plot(self):
-        """Load the current plot from file."""
-        if not self.heatmap_files:
+        """Returns the URL of the Z-map page (which opens on the current target)."""
+        if not self.page_url:
             print("No plots available")
             return None
         
-        file_path, target = self.heatmap_files[self.current_index]
-        self.current_target = target
-        
-        print(f"Loading plot: {file_path} with target {target}")
+        self.current_target = self.targets[self.current_index]
+        print(f"Loading Z-map page: {self.page_url} with target {self.current_target}")
         
-        return file_path
+        return self.page_url
     
     def next_plot(self):
-        """Move to the next plot in the sequence."""
-        if not self.heatmap_files:
+        """Move to the next target; returns its index, which the page draws with showTarget."""
+        if not self.targets:
             return None
-        self.current_index = (self.current_index + 1) % len(self.heatmap_files)
-        return self.load_current_plot()
+        self.current_index = (self.current_index + 1) % len(self.targets)
+        self.current_target = self.targets[self.current_index]
+        return self.current_index
     
     def prev_plot(self):
-        """Move to the previous plot in the sequence."""
-        if not self.heatmap_files:
+        """Move to the previous target; returns its index, which the page draws with showTarget."""
+        if not self.targets:
             return None
-        self.current_index = (self.current_index - 1) % len(self.heatmap_files)
-        return self.load_current_plot()
+        self.current_index = (self.current_index - 1) % len(self.targets)
+        self.current_target = self.targets[self.current_index]
+        return self.current_index
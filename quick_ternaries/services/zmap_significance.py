@@ -0,0 +1,170 @@
+"""Resampling significance tests and multiple-testing correction for Z-map correlations"""
+
+from typing import Callable, Optional
+
+import numpy as np
+
+from quick_ternaries.services.zmap_correlation import GroupedCorrelations
+from quick_ternaries.utils.parallel import MAX_PLOT_WORKERS, process_imap
+
+
+# 'asymptotic' keeps the t-test p-values of the correlation engine
+SIGNIFICANCE_METHODS = ['asymptotic', 'permutation', 'bootstrap']
+
+CORRECTION_METHODS = ['none', 'bonferroni', 'holm', 'fdr_bh']
+
+# Upper bound on the resampled values held at once (resamples x rows x columns)
+BATCH_ELEMENTS = 4_000_000
+
+# Resampled correlations this close to the observed one count as at least as extreme
+_TOLERANCE = 1e-12
+
+
+def _resample_counts(args) -> np.ndarray:
+    """
+    Counts resampled correlations for one category (module-level for the process pool).
+
+    Args:
+        args: (standardized, observed, method, n_resamples, seed): the
+            category's standardized columns, their correlation matrix, the
+            method, how many resamples to draw and the random seed
+
+    Returns:
+        For 'permutation', how often |r| of column i against permuted column j
+        reached the observed |r|; for 'bootstrap', how often the resampled r
+        fell on each side of 0, as an array of shape (2, columns, columns)
+    """
+    standardized, observed, method, n_resamples, seed = args
+    rng = np.random.default_rng(seed)
+    n, k = standardized.shape
+    batch_size = max(1, BATCH_ELEMENTS // max(n * k, 1))
+    counts = np.zeros((2, k, k))
+    threshold = np.abs(observed) - _TOLERANCE
+
+    done = 0
+    while done < n_resamples:
+        batch = min(batch_size, n_resamples - done)
+        if method == 'permutation':
+            # Permuting the rows of the (rank) columns breaks their pairing;
+            # one product gives every pair's null correlation at once
+            rows = rng.permuted(np.broadcast_to(np.arange(n), (batch, n)), axis=1)
+            resampled = np.matmul(standardized.T, standardized[rows])
+            counts[0] += (np.abs(resampled) >= threshold).sum(axis=0)
+        else:
+            # Resampled rows are standardized again (ranks are kept from the full sample)
+            sample = standardized[rng.integers(0, n, size=(batch, n))]
+            sample = sample - sample.mean(axis=1, keepdims=True)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sample = sample / np.sqrt((sample ** 2).sum(axis=1, keepdims=True))
+            resampled = np.matmul(sample.transpose(0, 2, 1), sample)
+            counts[0] += (resampled <= 0).sum(axis=0)
+            counts[1] += (resampled >= 0).sum(axis=0)
+        done += batch
+    return counts
+
+
+def resampled_p_values(
+        correlations: GroupedCorrelations,
+        method: str,
+        n_resamples: int = 1000,
+        seed: int = 0,
+        max_workers: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None) -> Optional[np.ndarray]:
+    """
+    Two-sided p-values of every correlation from permutations or bootstrap resamples.
+
+    Unlike the t-test p-values, these do not rely on large samples. Each
+    category's resamples are drawn in batches and correlated with one batched
+    matrix product; categories (and, with few categories, parts of their
+    resamples) run in parallel on the process pool.
+
+    Args:
+        correlations: Correlations from the correlation engine
+        method: 'permutation' or 'bootstrap'
+        n_resamples: Permutations or bootstrap resamples per category
+        seed: Random seed (results do not depend on the number of workers)
+        max_workers: Worker limit for the process pool
+        progress: Called with (jobs done, total jobs) after each job
+        cancelled: Polled after each job; returning True stops the test
+
+    Returns:
+        p-values shaped like correlations.r (NaN where r is NaN), or None if cancelled
+    """
+    if method not in SIGNIFICANCE_METHODS[1:]:
+        raise ValueError(f"Unknown resampling method: {method}")
+    groups = [g for g in range(len(correlations.categories)) if correlations.standardized(g) is not None]
+
+    # Split each category's resamples so that even a single category keeps the workers
+    # busy (by a fixed count, so that the draws do not depend on the machine)
+    parts = max(1, min(MAX_PLOT_WORKERS // max(len(groups), 1), n_resamples))
+    sizes = [len(part) for part in np.array_split(np.arange(n_resamples), parts)]
+    seeds = np.random.SeedSequence(seed).spawn(len(groups) * parts)
+    jobs = [
+        (correlations.standardized(g), correlations.r[g], method, size, seeds[i * parts + j])
+        for i, g in enumerate(groups)
+        for j, size in enumerate(sizes)
+    ]
+
+    counts = np.zeros((len(correlations.categories), 2) + correlations.r.shape[1:])
+    results = process_imap(_resample_counts, jobs, max_workers=max_workers)
+    for done, result in enumerate(results, start=1):
+        counts[groups[(done - 1) // parts]] += result
+        if progress is not None:
+            progress(done, len(jobs))
+        if cancelled is not None and cancelled():
+            results.close()
+            return None
+
+    if method == 'permutation':
+        # Column i against permuted j and j against permuted i are both draws from the null
+        extreme = counts[:, 0] + counts[:, 0].transpose(0, 2, 1)
+        p = (extreme + 1) / (2 * n_resamples + 1)
+    else:
+        p = np.minimum(1.0, (2 * np.minimum(counts[:, 0], counts[:, 1]) + 1) / (n_resamples + 1))
+    diagonal = np.arange(correlations.r.shape[1])
+    p[:, diagonal, diagonal] = 0.0
+    p[np.isnan(correlations.r)] = np.nan
+    return p
+
+
+def adjust_p_values(p: np.ndarray, method: str) -> np.ndarray:
+    """
+    Corrects p-values for testing every pair of columns in every category.
+
+    The family is each distinct pair (i < j) of each category with a p-value;
+    the adjusted values are mirrored to (j, i) and the diagonal is kept.
+
+    Args:
+        p: p-values of shape (categories, columns, columns)
+        method: 'none', 'bonferroni', 'holm' (step-down family-wise error
+            rate) or 'fdr_bh' (Benjamini-Hochberg false discovery rate)
+
+    Returns:
+        The adjusted p-values
+    """
+    if method not in CORRECTION_METHODS:
+        raise ValueError(f"Unknown correction method: {method}")
+    if method == 'none':
+        return p
+
+    g, i, j = np.nonzero(np.triu(np.ones(p.shape[1:], dtype=bool), k=1)[None, :, :] & ~np.isnan(p))
+    values = p[g, i, j]
+    m = len(values)
+    if method == 'bonferroni':
+        adjusted = values * m
+    else:
+        order = np.argsort(values, kind='stable')
+        ranked = values[order]
+        if method == 'holm':
+            adjusted_sorted = np.maximum.accumulate(ranked * (m - np.arange(m)))
+        else:
+            adjusted_sorted = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+        adjusted = np.empty(m)
+        adjusted[order] = adjusted_sorted
+    adjusted = np.minimum(adjusted, 1.0)
+
+    result = p.copy()
+    result[g, i, j] = adjusted
+    result[g, j, i] = adjusted
+    return result
@@ -1,24 +1,30 @@
-from typing import List
+from typing import List, Tuple
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from scipy.stats import gaussian_kde
 
+def ternary_to_cartesian(
+        a: np.ndarray,
+        b: np.ndarray,
+        c: np.ndarray) -> np.array:
+    """Transform ternary (A, B, C) arrays into an (n, 2) array of Cartesian coordinates."""
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    c = np.asarray(c, dtype=float)
+    total = a + b + c
+    x = 0.5 * (2*b + c) / total
+    y = (np.sqrt(3)/2) * c / total
+    return np.column_stack([x, y])
+
 def transform_to_cartesian(
         df: pd.DataFrame, 
         colA: str, 
         colB: str, 
         colC: str) -> np.array:
     """Transform ternary (A, B, C) data into 2D Cartesian coordinates for plotting and KDE."""
-    # Normalization might not be needed if df is already normalized
-    total = df.sum(axis=1)
-    A = df[colA] / total
-    B = df[colB] / total
-    C = df[colC] / total
-    x = 0.5 * (2*B + C) / (A + B + C)
-    y = (np.sqrt(3)/2) * C / (A + B + C)
-    return np.vstack([x, y]).T
+    return ternary_to_cartesian(df[colA].to_numpy(), df[colB].to_numpy(), df[colC].to_numpy())
 
 def compute_kde_contours(
         data: np.array, 
@@ -50,9 +56,9 @@ def compute_kde_contours(
     except TypeError:
         return False, []
 
-    fig, ax = plt.subplots()
+    # A bare Figure (no pyplot) keeps this safe to call from worker threads and processes
+    ax = Figure().add_subplot()
     CS = ax.contour(X, Y, Z, levels=sorted(density_levels))
-    plt.close(fig)
 
     # Check if contours are generated and are sufficiently smooth
     min_segment_length = 12  # Minimum number of points in a valid contour segment
@@ -67,6 +73,21 @@ def compute_kde_contours(
 
     #return CS.allsegs  # Returns all contour segments for each requested level
 
+def compute_kde_contours_job(args: Tuple[np.array, List[float]]):
+    """
+    Picklable single-argument wrapper around ``compute_kde_contours`` for worker pools.
+
+    A failing KDE (e.g. a singular covariance matrix) is reported as an
+    unsuccessful result instead of raising, so one bad trace does not abort
+    the other jobs in the pool.
+    """
+    data, levels = args
+    try:
+        return compute_kde_contours(data, levels)
+    except Exception as e:
+        print(f"Error computing KDE contours: {e}")
+        return False, []
+
 def convert_contour_to_ternary(contour: List[np.array]):
     """Convert 2D contour coordinates back to ternary coordinates."""
     # Assume contour is a list of arrays; convert each contour segment
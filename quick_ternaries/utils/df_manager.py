@@ -1,4 +1,5 @@
 
+import threading
 from typing import Dict, Optional
 
 import pandas as pd
@@ -13,6 +14,8 @@ class DataframeManager:
     def __init__(self):
         self._dataframes: Dict[str, pd.DataFrame] = {}
         self._display_to_metadata: Dict[str, DataFileMetadata] = {}
+        # Traces are built on worker threads; only one of them should read a file from disk
+        self._load_lock = threading.RLock()
 
     def load_dataframe(self, metadata: DataFileMetadata) -> str:
         """Loads a dataframe based on metadata and returns an identifier."""
@@ -93,14 +96,19 @@ class DataframeManager:
         if metadata.df_id and metadata.df_id in self._dataframes:
             return self._dataframes[metadata.df_id]
 
-        # Load the dataframe if needed
-        df_id = self.load_dataframe(metadata)
-        if df_id:
-            # Update the metadata with the df_id
-            metadata.df_id = df_id
-            # Add to display mapping
-            self._display_to_metadata[str(metadata)] = metadata
-            return self._dataframes[df_id]
+        with self._load_lock:
+            # Another thread may have loaded it while we waited
+            if metadata.df_id and metadata.df_id in self._dataframes:
+                return self._dataframes[metadata.df_id]
+
+            # Load the dataframe if needed
+            df_id = self.load_dataframe(metadata)
+            if df_id:
+                # Update the metadata with the df_id
+                metadata.df_id = df_id
+                # Add to display mapping
+                self._display_to_metadata[str(metadata)] = metadata
+                return self._dataframes[df_id]
         return None
 
     def remove_dataframe(self, df_id: str) -> bool:
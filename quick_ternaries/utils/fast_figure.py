@@ -0,0 +1,153 @@
+"""Validation-free figure assembly for the preview: plain dicts sharing the traces' NumPy arrays"""
+
+import json
+import math
+from typing import Iterable, Optional
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from quick_ternaries.utils.typed_arrays import numeric_array, typed_array_spec
+
+
+def trace_properties(trace) -> dict:
+    """
+    Returns the properties of a trace as a plain dict, without copying its arrays.
+
+    Args:
+        trace: A plotly trace object or a trace dict
+
+    Returns:
+        The trace's properties (including 'type'); treat it as read-only, it
+        is shared with the trace
+    """
+    if isinstance(trace, dict):
+        return trace
+    # A trace object keeps its validated properties as plain dicts; to_plotly_json
+    # deep-copies them, which takes seconds for object customdata of large traces
+    return trace._props
+
+
+def figure_properties(fig) -> dict:
+    """
+    Returns a figure as {'data': [trace dicts], 'layout': layout dict}, with the
+    trace arrays as NumPy arrays (go.Figure.to_plotly_json encodes them as
+    typed array specs) and without copying them.
+
+    Args:
+        fig: A go.Figure or FastFigure
+    """
+    if isinstance(fig, FastFigure):
+        return fig.to_plotly_json()
+    return {
+        'data': [trace_properties(trace) for trace in fig.data],
+        'layout': fig.layout.to_plotly_json(),
+    }
+
+
+def _default_template() -> Optional[dict]:
+    """Returns the layout template go.Figure applies to figures without one, as a dict."""
+    template = pio.templates.default
+    if template is None:
+        return None
+    if not isinstance(template, go.layout.Template):
+        template = pio.templates[template]
+    return template.to_plotly_json()
+
+
+class FastFigure:
+    """
+    A figure assembled as plain dicts, for the preview.
+
+    Adding traces and serializing skip plotly's property validation and the
+    deep copies go.Figure makes of every trace; the trace arrays are shared
+    with the traces the figure was built from. ``to_figure`` validates the
+    result into a go.Figure (for exports and tests).
+    """
+
+    def __init__(self, data: Iterable = (), layout=None):
+        """
+        Args:
+            data: Plotly trace objects or trace dicts
+            layout: A go.Layout or layout dict
+        """
+        self._data = [trace_properties(trace) for trace in data]
+        if hasattr(layout, 'to_plotly_json'):
+            layout = layout.to_plotly_json()
+        self._layout = dict(layout or {})
+        # go.Figure fills in the default template the same way
+        if self._layout.get('template') is None:
+            template = _default_template()
+            if template is not None:
+                self._layout['template'] = template
+
+    def add_trace(self, trace) -> 'FastFigure':
+        """Appends a plotly trace object or trace dict."""
+        self._data.append(trace_properties(trace))
+        return self
+
+    def to_plotly_json(self) -> dict:
+        """Returns the figure as {'data': [...], 'layout': {...}}, without copying."""
+        return {'data': self._data, 'layout': self._layout}
+
+    def to_json(self) -> str:
+        """Serializes the figure (see to_json)."""
+        return to_json(self.to_plotly_json())
+
+    def to_figure(self) -> go.Figure:
+        """Validates the figure into a go.Figure."""
+        return go.Figure(self.to_plotly_json())
+
+
+def _json_value(value):
+    """Converts NumPy and pandas values to what plotly's JSON has for them; other values are returned as they are."""
+    if hasattr(value, 'to_numpy') and not isinstance(value, np.ndarray):
+        # pandas Series and Index
+        value = value.to_numpy()
+    if isinstance(value, np.ndarray):
+        array = numeric_array(value)
+        if array is not None and array.ndim in (1, 2):
+            return typed_array_spec(array)
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _finite(value):
+    """Returns a value with NaN and infinite floats (also in nested dicts, lists and arrays) replaced by None."""
+    value = _json_value(value)
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+class _NumpyJSONEncoder(json.JSONEncoder):
+    """Encodes NumPy arrays (numbers as typed arrays) and scalars in one pass."""
+
+    def default(self, value):
+        converted = _json_value(value)
+        if converted is value:
+            return super().default(value)
+        return converted
+
+
+def to_json(value) -> str:
+    """
+    Serializes plotly figure data that holds NumPy arrays.
+
+    Number arrays become base64 typed arrays (as in validated figures), other
+    arrays lists; NaN and infinity become null, as plotly.js expects.
+    Unlike plotly's JSON encoder, this does not encode the output a second
+    time to clean it up: the rare value with NaN is converted up front.
+    """
+    try:
+        return json.dumps(value, cls=_NumpyJSONEncoder, allow_nan=False, separators=(',', ':'))
+    except ValueError:
+        # A NaN or infinity somewhere outside a number array
+        return json.dumps(_finite(value), cls=_NumpyJSONEncoder, allow_nan=False, separators=(',', ':'))
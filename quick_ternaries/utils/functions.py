@@ -4,33 +4,16 @@ from typing import TYPE_CHECKING
 
 import pandas as pd
 import numpy as np
-from molmass import Formula
 from PySide6.QtWidgets import QMessageBox, QFileDialog
 
 from quick_ternaries.models.data_file_metadata_model import DataFileMetadata
+# Re-exported here for the views; the memoized implementation lives with the calculator
+from quick_ternaries.services.molar_mass_calculator import is_valid_formula
 
 if TYPE_CHECKING:
     from PySide6.QtWidgets import QWidget
     from quick_ternaries.models.data_library_model import DataLibraryModel
 
-def is_valid_formula(formula: str) -> bool:
-    """
-    Checks if the provided chemical formula is valid by attempting to compute its molar mass using molmass.
-    
-    Parameters:
-        formula (str): The chemical formula to validate.
-    
-    Returns:
-        bool: True if the formula is valid and a molar mass can be computed, False otherwise.
-    """
-    try:
-        # Create a Formula object which computes properties including molar mass.
-        f = Formula(formula)
-        # Optionally, check that the computed molar mass is positive.
-        return f.mass > 0
-    except Exception:
-        return False
-    
 def recursive_to_dict(obj):
     """Recursively convert dataclass objects (or lists/dicts) to
     dictionaries."""
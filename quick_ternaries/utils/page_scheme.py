@@ -0,0 +1,61 @@
+"""QtWebEngine side of the in-memory page store: the URL scheme and its request handler"""
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+from PySide6.QtWebEngineCore import (
+    QWebEngineProfile,
+    QWebEngineUrlRequestJob,
+    QWebEngineUrlScheme,
+    QWebEngineUrlSchemeHandler,
+)
+
+from quick_ternaries.utils.page_store import PAGE_SCHEME, resolve_resource
+
+
+def register_page_scheme():
+    """
+    Registers the page scheme with QtWebEngine.
+
+    Must be called before the QApplication is created.
+    """
+    if not QWebEngineUrlScheme.schemeByName(PAGE_SCHEME.encode()).name().isEmpty():
+        return
+    scheme = QWebEngineUrlScheme(PAGE_SCHEME.encode())
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    # Pages load the bundled fonts from file URLs and qwebchannel.js from qrc,
+    # and fetch their data blobs from the same host
+    scheme.setFlags(
+        QWebEngineUrlScheme.Flag.SecureScheme
+        | QWebEngineUrlScheme.Flag.LocalAccessAllowed
+        | QWebEngineUrlScheme.Flag.FetchApiAllowed
+    )
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+class PageSchemeHandler(QWebEngineUrlSchemeHandler):
+    """Answers page scheme requests from the page stores, without touching the disk."""
+
+    def requestStarted(self, job: QWebEngineUrlRequestJob):
+        url = job.requestUrl()
+        resource = resolve_resource(url.host(), url.path())
+        if resource is None:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+        data, mime_type = resource
+        # The job owns the buffer and deletes it once the reply is read
+        buffer = QBuffer(job)
+        buffer.setData(QByteArray(data))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        job.reply(mime_type.encode(), buffer)
+
+
+# One handler serves every store; the profile does not take ownership of it
+_HANDLER = None
+
+
+def install_page_scheme_handler(profile: QWebEngineProfile):
+    """Installs the page scheme handler on a profile (once)."""
+    global _HANDLER
+    if _HANDLER is None:
+        _HANDLER = PageSchemeHandler()
+    if profile.urlSchemeHandler(PAGE_SCHEME.encode()) is None:
+        profile.installUrlSchemeHandler(PAGE_SCHEME.encode(), _HANDLER)
@@ -0,0 +1,105 @@
+"""In-memory pages, data blobs and static assets, served to the plot view over the app's URL scheme"""
+
+import threading
+import uuid
+import weakref
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Union
+
+from quick_ternaries.utils.plotly_html import plotly_js_bundle
+
+
+# URL scheme of the in-memory resources (registered with QtWebEngine in page_scheme)
+PAGE_SCHEME = 'quick-ternaries'
+
+# Absolute path of the plotly.js bundle on every host, for pages served from a store
+PLOTLY_JS_PATH = '/static/plotly.min.js'
+
+
+@lru_cache(maxsize=1)
+def _plotly_js() -> Optional[bytes]:
+    """Reads the plotly.js bundle once."""
+    bundle = plotly_js_bundle()
+    return bundle.read_bytes() if bundle is not None else None
+
+
+def _static_asset(path: str) -> Optional[Tuple[bytes, str]]:
+    """Returns a static asset shared by all hosts, or None."""
+    if path == PLOTLY_JS_PATH:
+        data = _plotly_js()
+        return (data, 'application/javascript') if data is not None else None
+    return None
+
+
+class PageStore:
+    """
+    Keeps the generated pages and data of one window in memory.
+
+    Each store has its own URL host, so two windows never serve each other's
+    pages; nothing is written to disk. A page put at ``plot.html`` is loaded
+    from ``quick-ternaries://<host>/plot.html``.
+    """
+
+    def __init__(self):
+        self.host = uuid.uuid4().hex
+        self._resources: Dict[str, Tuple[bytes, str]] = {}
+        # Resources are read on QtWebEngine's IO thread
+        self._lock = threading.Lock()
+        _STORES[self.host] = self
+
+    def put(self, path: str, data: Union[str, bytes], mime_type: str = 'text/html') -> str:
+        """
+        Stores a resource, replacing any at the same path.
+
+        Args:
+            path: Path of the resource on this store's host (e.g. 'zmap/Fe.html')
+            data: The content; text is encoded as UTF-8
+            mime_type: Content type sent with the resource (pages declare their charset)
+
+        Returns:
+            The URL that loads the resource
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        path = '/' + path.lstrip('/')
+        with self._lock:
+            self._resources[path] = (data, mime_type)
+        return self.url(path)
+
+    def url(self, path: str) -> str:
+        """Returns the URL of a path on this store's host."""
+        return f"{PAGE_SCHEME}://{self.host}/{path.lstrip('/')}"
+
+    def get(self, path: str) -> Optional[Tuple[bytes, str]]:
+        """Returns the (content, mime type) of a stored resource or static asset, or None."""
+        with self._lock:
+            resource = self._resources.get(path)
+        return resource if resource is not None else _static_asset(path)
+
+    def remove(self, prefix: str = ''):
+        """Drops the resources whose path starts with a prefix (all of them by default)."""
+        prefix = '/' + prefix.lstrip('/')
+        with self._lock:
+            self._resources = {
+                path: resource for path, resource in self._resources.items()
+                if not path.startswith(prefix)
+            }
+
+
+# Live stores by host; a closed window's store goes away with it
+_STORES: 'weakref.WeakValueDictionary[str, PageStore]' = weakref.WeakValueDictionary()
+
+
+def resolve_resource(host: str, path: str) -> Optional[Tuple[bytes, str]]:
+    """
+    Finds the resource a request URL points to.
+
+    Args:
+        host: Host of the URL (a store's host)
+        path: Path of the URL
+
+    Returns:
+        (content, mime type), or None if there is no such store or resource
+    """
+    store = _STORES.get(host)
+    return store.get(path) if store is not None else None
@@ -0,0 +1,132 @@
+"""Ordered fan-out of independent plot-building jobs to a worker pool"""
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Upper bound on workers used to build one figure; trace building is mostly
+# NumPy/SciPy work, so more threads than cores only adds contention
+MAX_PLOT_WORKERS = 8
+
+
+def default_worker_count(n_jobs: int) -> int:
+    """Returns the number of workers to use for ``n_jobs`` independent jobs."""
+    return max(1, min(n_jobs, os.cpu_count() or 1, MAX_PLOT_WORKERS))
+
+
+def ordered_map(
+        func: Callable[[T], R],
+        items: Iterable[T],
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None) -> List[R]:
+    """
+    Applies ``func`` to every item on a thread pool and returns the results in input order.
+
+    Threads are enough for trace building because the heavy parts (masking,
+    projections, KDE evaluation) run inside NumPy/SciPy with the GIL released.
+    A single job, or a single worker, runs inline without a pool.
+
+    Args:
+        func: Function to apply to each item
+        items: Items to process
+        max_workers: Worker limit; defaults to ``default_worker_count``
+        executor: Optional existing executor to submit to instead of a new thread pool
+
+    Returns:
+        List of results, ordered like ``items``. The first exception raised by
+        ``func`` (in input order) is re-raised, as in a plain loop.
+    """
+    items = list(items)
+    if executor is not None:
+        return list(executor.map(func, items))
+
+    workers = max_workers if max_workers is not None else default_worker_count(len(items))
+    if len(items) <= 1 or workers <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='plot-worker') as pool:
+        return list(pool.map(func, items))
+
+
+def process_map(
+        func: Callable[[T], R],
+        items: Iterable[T],
+        max_workers: Optional[int] = None) -> List[R]:
+    """
+    Applies a picklable top-level ``func`` to every item on a process pool, in input order.
+
+    Used for pure-Python-heavy work such as KDE contouring, where threads would
+    serialize on the GIL. Starting processes costs more than one job saves, so a
+    single job runs inline, and if the platform cannot start worker processes
+    (frozen apps, sandboxes) the work falls back to the thread pool.
+
+    Args:
+        func: Module-level function to apply to each item
+        items: Picklable items to process
+        max_workers: Worker limit; defaults to ``default_worker_count``
+
+    Returns:
+        List of results, ordered like ``items``
+    """
+    items = list(items)
+    workers = max_workers if max_workers is not None else default_worker_count(len(items))
+    if len(items) <= 1 or workers <= 1:
+        return [func(item) for item in items]
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(func, items))
+    except (BrokenProcessPool, OSError, NotImplementedError) as e:
+        print(f"Process pool unavailable ({e}), falling back to threads")
+        return ordered_map(func, items, max_workers=workers)
+
+
+def process_imap(
+        func: Callable[[T], R],
+        items: Iterable[T],
+        max_workers: Optional[int] = None) -> Iterator[R]:
+    """
+    Like ``process_map``, but yields each result (in input order) as soon as it is ready.
+
+    Lets the caller report progress between jobs and stop early: closing the
+    generator cancels the jobs that have not started. Falls back to running
+    the remaining jobs inline if the process pool cannot be used.
+
+    Args:
+        func: Module-level function to apply to each item
+        items: Picklable items to process
+        max_workers: Worker limit; defaults to ``default_worker_count``
+
+    Yields:
+        The result of each item, in input order
+    """
+    items = list(items)
+    workers = max_workers if max_workers is not None else default_worker_count(len(items))
+    if len(items) <= 1 or workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    done = 0
+    try:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    except (OSError, NotImplementedError) as e:
+        print(f"Process pool unavailable ({e}), running inline")
+        pool = None
+    if pool is not None:
+        try:
+            futures = [pool.submit(func, item) for item in items]
+            for future in futures:
+                result = future.result()
+                done += 1
+                yield result
+        except (BrokenProcessPool, OSError) as e:
+            print(f"Process pool unavailable ({e}), running inline")
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    for item in items[done:]:
+        yield func(item)
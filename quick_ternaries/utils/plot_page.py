@@ -0,0 +1,290 @@
+"""The persistent plot page: loaded once, then updated in place with Plotly.react over QWebChannel"""
+
+from typing import List, Optional
+
+from plotly.offline import get_plotlyjs
+
+from quick_ternaries.utils.fast_figure import figure_properties, to_json
+from quick_ternaries.utils.plotly_html import inject_open_sans_font_faces, plotly_js_uri
+from quick_ternaries.utils.typed_arrays import encode_trace
+
+
+# Passed to Plotly.react with every figure (to_html's default for embedded figures)
+PAGE_CONFIG_JSON = '{"responsive": true}'
+
+PLOT_PAGE_SCRIPT = """
+document.addEventListener("DOMContentLoaded", function() {
+    new QWebChannel(qt.webChannelTransport, function (channel) {
+        window.plotlyInterface = channel.objects.plotlyInterface;
+        var plotElement = document.getElementById('plot');
+        var handlersInstalled = false;
+
+        // Applies a figure update; traces that did not change arrive as null and keep the page's copy
+        function showFigure(payload) {
+            if (!payload) {
+                return;
+            }
+            var figure = JSON.parse(payload);
+            var current = plotElement.data || [];
+            // An update for traces this page never received (it loaded mid-update): ask for the whole figure
+            if (figure.data.some(function(trace, i) { return trace === null && !current[i]; })) {
+                window.plotlyInterface.get_figure(showFigure);
+                return;
+            }
+            var data = figure.data.map(function(trace, i) {
+                return trace === null ? current[i] : trace;
+            });
+            Plotly.react(plotElement, data, figure.layout, figure.config).then(function() {
+                if (!handlersInstalled) {
+                    installHandlers();
+                    handlersInstalled = true;
+                }
+                refreshZoomedTraces();
+            });
+        }
+        window.plotlyInterface.figure_changed.connect(showFigure);
+        window.plotlyInterface.get_figure(showFigure);
+
+        // Only the selection region is sent; Python finds the points inside it
+        function sendSelection(eventData) {
+            var region = null;
+            if (eventData && eventData.lassoPoints) {
+                region = {lasso: [eventData.lassoPoints.x, eventData.lassoPoints.y]};
+            } else if (eventData && eventData.range) {
+                region = {range: [eventData.range.x, eventData.range.y]};
+            }
+            // Traces hidden from the legend cannot be selected
+            var curveNumbers = [];
+            plotElement._fullData.forEach(function(trace, i) {
+                if (trace.visible === true) {
+                    curveNumbers.push(i);
+                }
+            });
+            window.plotlyInterface.receive_selection(JSON.stringify(region), JSON.stringify(curveNumbers));
+        }
+
+        // Decimated line traces are re-decimated for the visible x range on zoom
+        var refineToken = 0;
+        function refineDecimated(eventData) {
+            var x0, x1;
+            if (eventData['xaxis.autorange']) {
+                x0 = -Number.MAX_VALUE;
+                x1 = Number.MAX_VALUE;
+            } else if (eventData['xaxis.range[0]'] !== undefined) {
+                x0 = eventData['xaxis.range[0]'];
+                x1 = eventData['xaxis.range[1]'];
+            } else if (eventData['xaxis.range']) {
+                x0 = eventData['xaxis.range'][0];
+                x1 = eventData['xaxis.range'][1];
+            } else {
+                return;
+            }
+            // Log axis ranges are in powers of ten
+            if (plotElement._fullLayout.xaxis.type === 'log' && x1 !== Number.MAX_VALUE) {
+                x0 = Math.pow(10, x0);
+                x1 = Math.pow(10, x1);
+            }
+            var token = ++refineToken;
+            // See line_decimation.DECIMATED_UID_PREFIX
+            plotElement.data.forEach(function(trace, i) {
+                if (!trace.uid || trace.uid.indexOf('decimated-') !== 0) {
+                    return;
+                }
+                window.plotlyInterface.get_decimated_points(trace.uid, x0, x1, function(update) {
+                    // Ignore answers for ranges the user already zoomed away from
+                    if (token !== refineToken || !update) {
+                        return;
+                    }
+                    Plotly.restyle(plotElement, JSON.parse(update), [i]);
+                });
+            });
+        }
+
+        // Level-of-detail marker traces stream in the points of the new viewport on zoom
+        var viewportToken = 0;
+        function refineViewport(eventData) {
+            var keys = Object.keys(eventData);
+            var touches = function(prefix) {
+                return keys.some(function(key) { return key.indexOf(prefix) === 0; });
+            };
+            var viewport;
+            if (touches('ternary.')) {
+                // Ternary zoom raises the axis minimums; send them as fractions of the sum
+                var ternary = plotElement._fullLayout.ternary;
+                var total = ternary.sum || 1;
+                viewport = {ternary: [
+                    ternary.aaxis.min / total, ternary.baxis.min / total, ternary.caxis.min / total
+                ]};
+            } else if (eventData['xaxis.autorange'] || eventData['yaxis.autorange']) {
+                viewport = null;
+            } else if (touches('xaxis.') || touches('yaxis.')) {
+                var toData = function(axis) {
+                    return axis.range.map(function(v) {
+                        return axis.type === 'log' ? Math.pow(10, v) : v;
+                    });
+                };
+                viewport = {x: toData(plotElement._fullLayout.xaxis), y: toData(plotElement._fullLayout.yaxis)};
+            } else {
+                return;
+            }
+            var token = ++viewportToken;
+            // See viewport_lod.VIEWPORT_UID_PREFIX
+            plotElement.data.forEach(function(trace, i) {
+                if (!trace.uid || trace.uid.indexOf('viewport-') !== 0) {
+                    return;
+                }
+                window.plotlyInterface.get_viewport_points(trace.uid, JSON.stringify(viewport), function(update) {
+                    // Ignore answers for viewports the user already left
+                    if (token !== viewportToken || !update) {
+                        return;
+                    }
+                    Plotly.restyle(plotElement, JSON.parse(update), [i]);
+                });
+            });
+        }
+
+        // A new figure keeps the user's zoom, so its sampled traces are refined for that view
+        function refreshZoomedTraces() {
+            var fullLayout = plotElement._fullLayout;
+            if (fullLayout.ternary) {
+                var ternary = fullLayout.ternary;
+                if (ternary.aaxis.min > 0 || ternary.baxis.min > 0 || ternary.caxis.min > 0) {
+                    refineViewport({'ternary.aaxis.min': ternary.aaxis.min});
+                }
+            } else if (fullLayout.xaxis && fullLayout.yaxis) {
+                if (fullLayout.xaxis.autorange === false) {
+                    refineDecimated({'xaxis.range': fullLayout.xaxis.range.slice()});
+                }
+                if (fullLayout.xaxis.autorange === false || fullLayout.yaxis.autorange === false) {
+                    refineViewport({'xaxis.range': fullLayout.xaxis.range.slice()});
+                }
+            }
+        }
+
+        function installHandlers() {
+            plotElement.on('plotly_selected', sendSelection);
+            plotElement.on('plotly_deselect', function() {
+                sendSelection(null);
+            });
+
+            // Traces with on-demand hover carry only a point ID; fetch the details from Python
+            var tooltip = document.createElement('div');
+            tooltip.style.cssText = 'position:fixed;display:none;pointer-events:none;z-index:1000;' +
+                'background:rgba(255,255,255,0.95);border:1px solid #888;border-radius:3px;' +
+                'padding:4px 6px;font:12px "Open Sans",Arial,sans-serif;';
+            document.body.appendChild(tooltip);
+            var hoverToken = 0;
+            plotElement.on('plotly_hover', function(eventData) {
+                var pt = eventData.points[0];
+                if (!pt || !pt.data.meta || pt.data.hoverinfo !== 'none') {
+                    return;
+                }
+                var token = ++hoverToken;
+                var x = eventData.event.clientX, y = eventData.event.clientY;
+                window.plotlyInterface.get_hover_html(pt.data.meta, pt.pointNumber, function(html) {
+                    // Ignore answers for points the mouse already left
+                    if (token !== hoverToken || !html) {
+                        return;
+                    }
+                    tooltip.innerHTML = html;
+                    tooltip.style.left = (x + 12) + 'px';
+                    tooltip.style.top = (y + 12) + 'px';
+                    tooltip.style.display = 'block';
+                });
+            });
+            plotElement.on('plotly_unhover', function() {
+                hoverToken++;
+                tooltip.style.display = 'none';
+            });
+
+            plotElement.on('plotly_relayout', refineDecimated);
+            plotElement.on('plotly_relayout', refineViewport);
+        }
+    });
+});
+"""
+
+
+def _plotly_js_tag(src: Optional[str] = None) -> str:
+    """Return the script tag that loads plotly.js, from the local bundle when there is one."""
+    uri = src or plotly_js_uri()
+    if uri is not None:
+        return f'<script type="text/javascript" src="{uri}"></script>'
+    return f'<script type="text/javascript">{get_plotlyjs()}</script>'
+
+
+def plot_page_html(plotly_js_src: Optional[str] = None) -> str:
+    """
+    Build the persistent plot page, which receives its figures over the web channel.
+
+    Args:
+        plotly_js_src: Where the page loads plotly.js from (e.g. the page
+            store's PLOTLY_JS_PATH); the bundle's file URI by default
+    """
+    html = f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8" />
+{_plotly_js_tag(plotly_js_src)}
+<script type="text/javascript" src="qrc:///qtwebchannel/qwebchannel.js"></script>
+<style>html, body, #plot {{ width: 100%; height: 100%; margin: 0; }}</style>
+</head>
+<body>
+<div id="plot" class="plotly-graph-div"></div>
+<script type="text/javascript">{PLOT_PAGE_SCRIPT}</script>
+</body>
+</html>"""
+    return inject_open_sans_font_faces(html)
+
+
+class PageFigure:
+    """
+    Tracks the figure shown on the persistent plot page and builds its JSON updates.
+
+    Each trace is serialized once per render, with its per-point arrays as
+    base64 typed arrays; a trace whose JSON matches the
+    one at the same position on the page is sent as null, and the page keeps
+    its copy. The layout gets a ``uirevision`` per kind of axes, so Plotly.react
+    keeps the user's zoom, pan and legend state across updates.
+    """
+
+    def __init__(self):
+        self._traces: List[str] = []
+        self._layout: Optional[str] = None
+
+    def update(self, fig, float32_coordinates: bool = False) -> str:
+        """
+        Makes a figure the current one.
+
+        Args:
+            fig: The figure to show (go.Figure or FastFigure)
+            float32_coordinates: Send coordinates as float32 (see typed_arrays)
+
+        Returns:
+            JSON with 'data' (null for traces the page already shows), 'layout'
+            and 'config', for the page's Plotly.react
+        """
+        figure = figure_properties(fig)
+        data = figure.get('data', [])
+        layout = dict(figure.get('layout', {}))
+        is_ternary = 'ternary' in layout or any(trace.get('type') == 'scatterternary' for trace in data)
+        layout.setdefault('uirevision', 'ternary' if is_ternary else 'xy')
+
+        traces = [to_json(encode_trace(trace, float32_coordinates)) for trace in data]
+        changed = [
+            trace if i >= len(self._traces) or self._traces[i] != trace else 'null'
+            for i, trace in enumerate(traces)
+        ]
+        self._traces = traces
+        self._layout = to_json(layout)
+        return self._payload(changed)
+
+    def full(self) -> str:
+        """Returns the whole current figure (for a page that just loaded), or an empty string if there is none."""
+        if self._layout is None:
+            return ''
+        return self._payload(self._traces)
+
+    def _payload(self, traces: List[str]) -> str:
+        """Joins already serialized traces and the layout into one Plotly.react payload."""
+        return f'{{"data": [{", ".join(traces)}], "layout": {self._layout}, "config": {PAGE_CONFIG_JSON}}}'
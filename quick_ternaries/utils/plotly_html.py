@@ -1,6 +1,9 @@
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+import plotly
+
 from quick_ternaries.utils.fonts import (
     OPEN_SANS_ITALIC_FONT,
     OPEN_SANS_REGULAR_FONT,
@@ -54,6 +57,32 @@ def figure_to_html(fig: Any, **kwargs: Any) -> str:
     return inject_open_sans_font_faces(fig.to_html(**kwargs))
 
 
+@lru_cache(maxsize=1)
+def plotly_js_bundle() -> Path | None:
+    """Return the path of the plotly.js bundle shipped with the plotly package, if present."""
+    bundle = Path(plotly.__file__).resolve().parent / "package_data" / "plotly.min.js"
+    return bundle if bundle.is_file() else None
+
+
+def plotly_js_uri() -> str | None:
+    """Return the file URI of the plotly.js bundle shipped with the plotly package, if present."""
+    bundle = plotly_js_bundle()
+    return bundle.as_uri() if bundle is not None else None
+
+
+def figure_to_page_html(fig: Any, **kwargs: Any) -> str:
+    """
+    Render a Plotly figure for a page viewed on this machine (the plot view or a
+    temporary browser tab).
+
+    The page loads plotly.js from the local bundle instead of inlining it, so
+    each page is only the figure JSON rather than ~3.5 MB of script. Exported
+    files should use ``write_plotly_html``, which stays self-contained.
+    """
+    kwargs.setdefault("include_plotlyjs", plotly_js_uri() or True)
+    return figure_to_html(fig, **kwargs)
+
+
 def write_plotly_html(fig: Any, filepath: str | Path, **kwargs: Any) -> None:
     """Write Plotly HTML with bundled Open Sans support."""
     Path(filepath).write_text(figure_to_html(fig, **kwargs), encoding="utf-8")
@@ -0,0 +1,171 @@
+"""Compact encoding of per-point trace arrays for the plot page, as plotly's base64 typed arrays"""
+
+import base64
+import re
+from typing import Optional
+
+import numpy as np
+
+
+# Per-point arrays that are only drawn (never shown as numbers), so float32 is precise enough
+FLOAT32_ATTRIBUTES = ('marker.size', 'marker.opacity', 'marker.color', 'marker.line.width')
+
+# Per-point coordinates; float32 only if the user allows it
+COORDINATE_ATTRIBUTES = ('x', 'y', 'a', 'b', 'c')
+
+# Integer dtypes plotly.js can decode (it has no 64-bit integers), smallest first
+_INTEGER_DTYPES = ('i1', 'u1', 'i2', 'u2', 'i4', 'u4')
+
+# float32 keeps this much range; values outside it would round to 0 or inf
+_FLOAT32_RANGE = (1e-30, 1e30)
+
+
+def float32_coordinates_enabled(setup_model) -> bool:
+    """Returns True if the setup model allows coordinates to be sent as float32."""
+    advanced_settings = getattr(setup_model, 'advanced_settings', None)
+    # Compare against True so that only a real checkbox value turns it on
+    return getattr(advanced_settings, 'float32_coordinates_on', False) is True
+
+
+def numeric_array(values) -> Optional[np.ndarray]:
+    """
+    Converts a sequence of numbers (or a typed array spec) to a NumPy array.
+
+    Returns:
+        An integer or float array, or None if the values are not all numbers
+        (e.g. color strings or mixed customdata)
+    """
+    if isinstance(values, dict):
+        # Already a typed array spec (plotly encodes arrays that were NumPy to begin with)
+        if 'bdata' not in values or 'dtype' not in values or not isinstance(values['bdata'], str):
+            return None
+        array = np.frombuffer(base64.b64decode(values['bdata']), dtype='<' + values['dtype'])
+        if 'shape' in values:
+            array = array.reshape([int(n) for n in str(values['shape']).split(',')])
+        return array
+    if values is None or np.isscalar(values):
+        return None
+    array = np.asarray(values)
+    if array.dtype.kind in 'iuf':
+        return array
+    if array.dtype.kind != 'O':
+        return None
+    try:
+        return array.astype(float)
+    except (TypeError, ValueError):
+        return None
+
+
+def typed_array_spec(array: np.ndarray, float32: bool = False) -> dict:
+    """
+    Encodes an array in plotly's typed array format ({'dtype', 'bdata', 'shape'}).
+
+    Args:
+        array: A 1-D or 2-D integer or float array
+        float32: Send floats as float32 if their magnitudes fit
+
+    Returns:
+        The typed array spec, which plotly.js decodes without parsing numbers
+    """
+    if array.dtype.kind in 'iu':
+        low, high = (int(array.min()), int(array.max())) if array.size else (0, 0)
+        for dtype in _INTEGER_DTYPES:
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                break
+        else:
+            dtype = 'f8'
+    else:
+        dtype = 'f8'
+        if float32:
+            magnitudes = np.abs(array[np.isfinite(array) & (array != 0)])
+            if not magnitudes.size or (magnitudes.min() > _FLOAT32_RANGE[0] and magnitudes.max() < _FLOAT32_RANGE[1]):
+                dtype = 'f4'
+
+    spec = {
+        'dtype': dtype,
+        'bdata': base64.b64encode(np.ascontiguousarray(array, dtype='<' + dtype).tobytes()).decode('ascii'),
+    }
+    if array.ndim > 1:
+        spec['shape'] = ', '.join(str(n) for n in array.shape)
+    return spec
+
+
+def _get_path(trace: dict, path: str):
+    """Returns the value at a dotted attribute path, or None."""
+    value = trace
+    for name in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(name)
+    return value
+
+
+def _set_path(trace: dict, path: str, value) -> dict:
+    """Returns a copy of a trace dict with a dotted attribute path set, copying only the dicts on the path."""
+    head, _, rest = path.partition('.')
+    updated = dict(trace)
+    updated[head] = _set_path(trace.get(head) or {}, rest, value) if rest else value
+    return updated
+
+
+def _referenced_customdata_columns(trace: dict) -> Optional[int]:
+    """
+    Returns how many leading customdata columns the trace's templates use:
+    None if it uses all of customdata, 0 if it uses none.
+    """
+    templates = ' '.join(
+        str(trace.get(name) or '') for name in ('hovertemplate', 'texttemplate')
+    )
+    if re.search(r'customdata(?!\[)', templates):
+        return None
+    columns = [int(column) for column in re.findall(r'customdata\[(\d+)\]', templates)]
+    return max(columns) + 1 if columns else 0
+
+
+def _encode_array(path: str, value, float32_coordinates: bool):
+    """Returns the typed array spec of a per-point value, or None if it is not a number array."""
+    array = numeric_array(value)
+    if array is None or array.ndim not in (1, 2):
+        return None
+    float32 = path in FLOAT32_ATTRIBUTES or (float32_coordinates and path in COORDINATE_ATTRIBUTES)
+    return typed_array_spec(array, float32)
+
+
+def encode_restyle_update(update: dict, float32_coordinates: bool = False) -> dict:
+    """
+    Encodes the numeric per-point arrays of a restyle update ({attribute path: [array]})
+    as typed arrays; other values are left as they are.
+    """
+    encoded = dict(update)
+    for path, values in update.items():
+        if path in COORDINATE_ATTRIBUTES + FLOAT32_ATTRIBUTES + ('customdata',) and len(values) == 1:
+            spec = _encode_array(path, values[0], float32_coordinates)
+            if spec is not None:
+                encoded[path] = [spec]
+    return encoded
+
+
+def encode_trace(trace: dict, float32_coordinates: bool = False) -> dict:
+    """
+    Prepares a trace dict (from ``fig.to_plotly_json()``) for the plot page.
+
+    Customdata is cut to the columns the trace's templates show: row indices
+    and trace IDs after them are only used in Python (selection, bootstrap),
+    which keeps the full figure. Then the numeric per-point arrays are
+    encoded as typed arrays (color strings and mixed customdata stay lists).
+    """
+    customdata = trace.get('customdata')
+    if customdata is not None and not isinstance(customdata, dict):
+        used_columns = _referenced_customdata_columns(trace)
+        if used_columns == 0:
+            trace = {name: value for name, value in trace.items() if name != 'customdata'}
+        elif used_columns is not None:
+            customdata = np.asarray(customdata, dtype=object)
+            if customdata.ndim == 2 and customdata.shape[1] > used_columns:
+                trace = dict(trace, customdata=customdata[:, :used_columns])
+    for path in COORDINATE_ATTRIBUTES + FLOAT32_ATTRIBUTES + ('customdata',):
+        spec = _encode_array(path, _get_path(trace, path), float32_coordinates)
+        if spec is not None:
+            trace = _set_path(trace, path, spec)
+    return trace
@@ -1,13 +1,20 @@
 import json
 from typing import TYPE_CHECKING, List, Dict, Optional
 
-from PySide6.QtCore import QObject, Slot
+from PySide6.QtCore import QObject, Signal, Slot
 import pandas as pd
 import numpy as np
+from plotly.io.json import to_json_plotly
 
 from quick_ternaries.models.error_entry_model import ErrorEntryModel
 from quick_ternaries.models.trace_editor_model import TraceEditorModel
 from quick_ternaries.models.setup_menu_model import SetupMenuModel
+from quick_ternaries.services.hover_store import HOVER_STORE
+from quick_ternaries.services.line_decimation import LINE_STORE
+from quick_ternaries.services.selection_store import SELECTION_STORE
+from quick_ternaries.services.viewport_lod import VIEWPORT_STORE
+from quick_ternaries.utils.plot_page import PageFigure
+from quick_ternaries.utils.typed_arrays import encode_restyle_update
 
 if TYPE_CHECKING:
     from quick_ternaries.app import MainWindow
@@ -69,16 +76,71 @@ class WorkspaceManager:
 
 
 class PlotlyInterface(QObject):
+    # Emitted with a figure update (see PageFigure.update) for the persistent plot page
+    figure_changed = Signal(str)
+
     def __init__(self):
         super().__init__()
-        self.selected_indices = []
+        self.selection = []
+        self.page_figure = PageFigure()
+        self.float32_coordinates = False
+
+    def show_figure(self, fig, float32_coordinates: bool = False, notify_page: bool = True):
+        """
+        Makes a figure the current one of the plot page.
+
+        Args:
+            fig: The figure to show
+            float32_coordinates: Send coordinates (also of later zoom updates) as float32
+            notify_page: Send the update to the loaded page, which applies it
+                in place with Plotly.react; a page that is still loading asks
+                for the figure itself
+        """
+        self.float32_coordinates = float32_coordinates
+        payload = self.page_figure.update(fig, float32_coordinates)
+        if notify_page:
+            self.figure_changed.emit(payload)
 
-    @Slot(list)
-    def receive_selected_indices(self, indices: list):
-        self.selected_indices = indices
+    @Slot(result=str)
+    def get_figure(self) -> str:
+        """Returns the whole current figure as JSON, for a plot page that just loaded."""
+        return self.page_figure.full()
+
+    @Slot(str, str)
+    def receive_selection(self, region_json: str, curve_numbers_json: str):
+        """Resolves a lasso or box selection (region and selectable curve numbers, as JSON) against the shown figure."""
+        region = json.loads(region_json)
+        curve_numbers = json.loads(curve_numbers_json)
+        self.selection = SELECTION_STORE.select(region, curve_numbers) if region else []
+
+    def get_selection(self) -> List[dict]:
+        """Returns the selected points as one {'curveNumber', 'traceID', 'rows'} dict per curve."""
+        return list(self.selection)
 
     def get_indices(self) -> List:
-        return self.selected_indices.copy()
+        """Returns one {'traceID', 'pointIndex', 'curveNumber'} dict per selected point."""
+        return [
+            {'traceID': group['traceID'], 'pointIndex': row, 'curveNumber': group['curveNumber']}
+            for group in self.selection
+            for row in group['rows'].tolist()
+        ]
+
+    @Slot(str, int, result=str)
+    def get_hover_html(self, key: str, point_number: int) -> str:
+        """Returns the hover HTML of one point of a trace rendered with on-demand hover."""
+        return HOVER_STORE.hover_html(key, point_number)
+
+    @Slot(str, float, float, result=str)
+    def get_decimated_points(self, key: str, x0: float, x1: float) -> str:
+        """Returns a decimated line trace's points for the visible x range, as a JSON restyle update."""
+        update = LINE_STORE.refine(key, x0, x1)
+        return to_json_plotly(encode_restyle_update(update, self.float32_coordinates)) if update is not None else ''
+
+    @Slot(str, str, result=str)
+    def get_viewport_points(self, key: str, viewport_json: str) -> str:
+        """Returns a level-of-detail trace's points inside a viewport (JSON, null = full extent) as a JSON restyle update."""
+        update = VIEWPORT_STORE.refine(key, json.loads(viewport_json))
+        return to_json_plotly(encode_restyle_update(update, self.float32_coordinates)) if update is not None else ''
     
 
 class CustomJSONEncoder(json.JSONEncoder):
@@ -100,18 +162,18 @@ class ZmapPlotHandler(QObject):
         super().__init__()
         self.main_window = main_window
 
-    @Slot(str, str, str)
-    def cellDoubleClicked(self, category_value, target, other):
+    @Slot(int, str, str)
+    def cellDoubleClicked(self, category_index, target, other):
         """
         Handle a double-click on a Zmap cell.
         
         Args:
-            category_value: The value of the categorical column
+            category_index: Position of the category on the Zmap's x-axis
             target: The target column (x-axis)
             other: The other column (y-axis)
         """
-        print(f"Double clicked cell: {self.main_window.setupMenuModel.axis_members.categorical_column}={category_value}, target={target}, other={other}")
-        self.main_window.generate_scatter_plot(category_value, target, other)
+        print(f"Double clicked cell: category #{category_index}, target={target}, other={other}")
+        self.main_window.generate_scatter_plot(category_index, target, other)
     
     @Slot(str)
     def debugLog(self, message):
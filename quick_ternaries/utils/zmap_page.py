@@ -0,0 +1,128 @@
+"""The Z-map page: holds the whole correlation tensor and draws the selected target's heatmap on demand"""
+
+from quick_ternaries.utils.plotly_html import inject_open_sans_font_faces
+
+
+# Expects a global ZMAP with the page data (see zmap_page_html)
+ZMAP_PAGE_SCRIPT = """
+var lastHoverData = null;
+var currentTarget = 0;
+var zmapHandler = null;
+
+// Decodes a base64 typed array spec (only float arrays are sent to this page)
+function decodeTypedArray(spec) {
+    var binary = atob(spec.bdata);
+    var bytes = new Uint8Array(binary.length);
+    for (var i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return spec.dtype === 'f4' ? new Float32Array(bytes.buffer) : new Float64Array(bytes.buffer);
+}
+
+var correlations = decodeTypedArray(ZMAP.r);
+
+// Heatmap of one target: a row per other column, a cell per category; cells without a significant r are gaps
+function targetFigure(target) {
+    var nColumns = ZMAP.columns.length;
+    var nCategories = ZMAP.categories.length;
+    var others = [];
+    var z = [];
+    for (var j = 0; j < nColumns; j++) {
+        if (j === target) {
+            continue;
+        }
+        var row = new Array(nCategories);
+        for (var c = 0; c < nCategories; c++) {
+            var value = correlations[(c * nColumns + target) * nColumns + j];
+            row[c] = isNaN(value) ? null : value;
+        }
+        others.push(ZMAP.columns[j]);
+        z.push(row);
+    }
+    var trace = Object.assign({}, ZMAP.trace, {z: z, x: ZMAP.categories, y: others});
+    var layout = Object.assign({}, ZMAP.layout, {title: {text: ZMAP.titles[target]}});
+    return {data: [trace], layout: layout};
+}
+
+// Called by the app to switch targets without reloading the page
+function showTarget(target) {
+    currentTarget = target;
+    lastHoverData = null;
+    var figure = targetFigure(target);
+    return Plotly.react(document.getElementById('plot'), figure.data, figure.layout, ZMAP.config);
+}
+
+function installHandlers(plotDiv) {
+    plotDiv.on('plotly_hover', function(data) {
+        // Double-clicks report the cell under the pointer
+        lastHoverData = data.points[0];
+    });
+
+    var lastClickTime = 0;
+    plotDiv.onclick = function(event) {
+        var currentTime = new Date().getTime();
+        var isDoubleClick = (currentTime - lastClickTime < 300);
+        lastClickTime = currentTime;
+        if (!isDoubleClick || !zmapHandler || !lastHoverData) {
+            return;
+        }
+        try {
+            var target = ZMAP.columns[currentTarget];
+            zmapHandler.debugLog("Double-clicked cell: " + ZMAP.category_column + "=" + lastHoverData.x +
+                                 ", element=" + lastHoverData.y);
+            // The category goes by its position, so Python needs no value matching
+            zmapHandler.cellDoubleClicked(lastHoverData.pointNumber[1], target, String(lastHoverData.y));
+        } catch (e) {
+            zmapHandler.debugLog("Error in click handler: " + e.toString());
+        }
+    };
+}
+
+document.addEventListener("DOMContentLoaded", function() {
+    var plotDiv = document.getElementById('plot');
+    showTarget(ZMAP.initial_target).then(function() {
+        installHandlers(plotDiv);
+    });
+
+    new QWebChannel(qt.webChannelTransport, function(channel) {
+        zmapHandler = channel.objects.zmapHandler;
+        if (zmapHandler) {
+            zmapHandler.debugLog("QWebChannel connected for the Z-map page");
+        }
+    });
+});
+"""
+
+
+def zmap_page_html(data_json: str, plotly_js_src: str) -> str:
+    """
+    Build the Z-map page.
+
+    Args:
+        data_json: JSON object with the page data: 'categories', 'columns',
+            'category_column', 'titles' (one per column), 'r' (typed array spec
+            of the categories x columns x columns correlations, NaN where not
+            significant), 'trace' (heatmap properties), 'layout', 'config'
+            and 'initial_target'
+        plotly_js_src: Where the page loads plotly.js from (e.g. the page
+            store's PLOTLY_JS_PATH)
+    """
+    # Keep the JSON from closing the script element
+    data_json = data_json.replace('</', '<\\/')
+    html = f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8" />
+<script type="text/javascript" src="{plotly_js_src}"></script>
+<script type="text/javascript" src="qrc:///qtwebchannel/qwebchannel.js"></script>
+<style>html, body, #plot {{ width: 100%; height: 100%; margin: 0; }}</style>
+</head>
+<body>
+<div id="plot" class="plotly-graph-div"></div>
+<script type="text/javascript">
+var ZMAP = {data_json};
+{ZMAP_PAGE_SCRIPT}
+</script>
+</body>
+</html>"""
+    return inject_open_sans_font_faces(html)
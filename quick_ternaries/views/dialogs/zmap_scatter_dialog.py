@@ -0,0 +1,35 @@
+from PySide6.QtCore import QUrl
+from PySide6.QtWebEngineWidgets import QWebEngineView
+from PySide6.QtWidgets import QDialog, QVBoxLayout
+
+class ZmapScatterDialog(QDialog):
+    """
+    A window that shows the scatter plot of a double-clicked Zmap cell.
+
+    The dialog is kept open and reused, so each double-click only loads a new
+    page (served from memory) into the same view.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Zmap Scatter Plot")
+        self.resize(800, 600)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.view = QWebEngineView(self)
+        layout.addWidget(self.view)
+
+    def show_page(self, url: str, title: str = None):
+        """
+        Load a scatter plot page and bring the dialog to the front.
+
+        Args:
+            url: URL of the page (e.g. from the page store)
+            title: Optional window title
+        """
+        if title:
+            self.setWindowTitle(title)
+        self.view.setUrl(QUrl(url))
+        self.show()
+        self.raise_()
+        self.activateWindow()
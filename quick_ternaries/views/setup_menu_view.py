@@ -223,6 +223,13 @@ class SetupMenuView(QWidget):
                     field_widget.setSingleStep(0.1)
                     field_widget.setDecimals(3)
             elif isinstance(field_widget, QSpinBox):
+                if "minimum" in metadata or "maximum" in metadata:
+                    field_widget.setRange(
+                        int(metadata.get("minimum", field_widget.minimum())),
+                        int(metadata.get("maximum", field_widget.maximum())),
+                    )
+                if "single_step" in metadata:
+                    field_widget.setSingleStep(int(metadata["single_step"]))
                 field_widget.setValue(int(value))
                 field_widget.valueChanged.connect(
                     lambda val, fname=f.name, m=section_model: setattr(m, fname, val)
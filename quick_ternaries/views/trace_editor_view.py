@@ -161,6 +161,50 @@ class TraceEditorView(QWidget):
             print("Updating heatmap min/max after initialization")
             controller._update_heatmap_min_max_for_column(first_column)
 
+    def _on_split_by_category_enabled(self, enabled: bool):
+        """Populate the category column combo when split by category is enabled."""
+        if not enabled:
+            return
+
+        main_window = self.window()
+        if not hasattr(main_window, "traceEditorController"):
+            return
+        controller = main_window.traceEditorController
+
+        datafile = self.model.datafile
+        if not datafile or not datafile.file_path:
+            return
+
+        try:
+            df = controller.data_library.dataframe_manager.get_dataframe_by_metadata(datafile)
+        except Exception as e:
+            print(f"Error getting dataframe: {e}")
+            return
+
+        if df is None or df.empty:
+            return
+
+        combo = self.widgets.get("split_category_column")
+        if not combo or not isinstance(combo, QComboBox):
+            return
+
+        # Categorical splits are most useful on non-numeric columns, so list those first
+        numeric_cols = set(get_numeric_columns_from_dataframe(df))
+        all_cols = list(df.columns)
+        columns = [c for c in all_cols if c not in numeric_cols] + [c for c in all_cols if c in numeric_cols]
+
+        current = self.model.split_category_column
+        if current not in columns:
+            current = columns[0] if columns else ""
+
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItems(columns)
+        combo.setCurrentText(current)
+        combo.blockSignals(False)
+
+        self.model.split_category_column = current
+
     def connect_column_change_handlers(self):
         """Connect column change signals to update min/max values."""
         # Connect heatmap column combo if it exists
@@ -446,7 +490,9 @@ class TraceEditorView(QWidget):
                         "heatmap_on", 
                         "sizemap_on", 
                         "density_contour_on", 
+                        "binning_on",
                         "custom_colorscale_on",
+                        "split_by_category_on",
                         "vertical_offset_on",
                         "vertical_line_only",
                         "vertical_exaggeration_on",
@@ -468,6 +514,10 @@ class TraceEditorView(QWidget):
                         widget.stateChanged.connect(
                             lambda state: self._on_feature_enabled("sizemap", bool(state))
                         )
+                    elif f.name == 'split_by_category_on':
+                        widget.stateChanged.connect(
+                            lambda state: self._on_split_by_category_enabled(bool(state))
+                        )
                     elif f.name == 'filters_on':
                         self._connect_checkbox_for_scroll(
                             widget, 
@@ -511,8 +561,12 @@ class TraceEditorView(QWidget):
                     widget.addItems(["linear", "log"])
                 elif f.name == "heatmap_bar_orientation":
                     widget.addItems(["vertical", "horizontal"])
+                elif f.name == "binning_statistic":
+                    widget.addItems(["count", "mean", "sum", "min", "max"])
                 elif f.name == "contour_level":
                     widget.addItems(["Contour: 1-sigma", "Contour: 2-sigma"])
+                elif f.name == "split_category_column":
+                    widget.addItems([value] if value else [])
                 else:
                     widget.addItems([])
                 widget.setCurrentText(str(value))
@@ -977,7 +1031,7 @@ class TraceEditorView(QWidget):
                 widget.setChecked(bool(value))
             elif isinstance(widget, QComboBox):
                 # For heatmap and sizemap columns, just add the saved value if needed
-                if f.name in ["heatmap_column", "sizemap_column"] and value:
+                if f.name in ["heatmap_column", "sizemap_column", "split_category_column"] and value:
                     # Add the saved value to the combobox if it's not already there
                     if widget.findText(value) == -1 and value:
                         widget.addItem(value)
@@ -0,0 +1,19 @@
+from quick_ternaries.models.chemical_formula_model import ChemicalFormulaModel
+
+class TestChemicalFormulaModel:
+    """Tests for the ChemicalFormulaModel."""
+
+    def test_validate(self):
+        """Test that all formulas are validated in one batch, skipping empty ones."""
+        model = ChemicalFormulaModel()
+        model.set_formula("top_axis", "SiO2_wt", "SiO2")
+        model.set_formula("left_axis", "MgO_wt", "MgO")
+        model.set_formula("left_axis", "Bad", "Xx2O3")
+        model.set_formula("right_axis", "Empty", "  ")
+
+        validity = model.validate()
+
+        assert validity["top_axis"] == {"SiO2_wt": True}
+        assert validity["left_axis"] == {"MgO_wt": True, "Bad": False}
+        assert validity["right_axis"] == {}
+        assert validity["x_axis"] == {}
@@ -0,0 +1,60 @@
+import numpy as np
+from unittest.mock import MagicMock
+
+from quick_ternaries.services.axis_projection import (
+    AxisProjection,
+    get_formula_map,
+    get_molar_factors
+)
+from quick_ternaries.services.trace_arrays import TraceArrays
+
+
+class TestAxisProjection:
+    """Tests for the AxisProjection engine."""
+
+    def test_project_matches_scaled_column_sums(self):
+        """Test that one projection equals scaling each column and summing per axis."""
+        trace_data = TraceArrays({
+            'A': np.array([1.0, 2.0]),
+            'B': np.array([3.0, np.nan]),
+            'C': np.array([5.0, 6.0]),
+        })
+        projection = AxisProjection(
+            {'top': ['A', 'B'], 'left': ['C'], 'right': ['A']},
+            scaling_maps={'top': {'B': 10.0}, 'right': {'A': 2.0}}
+        )
+
+        values = projection.project_arrays(trace_data)
+
+        # Missing values count as 0, like a skipna column sum
+        assert list(values['top']) == [31.0, 2.0]
+        assert list(values['left']) == [5.0, 6.0]
+        assert list(values['right']) == [2.0, 4.0]
+        assert projection.weights.shape == (3, 3)
+
+    def test_molar_factors_fold_into_weights(self):
+        """Test that molar multipliers are folded into the weights, with fallbacks."""
+        calculator = MagicMock()
+        calculator.get_molar_mass.side_effect = lambda formula: {'SiO2': 60.0, 'MgO': 40.0}[formula]
+
+        factors = get_molar_factors(['SiO2', 'MgO', 'Bad', 'Other'], {'SiO2': 'SiO2', 'MgO': 'MgO', 'Bad': 'Bad'}, calculator)
+
+        assert factors == {'SiO2': 1 / 60.0, 'MgO': 1 / 40.0, 'Bad': 0.0, 'Other': 0.0}
+
+        projection = AxisProjection({'x': ['SiO2'], 'y': ['MgO']}, {'x': {'SiO2': 2.0}}, factors)
+        values = projection.project(np.array([[60.0, 40.0]]))
+        assert values['x'][0] == 2.0
+        assert values['y'][0] == 1.0
+
+    def test_get_formula_map(self):
+        """Test that formulas are collected across axes for the used columns only."""
+        setup_model = MagicMock()
+        setup_model.chemical_formulas.formulas = {
+            'top_axis': {'SiO2': 'SiO2', 'Unused': 'CaO'},
+            'left_axis': {'MgO': 'MgO'},
+        }
+
+        formula_map = get_formula_map(setup_model, ['top_axis', 'left_axis', 'right_axis'], ['SiO2', 'MgO'])
+
+        assert formula_map == {'SiO2': 'SiO2', 'MgO': 'MgO'}
+        assert get_formula_map(object(), ['top_axis'], ['SiO2']) is None
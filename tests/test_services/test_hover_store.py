@@ -0,0 +1,43 @@
+import numpy as np
+from unittest.mock import MagicMock
+
+from quick_ternaries.services.hover_store import HoverStore, lazy_hover_enabled
+
+
+class TestHoverStore:
+    """Tests for the on-demand hover row store."""
+
+    def test_hover_html_formats_one_point(self):
+        """Test that a point's hover HTML matches the embedded template's formatting."""
+        store = HoverStore()
+        key = store.register(
+            ['2×SiO2', 'Name'],
+            [np.array([49.377861, 50.0]), np.array(['a', 'b'], dtype=object)]
+        )
+
+        assert store.hover_html(key, 0) == "<b>2×SiO2:</b> 49.3779<br><b>Name:</b> a"
+        assert store.hover_html(key, 1) == "<b>2×SiO2:</b> 50<br><b>Name:</b> b"
+        assert store.hover_html(key, 2) == ''
+        assert store.hover_html('unknown', 0) == ''
+
+    def test_view_maps_point_numbers_to_rows(self):
+        """Test that a split-trace view resolves its points to the full trace's rows."""
+        store = HoverStore()
+        key = store.register(['A'], [np.array([10.0, 11.0, 12.0, 13.0])])
+
+        view_key = store.view(key, np.array([3, 1]))
+
+        assert store.rows(view_key) == 2
+        assert store.hover_html(view_key, 0) == "<b>A:</b> 13"
+        assert store.hover_html(view_key, 1) == "<b>A:</b> 11"
+
+        store.clear()
+        assert store.rows(key) is None
+
+    def test_lazy_hover_enabled_needs_a_real_setting(self):
+        """Test that only an explicit True turns on-demand hover on."""
+        setup_model = MagicMock()
+        assert not lazy_hover_enabled(setup_model)
+
+        setup_model.advanced_settings.lazy_hover_on = True
+        assert lazy_hover_enabled(setup_model)
@@ -0,0 +1,66 @@
+import numpy as np
+
+from quick_ternaries.services.cartesian_trace_maker import CartesianTraceMaker
+from quick_ternaries.services.hover_store import HOVER_STORE
+from quick_ternaries.services.line_decimation import DecimatedLineStore, LINE_STORE, lttb_indices
+
+
+class TestLineDecimation:
+    """Tests for LTTB decimation of line traces and its zoom refinement."""
+
+    def test_lttb_keeps_ends_and_peaks(self):
+        """Test that the ends and a one-sample spike survive decimation."""
+        x = np.arange(10000, dtype=float)
+        y = np.sin(x / 500)
+        y[4321] = 50.0
+
+        positions = lttb_indices(x, y, 200)
+
+        assert len(positions) == 200
+        assert positions[0] == 0 and positions[-1] == 9999
+        assert 4321 in positions
+        assert np.all(np.diff(positions) > 0)
+        assert list(lttb_indices(x[:5], y[:5], 200)) == [0, 1, 2, 3, 4]
+
+    def test_refine_returns_the_visible_range(self):
+        """Test that zooming re-decimates only the visible rows, plus one on each side."""
+        store = DecimatedLineStore()
+        x = np.arange(1000, dtype=float)
+        key = store.register({'x': x, 'y': x ** 2, 'marker.color': x * 10}, n_out=50)
+
+        update = store.refine(key, 100.5, 110.5)
+
+        assert list(update['x'][0]) == list(np.arange(100, 112, dtype=float))
+        assert list(update['marker.color'][0]) == list(update['x'][0] * 10)
+        assert len(store.refine(key, -1e308, 1e308)['x'][0]) == 50
+        assert store.refine('unknown', 0, 1) is None
+
+    def test_refine_unsorted_x_and_hover_views(self):
+        """Test that unsorted lines use a mask, and hover rows follow the kept points."""
+        store = DecimatedLineStore()
+        x = np.array([5.0, 1.0, 2.0, 9.0, 3.0])
+        hover_key = HOVER_STORE.register(['X'], [x])
+        key = store.register({'x': x, 'y': x}, n_out=10, hover_key=hover_key)
+
+        update = store.refine(key, 1.5, 2.5)
+
+        assert list(update['x'][0]) == [1.0, 2.0, 9.0]
+        assert HOVER_STORE.hover_html(update['meta'][0], 2) == "<b>X:</b> 9"
+
+    def test_build_trace_decimates_lines(self):
+        """Test that a long line trace is sent decimated and registered for zooming."""
+        n_points = 5000
+        prepared = dict(
+            x=np.arange(n_points, dtype=float), y=np.cos(np.arange(n_points) / 100.0),
+            name='Spectrum', mode='lines', marker=dict(color='red'), line=dict(width=1),
+            customdata=np.arange(n_points)[:, None], showlegend=True,
+            hover_kwargs=dict(hovertemplate='%{x}<extra></extra>'),
+            webgl_threshold=0, line_points=300, marker_points=0,
+        )
+
+        trace = CartesianTraceMaker().build_trace(prepared)
+
+        assert len(trace.x) == 300
+        assert trace.uid.startswith('decimated-')
+        assert list(trace.customdata[:, 0]) == list(trace.x.astype(int))
+        assert len(LINE_STORE.refine(trace.uid, 0, 100)['x'][0]) == 102
@@ -0,0 +1,78 @@
+import numpy as np
+
+from quick_ternaries.services.marker_styling import (
+    log_transform,
+    normalize_sizes,
+    rgb_to_hex,
+    scale_to_channel,
+    shuffled_order,
+    sort_order,
+    z_order
+)
+
+
+class TestMarkerStyling:
+    """Tests for the vectorized marker styling helpers."""
+
+    def test_log_transform_maps_non_positive_and_missing_to_zero(self):
+        """Test that only positive values are logged."""
+        values = log_transform(np.array([np.e, 1.0, 0.0, -2.0, np.nan]))
+
+        assert np.allclose(values, [1.0, 0.0, 0.0, 0.0, 0.0])
+
+    def test_normalize_sizes(self):
+        """Test the size range mapping and the constant/missing fallbacks."""
+        sizes, sizeref = normalize_sizes(np.array([0.0, 5.0, 10.0, np.nan]), 2.0, 12.0)
+        assert list(sizes) == [2.0, 7.0, 12.0, 0.0]
+        assert sizeref == 2. * 12.0 / 12.0**2
+
+        sizes, _ = normalize_sizes(np.array([3.0, 3.0, np.nan]), 2.0, 12.0, constant_size=7.0, missing_size=2.0)
+        assert list(sizes) == [7.0, 7.0, 7.0]
+
+        sizes, sizeref = normalize_sizes(np.array([]), 2.0, 12.0)
+        assert len(sizes) == 0 and sizeref == 1.0
+
+    def test_sort_order_puts_high_values_last(self):
+        """Test that 'high on top' draws the largest values last."""
+        order = sort_order(np.array([3.0, 1.0, 2.0]), 'high on top')
+
+        assert list(order) == [1, 2, 0]
+        assert sort_order(np.array([1.0]), 'no change') is None
+
+    def test_z_order_matches_sequential_stable_sorts(self):
+        """Test that one lexsort equals sorting by heatmap, then stably by sizemap."""
+        rng = np.random.default_rng(1)
+        heat = rng.integers(0, 5, 200).astype(float)
+        size = rng.integers(0, 5, 200).astype(float)
+        heat[::17] = np.nan
+
+        sequential = np.argsort(heat, kind='stable')
+        sequential = sequential[np.argsort(-size[sequential], kind='stable')]
+
+        order = z_order((heat, 'high on top'), (size, 'low on top'))
+
+        assert list(order) == list(sequential)
+        assert z_order((heat, 'no change'), (size, 'no change')) is None
+
+    def test_shuffled_order_is_seeded_and_cached(self):
+        """Test that 'shuffled' gives the same permutation on every render."""
+        first = sort_order(np.zeros(50), 'shuffled')
+
+        assert first is shuffled_order(50)
+        assert sorted(first) == list(range(50))
+        assert list(z_order((np.zeros(50), 'shuffled'), (np.zeros(50), 'no change'))) == list(first)
+
+    def test_rgb_to_hex_matches_string_formatting(self):
+        """Test that packed colors match per-point formatting, for all channel values."""
+        red = np.arange(256)
+        green = red[::-1]
+        blue = (red * 7) % 256
+
+        colors = rgb_to_hex(red, green, blue)
+
+        assert list(colors) == [f"#{r:02x}{g:02x}{b:02x}" for r, g, b in zip(red, green, blue)]
+
+    def test_scale_to_channel(self):
+        """Test that values are min-max scaled to 0-255, with constant columns at 0."""
+        assert list(scale_to_channel(np.array([0.0, 0.5, 1.0, np.nan]))) == [0, 127, 255, 0]
+        assert list(scale_to_channel(np.array([4.0, 4.0]))) == [0, 0]
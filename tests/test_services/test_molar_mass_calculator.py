@@ -1,5 +1,12 @@
 import pytest
-from quick_ternaries.services.molar_mass_calculator import MolarMassCalculator, MolarMassCalculatorException
+from quick_ternaries.services.molar_mass_calculator import (
+    FORMULA_TABLE,
+    MolarMassCalculator,
+    MolarMassCalculatorException,
+    _parse_formula,
+    is_valid_formula,
+    validate_formulas
+)
 
 class TestMolarMassCalculator:
     """Tests for the MolarMassCalculator service."""
@@ -33,4 +40,32 @@ class TestMolarMassCalculator:
         
         # Invalid element
         with pytest.raises(MolarMassCalculatorException):
-            self.calculator.get_molar_mass("Xx2O3")  # Xx is not an element
\ No newline at end of file
+            self.calculator.get_molar_mass("Xx2O3")  # Xx is not an element
+
+    def test_common_formulas_are_prebuilt(self):
+        """Test that common oxides and elements come from the startup table."""
+        assert 'SiO2' in FORMULA_TABLE
+        assert 'Fe' in FORMULA_TABLE
+        assert self.calculator.get_molar_mass("SiO2") == FORMULA_TABLE['SiO2']
+
+    def test_uncommon_formulas_are_memoized(self):
+        """Test that formulas outside the table are parsed once and then remembered."""
+        _parse_formula.cache_clear()
+
+        first = self.calculator.get_molar_mass("CaMgSi2O6")
+        second = self.calculator.get_molar_mass("CaMgSi2O6")
+        assert first == second
+        assert _parse_formula.cache_info().hits == 1
+
+        # Invalid formulas are remembered as well
+        assert is_valid_formula("NotAValidFormula") is False
+        assert is_valid_formula("NotAValidFormula") is False
+        assert _parse_formula.cache_info().misses == 2
+
+    def test_validate_formulas(self):
+        """Test batch validation of formulas."""
+        assert validate_formulas(["SiO2", "Xx2O3", "SiO2", "CaMgSi2O6"]) == {
+            "SiO2": True,
+            "Xx2O3": False,
+            "CaMgSi2O6": True,
+        }
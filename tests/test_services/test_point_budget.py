@@ -0,0 +1,62 @@
+import numpy as np
+
+from quick_ternaries.services.cartesian_trace_maker import CartesianTraceMaker
+from quick_ternaries.services.point_budget import allocate_point_budget, budget_positions
+
+
+def _prepared_trace(n_points, webgl_threshold=0, mode='markers+lines', line_points=0):
+    """Builds a prepare_trace-style dictionary with heatmap and sizemap arrays."""
+    return dict(
+        x=np.arange(n_points, dtype=float),
+        y=np.arange(n_points, dtype=float) * 2,
+        name='Trace',
+        mode=mode,
+        marker=dict(color=np.arange(n_points, dtype=float), size=np.full(n_points, 4.0), colorscale='Viridis'),
+        line=dict(color='rgba(0, 0, 0, 1)', width=1, dash='dash'),
+        customdata=np.arange(n_points)[:, None],
+        showlegend=False,
+        hover_kwargs=dict(hovertemplate='%{x}<extra></extra>'),
+        webgl_threshold=webgl_threshold,
+        line_points=line_points,
+        marker_points=0,
+    )
+
+
+class TestPointBudget:
+    """Tests for the per-figure point budget and the cartesian WebGL switch."""
+
+    def test_allocation_gives_unused_share_to_large_traces(self):
+        """Test that small traces stay whole and large ones split the rest."""
+        assert allocate_point_budget([100, 5000, 20000], 2100) == [None, 1000, 1000]
+        assert allocate_point_budget([100, 200], 1000) == [None, None]
+        assert allocate_point_budget([100, 200], 0) == [None, None]
+
+    def test_positions_are_even_and_keep_the_ends(self):
+        """Test that decimation keeps first and last rows without duplicates."""
+        positions = budget_positions(1000, 7)
+
+        assert positions[0] == 0 and positions[-1] == 999
+        assert len(np.unique(positions)) == 7
+        assert budget_positions(10, 10) is None
+        assert budget_positions(10, None) is None
+
+    def test_build_trace_slices_every_point_array(self):
+        """Test that a budgeted trace keeps matching x, marker and customdata rows."""
+        trace = CartesianTraceMaker().build_trace(_prepared_trace(100, mode='markers'), max_points=10)
+
+        assert trace.type == 'scatter'
+        assert len(trace.x) == 10
+        assert list(trace.marker.color) == list(trace.x)
+        assert list(trace.customdata[:, 0]) == list(trace.x.astype(int))
+        assert trace.marker.colorscale[0][1] == '#440154'
+        assert trace.line.dash == 'dash' and trace.showlegend is False
+
+    def test_build_trace_switches_to_webgl_above_threshold(self):
+        """Test that only traces over the threshold become Scattergl, with the same styling."""
+        maker = CartesianTraceMaker()
+
+        assert maker.build_trace(_prepared_trace(100, webgl_threshold=100)).type == 'scatter'
+        webgl_trace = maker.build_trace(_prepared_trace(101, webgl_threshold=100))
+        assert webgl_trace.type == 'scattergl'
+        assert webgl_trace.showlegend is False and webgl_trace.line.dash == 'dash'
+        assert len(webgl_trace.marker.size) == 101
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from quick_ternaries.services.selection_store import SelectionStore, points_in_polygon
+from quick_ternaries.services.viewport_lod import VIEWPORT_STORE
+
+
+class TestSelectionStore:
+    """Tests for resolving lasso and box selections against cached plot coordinates."""
+
+    def test_points_in_polygon_matches_triangle_test(self):
+        """Test that the polygon test agrees with a direct triangle test and skips NaN points."""
+        rng = np.random.default_rng(0)
+        x = rng.uniform(-1, 2, 20000)
+        y = rng.uniform(-1, 2, 20000)
+        x[::50] = np.nan
+
+        inside = points_in_polygon(x, y, [0, 1, 0], [0, 0, 1])
+
+        expected = (x > 0) & (y > 0) & (x + y < 1)
+        assert np.array_equal(inside, expected)
+        assert not points_in_polygon(x, y, [0, 1], [0, 1]).any()
+
+    def test_ternary_lasso_returns_row_labels_and_trace_id(self):
+        """Test that a lasso in plotly's ternary plane selects rows by index label."""
+        # A filtered and reordered frame: labels no longer match positions
+        df = pd.DataFrame({'A': [10.0, 80.0, 30.0, 5.0], 'B': [45.0, 10.0, 40.0, 90.0], 'C': [45.0, 10.0, 30.0, 5.0]},
+                          index=[7, 3, 12, 40])
+        customdata = np.hstack((df.index.to_numpy()[:, None], np.full((4, 1), 'trace-1', dtype=object)))
+        fig = go.Figure(go.Scatterternary(a=df['A'], b=df['B'], c=df['C'], mode='markers', customdata=customdata))
+        fig.add_trace(go.Scatterternary(a=df['A'], b=df['B'], c=df['C'], mode='lines', customdata=customdata))
+        fig.update_layout(ternary=dict(sum=100))
+        store = SelectionStore()
+        store.register_figure(fig)
+
+        # Box around the top region of the plane (x = c - b, y = a)
+        selection = store.select({'range': [[-30, 30], [50, 100]]}, [0, 1])
+
+        assert len(selection) == 1
+        assert selection[0]['curveNumber'] == 0 and selection[0]['traceID'] == 'trace-1'
+        assert list(selection[0]['rows']) == [3]
+        assert df.loc[selection[0]['rows'][0], 'A'] == 80.0
+        assert store.select({'range': [[-30, 30], [50, 100]]}, [1]) == []
+
+    def test_cartesian_lasso_on_log_axis(self):
+        """Test that lassos on log axes are tested in log space, without a trace ID."""
+        x = np.array([1.0, 10.0, 100.0, 1000.0])
+        y = np.array([1.0, 1.0, 1.0, 1.0])
+        fig = go.Figure(go.Scattergl(x=x, y=y, mode='markers', customdata=np.array([[0.5, 0], [0.5, 1], [0.5, 2], [0.5, 3]])))
+        fig.update_xaxes(type='log')
+        store = SelectionStore()
+        store.register_figure(fig)
+
+        selection = store.select({'lasso': [[5, 200, 200, 5], [0, 0, 2, 2]]})
+
+        assert selection[0]['traceID'] is None
+        assert selection[0]['rows'].dtype == np.int64
+        assert list(selection[0]['rows']) == [1, 2]
+
+    def test_level_of_detail_traces_select_all_points(self):
+        """Test that a sampled trace is matched on its full arrays, not only the points on the page."""
+        n_points = 5000
+        rng = np.random.default_rng(1)
+        arrays = {
+            'x': rng.uniform(0, 1, n_points),
+            'y': rng.uniform(0, 1, n_points),
+            'customdata': np.arange(n_points)[:, None],
+        }
+        uid = VIEWPORT_STORE.register(arrays, n_out=100)
+        sample = VIEWPORT_STORE.positions(uid)
+        fig = go.Figure(go.Scattergl(x=arrays['x'][sample], y=arrays['y'][sample], mode='markers',
+                                     customdata=arrays['customdata'][sample], uid=uid))
+        store = SelectionStore()
+        store.register_figure(fig)
+
+        selection = store.select({'range': [[0, 0.5], [0, 0.5]]})
+
+        expected = np.flatnonzero((arrays['x'] <= 0.5) & (arrays['y'] <= 0.5))
+        assert list(selection[0]['rows']) == list(expected)
@@ -0,0 +1,62 @@
+import numpy as np
+
+from quick_ternaries.services.ternary_binning import (
+    bin_corners,
+    bin_statistic,
+    color_levels,
+    polygon_paths,
+    triangular_bin_ids
+)
+
+
+class TestTernaryBinning:
+    """Tests for the triangular-grid aggregation of ternary points."""
+
+    def test_points_fall_inside_their_bin(self):
+        """Test that every point lies within the triangle of its assigned bin."""
+        rng = np.random.default_rng(0)
+        points = rng.dirichlet([1, 1, 1], 500) * 100
+        resolution = 6
+
+        bin_ids = triangular_bin_ids(points[:, 0], points[:, 1], points[:, 2], resolution)
+        corners = bin_corners(bin_ids, resolution)
+        fractions = points / points.sum(axis=1, keepdims=True)
+
+        # Barycentric weights of each point relative to its bin's corners
+        weights = np.linalg.solve(corners.transpose(0, 2, 1), fractions[:, :, None])[:, :, 0]
+        assert (weights > -1e-9).all()
+        assert bin_ids.max() < 2 * resolution ** 2
+
+    def test_apices_edges_and_missing_values(self):
+        """Test that boundary points stay in the grid and invalid points are dropped."""
+        a = np.array([1.0, 0.0, 0.0, 0.5, np.nan, 0.0])
+        b = np.array([0.0, 1.0, 0.0, 0.5, 0.5, 0.0])
+        c = np.array([0.0, 0.0, 1.0, 0.0, 0.5, 0.0])
+
+        bin_ids = triangular_bin_ids(a, b, c, 4)
+
+        assert (bin_ids[:4] >= 0).all() and (bin_ids[:4] < 32).all()
+        assert list(bin_ids[4:]) == [-1, -1]
+
+    def test_bin_statistic_reducers(self):
+        """Test count, mean and max per bin, skipping missing values and off-grid points."""
+        bin_ids = np.array([0, 0, 3, 3, -1])
+        values = np.array([1.0, np.nan, 5.0, 7.0, 100.0])
+
+        occupied, counts, stats = bin_statistic(bin_ids, 2, values, 'count')
+        assert list(occupied) == [0, 3] and list(counts) == [2, 2] and list(stats) == [2.0, 2.0]
+
+        _, _, means = bin_statistic(bin_ids, 2, values, 'mean')
+        assert list(means) == [1.0, 6.0]
+
+        _, _, maxima = bin_statistic(bin_ids, 2, values, 'max')
+        assert list(maxima) == [1.0, 7.0]
+
+    def test_polygons_and_color_levels(self):
+        """Test the NaN-separated outlines and the colorscale quantization."""
+        corners = bin_corners(np.array([0, 1]), 2)
+        a, b, c = polygon_paths(corners)
+
+        assert len(a) == 8 and np.isnan(a[3]) and np.isnan(a[7])
+        assert np.allclose((a + b + c)[[0, 1, 2, 4, 5, 6]], 1.0)
+        assert list(color_levels(np.array([0.0, 0.5, 1.0, np.nan]), 0.0, 1.0, 4)) == [0, 2, 3, -1]
@@ -111,4 +111,84 @@ class TestTernaryTraceMaker:
         assert "<b>2×A:</b>" in hovertemplate
         assert "<b>1.5×B:</b>" in hovertemplate
         assert "<b>3×C:</b>" in hovertemplate
-        assert "<extra></extra>" in hovertemplate
\ No newline at end of file
+        assert "<extra></extra>" in hovertemplate
+
+    def test_make_category_traces_splits_by_category(self, sample_dataframe):
+        """Test that a split trace yields one trace per category with the right points."""
+        from quick_ternaries.models.trace_editor_model import TraceEditorModel
+
+        setup_model = MagicMock()
+        setup_model.axis_members.top_axis = ['A']
+        setup_model.axis_members.left_axis = ['B']
+        setup_model.axis_members.right_axis = ['C']
+        setup_model.axis_members.hover_data = []
+        setup_model.column_scaling.scaling_factors = {}
+        setup_model.data_library.dataframe_manager.get_dataframe_by_metadata.return_value = sample_dataframe
+
+        trace_model = TraceEditorModel(trace_name="Samples")
+        trace_model.split_by_category_on = True
+        trace_model.split_category_column = 'Category'
+
+        traces = self.trace_maker.make_category_traces(setup_model, trace_model, source_trace_id="uid-1")
+
+        assert [t.name for t in traces] == ["Samples: X", "Samples: Y", "Samples: Z"]
+        assert list(traces[0].a) == [1, 3]
+        assert list(traces[1].a) == [2, 5]
+        assert list(traces[2].a) == [4]
+
+        # Each category gets its own color, and customdata keeps the original row index
+        assert len({t.marker.color for t in traces}) == 3
+        assert [row[-2] for row in traces[1].customdata] == [1, 4]
+        assert all(row[-1] == "uid-1" for t in traces for row in t.customdata)
+
+    def test_prepare_data_gathers_only_needed_rows_and_columns(self, sample_dataframe):
+        """Test that the working set holds only the filtered rows and the columns in use."""
+        from quick_ternaries.models.trace_editor_model import TraceEditorModel
+        from quick_ternaries.models.filter_model import FilterModel
+
+        setup_model = MagicMock()
+        setup_model.axis_members.hover_data = []
+        setup_model.data_library.dataframe_manager.get_dataframe_by_metadata.return_value = sample_dataframe
+
+        keep = FilterModel(filter_column='Category', filter_operation='is', filter_value1='Y')
+        empty = FilterModel(filter_column='A', filter_operation='>', filter_value1='100')
+        trace_model = TraceEditorModel(filters_on=True, filters=[keep, empty])
+
+        marker, trace_data = self.trace_maker._prepare_data(
+            setup_model, trace_model, ['A'], ['B'], [],
+            self.trace_maker._get_basic_marker_dict(trace_model),
+            {'top': {}, 'left': {}, 'right': {}, 'all': {}}
+        )
+
+        # The zero-row filter is skipped, the other one is applied
+        assert list(trace_data.index) == [1, 4]
+        assert 'C' not in trace_data
+        assert list(trace_data.computed['top']) == [2, 5]
+        assert list(trace_data.computed['right']) == [0, 0]
+        # The cached source frame is not modified
+        assert list(sample_dataframe.columns) == ['A', 'B', 'C', 'Category']
+
+    def test_density_contour_job_uses_the_filter_mask(self, sample_dataframe):
+        """Test that a contour job reads only the filtered rows, without copying the frame."""
+        from quick_ternaries.models.trace_editor_model import TraceEditorModel
+        from quick_ternaries.models.filter_model import FilterModel
+        from quick_ternaries.services.ternary_trace_maker import DensityContourMaker, ternary_to_cartesian
+
+        setup_model = MagicMock()
+        setup_model.axis_members.top_axis = ['A']
+        setup_model.axis_members.left_axis = ['B']
+        setup_model.axis_members.right_axis = ['C']
+        setup_model.column_scaling.scaling_factors = {}
+        setup_model.data_library.dataframe_manager.get_dataframe_by_metadata.return_value = sample_dataframe
+
+        keep = FilterModel(filter_column='Category', filter_operation='is', filter_value1='Y')
+        trace_model = TraceEditorModel(trace_name="Samples", filters_on=True, filters=[keep])
+        trace_model.density_contour_on = True
+
+        with patch.object(pd.DataFrame, 'copy', side_effect=AssertionError("frame copied")):
+            job = DensityContourMaker().prepare_contour_job(setup_model, trace_model)
+
+        rows = sample_dataframe.iloc[[1, 4]]
+        expected = ternary_to_cartesian(rows['A'].to_numpy(), rows['B'].to_numpy(), rows['C'].to_numpy())
+        assert np.allclose(job['points'], expected)
+        assert job['levels'] == [trace_model.density_contour_percentile / 100]
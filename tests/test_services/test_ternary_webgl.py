@@ -0,0 +1,76 @@
+import json
+
+import numpy as np
+import plotly.graph_objects as go
+from unittest.mock import MagicMock
+
+from quick_ternaries.utils.fast_figure import FastFigure
+
+from quick_ternaries.services.ternary_webgl import (
+    TRIANGLE_HEIGHT,
+    barycentric_xy,
+    count_points,
+    maybe_to_webgl_figure,
+    to_webgl_figure
+)
+
+
+def _ternary_figure(n_points=3):
+    """Builds a small ternary figure with one marker trace and one line trace."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatterternary(
+        a=np.linspace(0, 1, n_points), b=np.linspace(1, 0, n_points), c=np.zeros(n_points),
+        mode='markers', name='points', customdata=np.arange(n_points)[:, None]
+    ))
+    fig.add_trace(go.Scatterternary(
+        a=[0.2, 0.3], b=[0.4, 0.3], c=[0.4, 0.4], mode='lines', name='contour',
+        line=dict(dash='dash')
+    ))
+    fig.update_layout(ternary=dict(
+        sum=100,
+        aaxis=dict(title=dict(text='<br>Top'), dtick=20),
+        baxis=dict(title=dict(text='<br>Left'), dtick=20),
+        caxis=dict(title=dict(text='<br>Right'), dtick=20),
+    ))
+    return fig
+
+
+class TestTernaryWebgl:
+    """Tests for the WebGL rendering of large ternary figures."""
+
+    def test_apices_match_plotly_ternary_layout(self):
+        """Test that pure top, left and right compositions land on the triangle corners."""
+        xy = barycentric_xy(np.array([1.0, 0.0, 0.0]), np.array([0.0, 2.0, 0.0]), np.array([0.0, 0.0, 5.0]))
+
+        assert np.allclose(xy, [[0.5, TRIANGLE_HEIGHT], [0.0, 0.0], [1.0, 0.0]])
+
+    def test_conversion_keeps_trace_order_and_data(self):
+        """Test that markers become Scattergl, lines stay Scatter, and customdata is kept."""
+        webgl_fig = to_webgl_figure(_ternary_figure())
+
+        assert [trace.type for trace in webgl_fig.data] == ['scattergl', 'scatter']
+        assert [trace.name for trace in webgl_fig.data] == ['points', 'contour']
+        assert list(webgl_fig.data[0].customdata[:, 0]) == [0, 1, 2]
+        assert webgl_fig.data[1].line.dash == 'dash'
+        assert 'Top' in [annotation.text for annotation in webgl_fig.layout.annotations]
+
+    def test_fast_figure_converts_like_validated_figure(self):
+        """Test that a FastFigure is converted to a FastFigure with the same JSON."""
+        fig = _ternary_figure()
+        fast_webgl = to_webgl_figure(FastFigure(fig.data, fig.layout))
+
+        assert isinstance(fast_webgl, FastFigure)
+        assert json.loads(fast_webgl.to_json()) == json.loads(to_webgl_figure(fig).to_json())
+
+    def test_threshold_switches_only_large_figures(self):
+        """Test that the figure is converted only above a positive threshold."""
+        fig = _ternary_figure(n_points=10)
+        assert count_points(fig) == 12
+
+        assert maybe_to_webgl_figure(fig, None, threshold=0) is fig
+        assert maybe_to_webgl_figure(fig, None, threshold=12) is fig
+        assert maybe_to_webgl_figure(fig, None, threshold=11).data[0].type == 'scattergl'
+
+        setup_model = MagicMock()
+        setup_model.advanced_settings.webgl_point_threshold = 5
+        assert maybe_to_webgl_figure(fig, setup_model) is not fig
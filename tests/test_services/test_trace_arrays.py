@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from quick_ternaries.services.trace_arrays import TraceArrays
+
+
+class TestTraceArrays:
+    """Tests for the TraceArrays container."""
+
+    def test_from_dataframe_gathers_masked_rows_and_columns(self):
+        """Test that only the requested columns and masked rows are gathered."""
+        df = pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6], 'C': ['x', 'y', 'z']}, index=[10, 11, 12])
+
+        trace_data = TraceArrays.from_dataframe(df, ['A', 'C', 'missing'], np.array([True, False, True]))
+
+        assert len(trace_data) == 2
+        assert list(trace_data.index) == [10, 12]
+        assert 'B' not in trace_data
+        assert 'missing' not in trace_data
+        assert list(trace_data['C']) == ['x', 'z']
+        assert trace_data.block(['A']).shape == (2, 1)
+
+    def test_take_reorders_columns_computed_and_index(self):
+        """Test that take keeps source columns, computed values and the index aligned."""
+        trace_data = TraceArrays({'A': np.array([1.0, 2.0, 3.0])}, pd.Index([7, 8, 9]))
+        trace_data.computed['top'] = np.array([0.1, 0.2, 0.3])
+
+        taken = trace_data.take(np.array([2, 0]))
+
+        assert list(taken['A']) == [3.0, 1.0]
+        assert list(taken.computed['top']) == [0.3, 0.1]
+        assert list(taken.index) == [9, 7]
+        # The original container is unchanged
+        assert list(trace_data['A']) == [1.0, 2.0, 3.0]
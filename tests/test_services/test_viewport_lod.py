@@ -0,0 +1,78 @@
+import numpy as np
+
+from quick_ternaries.services.cartesian_trace_maker import CartesianTraceMaker
+from quick_ternaries.services.viewport_lod import (
+    VIEWPORT_STORE,
+    GridIndex,
+    ViewportStore,
+    representative_rows
+)
+
+
+class TestViewportLod:
+    """Tests for the viewport level of detail of large marker traces."""
+
+    def test_representative_rows_keep_outliers_and_extremes(self):
+        """Test that a sample stays within budget but keeps isolated points and color extremes."""
+        rng = np.random.default_rng(0)
+        x = rng.normal(0, 1, 50000)
+        y = rng.normal(0, 1, 50000)
+        x[123], y[123] = 40.0, 40.0
+        values = rng.uniform(0, 1, 50000)
+        values[777], values[888] = -5.0, 5.0
+
+        rows = representative_rows(x, y, 2000, values)
+
+        assert len(rows) <= 2000
+        assert np.all(np.diff(rows) > 0)
+        assert {123, 777, 888} <= set(rows)
+
+    def test_grid_query_matches_brute_force(self):
+        """Test that the grid returns exactly the points inside a box."""
+        rng = np.random.default_rng(1)
+        x = rng.uniform(0, 10, 20000)
+        y = rng.uniform(-5, 5, 20000)
+        x[::97] = np.nan
+
+        rows = GridIndex(x, y).query(2.5, 3.25, -1.0, 0.5)
+
+        expected = np.flatnonzero((x >= 2.5) & (x <= 3.25) & (y >= -1.0) & (y <= 0.5))
+        assert list(rows) == list(expected)
+        assert len(GridIndex(x, y).query(20, 30, 0, 1)) == 0
+
+    def test_ternary_viewport_uses_axis_minimums(self):
+        """Test that a ternary zoom returns the points above every axis minimum."""
+        rng = np.random.default_rng(2)
+        points = rng.dirichlet([2, 2, 2], 5000) * 100
+        store = ViewportStore()
+        key = store.register({'a': points[:, 0], 'b': points[:, 1], 'c': points[:, 2]}, n_out=100000)
+
+        update = store.refine(key, {'ternary': [0.2, 0.1, 0.3]})
+
+        fractions = points / 100
+        expected = (fractions[:, 0] >= 0.2) & (fractions[:, 1] >= 0.1) & (fractions[:, 2] >= 0.3)
+        assert len(update['a'][0]) == expected.sum()
+        assert np.allclose(np.sort(update['a'][0]), np.sort(points[expected, 0]))
+
+        store.as_cartesian(key)
+        assert set(store.refine(key, None)) == {'x', 'y'}
+
+    def test_build_trace_samples_large_marker_traces(self):
+        """Test that marker traces over the per-view count are sampled and registered."""
+        n_points = 20000
+        rng = np.random.default_rng(3)
+        prepared = dict(
+            x=rng.normal(0, 1, n_points), y=rng.normal(0, 1, n_points),
+            name='Cloud', mode='markers', marker=dict(color=np.arange(n_points, dtype=float)),
+            line=None, customdata=np.arange(n_points)[:, None], showlegend=True,
+            hover_kwargs=dict(hovertemplate='%{x}<extra></extra>'),
+            webgl_threshold=0, line_points=0, marker_points=1000,
+        )
+
+        trace = CartesianTraceMaker().build_trace(prepared)
+
+        assert len(trace.x) <= 1000
+        assert trace.uid.startswith('viewport-')
+        assert np.array_equal(trace.marker.color, trace.customdata[:, 0].astype(float))
+        zoomed = VIEWPORT_STORE.refine(trace.uid, {'x': [0, 0.1], 'y': [0, 0.1]})
+        assert np.all((zoomed['x'][0] >= 0) & (zoomed['x'][0] <= 0.1))
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import pearsonr, spearmanr
+
+from quick_ternaries.services import zmap_correlation
+from quick_ternaries.services.zmap_correlation import CorrelationCache, grouped_correlations
+
+
+def _frame(n_groups=5, rows=30, seed=0):
+    rng = np.random.default_rng(seed)
+    n = n_groups * rows
+    fe = rng.normal(size=n)
+    df = pd.DataFrame({
+        "Site": rng.choice([f"S{i}" for i in range(n_groups)], size=n),
+        "Fe": fe,
+        "Mg": fe + rng.normal(scale=0.5, size=n),
+        # Ties and missing values
+        "Si": np.round(rng.normal(size=n)),
+        "Al": rng.normal(size=n),
+    })
+    df.loc[::7, "Al"] = np.nan
+    return df
+
+
+class TestGroupedCorrelations:
+    """Tests for the grouped Z-map correlation engine."""
+
+    @pytest.mark.parametrize("method, reference", [("spearman", spearmanr), ("pearson", None)])
+    def test_matches_scipy_per_group(self, method, reference):
+        """Test that every group's R and p match SciPy on the group's complete rows."""
+        df = _frame()
+        columns = ["Fe", "Mg", "Si", "Al"]
+
+        result = grouped_correlations(df, "Site", columns, method=method)
+
+        assert result.categories == sorted(df["Site"].unique())
+        for g, category in enumerate(result.categories):
+            data = df[df["Site"] == category][columns].dropna()
+            assert result.n[g] == len(data)
+            if reference is not None:
+                r, p = reference(data)
+            else:
+                pairs = [[pearsonr(data[a], data[b]) for b in columns] for a in columns]
+                r = np.array([[pair[0] for pair in row] for row in pairs])
+                p = np.array([[pair[1] for pair in row] for row in pairs])
+            assert np.allclose(result.r[g], r)
+            assert np.allclose(result.p[g], p, atol=1e-12)
+
+    def test_small_and_constant_groups_are_nan(self):
+        """Test that groups with fewer than two rows, and constant columns, give NaN."""
+        df = pd.DataFrame({
+            "Site": ["A", "A", "A", "B", "C", "C"],
+            "Fe": [1.0, 2.0, 3.0, 4.0, 5.0, np.nan],
+            "Mg": [1.0, 1.0, 1.0, 2.0, 3.0, 4.0],
+        })
+
+        result = grouped_correlations(df, "Site", ["Fe", "Mg"])
+
+        assert list(result.n) == [3, 1, 1]
+        assert np.isnan(result.r[0, 0, 1]) and np.isclose(result.r[0, 0, 0], 1.0)
+        assert np.isnan(result.r[1:]).all() and np.isnan(result.p[1:]).all()
+        with pytest.raises(ValueError):
+            grouped_correlations(df, "Site", ["Fe", "Mg"], method="kendall")
+
+    def test_heatmap_arrays(self):
+        """Test the z-matrix and customdata of one target."""
+        df = _frame(n_groups=3)
+        result = grouped_correlations(df, "Site", ["Fe", "Mg", "Si"])
+
+        z, others, customdata = result.heatmap("Mg")
+
+        assert others == ["Fe", "Si"] and z.shape == (2, 3)
+        significant = result.p[:, 1, 0] <= 0.05
+        assert np.array_equal(np.isnan(z[0]), ~significant)
+        assert np.allclose(z[0][significant], result.r[significant, 1, 0])
+        assert list(customdata[1, 2]) == [result.categories[2], "Si"]
+
+    def test_process_pool_matches_inline(self, monkeypatch):
+        """Test that splitting many groups across workers gives the same matrices."""
+        df = _frame(n_groups=40, rows=6, seed=1)
+        columns = ["Fe", "Mg", "Si", "Al"]
+        inline = grouped_correlations(df, "Site", columns)
+
+        monkeypatch.setattr(zmap_correlation, "PROCESS_POOL_MIN_GROUPS", 2)
+        pooled = grouped_correlations(df, "Site", columns, max_workers=3)
+
+        assert np.allclose(inline.r, pooled.r, equal_nan=True)
+
+
+class TestCorrelationCache:
+    """Tests for incremental Z-map correlations."""
+
+    def test_added_column_extends_cached_blocks(self):
+        """Test that a new column only extends each category's matrix, unless it changes the complete rows."""
+        df = _frame(n_groups=4)
+        df["Al"] = df["Al"].fillna(0.0)
+        df.loc[df.index[df["Site"] == "S2"][0], "Al"] = np.nan
+        cache = CorrelationCache()
+        cache.correlations([(df, None)], "Site", ["Fe", "Mg"])
+
+        result = cache.correlations([(df, None)], "Site", ["Fe", "Mg", "Si", "Al"])
+
+        # S2 loses a row to Al's missing value, so it is computed again
+        assert cache.last_update == {"computed": 1, "extended": 3, "reused": 0}
+        fresh = grouped_correlations(df, "Site", ["Fe", "Mg", "Si", "Al"])
+        assert np.allclose(result.r, fresh.r, equal_nan=True)
+        assert np.allclose(result.p, fresh.p, equal_nan=True)
+
+        # Reordering and dropping columns reuses the blocks whose complete rows stay the same
+        result = cache.correlations([(df, None)], "Site", ["Si", "Fe"])
+        assert cache.last_update == {"computed": 1, "extended": 0, "reused": 3}
+        assert np.allclose(result.r, grouped_correlations(df, "Site", ["Si", "Fe"]).r)
+
+    def test_changed_categorical_column_recomputes(self):
+        """Test that blocks cached under one categorical column are not reused for another."""
+        df = _frame(n_groups=2)
+        # Two columns with the same values and group sizes, on swapped halves of the rows
+        df["Site"] = ["S0"] * 30 + ["S1"] * 30
+        df["Other"] = ["S1"] * 30 + ["S0"] * 30
+        columns = ["Fe", "Mg", "Si"]
+        cache = CorrelationCache()
+        cache.correlations([(df, None)], "Site", columns)
+
+        result = cache.correlations([(df, None)], "Other", columns)
+
+        assert cache.last_update == {"computed": 2, "extended": 0, "reused": 0}
+        assert np.allclose(result.r, grouped_correlations(df, "Other", columns).r)
+
+    def test_added_trace_recomputes_only_its_categories(self):
+        """Test that a trace, or a filter, only recomputes the categories it has rows in."""
+        df = _frame(n_groups=4)
+        extra = _frame(n_groups=4, seed=3)
+        extra_mask = (extra["Site"] == "S1").to_numpy()
+        columns = ["Fe", "Mg", "Si"]
+        cache = CorrelationCache()
+        cache.correlations([(df, None)], "Site", columns)
+
+        result = cache.correlations([(df, None), (extra, extra_mask)], "Site", columns)
+
+        assert cache.last_update == {"computed": 1, "extended": 0, "reused": 3}
+        combined = pd.concat([df, extra[extra_mask]], ignore_index=True)
+        assert np.allclose(result.r, grouped_correlations(combined, "Site", columns).r)
+
+        # The same trace with another filter is another source
+        cache.correlations([(df, None), (extra, (extra["Site"] == "S3").to_numpy())], "Site", columns)
+        assert cache.last_update == {"computed": 2, "extended": 0, "reused": 2}
@@ -0,0 +1,155 @@
+import json
+import re
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+from scipy.stats import spearmanr
+
+from quick_ternaries.models.setup_menu_model import SetupMenuModel
+from quick_ternaries.models.trace_editor_model import TraceEditorModel
+from quick_ternaries.services.zmap_plot_maker import ZmapPlotMaker
+from quick_ternaries.utils.page_store import PageStore
+from quick_ternaries.utils.typed_arrays import numeric_array
+
+
+def _setup_model(df):
+    setup_model = SetupMenuModel()
+    setup_model.axis_members.categorical_column = "Site"
+    setup_model.axis_members.numerical_columns = ["Fe", "Mg", "Si"]
+    setup_model.data_library = MagicMock()
+    setup_model.data_library.dataframe_manager.get_dataframe_by_metadata.return_value = df
+    return setup_model
+
+
+def _page_data(html):
+    """Returns the data object embedded in a Z-map page."""
+    return json.loads(re.search(r"var ZMAP = (\{.*?\});\n", html).group(1))
+
+
+class TestZmapPlotMaker:
+    """Tests for the single-page Z-map."""
+
+    def test_one_page_holds_every_target(self):
+        """Test that one page carries the significant correlations of all targets."""
+        rng = np.random.default_rng(0)
+        fe = rng.normal(size=40)
+        df = pd.DataFrame({
+            "Site": ["A"] * 20 + ["B"] * 20,
+            "Fe": fe,
+            "Mg": 2 * fe + rng.normal(scale=0.01, size=40),
+            "Si": rng.normal(size=40),
+        })
+        store = PageStore()
+        maker = ZmapPlotMaker(store)
+
+        assert maker.make_plot(_setup_model(df), [TraceEditorModel()])
+
+        assert maker.targets == ["Fe", "Mg", "Si"]
+        assert maker.load_current_plot() == maker.page_url
+        html = store.get("/zmap/zmap.html")[0].decode("utf-8")
+        data = _page_data(html)
+        assert data["categories"] == ["A", "B"] and data["columns"] == maker.targets
+        assert data["titles"][1] == "Spearman's R: Mg vs Other Elements by Site"
+
+        r = numeric_array(data["r"]).reshape(2, 3, 3)
+        expected, p = spearmanr(df[df["Site"] == "B"][["Fe", "Mg", "Si"]])
+        assert np.isclose(r[1, 0, 1], expected[0, 1])
+        # Insignificant correlations are left out
+        assert np.isnan(r[1, 0, 2]) == (p[0, 2] > 0.05)
+
+        # Navigation only moves the target; the page is not rebuilt
+        assert maker.next_plot() == 1 and maker.current_target == "Mg"
+        assert maker.prev_plot() == 0 and maker.prev_plot() == 2
+        assert store.get("/zmap/zmap.html")[0].decode("utf-8") == html
+
+    def test_pearson_setting_titles_the_page(self):
+        """Test that the correlation method setting reaches the page."""
+        df = pd.DataFrame({
+            "Site": ["A"] * 4,
+            "Fe": [1.0, 2.0, 3.0, 4.0],
+            "Mg": [1.0, 4.0, 9.0, 16.0],
+            "Si": [4.0, 3.0, 2.0, 1.0],
+        })
+        setup_model = _setup_model(df)
+        setup_model.advanced_settings.zmap_correlation_method = "pearson"
+        maker = ZmapPlotMaker(PageStore())
+
+        assert maker.make_plot(setup_model, [TraceEditorModel()])
+
+        data = _page_data(maker.page_store.get("/zmap/zmap.html")[0].decode("utf-8"))
+        assert data["titles"][0] == "Pearson's R: Fe vs Other Elements by Site"
+
+    def test_two_columns_and_sparse_categories(self):
+        """Test the two-column case and categories with too few rows."""
+        df = pd.DataFrame({
+            "Site": ["A", "A", "A", "A", "B"],
+            "Fe": [1.0, 2.0, 3.0, 4.0, 5.0],
+            "Mg": [2.0, 4.0, 6.0, 8.0, 1.0],
+        })
+        setup_model = _setup_model(df)
+        setup_model.axis_members.numerical_columns = ["Fe", "Mg"]
+        maker = ZmapPlotMaker(PageStore())
+
+        assert maker.make_plot(setup_model, [TraceEditorModel()])
+
+        data = _page_data(maker.page_store.get("/zmap/zmap.html")[0].decode("utf-8"))
+        r = numeric_array(data["r"]).reshape(2, 2, 2)
+        assert maker.targets == ["Fe", "Mg"]
+        assert np.allclose(r[0], [[1.0, 1.0], [1.0, 1.0]])
+        assert np.isnan(r[1]).all()
+
+    def test_scatter_of_a_cell_uses_the_cached_rows(self):
+        """Test that a cell's scatter plot comes from the zmap's rows of that category."""
+        df = pd.DataFrame({
+            "Site": [2, 1, 2, 1, 2, 1, np.nan],
+            "Fe": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0],
+            "Mg": [2.0, 1.0, 6.0, 3.0, np.nan, 5.0, 1.0],
+            "Si": [1.0, 3.0, 2.0, 5.0, 4.0, 6.0, 0.0],
+        })
+        maker = ZmapPlotMaker(PageStore())
+        assert maker.make_plot(_setup_model(df), [TraceEditorModel()])
+
+        # Categories are in page order (sorted); the index is the heatmap column
+        assert maker.categories == [1.0, 2.0]
+        fig = maker.scatter_figure(1, "Fe", "Mg")
+
+        points, fit = fig.data
+        assert list(points.x) == [1.0, 3.0, 5.0]
+        assert list(points.y[:2]) == [2.0, 6.0] and np.isnan(points.y[2])
+        # The fit (y = 2x) skips the point without a Mg value
+        assert np.allclose(fit.y, [2.0, 10.0])
+        assert fig.layout.title.text == "Scatter: Fe vs Mg for Site=2.0"
+        assert maker.scatter_figure(2, "Fe", "Mg") is None
+        assert maker.scatter_figure(0, "Fe", "Al") is None
+
+    def test_resampled_significance_and_cancellation(self):
+        """Test that the permutation setting drives the page and that cancelling stops the build."""
+        rng = np.random.default_rng(1)
+        fe = rng.normal(size=30)
+        df = pd.DataFrame({
+            "Site": ["A"] * 30,
+            "Fe": fe,
+            "Mg": fe + rng.normal(scale=0.1, size=30),
+            "Si": rng.normal(size=30),
+        })
+        setup_model = _setup_model(df)
+        setup_model.advanced_settings.zmap_significance = "permutation"
+        setup_model.advanced_settings.zmap_resamples = 200
+        setup_model.advanced_settings.zmap_correction = "bonferroni"
+        maker = ZmapPlotMaker(PageStore())
+
+        assert maker.make_plot(setup_model, [TraceEditorModel()])
+        data = _page_data(maker.page_store.get("/zmap/zmap.html")[0].decode("utf-8"))
+        r = numeric_array(data["r"]).reshape(1, 3, 3)
+        assert not np.isnan(r[0, 0, 1])
+
+        page_url = maker.page_url
+
+        assert not maker.make_plot(setup_model, [TraceEditorModel()], cancelled=lambda: True)
+        assert maker.cancelled
+        # The previous zmap is still shown, so its page, navigation and scatter plots keep working
+        assert maker.page_url == page_url and maker.targets == ["Fe", "Mg", "Si"]
+        assert maker.page_store.get("/zmap/zmap.html") is not None
+        assert maker.next_plot() == 1
+        assert maker.scatter_figure(0, "Fe", "Mg") is not None
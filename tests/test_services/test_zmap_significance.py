@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quick_ternaries.services.zmap_correlation import grouped_correlations
+from quick_ternaries.services.zmap_significance import adjust_p_values, resampled_p_values
+
+
+def _correlations(rows=15, seed=0):
+    rng = np.random.default_rng(seed)
+    fe = rng.normal(size=2 * rows)
+    df = pd.DataFrame({
+        "Site": ["A"] * rows + ["B"] * rows,
+        "Fe": fe,
+        "Mg": fe + rng.normal(scale=0.2, size=2 * rows),
+        "Si": rng.normal(size=2 * rows),
+    })
+    # One category too small to correlate
+    df.loc[len(df)] = ["C", 1.0, 2.0, 3.0]
+    return grouped_correlations(df, "Site", ["Fe", "Mg", "Si"])
+
+
+class TestResampledPValues:
+    """Tests for permutation and bootstrap significance."""
+
+    @pytest.mark.parametrize("method", ["permutation", "bootstrap"])
+    def test_strong_and_null_correlations(self, method):
+        """Test that a strong correlation is significant and an unrelated column is not."""
+        correlations = _correlations()
+
+        p = resampled_p_values(correlations, method, n_resamples=2000, max_workers=1)
+
+        assert p.shape == correlations.r.shape
+        assert (p[:2, 0, 1] < 0.01).all()
+        assert np.allclose(p[:2], p[:2].transpose(0, 2, 1))
+        assert np.isnan(p[2]).all()
+        if method == "permutation":
+            # Close to the t-test for an unrelated pair
+            assert abs(p[0, 0, 2] - correlations.p[0, 0, 2]) < 0.1
+
+    def test_seeded_results_do_not_depend_on_workers(self):
+        """Test that the process pool gives the same p-values as running inline."""
+        correlations = _correlations()
+
+        inline = resampled_p_values(correlations, "permutation", n_resamples=500, seed=3, max_workers=1)
+        pooled = resampled_p_values(correlations, "permutation", n_resamples=500, seed=3, max_workers=2)
+
+        assert np.array_equal(inline, pooled, equal_nan=True)
+
+    def test_progress_and_cancellation(self):
+        """Test that progress is reported per job and that cancelling stops the test."""
+        correlations = _correlations()
+        reports = []
+
+        p = resampled_p_values(
+            correlations, "bootstrap", n_resamples=200, max_workers=1,
+            progress=lambda done, total: reports.append((done, total)),
+            cancelled=lambda: len(reports) == 2,
+        )
+
+        assert p is None
+        assert reports[0][0] == 1 and reports[-1][0] == 2 and reports[0][1] > 2
+
+
+class TestAdjustPValues:
+    """Tests for multiple-testing correction."""
+
+    def test_corrections_over_distinct_pairs(self):
+        """Test Bonferroni, Holm and Benjamini-Hochberg over the distinct pairs of all categories."""
+        p = np.full((2, 3, 3), np.nan)
+        for g, i, j, value in [(0, 0, 1, 0.01), (0, 0, 2, 0.04), (0, 1, 2, 0.03), (1, 0, 1, 0.005)]:
+            p[g, i, j] = p[g, j, i] = value
+        p[0, [0, 1, 2], [0, 1, 2]] = 0.0
+
+        def pairs(adjusted):
+            return [adjusted[0, 0, 1], adjusted[0, 0, 2], adjusted[0, 1, 2], adjusted[1, 0, 1]]
+
+        assert np.allclose(pairs(adjust_p_values(p, "bonferroni")), [0.04, 0.16, 0.12, 0.02])
+        assert np.allclose(pairs(adjust_p_values(p, "holm")), [0.03, 0.06, 0.06, 0.02])
+        assert np.allclose(pairs(adjust_p_values(p, "fdr_bh")), [0.02, 0.04, 0.04, 0.02])
+        adjusted = adjust_p_values(p, "holm")
+        assert np.array_equal(adjusted, adjusted.transpose(0, 2, 1), equal_nan=True)
+        assert adjusted[0, 1, 1] == 0.0 and np.isnan(adjusted[1, 1, 2])
+        assert adjust_p_values(p, "none") is p
@@ -0,0 +1,73 @@
+import json
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from quick_ternaries.models.setup_menu_model import SetupMenuModel
+from quick_ternaries.models.trace_editor_model import TraceEditorModel
+from quick_ternaries.services.cartesian_plot_maker import CartesianPlotMaker
+from quick_ternaries.services.ternary_plot_maker import TernaryPlotMaker
+from quick_ternaries.utils.fast_figure import FastFigure, figure_properties, to_json
+
+
+def _setup_model():
+    df = pd.DataFrame({
+        "A": [1.0, 2.0, 3.0, 4.0],
+        "B": [10.0, 20.0, np.nan, 40.0],
+        "C": [5.0, 6.0, 7.0, 8.0],
+    })
+    setup_model = SetupMenuModel()
+    setup_model.axis_members.top_axis = ["A"]
+    setup_model.axis_members.left_axis = ["B"]
+    setup_model.axis_members.right_axis = ["C"]
+    setup_model.axis_members.x_axis = ["A"]
+    setup_model.axis_members.y_axis = ["B"]
+    setup_model.data_library = MagicMock()
+    setup_model.data_library.dataframe_manager.get_dataframe_by_metadata.return_value = df
+    return setup_model
+
+
+def test_plot_makers_fast_path_matches_validated_figure():
+    setup_model = _setup_model()
+    trace_model = TraceEditorModel(heatmap_on=True, heatmap_column="C")
+
+    for maker, trace_models in ((TernaryPlotMaker(), [("uid-1", trace_model)]), (CartesianPlotMaker(), [trace_model])):
+        fast = maker.make_plot(setup_model, trace_models, validate=False)
+        validated = maker.make_plot(setup_model, trace_models)
+
+        assert isinstance(fast, FastFigure)
+        assert json.loads(fast.to_json()) == json.loads(validated.to_json())
+
+
+def test_fast_figure_shares_trace_arrays_and_validates_on_request():
+    a = np.linspace(0, 1, 5)
+    trace = go.Scatterternary(a=a, b=1 - a, c=np.zeros(5), mode="markers")
+    fig = FastFigure([trace], go.Layout(ternary=dict(sum=100)))
+    fig.add_trace({"type": "scatterternary", "a": [0.5], "b": [0.5], "c": [0.0], "mode": "lines"})
+
+    data = fig.to_plotly_json()["data"]
+    assert data[0]["a"] is trace.a
+    assert "template" in fig.to_plotly_json()["layout"]
+    # go.Figure.to_plotly_json would give a typed array spec here
+    assert np.array_equal(figure_properties(go.Figure(trace))["data"][0]["a"], a)
+    assert [t.mode for t in fig.to_figure().data] == ["markers", "lines"]
+
+
+def test_to_json_handles_numpy_and_nan():
+    customdata = np.array([[1.5, "id"], [np.nan, "id"]], dtype=object)
+    encoded = json.loads(to_json({
+        "x": np.array([1.0, np.nan]),
+        "customdata": customdata,
+        "color": np.array(["red", "blue"]),
+        "size": np.float32(2.5),
+        "count": np.int64(3),
+        "range": [0.0, float("inf")],
+    }))
+
+    assert encoded["x"]["dtype"] == "f8"
+    assert encoded["customdata"] == [[1.5, "id"], [None, "id"]]
+    assert encoded["color"] == ["red", "blue"]
+    assert encoded["size"] == 2.5 and encoded["count"] == 3
+    assert encoded["range"] == [0.0, None]
@@ -0,0 +1,32 @@
+from urllib.parse import urlsplit
+
+from quick_ternaries.utils.page_store import PAGE_SCHEME, PLOTLY_JS_PATH, PageStore, resolve_resource
+from quick_ternaries.utils.plotly_html import plotly_js_bundle
+
+
+def test_page_store_serves_its_own_pages_from_memory():
+    first, second = PageStore(), PageStore()
+    url = first.put("zmap/heatmap_0.html", "<html>Fe</html>")
+    blob = first.put("data/tensor.bin", b"\x00\x01", mime_type="application/octet-stream")
+
+    parts = urlsplit(url)
+    assert parts.scheme == PAGE_SCHEME and parts.netloc == first.host
+    assert resolve_resource(first.host, parts.path) == (b"<html>Fe</html>", "text/html")
+    assert resolve_resource(first.host, urlsplit(blob).path) == (b"\x00\x01", "application/octet-stream")
+    # Hosts are unique per store, so windows never see each other's pages
+    assert first.host != second.host
+    assert resolve_resource(second.host, parts.path) is None
+
+    first.remove("zmap/")
+    assert resolve_resource(first.host, parts.path) is None
+    assert resolve_resource(first.host, urlsplit(blob).path) is not None
+
+
+def test_page_store_serves_plotly_js_on_every_host():
+    store = PageStore()
+
+    data, mime_type = resolve_resource(store.host, PLOTLY_JS_PATH)
+
+    assert data == plotly_js_bundle().read_bytes()
+    assert mime_type == "application/javascript"
+    assert resolve_resource("unknown-host", PLOTLY_JS_PATH) is None
@@ -0,0 +1,44 @@
+import time
+
+import pytest
+
+from quick_ternaries.utils.parallel import ordered_map, process_imap, process_map
+
+
+def _square(x):
+    return x * x
+
+
+class TestOrderedMap:
+    """Tests for the ordered worker-pool helpers."""
+
+    def test_results_keep_input_order(self):
+        """Test that results come back in input order even when later jobs finish first."""
+        def slow_for_small(x):
+            time.sleep(0.01 * (5 - x))
+            return x
+
+        assert ordered_map(slow_for_small, range(5), max_workers=5) == [0, 1, 2, 3, 4]
+
+    def test_exceptions_propagate(self):
+        """Test that a failing job raises, as it would in a plain loop."""
+        def fail_on_two(x):
+            if x == 2:
+                raise ValueError("bad trace")
+            return x
+
+        with pytest.raises(ValueError, match="bad trace"):
+            ordered_map(fail_on_two, range(4), max_workers=4)
+
+    def test_process_map_keeps_input_order(self):
+        """Test that the process pool returns results in input order."""
+        assert process_map(_square, [3, 1, 2], max_workers=2) == [9, 1, 4]
+
+    def test_process_imap_yields_in_order_and_stops_early(self):
+        """Test that results stream in input order and that closing the generator stops it."""
+        assert list(process_imap(_square, [3, 1, 2], max_workers=2)) == [9, 1, 4]
+
+        results = process_imap(_square, range(10), max_workers=1)
+        assert next(results) == 0
+        results.close()
+        assert list(results) == []
@@ -0,0 +1,80 @@
+import json
+
+import numpy as np
+import plotly.graph_objects as go
+
+from quick_ternaries.services.cartesian_trace_maker import CartesianTraceMaker
+from quick_ternaries.services.hover_store import HOVER_STORE, trace_store_key
+from quick_ternaries.services.line_decimation import LINE_STORE
+from quick_ternaries.services.viewport_lod import VIEWPORT_STORE
+from quick_ternaries.utils.fast_figure import FastFigure
+from quick_ternaries.utils.plot_page import PageFigure, plot_page_html
+from quick_ternaries.utils.plotly_html import OPEN_SANS_STYLE_ID, plotly_js_uri
+
+
+def test_plot_page_loads_plotly_and_the_web_channel():
+    html = plot_page_html()
+
+    assert f'src="{plotly_js_uri()}"' in html
+    assert "qrc:///qtwebchannel/qwebchannel.js" in html
+    assert "figure_changed.connect" in html
+    assert OPEN_SANS_STYLE_ID in html
+
+
+def test_page_figure_sends_only_changed_traces():
+    page_figure = PageFigure()
+    first = go.Figure([go.Scatter(x=[1, 2], y=[3, 4], name="A"), go.Scatter(x=[5], y=[6], name="B")])
+    second = go.Figure([go.Scatter(x=[1, 2], y=[3, 4], name="A"), go.Scatter(x=[5], y=[7], name="B"),
+                        go.Scatter(x=[8], y=[9], name="C")])
+
+    initial = json.loads(page_figure.update(first))
+    update = json.loads(page_figure.update(second))
+
+    assert [trace["name"] for trace in initial["data"]] == ["A", "B"]
+    assert update["data"][0] is None
+    assert [trace["name"] for trace in update["data"][1:]] == ["B", "C"]
+    assert update["layout"]["uirevision"] == "xy"
+    assert update["config"] == {"responsive": True}
+    assert [trace["name"] for trace in json.loads(page_figure.full())["data"]] == ["A", "B", "C"]
+
+
+def test_page_figure_keeps_ui_state_per_kind_of_axes():
+    page_figure = PageFigure()
+
+    assert page_figure.full() == ""
+    payload = json.loads(page_figure.update(go.Figure(go.Scatterternary(a=[1], b=[1], c=[1]))))
+    assert payload["layout"]["uirevision"] == "ternary"
+
+
+def _render_large_traces():
+    """Renders a decimated line and a sampled marker trace the way the preview does."""
+    for store in (HOVER_STORE, LINE_STORE, VIEWPORT_STORE):
+        store.clear()
+    n_points = 5000
+    x = np.arange(n_points, dtype=float)
+    traces = []
+    for trace_id, mode in [("line-tab", "lines"), ("marker-tab", "markers")]:
+        hover_key = HOVER_STORE.register(["X"], [x], trace_store_key(trace_id, "hover"))
+        prepared = dict(
+            x=x, y=np.cos(x / 100.0), name=trace_id, mode=mode, marker=dict(color="red"),
+            line=None, customdata=np.arange(n_points)[:, None], showlegend=True,
+            hover_kwargs=dict(hoverinfo="none", meta=hover_key),
+            webgl_threshold=0, line_points=2000, marker_points=2000, source_trace_id=trace_id,
+        )
+        traces.append(CartesianTraceMaker().build_trace(prepared))
+    return traces
+
+
+def test_page_figure_skips_unchanged_large_traces():
+    page_figure = PageFigure()
+    first = _render_large_traces()
+    page_figure.update(FastFigure(data=first))
+
+    second = _render_large_traces()
+    update = json.loads(page_figure.update(FastFigure(data=second)))
+
+    # The store keys (uid and hover meta) do not change between renders
+    assert [trace.uid for trace in second] == ["decimated-line-tab-sample", "viewport-marker-tab-sample"]
+    assert second[0].meta == first[0].meta == "line-tab-sample-hover"
+    assert update["data"] == [None, None]
+    assert len(LINE_STORE.refine(second[0].uid, 0, 100)["x"][0]) == 102
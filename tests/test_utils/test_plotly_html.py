@@ -8,8 +8,10 @@ from quick_ternaries.utils.fonts import (
 from quick_ternaries.utils.plotly_html import (
     OPEN_SANS_STYLE_ID,
     figure_to_html,
+    figure_to_page_html,
     inject_open_sans_font_faces,
     open_sans_font_face_style,
+    plotly_js_uri,
     write_plotly_html,
 )
 
@@ -61,3 +63,14 @@ def test_write_plotly_html_writes_bundled_open_sans_support(tmp_path):
     html = filepath.read_text(encoding="utf-8")
     assert OPEN_SANS_STYLE_ID in html
     assert OPEN_SANS_REGULAR_FONT.resolve().as_uri() in html
+
+
+def test_figure_to_page_html_loads_the_local_plotly_bundle():
+    fig = go.Figure(data=go.Scatter(x=[1, 2], y=[3, 4]))
+
+    html = figure_to_page_html(fig)
+
+    assert plotly_js_uri().startswith("file://")
+    assert f'src="{plotly_js_uri()}"' in html
+    assert len(html) < 100_000
+    assert OPEN_SANS_STYLE_ID in html
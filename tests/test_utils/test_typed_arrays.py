@@ -0,0 +1,70 @@
+import base64
+
+import numpy as np
+
+from quick_ternaries.utils.typed_arrays import (
+    encode_restyle_update,
+    encode_trace,
+    numeric_array,
+    typed_array_spec,
+)
+
+
+def test_typed_array_spec_round_trips_and_downcasts():
+    integers = typed_array_spec(np.array([0, 300, 70000], dtype=np.int64))
+    small = typed_array_spec(np.array([-3, 100], dtype=np.int64))
+    grid = typed_array_spec(np.arange(6.0).reshape(3, 2))
+
+    assert integers["dtype"] == "i4" and list(numeric_array(integers)) == [0, 300, 70000]
+    assert small["dtype"] == "i1"
+    assert grid["shape"] == "3, 2" and np.array_equal(numeric_array(grid), np.arange(6.0).reshape(3, 2))
+    assert typed_array_spec(np.array([1.5, np.nan]), float32=True)["dtype"] == "f4"
+    # float32 would turn these into 0 and inf, so they stay float64
+    assert typed_array_spec(np.array([1e-40, 1.0]), float32=True)["dtype"] == "f8"
+    assert typed_array_spec(np.array([1e300]), float32=True)["dtype"] == "f8"
+
+
+def test_encode_trace_uses_float32_only_where_allowed():
+    x = np.linspace(0, 1, 50)
+    trace = {
+        "type": "scatter", "x": list(x), "y": x.tolist(),
+        "marker": {"size": [4.0] * 50, "color": ["red"] * 50},
+    }
+
+    encoded = encode_trace(trace)
+    quantized = encode_trace(trace, float32_coordinates=True)
+
+    assert encoded["x"]["dtype"] == "f8" and np.array_equal(numeric_array(encoded["x"]), x)
+    assert encoded["marker"]["size"]["dtype"] == "f4"
+    assert encoded["marker"]["color"] == ["red"] * 50
+    assert quantized["x"]["dtype"] == "f4"
+    assert isinstance(trace["x"], list) and isinstance(trace["marker"]["size"], list)
+
+
+def test_encode_trace_keeps_only_customdata_the_hover_shows():
+    customdata = np.array([[1.5, 2.5, 7, "trace-id"], [3.5, 4.5, 8, "trace-id"]], dtype=object)
+    shown = encode_trace({"customdata": customdata, "hovertemplate": "%{customdata[0]} %{customdata[1]}"})
+    hidden = encode_trace({"customdata": customdata, "hoverinfo": "none", "meta": "key"})
+    whole = encode_trace({"customdata": customdata, "hovertemplate": "%{customdata}"})
+
+    assert shown["customdata"]["shape"] == "2, 2"
+    assert np.array_equal(numeric_array(shown["customdata"]), [[1.5, 2.5], [3.5, 4.5]])
+    assert "customdata" not in hidden
+    assert whole["customdata"] is customdata
+
+
+def test_encode_restyle_update_encodes_point_arrays():
+    update = {
+        "x": [np.array([1.0, 2.0])],
+        "marker.size": [np.array([4.0, 5.0])],
+        "marker.color": [np.array(["red", "blue"])],
+        "meta": ["hover-key"],
+    }
+
+    encoded = encode_restyle_update(update)
+
+    assert encoded["x"][0]["dtype"] == "f8"
+    assert encoded["marker.size"][0]["dtype"] == "f4"
+    assert list(encoded["marker.color"][0]) == ["red", "blue"]
+    assert encoded["meta"] == ["hover-key"]
+    assert base64.b64decode(encoded["x"][0]["bdata"]) == np.array([1.0, 2.0]).tobytes()